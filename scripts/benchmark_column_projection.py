@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark reading a wide extract through a sheet's scan plan.
+
+Generates a CSV file with many columns of which a mapping uses only a few,
+then reads it with CSVParser.parse() (every column) and with
+CSVParser.parse_plan() using the sheet's scan plan (mapped columns only,
+optionally filtered). Reports the read time and the size of the largest
+chunk held in memory.
+
+Usage:
+    python benchmark_column_projection.py
+    python benchmark_column_projection.py --rows 200000 --columns 300 --mapped 20
+    python benchmark_column_projection.py --filter "c0001 % 2 = 0"
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import polars as pl
+
+from rdfmap.emitter.mapping_plan import compile_sheet
+from rdfmap.models.mapping import MappingConfig
+from rdfmap.parsers.data_source import CSVParser
+
+
+def write_csv(path: Path, rows: int, columns: int) -> None:
+    """Write a CSV file of ``columns`` columns: an id, then numbers and text."""
+    frame = pl.DataFrame({"id": pl.int_range(rows, eager=True)})
+    frame = frame.with_columns([
+        ((pl.col("id") * (i + 7)) % 100_003).alias(f"c{i:04d}") if i % 2
+        else pl.format("value-{}-{}", pl.col("id") % 997, pl.lit(i)).alias(f"c{i:04d}")
+        for i in range(1, columns)
+    ])
+    frame.write_csv(path)
+
+
+def make_config(mapped: int, condition: Optional[str]) -> MappingConfig:
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        defaults={"base_iri": "http://example.org/"},
+        sheets=[{
+            "name": "wide",
+            "source": "wide.csv",
+            "filter_condition": condition,
+            "row_resource": {"class": "ex:Row", "iri_template": "{base_iri}row/{id}"},
+            "columns": {f"c{i:04d}": {"as": f"ex:p{i}"} for i in range(1, mapped)},
+        }],
+    )
+
+
+def time_read(chunks: Iterator[pl.DataFrame]) -> Tuple[float, int, float]:
+    start = time.perf_counter()
+    total, peak = 0, 0
+    for chunk in chunks:
+        total += len(chunk)
+        peak = max(peak, chunk.estimated_size())
+    return time.perf_counter() - start, total, peak / (1024 * 1024)
+
+
+def main(rows: int, columns: int, mapped: int, chunk_size: int, condition: Optional[str]) -> None:
+    config = make_config(mapped, condition)
+    plan = compile_sheet(config.sheets[0], config).scan_plan()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "wide.csv"
+        write_csv(path, rows, columns)
+        size_mb = path.stat().st_size / (1024 * 1024)
+        print(f"{rows:,} rows x {columns} columns ({size_mb:.1f} MB), {mapped} mapped, chunk_size={chunk_size:,}")
+        print(f"{'reader':>12} {'rows':>10} {'seconds':>9} {'chunk MB':>9}")
+
+        parser = CSVParser(path)
+        full = time_read(parser.parse(chunk_size=chunk_size))
+        planned = time_read(parser.parse_plan(plan, chunk_size=chunk_size))
+        for name, (elapsed, total, peak) in (("all columns", full), ("scan plan", planned)):
+            print(f"{name:>12} {total:>10,} {elapsed:>9.3f} {peak:>9.1f}")
+
+    print(f"\nSpeed-up {full[0] / planned[0]:.1f}x, chunk memory {full[2] / max(planned[2], 1e-9):.1f}x smaller")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark column projection of wide sources")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=300)
+    parser.add_argument("--mapped", type=int, default=20, help="Columns used by the mapping, id included")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--filter", dest="condition", help="filter_condition of the sheet")
+    args = parser.parse_args()
+    main(args.rows, args.columns, args.mapped, args.chunk_size, args.condition)
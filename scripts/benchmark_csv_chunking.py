@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark chunked CSV reading to show it scales linearly with file size.
+
+Generates CSV files of increasing size, reads each one with
+CSVParser.parse(chunk_size=...) and reports time per row. With the
+single-pass batched reader the time per row stays flat as the file grows;
+the old skip_rows loop (--legacy) re-scans the file for every chunk and its
+time per row grows with the file.
+
+Usage:
+    python benchmark_csv_chunking.py
+    python benchmark_csv_chunking.py --rows 50000 100000 200000 400000 --chunk-size 1000
+    python benchmark_csv_chunking.py --legacy  # also time the old skip_rows loop
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+import polars as pl
+
+from rdfmap.parsers.data_source import CSVParser
+
+
+def write_csv(path: Path, rows: int) -> None:
+    """Write a mortgage-like CSV file with the given number of rows."""
+    pl.DataFrame({
+        "LoanID": [f"L-{i:08d}" for i in range(rows)],
+        "BorrowerID": [f"B-{i % 50000:06d}" for i in range(rows)],
+        "Principal": [100000 + (i * 37) % 900000 for i in range(rows)],
+        "InterestRate": [0.03 + (i % 500) / 10000 for i in range(rows)],
+        "OriginationDate": [f"2023-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in range(rows)],
+    }).write_csv(path)
+
+
+def legacy_chunks(path: Path, chunk_size: int) -> Iterator[pl.DataFrame]:
+    """The previous skip_rows/n_rows loop, kept here for comparison only."""
+    offset = 0
+    while True:
+        try:
+            chunk = pl.read_csv(
+                path, has_header=False, skip_rows=1 + offset, n_rows=chunk_size,
+                null_values=[""], ignore_errors=True,
+            )
+        except pl.exceptions.NoDataError:
+            break
+        if len(chunk) == 0:
+            break
+        yield chunk
+        offset += len(chunk)
+        if len(chunk) < chunk_size:
+            break
+
+
+def time_read(chunks: Iterator[pl.DataFrame]) -> tuple[float, int]:
+    start = time.perf_counter()
+    total = sum(len(chunk) for chunk in chunks)
+    return time.perf_counter() - start, total
+
+
+def main(row_counts: List[int], chunk_size: int, legacy: bool) -> None:
+    print(f"Chunked CSV read benchmark (chunk_size={chunk_size:,})")
+    print(f"{'rows':>12} {'MB':>8} {'batched s':>10} {'us/row':>8}" + (f" {'legacy s':>10} {'us/row':>8}" if legacy else ""))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            path = Path(tmp) / f"loans_{rows}.csv"
+            write_csv(path, rows)
+            size_mb = path.stat().st_size / (1024 * 1024)
+
+            elapsed, total = time_read(CSVParser(path).parse(chunk_size=chunk_size))
+            assert total == rows
+            line = f"{rows:>12,} {size_mb:>8.1f} {elapsed:>10.3f} {elapsed / rows * 1e6:>8.2f}"
+
+            if legacy:
+                legacy_elapsed, legacy_total = time_read(legacy_chunks(path, chunk_size))
+                assert legacy_total == rows
+                line += f" {legacy_elapsed:>10.3f} {legacy_elapsed / rows * 1e6:>8.2f}"
+
+            print(line)
+            path.unlink()
+
+    print("\nLinear scaling: the batched us/row column should stay roughly constant.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark chunked CSV reading")
+    parser.add_argument("--rows", type=int, nargs="+", default=[50_000, 100_000, 200_000, 400_000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--legacy", action="store_true", help="Also time the old skip_rows loop")
+    args = parser.parse_args()
+    main(args.rows, args.chunk_size, args.legacy)
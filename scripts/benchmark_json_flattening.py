@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark flattening nested JSON records in Python and with Polars.
+
+Repeats the records of a nested sample (by default the mortgage
+applications written by create_nested_test_data.py) with unique ids into a
+JSON file, then reads it in batches by decoding each record and flattening
+it with JSONParser._flatten_json_data (Python), with JSONParser.parse()
+(Polars, every column) and with JSONParser.parse_plan() limited to the
+paths a mapping references. Checks that the Python and Polars outputs hold
+the same rows and columns.
+
+Usage:
+    python benchmark_json_flattening.py
+    python benchmark_json_flattening.py --records 200000 --batch-size 10000
+    python benchmark_json_flattening.py --sample ../test_formats/mortgage_applications_nested.json
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+
+import polars as pl
+
+from rdfmap.parsers.data_source import JSONParser, ScanPlan
+from rdfmap.parsers.json_stream import iter_json_records
+
+DEFAULT_SAMPLE = Path(__file__).resolve().parent.parent / "test_formats" / "mortgage_applications_nested.json"
+
+# Columns a mapping of applications and their borrowers would use
+MAPPED_PATHS = [
+    "applicationId", "status", "loanDetails.requestedAmount", "property.address.city",
+    "borrowers.borrowerId", "borrowers.personalInfo.firstName", "borrowers.creditReport.score",
+]
+
+
+def make_records(sample: List[Any], count: int) -> List[Any]:
+    """Repeat the sample records, renumbering their applicationId."""
+    records = []
+    for i in range(count):
+        record = copy.deepcopy(sample[i % len(sample)])
+        record["applicationId"] = f"APP-{i:08d}"
+        records.append(record)
+    return records
+
+
+def python_frames(path: Path, batch_size: int) -> Iterator[pl.DataFrame]:
+    """Decode every record in Python and flatten it with the Python flattener."""
+    parser = JSONParser(path)
+    with open(path, encoding="utf-8") as f:
+        records = iter_json_records(f)
+        while True:
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                return
+            yield pl.DataFrame(parser._flatten_json_data(batch), infer_schema_length=None)
+
+
+def time_read(frames: Iterator[pl.DataFrame]) -> Tuple[float, pl.DataFrame]:
+    start = time.perf_counter()
+    frames = list(frames)
+    elapsed = time.perf_counter() - start
+    return elapsed, pl.concat(frames, how="diagonal_relaxed")
+
+
+def main(sample_path: Path, count: int, batch_size: int) -> None:
+    sample = json.loads(sample_path.read_text())
+    records = make_records(sample if isinstance(sample, list) else [sample], count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "records.json"
+        path.write_text(json.dumps(records))
+        size_mb = path.stat().st_size / (1024 * 1024)
+        print(f"{count:,} records from {sample_path.name} ({size_mb:.1f} MB), batch_size={batch_size:,}")
+        print(f"{'flattener':>16} {'rows':>10} {'columns':>8} {'seconds':>9}")
+
+        parser = JSONParser(path)
+        python = time_read(python_frames(path, batch_size))
+        polars = time_read(parser.parse(chunk_size=batch_size))
+        mapped = time_read(parser.parse_plan(ScanPlan(columns=MAPPED_PATHS), chunk_size=batch_size))
+    for name, (elapsed, frame) in (("python", python), ("polars", polars), ("polars, mapped", mapped)):
+        print(f"{name:>16} {frame.height:>10,} {frame.width:>8} {elapsed:>9.3f}")
+
+    expected, actual = python[1], polars[1]
+    same = set(expected.columns) == set(actual.columns) and expected.equals(actual.select(expected.columns))
+    print(f"\nPolars output matches Python: {same}")
+    print(f"Speed-up {python[0] / polars[0]:.1f}x (every column), {python[0] / mapped[0]:.1f}x (mapped paths)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark nested JSON flattening")
+    parser.add_argument("--sample", type=Path, default=DEFAULT_SAMPLE, help="JSON file of sample records")
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.sample, args.records, args.batch_size)
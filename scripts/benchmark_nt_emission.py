@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark N-Triples emission: columnar engine vs row-wise RDFGraphBuilder.
+
+Generates the mortgage dataset described by config_mortgage_500k.json, maps
+it with examples/mortgage/config/internal_inline.yaml and streams N-Triples
+with both ColumnarNTriplesBuilder and RDFGraphBuilder(streaming_writer=...).
+Reports rows/second for each engine, the speedup, and checks that both
+wrote the same triples.
+
+Usage:
+    python benchmark_nt_emission.py
+    python benchmark_nt_emission.py --rows 100000 --chunk-size 50000
+    python benchmark_nt_emission.py --skip-row-wise  # columnar engine only
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from rdfmap.config.loader import load_mapping_config
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.parsers.data_source import CSVParser
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+from generate_large_dataset import DataGenerator  # noqa: E402
+
+MAPPING = SCRIPTS_DIR.parent / "examples" / "mortgage" / "config" / "internal_inline.yaml"
+
+
+def run(engine: str, config, chunks, output: Path) -> tuple[float, int]:
+    """Stream all chunks to an N-Triples file and return (seconds, triples)."""
+    report = ProcessingReport()
+    sheet = config.sheets[0]
+    start = time.perf_counter()
+    with NTriplesStreamWriter(output) as writer:
+        if engine == "columnar":
+            builder = ColumnarNTriplesBuilder(config, report, writer)
+        else:
+            builder = RDFGraphBuilder(config, report, streaming_writer=writer)
+        offset = 0
+        for chunk in chunks:
+            builder.add_dataframe(chunk, sheet, offset=offset)
+            offset += len(chunk)
+    return time.perf_counter() - start, builder.get_triple_count()
+
+
+def main(rows: int, chunk_size: int, skip_row_wise: bool) -> None:
+    with open(SCRIPTS_DIR / "config_mortgage_500k.json") as f:
+        data_config = json.load(f)
+    if rows:
+        data_config["num_rows"] = rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        csv_path = tmp / "loans.csv"
+        DataGenerator(data_config).generate().write_csv(csv_path)
+
+        # Point the example mapping at the generated file; imports and SHACL
+        # shapes are not needed for emission
+        mapping = yaml.safe_load(MAPPING.read_text())
+        mapping["sheets"][0]["source"] = str(csv_path)
+        mapping.pop("imports", None)
+        mapping.pop("validation", None)
+        mapping_path = tmp / "mapping.yaml"
+        mapping_path.write_text(yaml.safe_dump(mapping))
+
+        config = load_mapping_config(mapping_path)
+        config.options.aggregate_duplicates = False
+
+        # Parse once up front so only emission is timed
+        chunks = list(CSVParser(csv_path).parse(chunk_size=chunk_size))
+        total_rows = sum(len(chunk) for chunk in chunks)
+        print(f"\nN-Triples emission benchmark: {total_rows:,} rows, chunk_size={chunk_size:,}")
+
+        engines = ["columnar"] if skip_row_wise else ["columnar", "row-wise"]
+        results = {}
+        for engine in engines:
+            output = tmp / f"{engine}.nt"
+            elapsed, triples = run(engine, config, chunks, output)
+            results[engine] = (elapsed, output)
+            print(f"  {engine:>9}: {elapsed:8.2f}s  {total_rows / elapsed:>12,.0f} rows/s  {triples:,} triples")
+
+        if not skip_row_wise:
+            speedup = results["row-wise"][0] / results["columnar"][0]
+            print(f"\n  Speedup: {speedup:.1f}x")
+            columnar, row_wise = (sorted(results[e][1].read_text().splitlines()) for e in engines)
+            print(f"  Identical output: {columnar == row_wise}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark N-Triples emission engines")
+    parser.add_argument("--rows", type=int, default=None, help="Rows to generate (default: from config)")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--skip-row-wise", action="store_true", help="Only time the columnar engine")
+    args = parser.parse_args()
+    main(args.rows, args.chunk_size, args.skip_row_wise)
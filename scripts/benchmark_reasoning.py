@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark conversion with ontology reasoning against ontology size.
+
+Generates a reporting-chain dataset (employees linked to managers and peers)
+and ontologies with a growing number of properties, of which only a handful
+(reportsTo: transitive with an inverse, colleague: symmetric) are used by the
+mapping. Conversion with RDFGraphBuilder(ontology_analyzer=...) materializes
+superclass types and property links in one pass over the finished graph, so
+the time should stay flat as the ontology grows.
+
+Usage:
+    python benchmark_reasoning.py
+    python benchmark_reasoning.py --rows 50000 --sizes 10 1000 10000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.generator.ontology_analyzer import OntologyAnalyzer
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+
+HEADER = """@prefix ex: <http://example.org/> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Agent a owl:Class .
+ex:Person a owl:Class ; rdfs:subClassOf ex:Agent .
+ex:Employee a owl:Class ; rdfs:subClassOf ex:Person .
+ex:reportsTo a owl:ObjectProperty, owl:TransitiveProperty ; owl:inverseOf ex:manages .
+ex:manages a owl:ObjectProperty .
+ex:colleague a owl:ObjectProperty, owl:SymmetricProperty .
+"""
+
+CHARACTERISTICS = ["", ", owl:TransitiveProperty", ", owl:SymmetricProperty", ", owl:FunctionalProperty"]
+
+
+def write_ontology(path: Path, properties: int) -> None:
+    """Write an ontology with ``properties`` extra, unused properties."""
+    lines = [HEADER]
+    for i in range(properties):
+        kind = CHARACTERISTICS[i % len(CHARACTERISTICS)]
+        lines.append(f"ex:p{i} a owl:ObjectProperty{kind} ; rdfs:domain ex:Person ; rdfs:range ex:Person .")
+        if i % 5 == 0:
+            lines.append(f"ex:p{i} owl:inverseOf ex:q{i} .")
+    path.write_text("\n".join(lines) + "\n")
+
+
+def make_config() -> MappingConfig:
+    def person(predicate, column):
+        return {"predicate": predicate, "class": "ex:Employee", "iri_template": f"{{base_iri}}person/{{{column}}}"}
+
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        defaults={"base_iri": "http://example.org/"},
+        sheets=[{
+            "name": "people",
+            "source": "people.csv",
+            "row_resource": {"class": "ex:Employee", "iri_template": "{base_iri}person/{id}"},
+            "columns": {"name": {"as": "ex:name"}},
+            "objects": {
+                "manager": person("ex:reportsTo", "manager_id"),
+                "peer": person("ex:colleague", "peer_id"),
+            },
+        }],
+    )
+
+
+def make_frame(rows: int) -> pl.DataFrame:
+    """Teams of 10 employees, each reporting to the next; even rows name a peer."""
+    ids = [f"e{i}" for i in range(rows)]
+    return pl.DataFrame({
+        "id": ids,
+        "name": [f"Employee {i}" for i in range(rows)],
+        "manager_id": [ids[i + 1] if (i + 1) % 10 else None for i in range(rows - 1)] + [None],
+        "peer_id": [ids[i + 1] if i % 2 == 0 and i + 1 < rows else None for i in range(rows)],
+    })
+
+
+def run(config: MappingConfig, frame: pl.DataFrame, analyzer: OntologyAnalyzer) -> tuple[float, ProcessingReport, int]:
+    report = ProcessingReport()
+    start = time.perf_counter()
+    builder = RDFGraphBuilder(config, report, ontology_analyzer=analyzer)
+    builder.add_dataframe(frame, config.sheets[0])
+    graph = builder.get_graph()
+    return time.perf_counter() - start, report, len(graph)
+
+
+def main(rows: int, sizes: list[int]) -> None:
+    config = make_config()
+    frame = make_frame(rows)
+    print(f"\nReasoning benchmark: {rows:,} rows")
+    print(f"  {'properties':>10}  {'seconds':>8}  {'triples':>9}  {'types':>7}  {'transitive':>10}  {'inverse':>8}  {'symmetric':>9}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = Path(tmp) / f"ontology_{size}.ttl"
+            write_ontology(path, size)
+            analyzer = OntologyAnalyzer(str(path))
+            elapsed, report, triples = run(config, frame, analyzer)
+            print(
+                f"  {size:>10,}  {elapsed:>8.2f}  {triples:>9,}  {report.inferred_types:>7,}"
+                f"  {report.transitive_links_added:>10,}  {report.inverse_links_added:>8,}"
+                f"  {report.symmetric_links_added:>9,}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark reasoning cost against ontology size")
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+    main(args.rows, args.sizes)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory of aggregated conversion with each triple store.
+
+Builds the aggregated graph of a generated loan dataset with RDFGraphBuilder
+on rdflib's memory store and on InternedTripleStore (options.triple_store),
+and reports the time, the memory held by the finished graph and the peak
+memory, as measured by tracemalloc (which also tracks numpy arrays).
+
+Usage:
+    python benchmark_triple_store.py
+    python benchmark_triple_store.py --rows 200000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import polars as pl
+
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+
+
+def make_config(triple_store: str) -> MappingConfig:
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        defaults={"base_iri": "http://example.org/"},
+        options={"triple_store": triple_store},
+        sheets=[{
+            "name": "loans",
+            "source": "loans.csv",
+            "row_resource": {"class": "ex:Loan", "iri_template": "{base_iri}loan/{id}"},
+            "columns": {
+                "amount": {"as": "ex:amount", "datatype": "xsd:integer"},
+                "rate": {"as": "ex:rate", "datatype": "xsd:decimal"},
+                "status": {"as": "ex:status"},
+            },
+            "objects": {
+                "borrower": {
+                    "predicate": "ex:hasBorrower", "class": "ex:Borrower",
+                    "iri_template": "{base_iri}borrower/{borrower_id}",
+                    "properties": [{"column": "borrower_name", "as": "ex:name"}],
+                },
+            },
+        }],
+    )
+
+
+def make_frame(rows: int) -> pl.DataFrame:
+    """Loans with a borrower shared by every 3 loans."""
+    return pl.DataFrame({
+        "id": [f"L{i}" for i in range(rows)],
+        "amount": [str(100_000 + i) for i in range(rows)],
+        "rate": [f"{3 + (i % 400) / 100:.2f}" for i in range(rows)],
+        "status": [("Active", "Closed", "Pending")[i % 3] for i in range(rows)],
+        "borrower_id": [f"B{i // 3}" for i in range(rows)],
+        "borrower_name": [f"Borrower {i // 3}" for i in range(rows)],
+    })
+
+
+def run(triple_store: str, frame: pl.DataFrame) -> tuple[float, int, int, int]:
+    config = make_config(triple_store)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    builder = RDFGraphBuilder(config, ProcessingReport())
+    for offset in range(0, len(frame), 10_000):
+        builder.add_dataframe(frame.slice(offset, 10_000), config.sheets[0], offset=offset)
+    triples = builder.get_triple_count()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, triples, current, peak
+
+
+def main(rows: int) -> None:
+    frame = make_frame(rows)
+    print(f"\nTriple store benchmark: {rows:,} rows")
+    print(f"  {'store':>9}  {'seconds':>8}  {'triples':>10}  {'held MB':>8}  {'peak MB':>8}  {'bytes/triple':>12}")
+    for triple_store in ("memory", "interned"):
+        elapsed, triples, current, peak = run(triple_store, frame)
+        print(
+            f"  {triple_store:>9}  {elapsed:>8.2f}  {triples:>10,}  {current / 2**20:>8.1f}"
+            f"  {peak / 2**20:>8.1f}  {current / triples:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark memory of the aggregated triple stores")
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.rows)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory of reading an XLSX sheet whole and in streamed chunks.
+
+Writes a generated workbook, then reads its first sheet by loading every
+row into a list and building one DataFrame (as XLSXParser did before it
+streamed rows) and with XLSXParser.parse(), in chunks. Reports the time
+and the peak memory of each, as measured by tracemalloc (Python objects:
+the row lists, not the frames Polars allocates), and checks that both give
+the same rows. Also reports the time to open the workbook, which the
+parsers of its sheets and the analyzers now pay once per run.
+
+Usage:
+    python benchmark_xlsx_streaming.py
+    python benchmark_xlsx_streaming.py --rows 500000 --chunk-size 10000
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+import polars as pl
+from openpyxl import Workbook, load_workbook
+
+from rdfmap.parsers.data_source import XLSXParser
+from rdfmap.parsers.xlsx_stream import close_workbooks, header_names, open_workbook
+
+
+def write_workbook(path: Path, rows: int) -> None:
+    """Loans and a second sheet of borrowers."""
+    wb = Workbook(write_only=True)
+    loans = wb.create_sheet("Loans")
+    loans.append(["LoanID", "Amount", "Rate", "Status", "City"])
+    for i in range(rows):
+        loans.append([f"L{i}", 100_000 + i, 0.05 + (i % 7) / 100, "Active", f"City {i % 97}"])
+    borrowers = wb.create_sheet("Borrowers")
+    borrowers.append(["BorrowerID", "LoanID"])
+    for i in range(rows):
+        borrowers.append([f"B{i}", f"L{i}"])
+    wb.save(path)
+
+
+def whole_sheet(path: Path, chunk_size: int) -> pl.DataFrame:
+    """Every row read into a list, then one DataFrame sliced into chunks."""
+    wb = load_workbook(path, read_only=True)
+    data = [list(row) for row in wb.active.iter_rows(values_only=True)]
+    wb.close()
+    df = pl.DataFrame(data[1:], schema=header_names(data[0]), orient="row")
+    return pl.concat([df.slice(i, chunk_size) for i in range(0, len(df), chunk_size)])
+
+
+def streamed(path: Path, chunk_size: int) -> pl.DataFrame:
+    """Rows streamed into chunks."""
+    close_workbooks()
+    return pl.concat(list(XLSXParser(path).parse(chunk_size=chunk_size)))
+
+
+def measure(read: Callable[[Path, int], pl.DataFrame], path: Path, chunk_size: int) -> Tuple[float, int, pl.DataFrame]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    frame = read(path, chunk_size)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, frame
+
+
+def main(rows: int, chunk_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "portfolio.xlsx"
+        write_workbook(path, rows)
+        size_mb = path.stat().st_size / (1024 * 1024)
+        print(f"{rows:,} loans ({size_mb:.1f} MB), chunk_size={chunk_size:,}")
+        print(f"{'reader':>12} {'seconds':>9} {'peak MB':>9}")
+
+        results = {}
+        for name, read in (("whole sheet", whole_sheet), ("streamed", streamed)):
+            elapsed, peak, frame = measure(read, path, chunk_size)
+            results[name] = frame
+            print(f"{name:>12} {elapsed:>9.2f} {peak / (1024 * 1024):>9.1f}")
+
+        close_workbooks()
+        start = time.perf_counter()
+        open_workbook(path)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        open_workbook(path)
+        shared = time.perf_counter() - start
+        close_workbooks()
+        print(f"\nOpen workbook: {opened * 1000:.1f} ms, again from the shared handle: {shared * 1000:.3f} ms")
+
+    print(f"Same rows: {results['whole sheet'].equals(results['streamed'])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streamed XLSX parsing")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.rows, args.chunk_size)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark memory of reading an XML source whole and incrementally.
+
+Writes a generated loan feed, then reads its rows by parsing the whole
+tree with ElementTree and calling findall (as XMLParser did before it used
+iterparse) and with XMLParser.parse(), in chunks. Reports the time and the
+peak memory of each, as measured by tracemalloc (Python objects: the tree
+and the row dicts, not the frames Polars allocates), and checks that both
+give the same rows.
+
+Usage:
+    python benchmark_xml_streaming.py
+    python benchmark_xml_streaming.py --rows 500000 --chunk-size 10000
+"""
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Callable, Tuple
+
+import polars as pl
+
+from rdfmap.parsers.data_source import XMLParser
+
+ROW_XPATH = "/feed/loans/loan"
+
+
+def write_feed(path: Path, rows: int) -> None:
+    """Loans with an attribute, nested elements and two borrowers each."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<feed><loans>\n')
+        for i in range(rows):
+            f.write(
+                f'<loan id="L{i}"><amount>{100_000 + i}</amount><status>Active</status>'
+                f"<property><city>City {i % 97}</city><state>OR</state></property>"
+                f"<borrower><name>Borrower {2 * i}</name></borrower>"
+                f"<borrower><name>Borrower {2 * i + 1}</name></borrower></loan>\n"
+            )
+        f.write("</loans></feed>\n")
+
+
+def whole_tree(path: Path, chunk_size: int) -> pl.DataFrame:
+    """Rows of the fully parsed tree."""
+    parser = XMLParser(path, ROW_XPATH)
+    root = ET.parse(path).getroot()
+    rows = [
+        parser._flatten_xml_dict(parser._xml_element_to_dict(element))
+        for element in root.findall("loans/loan")
+    ]
+    frames = [pl.DataFrame(rows[i:i + chunk_size]) for i in range(0, len(rows), chunk_size)]
+    return pl.concat(frames)
+
+
+def incremental(path: Path, chunk_size: int) -> pl.DataFrame:
+    """Rows read with iterparse, a chunk at a time."""
+    return pl.concat(list(XMLParser(path, ROW_XPATH).parse(chunk_size=chunk_size)))
+
+
+def measure(read: Callable[[Path, int], pl.DataFrame], path: Path, chunk_size: int) -> Tuple[float, int, pl.DataFrame]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    frame = read(path, chunk_size)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, frame
+
+
+def main(rows: int, chunk_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "feed.xml"
+        write_feed(path, rows)
+        size_mb = path.stat().st_size / (1024 * 1024)
+        print(f"{rows:,} loans ({size_mb:.1f} MB), chunk_size={chunk_size:,}")
+        print(f"{'reader':>12} {'seconds':>9} {'peak MB':>9}")
+
+        results = {}
+        for name, read in (("whole tree", whole_tree), ("iterparse", incremental)):
+            elapsed, peak, frame = measure(read, path, chunk_size)
+            results[name] = frame
+            print(f"{name:>12} {elapsed:>9.2f} {peak / (1024 * 1024):>9.1f}")
+
+    print(f"\nSame rows: {results['whole tree'].equals(results['iterparse'])}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark incremental XML parsing")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args()
+    main(args.rows, args.chunk_size)
@@ -1,5 +1,6 @@
 """Main CLI application."""
 
+import sys
 from pathlib import Path
 from typing import List, Optional
 
@@ -9,8 +10,11 @@ from rich.table import Table
 
 from ..config.loader import load_mapping_config
 from ..emitter.graph_builder import RDFGraphBuilder, serialize_graph
+from ..emitter.sinks import COMPRESSIONS
 from ..models.errors import ProcessingReport
+from ..models.mapping import TripleStoreType
 from ..parsers.data_source import create_parser
+from ..parsers.xlsx_stream import close_workbooks, mapped_sheet_name
 from ..validator.shacl import validate_rdf, write_validation_report, validate_against_ontology
 from ..validator.config import validate_namespace_prefixes, validate_required_fields
 from ..generator.mapping_generator import MappingGenerator, GeneratorConfig
@@ -263,6 +267,8 @@ def init(
         import traceback
         traceback.print_exc()
         raise typer.Exit(1)
+    finally:
+        close_workbooks()
 
 
 @app.command()
@@ -286,13 +292,13 @@ def convert(
         None,
         "--format",
         "-f",
-        help="Output format: ttl, xml, jsonld, nt (default: ttl)",
+        help="Output format: ttl, trig, xml, jsonld, ndjsonld, nt, nq, parquet-triples (default: ttl)",
     ),
     output: Optional[Path] = typer.Option(
         None,
         "--output",
         "-o",
-        help="Output file path",
+        help="Output file path ('-' streams to standard output)",
         dir_okay=False,
     ),
     validate_flag: bool = typer.Option(
@@ -333,9 +339,69 @@ def convert(
         help="Write log to file",
         dir_okay=False,
     ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Convert with N worker processes, splitting CSV sources into byte ranges (N-Triples streaming output only)",
+    ),
+    keep_parts: bool = typer.Option(
+        False,
+        "--keep-parts",
+        help="With --workers, leave numbered part files (out.part-00001.nt, ...) instead of concatenating them",
+    ),
+    memory_budget: Optional[int] = typer.Option(
+        None,
+        "--memory-budget",
+        min=1,
+        help="Aggregate NT/Turtle output out of core with about this many MB of memory, spilling sorted runs to disk",
+    ),
+    spill_dir: Optional[Path] = typer.Option(
+        None,
+        "--spill-dir",
+        help="Directory for the sorted runs of --memory-budget (default: system temp dir)",
+        file_okay=False,
+    ),
+    max_triples_per_file: Optional[int] = typer.Option(
+        None,
+        "--max-triples-per-file",
+        min=1,
+        help="Rotate streamed output to numbered shard files (out.part-00001.nt, ...) of about N triples, never splitting a chunk or subject, with a manifest",
+    ),
+    max_bytes_per_file: Optional[int] = typer.Option(
+        None,
+        "--max-bytes-per-file",
+        min=1,
+        help="Rotate streamed output to numbered shard files of about N bytes (before compression)",
+    ),
+    object_cache_mb: Optional[int] = typer.Option(
+        None,
+        "--object-cache-mb",
+        min=1,
+        help="Without aggregation, skip linked-object descriptions already written, remembering about this many MB of them",
+    ),
+    triple_store: Optional[str] = typer.Option(
+        None,
+        "--triple-store",
+        help="Store of aggregated triples: memory (rdflib) or interned (integer IDs in numpy arrays, far less memory)",
+    ),
+    compression: Optional[str] = typer.Option(
+        None,
+        "--compression",
+        help="Compress the output while writing it: gzip or zstd (default: from the output suffix, .gz or .zst)",
+    ),
 ) -> None:
     """Convert spreadsheet data to RDF triples using high-performance Polars engine."""
     try:
+        if output is not None and str(output) == "-":
+            # Keep standard output for the RDF; progress goes to stderr
+            console.file = sys.stderr
+        if compression is not None and compression not in COMPRESSIONS:
+            console.print(f"[red]Unsupported compression: {compression} (use gzip or zstd)[/red]")
+            raise typer.Exit(code=1)
+        compression = compression or "infer"
+
         # Load mapping configuration
         console.print(f"[blue]Loading mapping configuration from {mapping}...[/blue]")
         config = load_mapping_config(mapping)
@@ -371,8 +437,8 @@ def convert(
 
         # Auto-detect aggregation setting based on format and user preference
         if aggregate_duplicates is None:
-            # Auto-detect: NT format defaults to no aggregation for performance
-            if output_format.lower() in ['nt', 'ntriples']:
+            # Auto-detect: NT and N-Quads default to no aggregation for performance
+            if output_format.lower() in ['nt', 'ntriples', 'nq', 'nquads']:
                 enable_aggregation = False
                 if verbose:
                     console.print("[yellow]NT format detected: Disabling aggregation for performance (use --aggregate-duplicates to override)[/yellow]")
@@ -384,15 +450,86 @@ def convert(
         # Override config setting for this run
         config.options.aggregate_duplicates = enable_aggregation
 
+        streaming_nt = output_format.lower() in ['nt', 'ntriples'] and not enable_aggregation and output
+        streaming_other = (
+            output_format.lower() in ['ttl', 'turtle', 'jsonld', 'json-ld', 'ndjsonld', 'ndjson-ld', 'xml', 'rdf', 'rdfxml',
+                                      'parquet-triples', 'parquet', 'nq', 'nquads', 'trig']
+            and not enable_aggregation and output
+        )
+        if memory_budget is not None:
+            config.options.memory_budget_mb = memory_budget
+        if triple_store is not None:
+            config.options.triple_store = TripleStoreType(triple_store)
+        if object_cache_mb is not None:
+            config.options.object_cache_mb = object_cache_mb
+        out_of_core = (
+            enable_aggregation and output and config.options.memory_budget_mb is not None
+            and output_format.lower() in ['nt', 'ntriples', 'ttl', 'turtle']
+        )
+        sharded = bool(max_triples_per_file or max_bytes_per_file)
+        rotation = {'max_triples_per_file': max_triples_per_file, 'max_bytes_per_file': max_bytes_per_file}
+        if sharded and output is not None and str(output) == "-":
+            console.print("[red]--max-triples-per-file and --max-bytes-per-file need an output file[/red]")
+            raise typer.Exit(code=1)
+        parallel = workers > 1 and not dry_run
+        if parallel and not (streaming_nt and limit is None and str(output) != "-"):
+            console.print("[yellow]--workers requires streaming N-Triples output to a file (--format nt with --output) and no --limit; converting in a single process[/yellow]")
+            parallel = False
+        if parallel and sharded:
+            console.print("[yellow]--workers already writes one part file per worker with --keep-parts; rotating shards in a single process[/yellow]")
+            parallel = False
+
         # Create appropriate builder based on format and aggregation settings
-        if output_format.lower() in ['nt', 'ntriples'] and not enable_aggregation and output:
-            # Use streaming NT writer for high performance
-            from ..emitter.nt_streaming import NTriplesStreamWriter
-            nt_writer = NTriplesStreamWriter(output)
-            builder = RDFGraphBuilder(config, processing_report, streaming_writer=nt_writer)
+        if parallel:
+            builder = None
+            nt_context_manager = None
+            if verbose:
+                console.print(f"[blue]Using {workers} worker processes for NT streaming[/blue]")
+        elif streaming_nt:
+            # Use streaming NT writer with columnar emission for high performance
+            from ..emitter.columnar_nt import ColumnarNTriplesBuilder
+            from ..emitter.node_streaming import create_stream_writer
+            nt_writer = create_stream_writer(
+                "nt", output,
+                compression=compression,
+                buffer_size=config.options.write_buffer_mb * 1024 * 1024,
+                **rotation,
+            )
+            builder = ColumnarNTriplesBuilder(config, processing_report, nt_writer)
             nt_context_manager = nt_writer
             if verbose:
                 console.print("[blue]Using high-performance NT streaming mode (no aggregation)[/blue]")
+        elif streaming_other:
+            # Stream Turtle, TriG, N-Quads, JSON-LD, RDF/XML or a Parquet triple table;
+            # text formats group each chunk by subject
+            from ..emitter.columnar_nt import ColumnarNTriplesBuilder
+            from ..emitter.node_streaming import create_stream_writer
+            nt_writer = create_stream_writer(
+                output_format, output, config.namespaces, compression,
+                buffer_size=config.options.write_buffer_mb * 1024 * 1024,
+                **rotation,
+            )
+            builder = ColumnarNTriplesBuilder(config, processing_report, nt_writer)
+            nt_context_manager = nt_writer
+            if verbose:
+                console.print(f"[blue]Using {output_format.upper()} streaming mode (no aggregation)[/blue]")
+        elif out_of_core:
+            # Aggregate through sorted runs on disk instead of an in-memory graph
+            from ..emitter.columnar_nt import ColumnarNTriplesBuilder
+            from ..emitter.external_sort import SortedRunWriter
+            nt_writer = SortedRunWriter(
+                output,
+                output_format="nt" if output_format.lower() in ['nt', 'ntriples'] else "ttl",
+                memory_budget_mb=config.options.memory_budget_mb,
+                spill_dir=spill_dir,
+                namespaces=config.namespaces,
+                compression=compression,
+                **rotation,
+            )
+            builder = ColumnarNTriplesBuilder(config, processing_report, nt_writer)
+            nt_context_manager = nt_writer
+            if verbose:
+                console.print(f"[blue]Aggregating out of core with a {config.options.memory_budget_mb} MB memory budget[/blue]")
         else:
             # Use regular graph builder with in-memory aggregation
             builder = RDFGraphBuilder(config, processing_report)
@@ -409,10 +546,18 @@ def convert(
             def nullcontext():
                 yield
 
+        if parallel:
+            from ..emitter.parallel_nt import convert_parallel
+            console.print(f"[blue]Processing {len(config.sheets)} sheet(s) with {workers} workers...[/blue]")
+            parallel_triples = convert_parallel(
+                mapping, config, processing_report, output, workers,
+                keep_parts=keep_parts, compression=compression,
+            )
+
         # Process sheets with optional NT streaming context
         with nt_context_manager if nt_context_manager else nullcontext():
             # Process each sheet
-            for sheet in config.sheets:
+            for sheet in ([] if parallel else config.sheets):
                 console.print(f"[blue]Processing sheet: {sheet.name}[/blue]")
 
                 # Prepare parser arguments
@@ -423,7 +568,11 @@ def convert(
 
                 # Add iterator for XML/JSON if specified
                 if sheet.iterator:
-                    parser_kwargs['row_xpath'] = sheet.iterator
+                    parser_kwargs['iterator'] = sheet.iterator
+
+                # Read the worksheet a mapping generated from a workbook is named after
+                if Path(sheet.source).suffix.lower() in ['.xlsx', '.xls']:
+                    parser_kwargs['sheet_name'] = mapped_sheet_name(Path(sheet.source), sheet.name)
 
                 # Create parser
                 parser = create_parser(
@@ -435,17 +584,12 @@ def convert(
                     columns = parser.get_column_names()
                     console.print(f"  Columns: {', '.join(columns)}")
 
+                # Read only the mapped columns of the filtered, limited rows
+                scan_plan = builder.compiled.plan_for(sheet).scan_plan(limit or None)
+
                 # Process data in chunks
                 row_offset = 0
-                for chunk in parser.parse(chunk_size=config.options.chunk_size):
-                    # Apply limit if specified
-                    if limit and row_offset >= limit:
-                        break
-
-                    if limit:
-                        remaining = limit - row_offset
-                        chunk = chunk.head(remaining)
-
+                for chunk in parser.parse_plan(scan_plan, chunk_size=config.options.chunk_size):
                     # Add to graph
                     builder.add_dataframe(chunk, sheet, offset=row_offset)
 
@@ -464,13 +608,27 @@ def convert(
         _display_processing_summary(processing_report, verbose)
         
         # Get graph and triple count
-        graph = builder.get_graph()
-        triple_count = builder.get_triple_count()
+        if parallel:
+            graph = None
+            triple_count = parallel_triples
+        else:
+            graph = builder.get_graph()
+            triple_count = builder.get_triple_count()
 
-        if nt_context_manager:
+        if parallel and keep_parts:
+            console.print(f"[green]Streamed {triple_count} RDF triples to part files of {output}[/green]")
+        elif nt_context_manager or parallel:
             console.print(f"[green]Streamed {triple_count} RDF triples to {output}[/green]")
+            if out_of_core and verbose:
+                console.print(
+                    f"  {nt_writer.input_triples - triple_count} duplicate triples removed"
+                    f" while merging {len(nt_writer.runs)} sorted run(s)"
+                )
         else:
             console.print(f"[green]Generated {triple_count} RDF triples[/green]")
+        if sharded and output and not dry_run:
+            from ..emitter.sinks import manifest_path
+            console.print(f"  Shards listed in {manifest_path(output)}")
 
         # Validate if requested (only for non-streaming mode)
         validation_report = None
@@ -526,15 +684,18 @@ def convert(
                 console.print(f"[green]Validation report written to {report}[/green]")
         
         # Write output (skip if already written in streaming mode)
-        if not dry_run and output and not nt_context_manager:
+        if not dry_run and output and not (nt_context_manager or parallel):
             # Use command-line format, config format, or default to ttl
             final_output_format = format or config.options.output_format or "ttl"
 
             console.print(f"[blue]Writing {final_output_format.upper()} to {output}...[/blue]")
-            serialize_graph(graph, final_output_format, output)
+            serialize_graph(
+                graph, final_output_format, output,
+                namespaces=config.namespaces, compression=compression, **rotation,
+            )
             console.print("[green]Output written successfully[/green]")
-        elif not dry_run and output and nt_context_manager:
-            console.print("[green]NT output already written via streaming[/green]")
+        elif not dry_run and output:
+            console.print(f"[green]{'Aggregated' if out_of_core else output_format.upper()} output already written via streaming[/green]")
         elif dry_run:
             console.print("[yellow]Dry run mode: no output written[/yellow]")
         elif not output:
@@ -560,6 +721,8 @@ def convert(
             import traceback
             console.print(traceback.format_exc())
         raise typer.Exit(code=1)
+    finally:
+        close_workbooks()
 
 
 @app.command()
@@ -647,7 +810,7 @@ def validate(
     rdf_file: Path = typer.Option(
         ...,
         "--rdf",
-        help="Path to RDF file to validate",
+        help="Path to RDF file to validate (or a Parquet triple table from --format parquet-triples)",
         exists=True,
         dir_okay=False,
     ),
@@ -674,10 +837,18 @@ def validate(
     try:
         console.print(f"[blue]Loading RDF from {rdf_file}...[/blue]")
         
-        from rdflib import Graph
+        from rdflib import Dataset, Graph
+        from ..emitter.parquet_triples import is_parquet_triples, read_parquet_graph
         
-        data_graph = Graph()
-        data_graph.parse(rdf_file)
+        if is_parquet_triples(rdf_file):
+            data_graph = read_parquet_graph(rdf_file)
+        elif rdf_file.suffix.lower() in ('.nq', '.trig'):
+            # Shapes are checked against the union of the named graphs
+            data_graph = Dataset(default_union=True)
+            data_graph.parse(rdf_file)
+        else:
+            data_graph = Graph()
+            data_graph.parse(rdf_file)
         
         console.print(f"[green]Loaded {len(data_graph)} triples[/green]")
         
@@ -762,6 +933,11 @@ def _display_processing_summary(report: ProcessingReport, verbose: bool) -> None
     table.add_row("Successful", str(report.successful_rows))
     table.add_row("Failed", str(report.failed_rows))
     table.add_row("Warnings", str(report.warnings))
+    for column, count in report.datatype_violations.items():
+        table.add_row(f"Invalid values in '{column}'", str(count))
+    if report.object_cache_hits or report.object_cache_misses:
+        table.add_row("Linked objects described", str(report.object_cache_misses))
+        table.add_row("Repeated descriptions skipped", str(report.object_cache_hits))
     
     console.print(table)
     
@@ -1198,6 +1374,8 @@ def generate(
             import traceback
             console.print(traceback.format_exc())
         raise typer.Exit(code=1)
+    finally:
+        close_workbooks()
 
 
 @app.command()
@@ -1474,14 +1652,22 @@ def _interactive_enrichment(
 
 @app.command()
 def stats(
-    reports_dir: Path = typer.Option(
-        ...,
+    reports_dir: Optional[Path] = typer.Option(
+        None,
         "--reports-dir",
         "-r",
         help="Directory containing alignment report JSON files",
         exists=True,
         file_okay=False,
     ),
+    triples: Optional[Path] = typer.Option(
+        None,
+        "--triples",
+        "-t",
+        help="Parquet triple table (from convert --format parquet-triples) to summarize instead",
+        exists=True,
+        dir_okay=False,
+    ),
     output: Optional[Path] = typer.Option(
         None,
         "--output",
@@ -1515,8 +1701,19 @@ def stats(
     
     This is useful for demonstrating the value of ontology enrichment
     and tracking the continuous improvement of your semantic alignment.
+
+    With --triples, summarizes a Parquet triple table instead: triple,
+    subject and literal counts and the most frequent predicates, classes
+    and datatypes.
     """
     try:
+        if triples is not None:
+            _display_triple_stats(triples, output, format)
+            return
+        if reports_dir is None:
+            console.print("[red]Error: give --reports-dir or --triples[/red]")
+            raise typer.Exit(code=1)
+
         console.print(f"[blue]Loading alignment reports from {reports_dir}...[/blue]")
         
         analyzer = AlignmentStatsAnalyzer()
@@ -1601,6 +1798,36 @@ def stats(
         raise typer.Exit(code=1)
 
 
+def _display_triple_stats(path: Path, output: Optional[Path], format: str) -> None:
+    """Display statistics of a Parquet triple table."""
+    from ..emitter.parquet_triples import parquet_triple_stats
+
+    console.print(f"[blue]Scanning triple table {path}...[/blue]")
+    triple_stats = parquet_triple_stats(path)
+
+    if format.lower() in ("text", "both"):
+        console.print(f"\n  Triples: {triple_stats['triples']}")
+        console.print(f"  Subjects: {triple_stats['subjects']}")
+        console.print(f"  Predicates: {triple_stats['predicates']}")
+        console.print(f"  Literals: {triple_stats['literals']}")
+        for title, key in [("Top Predicates", "top_predicates"), ("Top Classes", "top_classes"),
+                           ("Datatypes", "datatypes")]:
+            if not triple_stats[key]:
+                continue
+            table = Table(title=title)
+            table.add_column("IRI", style="cyan")
+            table.add_column("Triples", justify="right")
+            for iri, count in triple_stats[key]:
+                table.add_row(iri, str(count))
+            console.print(table)
+
+    if output or format.lower() in ("json", "both"):
+        output_path = output or path.with_suffix(".stats.json")
+        with open(output_path, 'w') as f:
+            json.dump(triple_stats, f, indent=2)
+        console.print(f"\n[green]✓ Statistics written to {output_path}[/green]")
+
+
 @app.command()
 def validate_ontology(
     ontology: Path = typer.Option(
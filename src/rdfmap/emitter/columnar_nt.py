@@ -0,0 +1,521 @@
+"""Columnar N-Triples emission engine.
+
+``ColumnarNTriplesBuilder`` produces the same triples as
+``RDFGraphBuilder(config, report, streaming_writer=writer)`` without creating
+rdflib terms. Each chunk is emitted one predicate at a time as a block of
+the triple table of ``TRIPLE_SCHEMA``: the rendered subject IRI column, the
+constant predicate and the object IRI or lexical value column with its
+datatype and language, with rows dropped by null masks. The blocks of a
+chunk are handed to ``ParquetTripleWriter`` as they are, or concatenated
+into N-Triples lines by Polars and written to other writers as one block of
+text.
+
+Values whose lexical form would not survive unchanged through rdflib
+(``"007"`` as xsd:integer, ``"2021-13-45"`` as xsd:date, ...) and values
+produced by Python-only transforms go through the row-wise literal path for
+just those rows, so warnings and output match the row-wise builder.
+
+With ``options.object_cache_mb``, linked objects whose description is in
+the builder's ``ObjectDescriptionCache`` are only linked, not described
+again.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import polars as pl
+from rdflib import URIRef
+from rdflib.namespace import RDF, XSD
+
+from ..models.errors import ErrorSeverity, ProcessingReport
+from ..models.mapping import MappingConfig, SheetMapping
+from .graph_builder import RDFGraphBuilder
+from .mapping_plan import PARENT_ROW, ChildFrame, LiteralRule, ObjectPlan, SheetPlan, split_child_frames
+from .nt_streaming import NTriplesStreamWriter
+from .object_cache import ObjectDescriptionCache
+from .parquet_triples import ParquetTripleWriter
+
+
+# String lexical forms that validate and that rdflib keeps as written
+_CANONICAL_LEXICAL = {
+    XSD.integer: r"^(0|-?[1-9][0-9]*)$",
+    XSD.decimal: r"^-?(0|[1-9][0-9]*)(\.[0-9]+)?$",
+    XSD.boolean: r"^(true|false)$",
+    XSD.date: r"^[0-9]{4}-[0-9]{2}-[0-9]{2}$",
+}
+
+# Datatypes under which a native Polars value formats like its Python value;
+# None stands for the datatype rdflib infers for untyped literals
+_INTEGER_DATATYPES = {None, XSD.integer, XSD.decimal, XSD.string}
+_FLOAT_DATATYPES = {None, XSD.decimal, XSD.double, XSD.string}
+_INFERRED_DATATYPES = {"integer": XSD.integer, "float": XSD.double, "boolean": XSD.boolean, "date": XSD.date}
+
+_NT_ESCAPES = (("\\", "\\\\"), ('"', '\\"'), ("\n", "\\n"), ("\r", "\\r"), ("\t", "\\t"))
+
+
+def escape_nt_expr(expr: pl.Expr) -> pl.Expr:
+    """Escape a string expression for N-Triples, like ``escape_nt_string``.
+
+    Args:
+        expr: String expression
+
+    Returns:
+        Expression with backslashes, quotes and line breaks escaped
+    """
+    for char, escaped in _NT_ESCAPES:
+        expr = expr.str.replace_all(char, escaped, literal=True)
+    return expr
+
+
+def literal_value_expr(
+    column: str,
+    dtype: pl.DataType,
+    datatype: Optional[URIRef],
+    language: Optional[str],
+) -> Tuple[pl.Expr, Optional[str], Optional[str], pl.Expr]:
+    """Build the literal of a column: its lexical form and the rows it covers.
+
+    Args:
+        column: Column name
+        dtype: Polars dtype of the column
+        datatype: Resolved datatype of the mapping, if any
+        language: Effective language tag of the mapping, if any
+
+    Returns:
+        Tuple of (lexical form expression, datatype IRI, language tag, mask
+        expression). The mask is False for rows that must be converted
+        row-wise.
+    """
+    col = pl.col(column)
+    kind = None
+    if dtype == pl.String:
+        lexical = col
+        if datatype is None or datatype == XSD.string:
+            covered = pl.lit(True)
+        elif datatype in _CANONICAL_LEXICAL:
+            covered = col.str.contains(_CANONICAL_LEXICAL[datatype])
+            if datatype == XSD.date:
+                covered = covered & col.str.to_date("%Y-%m-%d", strict=False).is_not_null()
+        elif not str(datatype).startswith((str(XSD), str(RDF))):
+            # Custom datatypes are neither validated nor normalized
+            covered = pl.lit(True)
+        else:
+            covered = pl.lit(False)
+    elif language and datatype is None:
+        return pl.lit(None, dtype=pl.String), None, None, pl.lit(False)
+    elif dtype.is_integer() and datatype in _INTEGER_DATATYPES:
+        kind, lexical, covered = "integer", col.cast(pl.String), pl.lit(True)
+    elif dtype.is_float() and datatype in _FLOAT_DATATYPES:
+        # Polars and Python print floats alike except in exponent notation
+        value = col.cast(pl.Float64)
+        kind, lexical = "float", value.cast(pl.String)
+        covered = value.is_finite() & ((value.abs() >= 1e-4) | (value == 0)) & (value.abs() < 1e16)
+    elif dtype == pl.Boolean and datatype in (None, XSD.boolean):
+        kind, lexical, covered = "boolean", col.cast(pl.String), pl.lit(True)
+    elif dtype == pl.Date and datatype in (None, XSD.date):
+        kind, lexical, covered = "date", col.cast(pl.String), pl.lit(True)
+    else:
+        return pl.lit(None, dtype=pl.String), None, None, pl.lit(False)
+
+    # Typed literals take precedence over language tags, as in RDFGraphBuilder
+    if datatype is None and kind is not None:
+        datatype = _INFERRED_DATATYPES[kind]
+    if datatype is not None:
+        return lexical, str(datatype), None, covered
+    return lexical, None, language or None, covered
+
+
+def nt_lines_expr() -> pl.Expr:
+    """Build the N-Triples lines of a triple table.
+
+    Returns:
+        String expression over the columns of ``TRIPLE_SCHEMA``, one
+        newline-terminated line per row; subjects are IRIs, as the columnar
+        engine renders them
+    """
+    obj = pl.col("object")
+    kind = pl.col("object_kind")
+    literal = pl.concat_str([
+        pl.lit('"'),
+        escape_nt_expr(obj),
+        pl.lit('"'),
+        pl.when(pl.col("lang").is_not_null()).then(pl.lit("@") + pl.col("lang"))
+        .when(pl.col("datatype").is_not_null()).then(pl.lit("^^<") + pl.col("datatype") + pl.lit(">"))
+        .otherwise(pl.lit("")),
+    ])
+    term = (
+        pl.when(kind == "literal").then(literal)
+        .when(kind == "bnode").then(obj)
+        .otherwise(pl.lit("<") + obj + pl.lit(">"))
+    )
+    return pl.concat_str([
+        pl.lit("<"), pl.col("subject"), pl.lit("> <"), pl.col("predicate"), pl.lit("> "), term, pl.lit(" .\n"),
+    ])
+
+
+def _iri_block(subjects: pl.Series, predicate: URIRef, objects: pl.Series) -> pl.DataFrame:
+    """Triple-table rows linking subjects to object IRIs, without null rows."""
+    return pl.DataFrame({"subject": subjects, "object": objects}).drop_nulls().select(
+        "subject",
+        pl.lit(str(predicate)).alias("predicate"),
+        "object",
+        pl.lit("iri").alias("object_kind"),
+        pl.lit(None, dtype=pl.String).alias("datatype"),
+        pl.lit(None, dtype=pl.String).alias("lang"),
+    )
+
+
+class ColumnarNTriplesBuilder(RDFGraphBuilder):
+    """Streams N-Triples for whole chunks with Polars string expressions."""
+
+    def __init__(self, config: MappingConfig, report: ProcessingReport, streaming_writer: NTriplesStreamWriter):
+        """Initialize columnar builder.
+
+        Args:
+            config: Mapping configuration
+            report: Processing report for error tracking
+            streaming_writer: NT writer the lines are written to
+        """
+        super().__init__(config, report, streaming_writer=streaming_writer)
+
+    def add_dataframe(
+        self,
+        df: pl.DataFrame,
+        sheet: SheetMapping,
+        offset: int = 0,
+    ) -> None:
+        """Emit the N-Triples of a DataFrame column by column.
+
+        Args:
+            df: Polars DataFrame to process
+            sheet: Sheet mapping configuration
+            offset: Row offset for error reporting (rows of a filtered chunk
+                report their ``SOURCE_ROW`` instead)
+        """
+        if len(df) == 0:
+            return
+
+        plan = self.compiled.plan_for(sheet)
+        self._use_graph(plan)
+        df = self._take_source_rows(df)
+        df = self._take_invalid_values(df, plan, offset)
+        df = self._apply_column_transforms(df, plan)
+        df, objects, children = split_child_frames(df, plan)
+        plan.bind(df.columns)
+        self._validate_chunk(df, plan.literal_rules(), offset)
+        try:
+            self._write_blocks(self._chunk_blocks(df, plan, offset, objects, children))
+        finally:
+            self._chunk_rows = None
+            self._source_rows = None
+            self._flush_datatype_violations()
+
+    def _chunk_blocks(
+        self,
+        df: pl.DataFrame,
+        plan: SheetPlan,
+        offset: int,
+        objects: Optional[List[ObjectPlan]] = None,
+        children: Sequence[ChildFrame] = (),
+    ) -> List[pl.DataFrame]:
+        """All triples of a chunk, one triple-table block per predicate.
+
+        ``objects`` are the linked objects emitted from the rows, all of the
+        plan's by default; those of ``children`` hang off their parent rows.
+        """
+        if objects is None:
+            objects = plan.objects
+        blocks: List[pl.DataFrame] = []
+        if plan.entities:
+            # Merged sheet - every row produces one resource per entity type
+            for entity in plan.entities:
+                subjects = self._subject_column(
+                    df, entity.iri_template, None, offset, f"entity {entity.class_label}"
+                )
+                self._track_subject_terms(plan, entity.iri_template, subjects, offset)
+                blocks.extend(self._type_blocks(subjects, entity.classes))
+                blocks.extend(self._literal_blocks(df, subjects, entity.columns, offset, check_required=True))
+                for obj in entity.objects:
+                    blocks.extend(self._object_blocks(df, subjects, obj, offset))
+            self.report.total_rows += len(df)
+        else:
+            subjects = self._subject_column(
+                df, plan.subject_template, None, offset, f"row resource (sheet: {plan.name})"
+            )
+            self._track_subject_terms(plan, plan.subject_template, subjects, offset)
+            failed = subjects.null_count()
+            self.report.failed_rows += failed
+
+            blocks.extend(self._type_blocks(subjects, plan.classes))
+            blocks.extend(self._literal_blocks(df, subjects, plan.columns, offset, check_required=True))
+            for obj in objects:
+                blocks.extend(self._object_blocks(df, subjects, obj, offset))
+            self.report.total_rows += len(df) - failed
+            for child in children:
+                frame = self._begin_child_frame(child, plan, offset)
+                parents = subjects.gather(frame.get_column(PARENT_ROW))
+                for obj in child.objects:
+                    blocks.extend(self._object_blocks(frame, parents, obj, offset))
+        return blocks
+
+    def _track_subject_terms(self, plan: SheetPlan, template: str, subjects: pl.Series, offset: int) -> None:
+        """Feed subject IRIs to the duplicate detector."""
+        if plan.detect_duplicates:
+            self._track_duplicates(plan, template, subjects, offset)
+
+    def _subject_column(
+        self,
+        df: pl.DataFrame,
+        template: str,
+        parents: Optional[pl.Series],
+        offset: int,
+        context: str,
+    ) -> pl.Series:
+        """Render an IRI template as a column of IRIs.
+
+        Args:
+            df: Chunk being processed
+            template: IRI template
+            parents: Subjects the resources hang off; rows without a parent
+                are skipped without reporting
+            offset: Row offset for error reporting
+            context: Context for error reporting
+
+        Returns:
+            String Series with nulls where no resource is created
+        """
+        compiled = self._compile_template(template)
+        try:
+            iris, null_mask = compiled.render(df)
+            failure = "null value for IRI template variable(s): " + ", ".join(compiled.variables)
+        except ValueError as e:
+            iris = pl.Series("iri", [None] * len(df), dtype=pl.String)
+            null_mask = pl.Series("null_mask", [True] * len(df))
+            failure = str(e)
+
+        if parents is not None:
+            has_parent = parents.is_not_null()
+            null_mask = null_mask & has_parent
+            iris = iris.zip_with(has_parent, pl.Series([None] * len(df), dtype=pl.String))
+
+        for idx in null_mask.arg_true().to_list():
+            self.report.add_error(
+                f"Failed to generate IRI for {context}: {failure}",
+                row=self._row_number(offset, idx),
+                severity=ErrorSeverity.ERROR,
+            )
+        return iris
+
+    def _type_blocks(self, subjects: pl.Series, classes: List[URIRef]) -> List[pl.DataFrame]:
+        """Triples typing every created resource with each of its classes."""
+        present = subjects.drop_nulls()
+        return [
+            _iri_block(present, RDF.type, pl.repeat(str(class_uri), len(present), dtype=pl.String, eager=True))
+            for class_uri in classes
+        ]
+
+    def _object_blocks(
+        self,
+        df: pl.DataFrame,
+        parents: pl.Series,
+        obj: ObjectPlan,
+        offset: int,
+    ) -> List[pl.DataFrame]:
+        """Triples for a linked object: types, properties and the link."""
+        objects = self._subject_column(
+            df, obj.iri_template, parents, offset, f"linked object (class: {obj.class_label})"
+        )
+        described = objects
+        cache = self._object_cache(obj)
+        if cache is not None:
+            described = self._new_descriptions(df, objects, obj, cache)
+        blocks = self._type_blocks(described, obj.classes)
+        blocks.extend(self._literal_blocks(df, described, obj.properties, offset, check_required=False))
+        if obj.predicate is not None:
+            blocks.append(_iri_block(parents, obj.predicate, objects))
+        return blocks
+
+    def _new_descriptions(
+        self,
+        df: pl.DataFrame,
+        objects: pl.Series,
+        obj: ObjectPlan,
+        cache: ObjectDescriptionCache,
+    ) -> pl.Series:
+        """Object terms of the rows whose description was not streamed before.
+
+        Args:
+            df: Chunk being processed
+            objects: Object IRIs, null where no object is created
+            obj: Compiled linked object
+            cache: Descriptions streamed for the linked object mapping
+
+        Returns:
+            ``objects`` with nulls for the rows to skip
+        """
+        present = objects.is_not_null()
+        columns = [objects] + [df.get_column(rule.column) for rule in obj.properties if rule.index >= 0]
+        # Positional names: a column may describe several properties
+        keys = pl.DataFrame([column.alias(f"c{i}") for i, column in enumerate(columns)]).filter(present)
+        describe = cache.new_rows(keys.hash_rows(seed=0).to_numpy())
+
+        written = int(describe.sum())
+        self.report.object_cache_misses += written
+        self.report.object_cache_hits += len(describe) - written
+        mask = np.zeros(len(df), dtype=bool)
+        mask[present.arg_true().to_numpy()[describe]] = True
+        return objects.zip_with(pl.Series(mask), pl.Series([None] * len(df), dtype=pl.String))
+
+    def _literal_blocks(
+        self,
+        df: pl.DataFrame,
+        subjects: pl.Series,
+        rules: List[LiteralRule],
+        offset: int,
+        check_required: bool,
+    ) -> List[pl.DataFrame]:
+        """Triples for the literal-valued properties of a column of subjects.
+
+        Args:
+            df: Chunk being processed
+            subjects: Subject IRIs, null where no resource is created
+            rules: Compiled literal rules
+            offset: Row offset for error reporting
+            check_required: Whether to report empty required columns
+
+        Returns:
+            One triple-table block per rule
+        """
+        blocks = []
+        for rule in rules:
+            if rule.index < 0:
+                continue
+            values = df.get_column(rule.column)
+
+            empty = values.is_null()
+            if values.dtype == pl.String:
+                empty = empty | (values == "")
+            active = subjects.is_not_null() & ~empty
+
+            if check_required and rule.required:
+                for idx in (subjects.is_not_null() & empty).arg_true().to_list():
+                    self.report.add_error(
+                        f"Required column '{rule.column}' is empty",
+                        row=self._row_number(offset, idx),
+                        severity=ErrorSeverity.ERROR,
+                    )
+
+            if rule.transform is None:
+                lexical_expr, datatype, language, covered_expr = literal_value_expr(
+                    rule.column, values.dtype, rule.datatype, rule.language
+                )
+                lexicals, covered = df.select(
+                    lexical_expr.alias("object"), covered_expr.alias("covered")
+                ).get_columns()
+                covered = covered.fill_null(False)
+                if len(covered) != len(df):
+                    covered = pl.Series("covered", [covered[0]] * len(df))
+                    lexicals = pl.Series("object", [lexicals[0]] * len(df), dtype=pl.String)
+                datatypes = pl.repeat(datatype, len(df), dtype=pl.String, eager=True)
+                languages = pl.repeat(language, len(df), dtype=pl.String, eager=True)
+
+                validation = self._chunk_validation.get(id(rule))
+                if validation is not None and validation.invalid_count and values.dtype == pl.String:
+                    # Invalid values fall back to plain literals, as in _create_literal
+                    untyped = pl.repeat(None, len(df), dtype=pl.String, eager=True)
+                    lexicals = lexicals.zip_with(validation.valid, values)
+                    datatypes = datatypes.zip_with(validation.valid, untyped)
+                    languages = languages.zip_with(validation.valid, untyped)
+                    covered = covered | ~validation.valid
+                    invalid = (~validation.valid & active).arg_true()
+                    samples = invalid.head(10)
+                    self._record_datatype_violations(
+                        rule,
+                        len(invalid),
+                        [
+                            (self._row_number(offset, idx), value)
+                            for idx, value in zip(samples.to_list(), values.gather(samples).to_list())
+                        ],
+                    )
+            else:
+                lexicals, datatypes, languages = (
+                    pl.repeat(None, len(df), dtype=pl.String, eager=True) for _ in range(3)
+                )
+                covered = pl.Series("covered", [False] * len(df))
+
+            fallback = (active & ~covered).arg_true()
+            if len(fallback):
+                row_lexicals, row_datatypes, row_languages = self._row_literals(
+                    values, fallback, rule, offset, check_required
+                )
+                lexicals = lexicals.scatter(fallback, row_lexicals)
+                datatypes = datatypes.scatter(fallback, row_datatypes)
+                languages = languages.scatter(fallback, row_languages)
+
+            block = pl.DataFrame({
+                "subject": subjects, "object": lexicals, "datatype": datatypes, "lang": languages,
+            }).filter(active & lexicals.is_not_null())
+            blocks.append(block.select(
+                "subject",
+                pl.lit(str(rule.predicate)).alias("predicate"),
+                "object",
+                pl.lit("literal").alias("object_kind"),
+                "datatype",
+                "lang",
+            ))
+        return blocks
+
+    def _row_literals(
+        self,
+        values: pl.Series,
+        indices: pl.Series,
+        rule: LiteralRule,
+        offset: int,
+        check_required: bool,
+    ) -> Tuple[pl.Series, pl.Series, pl.Series]:
+        """Convert the rows the columnar path does not cover one value at a time.
+
+        Returns:
+            Tuple of (lexical forms, datatype IRIs, language tags), null
+            where no literal is created
+        """
+        rows: List[Tuple[Optional[str], Optional[str], Optional[str]]] = []
+        for idx, value in zip(indices.to_list(), values.gather(indices).to_list()):
+            row_num = self._row_number(offset, idx)
+            if rule.transform is not None:
+                try:
+                    value = rule.transform(value)
+                except Exception as e:
+                    target = "column" if check_required else "linked object column"
+                    self.report.add_error(
+                        f"Transform '{rule.transform_name}' failed for {target} '{rule.column}': {e}",
+                        row=row_num,
+                        severity=ErrorSeverity.WARNING,
+                    )
+                    rows.append((None, None, None))
+                    continue
+            literal = self._create_literal(value, rule, row_num)
+            if literal is None:
+                rows.append((None, None, None))
+            elif literal.language:
+                rows.append((str(literal), None, literal.language))
+            else:
+                rows.append((str(literal), str(literal.datatype) if literal.datatype else None, None))
+        frame = pl.DataFrame(rows, schema={column: pl.String for column in ("object", "datatype", "lang")}, orient="row")
+        return frame.get_column("object"), frame.get_column("datatype"), frame.get_column("lang")
+
+    def _write_blocks(self, blocks: List[pl.DataFrame]) -> None:
+        """Write the triples of a chunk in one call.
+
+        ``ParquetTripleWriter`` takes them as a triple table; other writers
+        take N-Triples lines as UTF-8 bytes.
+        """
+        blocks = [block for block in blocks if len(block)]
+        if not blocks:
+            return
+        triples = pl.concat(blocks)
+        if isinstance(self.streaming_writer, ParquetTripleWriter):
+            self.streaming_writer.write_frame(triples)
+            return
+        lines = triples.select(nt_lines_expr()).to_series()
+        self.streaming_writer.write_lines(lines.str.join("").cast(pl.Binary).item(), len(lines))
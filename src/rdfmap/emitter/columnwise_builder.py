@@ -1,17 +1,17 @@
 """Enhanced RDF graph builder that supports true column-wise streaming processing."""
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import polars as pl
 from rdflib import Graph, Literal, Namespace, RDF, URIRef
-from rdflib.namespace import OWL
+from rdflib.namespace import OWL, XSD
 
-from ..iri.generator import IRITemplate, curie_to_iri
+from ..iri.generator import compile_iri_template
 from ..models.errors import ErrorSeverity, ProcessingReport
 from ..models.mapping import MappingConfig, SheetMapping
-from ..transforms.functions import apply_transform
-from ..validator.datatypes import validate_datatype
+from ..validator.datatypes import validate_datatype, validate_series
+from .mapping_plan import CompiledMapping, LiteralRule, SheetPlan, resolve_term
 
 
 class ColumnWiseRDFBuilder:
@@ -28,6 +28,7 @@ class ColumnWiseRDFBuilder:
         self.config = config
         self.report = report
         self.streaming_writer = streaming_writer
+        self.compiled = CompiledMapping(config)
 
         # Only create in-memory graph if not streaming
         if streaming_writer is None:
@@ -51,13 +52,7 @@ class ColumnWiseRDFBuilder:
 
     def _resolve_property(self, property_ref: str) -> URIRef:
         """Resolve property reference (CURIE or IRI) to URIRef."""
-        if ":" in property_ref and not property_ref.startswith("http"):
-            # Looks like a CURIE
-            iri = curie_to_iri(property_ref, self.config.namespaces)
-            return URIRef(iri)
-        else:
-            # Full IRI
-            return URIRef(property_ref)
+        return resolve_term(property_ref, self.config.namespaces)
 
     def _resolve_class(self, class_ref: str) -> URIRef:
         """Resolve class reference (CURIE or IRI) to URIRef."""
@@ -69,123 +64,123 @@ class ColumnWiseRDFBuilder:
             return
 
         print(f"🌊 Column-wise processing: {len(df)} rows")
+        plan = self.compiled.plan_for(sheet)
 
         # Step 1: Generate all subject IRIs first (this is one column operation)
         print("  📍 Step 1: Generating subject IRIs...")
-        subject_iris = self._generate_subject_iris_vectorized(df, sheet, offset)
+        subject_iris = self._generate_subject_iris_vectorized(df, plan, offset)
 
         # Step 2: Add rdf:type triples for all subjects (column-wise)
         print("  🏷️  Step 2: Adding type triples...")
-        self._add_type_triples_vectorized(subject_iris, sheet)
+        self._add_type_triples_vectorized(subject_iris, plan)
 
         # Step 3: Process each property column independently
         print("  📊 Step 3: Processing property columns...")
-        for column_name, column_mapping in sheet.columns.items():
-            if column_name in df.columns:
-                print(f"    Processing column: {column_name}")
-                self._add_property_column_vectorized(
-                    df, subject_iris, column_name, column_mapping, offset
-                )
+        exprs = [expr for name, expr in plan.transform_exprs.items() if name in df.columns]
+        if exprs:
+            df = df.with_columns(exprs)
+        for rule in plan.columns:
+            if rule.column in df.columns:
+                print(f"    Processing column: {rule.column}")
+                self._add_property_column_vectorized(df, subject_iris, rule, offset)
 
         self.report.total_rows += len(df)
 
-    def _generate_subject_iris_vectorized(self, df: pl.DataFrame, sheet: SheetMapping, offset: int) -> List[URIRef]:
-        """Generate all subject IRIs using vectorized operations."""
-        # Convert IRI template to work with Polars
-        template = sheet.row_resource.iri_template
-        base_iri = self.config.defaults.base_iri
-
-        # Simple template substitution (could be enhanced)
-        if '{base_iri}' in template and '{EmployeeID}' in template:
-            # Example: {base_iri}employee/{EmployeeID}
-            template_without_base = template.replace('{base_iri}', base_iri)
-
-            if 'EmployeeID' in df.columns:
-                # Use Polars string operations for vectorized IRI generation
-                iri_series = df.select(
-                    pl.lit(template_without_base.replace('{EmployeeID}', '')) +
-                    pl.col('EmployeeID').cast(pl.Utf8)
-                ).to_series()
-
-                return [URIRef(iri) for iri in iri_series.to_list()]
-
-        # Fallback to row-wise processing for complex templates
-        subject_iris = []
-        for idx, row in enumerate(df.to_dicts()):
-            iri_template = IRITemplate(template)
-            try:
-                context = {**row, 'base_iri': base_iri}
-                iri_str = iri_template.render(context)
-                subject_iris.append(URIRef(iri_str))
-            except Exception as e:
+    def _generate_subject_iris_vectorized(self, df: pl.DataFrame, plan: SheetPlan, offset: int) -> List[Optional[URIRef]]:
+        """Generate all subject IRIs using vectorized operations.
+
+        Returns one entry per row (None where the IRI could not be generated)
+        so the list stays aligned with the DataFrame's columns.
+        """
+        compiled = compile_iri_template(plan.subject_template, self.config.defaults.base_iri)
+
+        try:
+            iri_series, null_mask = compiled.render(df)
+        except ValueError as e:
+            for idx in range(len(df)):
                 self.report.add_error(f"IRI generation failed: {e}", row=offset + idx + 1)
-                subject_iris.append(None)
+            return [None] * len(df)
 
-        return [iri for iri in subject_iris if iri is not None]
+        # Report all rows with null template variables in one pass
+        for idx in null_mask.arg_true().to_list():
+            self.report.add_error(
+                "IRI generation failed: null value for IRI template variable(s): "
+                + ", ".join(compiled.variables),
+                row=offset + idx + 1,
+            )
 
-    def _add_type_triples_vectorized(self, subject_iris: List[URIRef], sheet: SheetMapping) -> None:
-        """Add rdf:type triples for all subjects at once."""
-        class_uri = self._resolve_class(sheet.row_resource.class_type)
+        return [URIRef(iri) if iri is not None else None for iri in iri_series.to_list()]
 
+    def _add_type_triples_vectorized(self, subject_iris: List[Optional[URIRef]], plan: SheetPlan) -> None:
+        """Add rdf:type triples for all subjects at once."""
         for subject_iri in subject_iris:
-            self._add_triple(subject_iri, RDF.type, class_uri)
+            if subject_iri is None:
+                continue
+            for class_uri in plan.classes:
+                self._add_triple(subject_iri, RDF.type, class_uri)
             self._add_triple(subject_iri, RDF.type, OWL.NamedIndividual)
 
     def _add_property_column_vectorized(
         self,
         df: pl.DataFrame,
-        subject_iris: List[URIRef],
-        column_name: str,
-        column_mapping,
+        subject_iris: List[Optional[URIRef]],
+        rule: LiteralRule,
         offset: int
     ) -> None:
         """Process an entire property column at once."""
-        property_uri = self._resolve_property(column_mapping.as_property)
+        column = df[rule.column]
+        column_values = column.to_list()
 
-        # Get the column values
-        column_values = df[column_name].to_list()
+        # Untransformed typed columns are validated in one pass; invalid
+        # values are skipped and reported per column rather than per cell
+        valid = None
+        if rule.datatype is not None and rule.transform is None:
+            valid = validate_series(column, rule.datatype, max_samples=0).valid.to_list()
+        invalid_count = 0
+        samples: List[Tuple[int, Any]] = []
 
-        # Process all values in this column
         for idx, (subject_iri, value) in enumerate(zip(subject_iris, column_values)):
             if subject_iri is None or value is None:
                 continue
 
-            # Apply transforms if specified
-            if hasattr(column_mapping, 'transform') and column_mapping.transform:
+            if valid is not None and not valid[idx]:
+                invalid_count += 1
+                if len(samples) < 10:
+                    samples.append((offset + idx + 1, value))
+                continue
+
+            # Transforms without a Polars equivalent are applied per value
+            if rule.transform is not None:
                 try:
-                    # For column-wise processing, we'd ideally use Polars expressions
-                    # For now, apply transform row-wise
-                    row_data = df.row(idx, named=True)
-                    value = apply_transform(value, column_mapping.transform, row_data)
+                    value = rule.transform(value)
                 except Exception as e:
                     self.report.add_error(
-                        f"Transform failed for {column_name}: {e}",
+                        f"Transform failed for {rule.column}: {e}",
                         row=offset + idx + 1,
                         severity=ErrorSeverity.WARNING
                     )
                     continue
 
-            # Create literal
-            literal = self._create_literal(
-                value,
-                datatype=getattr(column_mapping, 'datatype', None),
-                language=getattr(column_mapping, 'language', None) or self.config.defaults.language,
-                row_num=offset + idx + 1,
-                column_name=column_name
-            )
+            literal = self._create_literal(value, rule, row_num=offset + idx + 1, validated=valid is not None)
 
             if literal is not None:
-                self._add_triple(subject_iri, property_uri, literal)
+                self._add_triple(subject_iri, rule.predicate, literal)
+
+        if invalid_count:
+            self.report.add_datatype_violations(rule.column, str(rule.datatype), invalid_count, samples)
 
     def _create_literal(
         self,
         value: Any,
-        datatype: Optional[str] = None,
-        language: Optional[str] = None,
+        rule: LiteralRule,
         row_num: Optional[int] = None,
-        column_name: Optional[str] = None,
+        validated: bool = False,
     ) -> Optional[Literal]:
-        """Create RDF literal with appropriate datatype or language tag."""
+        """Create RDF literal with appropriate datatype or language tag.
+
+        Values of columns already checked by validate_series are passed with
+        validated=True and skip the scalar datatype check.
+        """
         # Handle Polars null values and regular Python values
         if value is None:
             return None
@@ -194,29 +189,31 @@ class ColumnWiseRDFBuilder:
         if hasattr(value, 'item'):
             value = value.item()
 
+        datatype = rule.datatype
+
         # Validate datatype before creating literal
-        if datatype:
-            is_valid, error_msg = validate_datatype(value, datatype)
+        if datatype is not None:
+            is_valid, error_msg = (True, None) if validated else validate_datatype(value, datatype)
             if not is_valid:
                 self.report.add_error(
-                    f"Invalid datatype for column '{column_name}': {error_msg}",
+                    f"Invalid datatype for column '{rule.column}': {error_msg}",
                     row=row_num,
                     severity=ErrorSeverity.WARNING,
                 )
                 return None
 
             # Convert value to appropriate Python type for RDF
-            if datatype == "xsd:integer":
+            if datatype == XSD.integer:
                 try:
                     value = int(float(str(value)))  # Handle string numbers
                 except (ValueError, TypeError):
                     return None
-            elif datatype == "xsd:decimal" or datatype == "xsd:double":
+            elif datatype == XSD.decimal or datatype == XSD.double:
                 try:
                     value = float(str(value))
                 except (ValueError, TypeError):
                     return None
-            elif datatype == "xsd:boolean":
+            elif datatype == XSD.boolean:
                 if isinstance(value, bool):
                     value = value
                 elif str(value).lower() in ('true', '1', 'yes', 'on'):
@@ -228,16 +225,15 @@ class ColumnWiseRDFBuilder:
 
         # Create the literal
         try:
-            if language:
-                return Literal(value, lang=language)
-            elif datatype:
-                dt_uri = self._resolve_property(datatype)
-                return Literal(value, datatype=dt_uri)
+            if rule.language:
+                return Literal(value, lang=rule.language)
+            elif datatype is not None:
+                return Literal(value, datatype=datatype)
             else:
                 return Literal(value)
         except Exception as e:
             self.report.add_error(
-                f"Literal creation failed for column '{column_name}': {e}",
+                f"Literal creation failed for column '{rule.column}': {e}",
                 row=row_num,
                 severity=ErrorSeverity.WARNING,
             )
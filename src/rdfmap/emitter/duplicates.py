@@ -0,0 +1,159 @@
+"""Compact duplicate IRI detection.
+
+A detector sees the subject IRIs of every chunk and reports IRIs generated
+for more than one row. ``HashedIRIDuplicateDetector`` keeps 64-bit hashes
+of the IRIs seen so far, with the row of their first occurrence and whether
+they were seen again, in sorted numpy runs (17 bytes per distinct IRI, no
+Python objects). Each chunk is hashed and sorted with Polars and numpy,
+looked up in the runs with binary search, and appended as a new run. Runs
+of similar size are merged, as in an LSM tree, so a lookup touches
+O(log n) runs.
+
+Only the first ``max_iris`` duplicated IRIs keep their text and a sample of
+their row numbers. All other duplicates are only counted.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import polars as pl
+
+
+class IRIDuplicateDetector(ABC):
+    """Interface of duplicate IRI detectors used by the graph builders."""
+
+    @abstractmethod
+    def add(self, iris: pl.Series, offset: int, rows: Optional[np.ndarray] = None) -> None:
+        """Register the IRIs of a chunk.
+
+        Args:
+            iris: IRI strings of the chunk's rows (null where none was generated)
+            offset: Number of rows before the chunk
+            rows: Row numbers of the chunk's rows, when they do not follow
+                ``offset`` one after another (filtered chunks)
+        """
+
+    @abstractmethod
+    def get_duplicate_iris(self) -> Dict[str, List[int]]:
+        """Sampled duplicated IRIs.
+
+        Returns:
+            Dictionary mapping duplicated IRIs to some of their row numbers
+        """
+
+    @property
+    @abstractmethod
+    def duplicate_count(self) -> int:
+        """Number of distinct IRIs generated for more than one row."""
+
+
+class HashedIRIDuplicateDetector(IRIDuplicateDetector):
+    """Duplicate detector over 64-bit IRI hashes in sorted numpy runs."""
+
+    def __init__(self, max_iris: int = 1000, max_rows: int = 10):
+        """Initialize detector.
+
+        Args:
+            max_iris: Duplicated IRIs whose text and rows are kept
+            max_rows: Row numbers kept per duplicated IRI
+        """
+        self.max_iris = max_iris
+        self.max_rows = max_rows
+        # Disjoint sorted runs of (hash, first row number, seen again)
+        self._runs: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+        self._duplicates = 0
+        self._samples: Dict[int, Tuple[str, List[int]]] = {}
+        self.extra_occurrences = 0  # Rows whose IRI was generated before
+
+    @property
+    def duplicate_count(self) -> int:
+        return self._duplicates
+
+    def add(self, iris: pl.Series, offset: int, rows: Optional[np.ndarray] = None) -> None:
+        if rows is None:
+            rows = np.arange(offset + 1, offset + len(iris) + 1, dtype=np.int64)
+        present = iris.is_not_null()
+        if not present.all():
+            iris = iris.filter(present)
+            rows = rows[present.to_numpy()]
+        if len(iris) == 0:
+            return
+
+        hashes = iris.hash(seed=0).to_numpy()
+        order = np.argsort(hashes, kind="stable")
+        hashes = hashes[order]
+        rows = rows[order]
+        unique, first = np.unique(hashes, return_index=True)
+        counts = np.diff(np.append(first, len(hashes)))
+
+        # Row of an occurrence in an earlier chunk, -1 if none, and whether
+        # that IRI was already known to be duplicated
+        earlier = np.full(len(unique), -1, dtype=np.int64)
+        known = np.zeros(len(unique), dtype=bool)
+        for run_hashes, run_rows, run_repeated in self._runs:
+            pos = np.minimum(np.searchsorted(run_hashes, unique), len(run_hashes) - 1)
+            hit = run_hashes[pos] == unique
+            earlier[hit] = run_rows[pos[hit]]
+            known[hit] = run_repeated[pos[hit]]
+            run_repeated[pos[hit]] = True
+        seen = earlier >= 0
+
+        duplicated = np.flatnonzero(seen | (counts > 1))
+        if len(duplicated):
+            self._record(iris, order, unique[duplicated], first[duplicated], counts[duplicated],
+                         earlier[duplicated], ~known[duplicated], rows)
+
+        new = ~seen
+        self._push_run(unique[new], rows[first[new]], counts[new] > 1)
+
+    def _record(
+        self,
+        iris: pl.Series,
+        order: np.ndarray,
+        hashes: np.ndarray,
+        first: np.ndarray,
+        counts: np.ndarray,
+        earlier: np.ndarray,
+        is_new: np.ndarray,
+        rows: np.ndarray,
+    ) -> None:
+        """Count duplicated hashes and sample the text and rows of some of them."""
+        self.extra_occurrences += int((counts - 1).sum() + (earlier >= 0).sum())
+        self._duplicates += int(is_new.sum())
+
+        sampled = np.isin(hashes, np.fromiter(self._samples, dtype=np.uint64, count=len(self._samples)))
+        room = self.max_iris - len(self._samples)
+        if room > 0:
+            # Sample the new duplicates that occurred first
+            candidates = np.flatnonzero(is_new)
+            first_rows = np.where(earlier >= 0, earlier, rows[first])[candidates]
+            sampled[candidates[np.argsort(first_rows, kind="stable")[:room]]] = True
+
+        for i in np.flatnonzero(sampled):
+            key = int(hashes[i])
+            iri = iris[int(order[first[i]])]
+            chunk_rows = rows[first[i]:first[i] + counts[i]].tolist()
+            entry = self._samples.get(key)
+            if entry is None:
+                entry = (iri, [int(earlier[i])] if earlier[i] >= 0 else [])
+                self._samples[key] = entry
+            elif entry[0] != iri:
+                continue  # Hash collision between different IRIs
+            entry[1].extend(chunk_rows[:max(0, self.max_rows - len(entry[1]))])
+
+    def _push_run(self, hashes: np.ndarray, rows: np.ndarray, repeated: np.ndarray) -> None:
+        """Add a sorted run, merging runs of similar size."""
+        if len(hashes) == 0:
+            return
+        self._runs.append((hashes, rows, repeated))
+        while len(self._runs) > 1 and len(self._runs[-2][0]) <= 2 * len(self._runs[-1][0]):
+            (h1, r1, d1), (h2, r2, d2) = self._runs.pop(), self._runs.pop()
+            merged = np.concatenate([h2, h1])
+            order = np.argsort(merged, kind="stable")
+            self._runs.append((
+                merged[order], np.concatenate([r2, r1])[order], np.concatenate([d2, d1])[order],
+            ))
+
+    def get_duplicate_iris(self) -> Dict[str, List[int]]:
+        return {iri: rows for iri, rows in self._samples.values()}
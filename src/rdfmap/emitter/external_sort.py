@@ -0,0 +1,217 @@
+"""Out-of-core aggregation of N-Triples output.
+
+``SortedRunWriter`` takes the place of ``NTriplesStreamWriter`` when
+duplicates must be aggregated but the output may not fit in memory. Lines
+are buffered until the memory budget is reached, then sorted and
+deduplicated with Polars and spilled to a run file. When the writer is
+closed, the runs are combined with a k-way merge (``heapq.merge``) that
+drops identical lines. Sorted N-Triples lines are grouped by subject, since
+all lines of a subject share the same prefix, so the merged stream is
+written either as deduplicated N-Triples or, through ``TurtleStreamWriter``,
+as subject-grouped Turtle.
+
+Only the text of the buffered chunk lines is counted against the budget;
+sorting a run temporarily needs a few times that, so a run is spilled at a
+quarter of the budget.
+"""
+
+import heapq
+import shutil
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Type, Union
+
+import polars as pl
+from rdflib import Literal, URIRef
+
+from .node_streaming import create_stream_writer
+from .nt_streaming import decode_lines, format_nt_term
+
+# Runs merged at once; more runs are merged in several passes
+MERGE_FAN_IN = 64
+
+# Lines written per call when spilling a sorted run
+_WRITE_BATCH = 100_000
+
+_READ_BUFFER = 1 << 20
+
+
+def merge_sorted_lines(sources: Iterable[Iterable[str]]) -> Iterator[str]:
+    """Merge sorted line streams, dropping repeated lines.
+
+    Args:
+        sources: Streams of lines, each sorted and newline-terminated
+
+    Yields:
+        The distinct lines of all streams, in sorted order
+    """
+    previous = None
+    for line in heapq.merge(*sources):
+        if line != previous:
+            yield line
+            previous = line
+
+
+class SortedRunWriter:
+    """N-Triples writer that aggregates its output through sorted runs on disk.
+
+    It has the interface of ``NTriplesStreamWriter`` and is used as a context
+    manager; the deduplicated output is written when the context exits.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        output_format: str = "nt",
+        memory_budget_mb: int = 512,
+        spill_dir: Optional[Path] = None,
+        namespaces: Optional[Dict[str, str]] = None,
+        encoding: str = 'utf-8',
+        compression: Optional[str] = "infer",
+        max_triples_per_file: Optional[int] = None,
+        max_bytes_per_file: Optional[int] = None,
+    ):
+        """Initialize writer.
+
+        Args:
+            output_path: Path of the final NT or Turtle file
+            output_format: "nt" for N-Triples, "ttl" for subject-grouped Turtle
+            memory_budget_mb: Approximate memory used for buffering and sorting
+            spill_dir: Directory for the temporary run files (system temp dir by default)
+            namespaces: Prefixes of the Turtle output
+            encoding: File encoding (default: utf-8)
+            compression: Compression of the output: "gzip", "zstd", None, or
+                "infer" from the file suffix
+            max_triples_per_file: Rotate to numbered shard files of about this
+                many triples, between subjects
+            max_bytes_per_file: Rotate to numbered shard files of about this
+                many bytes, between subjects
+        """
+        if output_format not in ("nt", "ttl"):
+            raise ValueError(f"Out-of-core aggregation supports nt and ttl output, not {output_format}")
+        self.output_path = output_path
+        self.output_format = output_format
+        self.spill_threshold = max(1, memory_budget_mb * 1024 * 1024 // 4)
+        self.spill_dir = spill_dir
+        self.namespaces = namespaces
+        self.encoding = encoding
+        self.compression = compression
+        self.max_triples_per_file = max_triples_per_file
+        self.max_bytes_per_file = max_bytes_per_file
+        self.input_triples = 0   # Triples received, with duplicates
+        self.triple_count = 0    # Distinct triples written
+        self.runs: List[Path] = []
+        self._blocks: List[str] = []
+        self._buffered = 0
+        self._tmpdir: Optional[Path] = None
+
+    def __enter__(self) -> "SortedRunWriter":
+        """Enter context manager."""
+        if self.spill_dir is not None:
+            Path(self.spill_dir).mkdir(parents=True, exist_ok=True)
+        self._tmpdir = Path(tempfile.mkdtemp(prefix="rdfmap-spill-", dir=self.spill_dir))
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager, merging the runs into the output on success."""
+        try:
+            if exc_type is None:
+                self._spill()
+                self._merge()
+        finally:
+            self._blocks = []
+            if self._tmpdir is not None:
+                shutil.rmtree(self._tmpdir, ignore_errors=True)
+                self._tmpdir = None
+
+    def write_triple(self, subject: URIRef, predicate: URIRef, obj: Union[URIRef, Literal]) -> None:
+        """Buffer a single triple.
+
+        Args:
+            subject: Subject URI
+            predicate: Predicate URI
+            obj: Object (URI or Literal)
+        """
+        self.write_lines(f'<{subject}> <{predicate}> {format_nt_term(obj)} .\n', 1)
+
+    def write_lines(self, lines: Union[str, bytes], count: Optional[int] = None) -> None:
+        """Buffer a block of N-Triples lines, spilling a run when the budget is reached.
+
+        Args:
+            lines: Complete N-Triples lines, each terminated by a newline, as text or bytes
+            count: Number of triples in the block (default: number of lines)
+        """
+        if self._tmpdir is None:
+            raise RuntimeError("Writer not opened (use context manager)")
+        lines = decode_lines(lines, self.encoding)
+        self._blocks.append(lines)
+        self._buffered += len(lines)
+        self.input_triples += lines.count("\n") if count is None else count
+        if self._buffered >= self.spill_threshold:
+            self._spill()
+
+    def get_triple_count(self) -> int:
+        """Get number of triples written.
+
+        Returns:
+            Number of distinct triples once the output is written, else the
+            number of triples received so far
+        """
+        return self.triple_count or self.input_triples
+
+    def _spill_path(self, name: str) -> Path:
+        if self._tmpdir is None:
+            raise RuntimeError("Writer not opened (use context manager)")
+        return self._tmpdir / name
+
+    def _spill(self) -> None:
+        """Sort and deduplicate the buffered lines into a new run file."""
+        if not self._blocks:
+            return
+        lines = pl.Series("line", self._blocks).str.split("\n").explode()
+        self._blocks = []
+        self._buffered = 0
+        lines = lines.filter(lines.str.len_bytes() > 0).unique().sort()
+
+        path = self._spill_path(f"run-{len(self.runs):05d}.nt")
+        with open(path, 'w', encoding=self.encoding) as handle:
+            for start in range(0, len(lines), _WRITE_BATCH):
+                batch = lines.slice(start, _WRITE_BATCH)
+                handle.write((batch + "\n").str.join("").item())
+        self.runs.append(path)
+
+    def _open_runs(self, stack: ExitStack, runs: List[Path]) -> List[TextIO]:
+        return [stack.enter_context(open(run, encoding=self.encoding, buffering=_READ_BUFFER)) for run in runs]
+
+    def _merge(self) -> None:
+        """Merge the runs into the output file, in several passes if there are many."""
+        runs = self.runs
+        generation = 0
+        while len(runs) > MERGE_FAN_IN:
+            merged = []
+            for i in range(0, len(runs), MERGE_FAN_IN):
+                path = self._spill_path(f"merge-{generation}-{i // MERGE_FAN_IN:05d}.nt")
+                with ExitStack() as stack, open(path, 'w', encoding=self.encoding) as handle:
+                    handle.writelines(merge_sorted_lines(self._open_runs(stack, runs[i:i + MERGE_FAN_IN])))
+                for run in runs[i:i + MERGE_FAN_IN]:
+                    run.unlink()
+                merged.append(path)
+            runs = merged
+            generation += 1
+
+        with ExitStack() as stack:
+            lines = merge_sorted_lines(self._open_runs(stack, runs))
+            writer = create_stream_writer(
+                self.output_format, self.output_path, self.namespaces, self.compression,
+                max_triples_per_file=self.max_triples_per_file, max_bytes_per_file=self.max_bytes_per_file,
+            )
+            with writer:
+                writer.write_sorted_lines(lines)
+            self.triple_count = writer.get_triple_count()
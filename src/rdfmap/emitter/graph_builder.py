@@ -1,18 +1,29 @@
 """High-performance RDF graph construction using Polars DataFrames."""
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
+import numpy as np
 import polars as pl
-from rdflib import Graph, Literal, Namespace, RDF, URIRef
+from rdflib import Dataset, Graph, Literal, Namespace, RDF, URIRef
 from rdflib.namespace import OWL
 
 from ..generator.ontology_analyzer import OntologyAnalyzer  # removed OntologyProperty
-from ..iri.generator import IRITemplate, curie_to_iri
+from ..iri.generator import CompiledIRITemplate, IRITemplate
 from ..models.errors import ErrorSeverity, ProcessingReport
-from ..models.mapping import MappingConfig, SheetMapping
-from ..transforms.functions import apply_transform
-from ..validator.datatypes import validate_datatype
+from ..models.mapping import MappingConfig, SheetMapping, TripleStoreType
+from ..parsers.data_source import INVALID_PREFIX, SOURCE_ROW
+from ..validator.datatypes import ColumnValidation, validate_datatype, validate_series
+from ..validator.structure import RuleViolation, check_plan_structure
+from .duplicates import HashedIRIDuplicateDetector, IRIDuplicateDetector
+from .mapping_plan import (
+    PARENT_ROW, ChildFrame, CompiledMapping, EntityPlan, LiteralRule, ObjectPlan, SheetPlan,
+    resolve_term, split_child_frames,
+)
+from .node_streaming import create_stream_writer, write_graph
+from .object_cache import ObjectDescriptionCache, cache_entries
+from .reasoning import INFERENCE_COUNTERS, VIOLATION_COUNTERS, ReasoningRules, materialize
+from .triple_store import InternedTripleStore
 
 
 class RDFGraphBuilder:
@@ -32,55 +43,74 @@ class RDFGraphBuilder:
         self.ontology_analyzer = ontology_analyzer
 
         # Only create in-memory graph if not streaming
+        interned = getattr(config.options, 'triple_store', None) == TripleStoreType.INTERNED
+        # Triples of the current chunk, added to the interned store in one
+        # batch with add_many
+        self._store_batch: Optional[List[Tuple[Any, Any, Any]]] = None
+        self._batch_store: Optional[InternedTripleStore] = None
+        self.graph: Optional[Graph]
         if streaming_writer is None:
-            self.graph = Graph()
+            if self._uses_named_graphs(config):
+                if interned:
+                    raise ValueError("Named graphs need the memory triple store")
+                # Triples of each sheet go to its graph; lookups see the union
+                self.graph = Dataset(default_union=True)
+            elif interned:
+                self._batch_store = InternedTripleStore()
+                self.graph = Graph(store=self._batch_store)
+                self._store_batch = []
+            else:
+                self.graph = Graph()
             # Bind namespaces
             for prefix, namespace in config.namespaces.items():
                 self.graph.bind(prefix, Namespace(namespace))
         else:
             self.graph = None
+        # Graph the triples of the current sheet are added to
+        self._target: Optional[Graph] = self.graph
+
+        # Duplicate subject IRI detectors of sheets that enable them,
+        # keyed by (sheet name, IRI template)
+        self._duplicate_detectors: Dict[Tuple[str, str], IRIDuplicateDetector] = {}
+
+        # Linked-object descriptions already streamed, per object mapping
+        # (keyed by id(ObjectPlan)), when options.object_cache_mb is set
+        self._object_caches: Dict[int, ObjectDescriptionCache] = {}
+        object_cache_mb = getattr(config.options, 'object_cache_mb', None)
+        if object_cache_mb and streaming_writer is not None:
+            mappings = sum(len(getattr(sheet, 'objects', {})) for sheet in config.sheets or [])
+            self._object_cache_entries: Optional[int] = cache_entries(object_cache_mb, mappings)
+        else:
+            self._object_cache_entries = None
+
+        # IRI templates compiled once, and their rendering for the current chunk
+        self._compiled_templates: Dict[str, CompiledIRITemplate] = {}
+        self._chunk_iris: Dict[str, Tuple[List[Optional[str]], Optional[str]]] = {}
+        # Source position of each row of a filtered chunk, see ScanPlan
+        self._source_rows: Optional[List[int]] = None
+        # Position of the parent row of each child record while a child frame is emitted
+        self._chunk_rows: Optional[List[int]] = None
 
-        # Track generated IRIs to detect duplicates (only when aggregating)
-        self.iri_registry: Dict[str, List[int]] = {}  # iri -> [row_numbers]
+        # Typed columns of the current chunk validated in bulk, keyed by
+        # id(rule), and the invalid values actually emitted as plain literals
+        self._chunk_validation: Dict[int, ColumnValidation] = {}
+        self._chunk_invalid: Dict[int, Set[int]] = {}
+        self._chunk_violations: Dict[int, List[Any]] = {}  # id(rule) -> [rule, count, samples]
 
-        # Build quick property index for structural validation
-        self._prop_index = {}
-        if ontology_analyzer:
-            for prop in ontology_analyzer.properties.values():
-                self._prop_index[str(prop.uri)] = prop
+        # Sheet mappings compiled to resolved terms on first use
+        self.compiled = CompiledMapping(config)
+
+        # Domain/range violations of each plan, decided once per column schema
+        self._structure_checks: Dict[Tuple[int, Tuple[Any, ...]], List[RuleViolation]] = {}
 
         self.enable_reasoning = getattr(config.defaults, 'enable_reasoning', True)
         self.transitive_depth = getattr(config.defaults, 'transitive_depth', 2)
 
-    def _structural_check(self, subject: URIRef, predicate: URIRef, obj) -> None:
-        if not self.ontology_analyzer:
-            return
-        prop = self._prop_index.get(str(predicate))
-        if not prop:
-            return
-        # Domain check: subject must have rdf:type of domain if domain declared
-        if prop.domain and self.graph:
-            has_domain_type = (subject, RDF.type, prop.domain) in self.graph
-            if not has_domain_type:
-                self.report.add_structural_violation(
-                    f"Domain violation: {subject} missing type {prop.domain} for property {predicate}", is_domain=True
-                )
-        # Range check
-        if prop.range_type and self.graph:
-            from rdflib.namespace import XSD
-            if isinstance(obj, Literal):
-                # If range is a datatype
-                if str(prop.range_type).startswith(str(XSD)) and obj.datatype != prop.range_type:
-                    self.report.add_structural_violation(
-                        f"Range datatype violation: {predicate} expected {prop.range_type} got {obj.datatype} on {subject}", is_domain=False
-                    )
-            else:
-                # Object: must have rdf:type of range class
-                has_range_type = (obj, RDF.type, prop.range_type) in self.graph
-                if not has_range_type:
-                    self.report.add_structural_violation(
-                        f"Range class violation: object {obj} missing type {prop.range_type} for {predicate}", is_domain=False
-                    )
+        # Reasoning runs as one pass over the graph when it is requested
+        self._reasoning_rules = ReasoningRules.from_analyzer(ontology_analyzer) if ontology_analyzer else None
+        self._reasoning_pending = False
+        # Cardinality violations of the last pass, replaced by those of the next
+        self._reasoning_check = ProcessingReport()
 
     def _add_triple(self, subject: URIRef, predicate: URIRef, obj) -> None:
         """Add a triple to the output (streaming or aggregated).
@@ -93,14 +123,49 @@ class RDFGraphBuilder:
         if self.streaming_writer:
             # Stream directly to NT file
             self.streaming_writer.write_triple(subject, predicate, obj)
-        elif self.graph is not None:
+        elif self._store_batch is not None:
+            self._store_batch.append((subject, predicate, obj))
+        elif self._target is not None:
             # Add to in-memory graph
-            self.graph.add((subject, predicate, obj))
-            # Structural validation inline (only when aggregating)
-            self._structural_check(subject, predicate, obj)
+            self._target.add((subject, predicate, obj))
         else:
             raise RuntimeError("Builder not properly configured")
 
+    def _flush_store_batch(self) -> None:
+        """Add the triples batched for the store with one ``add_many`` call."""
+        if self._store_batch and self._batch_store is not None:
+            self._batch_store.add_many(self._store_batch)
+            self._store_batch = []
+
+    @staticmethod
+    def _uses_named_graphs(config: MappingConfig) -> bool:
+        """Whether any sheet of a configuration has a named graph."""
+        if getattr(config.defaults, 'graph', None):
+            return True
+        return any(getattr(sheet, 'graph', None) for sheet in config.sheets or [])
+
+    def _use_graph(self, plan: SheetPlan) -> None:
+        """Direct the triples added next to the named graph of a sheet.
+
+        Args:
+            plan: Compiled plan of the sheet about to be processed
+        """
+        if self.streaming_writer is not None:
+            set_graph = getattr(self.streaming_writer, 'set_graph', None)
+            if set_graph is not None:
+                set_graph(plan.graph)
+        elif isinstance(self.graph, Dataset):
+            self._target = self.graph if plan.graph is None else self.graph.graph(plan.graph)
+
+    def _object_cache(self, obj: ObjectPlan) -> Optional[ObjectDescriptionCache]:
+        """Cache of the descriptions streamed for a linked object mapping, if enabled."""
+        if self._object_cache_entries is None:
+            return None
+        cache = self._object_caches.get(id(obj))
+        if cache is None:
+            cache = self._object_caches[id(obj)] = ObjectDescriptionCache(self._object_cache_entries)
+        return cache
+
     def _resolve_property(self, property_ref: str) -> URIRef:
         """Resolve property reference (CURIE or IRI) to URIRef.
 
@@ -110,13 +175,7 @@ class RDFGraphBuilder:
         Returns:
             URIRef for the property
         """
-        if ":" in property_ref and not property_ref.startswith("http"):
-            # Looks like a CURIE
-            iri = curie_to_iri(property_ref, self.config.namespaces)
-            return URIRef(iri)
-        else:
-            # Full IRI
-            return URIRef(property_ref)
+        return resolve_term(property_ref, self.config.namespaces)
 
     def _resolve_class(self, class_ref: str) -> URIRef:
         """Resolve class reference (CURIE or IRI) to URIRef.
@@ -132,19 +191,15 @@ class RDFGraphBuilder:
     def _create_literal(
         self,
         value: Any,
-        datatype: Optional[str] = None,
-        language: Optional[str] = None,
+        rule: LiteralRule,
         row_num: Optional[int] = None,
-        column_name: Optional[str] = None,
     ) -> Optional[Literal]:
         """Create RDF literal with appropriate datatype or language tag.
 
         Args:
             value: Literal value
-            datatype: XSD datatype (as CURIE or IRI)
-            language: Language tag
+            rule: Compiled rule carrying the resolved datatype and language
             row_num: Row number for error reporting
-            column_name: Column name for error reporting
 
         Returns:
             RDF Literal or None if validation fails
@@ -152,10 +207,9 @@ class RDFGraphBuilder:
         # Handle Polars null values and regular Python values
         if value is None:
             # Handle empty values
-            if datatype:
+            if rule.datatype is not None:
                 # Return typed empty literal
-                dt_uri = self._resolve_property(datatype)
-                return Literal("", datatype=dt_uri)
+                return Literal("", datatype=rule.datatype)
             return Literal("")
 
         # Convert Polars types to Python types
@@ -163,124 +217,303 @@ class RDFGraphBuilder:
             value = value.item()
 
         # Validate datatype before creating literal
-        if datatype:
-            is_valid, error_msg = validate_datatype(value, datatype)
+        if rule.datatype is not None:
+            invalid_rows = self._chunk_invalid.get(id(rule))
+            if invalid_rows is not None:
+                # Column already validated for the whole chunk
+                is_valid = row_num not in invalid_rows
+            else:
+                is_valid, _ = validate_datatype(value, rule.datatype)
             if not is_valid:
-                context = f" in column '{column_name}'" if column_name else ""
-                self.report.add_error(
-                    f"Datatype validation failed{context}: {error_msg}",
-                    row=row_num,
-                    severity=ErrorSeverity.WARNING,
-                )
+                self._record_datatype_violations(rule, 1, [(row_num, value)])
                 # Return string literal as fallback
                 return Literal(str(value))
 
             # Create typed literal
-            dt_uri = self._resolve_property(datatype)
-            return Literal(value, datatype=dt_uri)
-        elif language:
+            return Literal(value, datatype=rule.datatype)
+        elif rule.language:
             # Create language-tagged literal
-            return Literal(value, lang=language)
+            return Literal(value, lang=rule.language)
         else:
             # Create untyped literal
             return Literal(value)
 
+    def _validate_chunk(self, df: pl.DataFrame, rules: List[LiteralRule], offset: int) -> None:
+        """Validate every typed column of a chunk in one pass per column.
+
+        Columns with a Python transform are validated per value after the
+        transform instead.
+
+        Args:
+            df: Chunk being processed, with vectorized transforms applied
+            rules: Literal rules bound to the chunk's columns
+            offset: Row offset of the chunk
+        """
+        self._chunk_validation = {}
+        self._chunk_invalid = {}
+        for rule in rules:
+            if rule.datatype is None or rule.transform is not None or rule.index < 0:
+                continue
+            if id(rule) in self._chunk_validation:
+                continue
+            validation = validate_series(df.get_column(rule.column), rule.datatype, max_samples=0)
+            self._chunk_validation[id(rule)] = validation
+            if self._chunk_rows is not None:
+                # Child records share their parent's row number: check values one at a time
+                continue
+            self._chunk_invalid[id(rule)] = (
+                {self._row_number(offset, idx) for idx in (~validation.valid).arg_true().to_list()}
+                if validation.invalid_count else set()
+            )
+
+    def _record_datatype_violations(
+        self, rule: LiteralRule, count: int, samples: List[Tuple[Optional[int], Any]]
+    ) -> None:
+        """Count values emitted as plain literals because their datatype was invalid.
+
+        Args:
+            rule: Rule of the column
+            count: Number of invalid values
+            samples: (row number, value) pairs of some of them
+        """
+        entry = self._chunk_violations.setdefault(id(rule), [rule, 0, []])
+        entry[1] += count
+        entry[2].extend(samples[:10 - len(entry[2])])
+
+    def _flush_datatype_violations(self) -> None:
+        """Report the chunk's datatype violations per column, with bounded samples."""
+        for rule, count, samples in self._chunk_violations.values():
+            self.report.add_datatype_violations(rule.column, rule.datatype, count, samples)
+        self._chunk_violations = {}
+        self._chunk_validation = {}
+        self._chunk_invalid = {}
+
+    def _count_structural_violations(
+        self, df: pl.DataFrame, plan: SheetPlan, objects: Optional[List[ObjectPlan]] = None
+    ) -> None:
+        """Count the chunk's triples produced by rules that break a domain or range.
+
+        Args:
+            df: Chunk with its IRIs already rendered
+            plan: Compiled sheet plan
+            objects: Linked objects the chunk is a child frame of, None for a chunk of rows
+        """
+        if self.ontology_analyzer is None:
+            return
+        key = (id(plan), tuple(df.schema.items()))
+        violations = self._structure_checks.get(key)
+        if violations is None:
+            violations = check_plan_structure(plan, self.ontology_analyzer, dict(df.schema))
+            self._structure_checks[key] = violations
+
+        templates = {obj.iri_template for obj in objects} if objects is not None else None
+        for violation in violations:
+            if templates is not None and not (
+                violation.subject_template in templates or violation.object_template in templates
+            ):
+                continue
+            emitted = pl.Series(self._chunk_iris[violation.subject_template][0], dtype=pl.String).is_not_null()
+            if violation.column is not None:
+                if violation.column not in df.columns:
+                    continue
+                emitted = emitted & df[violation.column].is_not_null()
+            elif violation.object_template is not None:
+                object_iris = self._chunk_iris[violation.object_template][0]
+                emitted = emitted & pl.Series(object_iris, dtype=pl.String).is_not_null()
+            count = int(emitted.sum())
+            if count:
+                self.report.add_structural_violations(violation.message, count, violation.is_domain)
+
+    def _compile_template(self, template: str) -> CompiledIRITemplate:
+        """Get the compiled form of an IRI template, compiling it on first use."""
+        compiled = self._compiled_templates.get(template)
+        if compiled is None:
+            compiled = CompiledIRITemplate(template, self.config.defaults.base_iri)
+            self._compiled_templates[template] = compiled
+        return compiled
+
+    def _render_chunk_iris(self, df: pl.DataFrame, templates: List[str]) -> Dict[str, pl.Series]:
+        """Render every IRI template of a chunk as a column in one pass.
+
+        Args:
+            df: Chunk being processed
+            templates: IRI templates used by the sheet mapping
+
+        Returns:
+            Rendered IRI column of each template that could be rendered
+        """
+        self._chunk_iris = {}
+        rendered: Dict[str, pl.Series] = {}
+        for template in dict.fromkeys(templates):
+            compiled = self._compile_template(template)
+            try:
+                iris, null_mask = compiled.render(df)
+            except ValueError as e:
+                # Template references columns this source does not have
+                self._chunk_iris[template] = ([None] * len(df), str(e))
+                continue
+            failure = None
+            if null_mask.any():
+                failure = (
+                    "null value for IRI template variable(s): "
+                    + ", ".join(compiled.variables)
+                )
+            self._chunk_iris[template] = (iris.to_list(), failure)
+            rendered[template] = iris
+        return rendered
+
+    def create_duplicate_detector(self) -> IRIDuplicateDetector:
+        """Create the duplicate detector of a sheet's subject IRIs (override to plug in another)."""
+        return HashedIRIDuplicateDetector()
+
+    def _track_duplicates(self, plan: SheetPlan, template: str, iris: pl.Series, offset: int) -> None:
+        """Feed a chunk's subject IRIs to the sheet's duplicate detector, if enabled.
+
+        Args:
+            plan: Compiled sheet plan
+            template: Subject IRI template
+            iris: IRI strings of the chunk's rows
+            offset: Number of rows before the chunk
+        """
+        if not plan.detect_duplicates:
+            return
+        key = (plan.name, template)
+        detector = self._duplicate_detectors.get(key)
+        if detector is None:
+            detector = self.create_duplicate_detector()
+            self._duplicate_detectors[key] = detector
+        rows = None
+        if self._source_rows is not None:
+            rows = np.asarray(self._source_rows, dtype=np.int64) + 1
+        detector.add(iris, offset, rows)
+
     def _generate_iri(
         self,
         template: str,
-        row_data: Dict[str, Any],
+        row_data: Any,
         row_num: int,
         context: str = "resource",
+        position: Optional[int] = None,
     ) -> Optional[URIRef]:
         """Generate IRI from template and row data.
 
+        Inside ``add_dataframe`` the IRI is looked up from the chunk's
+        pre-rendered IRI column; otherwise the template is rendered for the
+        single row.
+
         Args:
             template: IRI template string
-            row_data: Row data dictionary
+            row_data: Row data dictionary (only read when the template was not
+                pre-rendered for the current chunk)
             row_num: Row number for error reporting
             context: Context for error reporting
+            position: Position of the row in the chunk (read when the
+                template was pre-rendered for the chunk)
 
         Returns:
             Generated URIRef or None if generation fails
         """
-        try:
-            # Add base_iri to context for template rendering
-            template_context = row_data.copy()
-            template_context["base_iri"] = self.config.defaults.base_iri
-
-            # Render template
-            iri_gen = IRITemplate(template)
-            iri = iri_gen.render(template_context)
-
-            # Track for duplicate detection
-            if iri in self.iri_registry:
-                self.iri_registry[iri].append(row_num)
-            else:
-                self.iri_registry[iri] = [row_num]
-
-            return URIRef(iri)
+        rendered = self._chunk_iris.get(template)
+        if rendered is not None and position is not None:
+            iris, failure = rendered
+            iri = iris[position]
+            if iri is None:
+                self.report.add_error(
+                    f"Failed to generate IRI for {context}: {failure}",
+                    row=row_num,
+                    severity=ErrorSeverity.ERROR,
+                )
+                return None
+        else:
+            try:
+                # Add base_iri to context for template rendering
+                template_context = row_data.copy()
+                template_context["base_iri"] = self.config.defaults.base_iri
+
+                # Render template
+                iri_gen = IRITemplate(template)
+                iri = iri_gen.render(template_context)
+            except Exception as e:
+                self.report.add_error(
+                    f"Failed to generate IRI for {context}: {e}",
+                    row=row_num,
+                    severity=ErrorSeverity.ERROR,
+                )
+                return None
 
-        except Exception as e:
-            self.report.add_error(
-                f"Failed to generate IRI for {context}: {e}",
-                row=row_num,
-                severity=ErrorSeverity.ERROR,
-            )
-            return None
+        return URIRef(iri)
 
     def _apply_column_transforms(
-        self, df: pl.DataFrame, sheet: SheetMapping
+        self, df: pl.DataFrame, plan: SheetPlan, columns: Optional[Iterable[str]] = None
     ) -> pl.DataFrame:
         """Apply transforms to DataFrame columns using Polars expressions.
 
         Args:
             df: Input DataFrame
-            sheet: Sheet mapping configuration
+            plan: Compiled sheet plan
+            columns: Only transform these columns; None for all of them
 
         Returns:
             DataFrame with transforms applied
         """
-        # Build list of Polars expressions for transforms
-        exprs = []
-
-        for column_name in df.columns:
-            if column_name in sheet.columns:
-                column_mapping = sheet.columns[column_name]
-                if column_mapping.transform:
-                    # Apply transform using Polars expression
-                    try:
-                        if column_mapping.transform == "to_decimal":
-                            expr = pl.col(column_name).cast(pl.Float64)
-                        elif column_mapping.transform == "to_integer":
-                            expr = pl.col(column_name).cast(pl.Int64)
-                        elif column_mapping.transform == "to_date":
-                            expr = pl.col(column_name).str.strptime(pl.Date, "%Y-%m-%d", strict=False)
-                        elif column_mapping.transform == "to_datetime":
-                            expr = pl.col(column_name).str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S", strict=False)
-                        elif column_mapping.transform == "lowercase":
-                            expr = pl.col(column_name).str.to_lowercase()
-                        elif column_mapping.transform == "uppercase":
-                            expr = pl.col(column_name).str.to_uppercase()
-                        elif column_mapping.transform == "trim":
-                            expr = pl.col(column_name).str.strip_chars()
-                        else:
-                            # Keep original column for custom transforms
-                            expr = pl.col(column_name)
-
-                        exprs.append(expr.alias(column_name))
-                    except Exception as e:
-                        # Keep original column on transform error
-                        exprs.append(pl.col(column_name))
-                        self.report.add_error(
-                            f"Transform '{column_mapping.transform}' failed for column '{column_name}': {e}",
-                            severity=ErrorSeverity.WARNING,
-                        )
-                else:
-                    exprs.append(pl.col(column_name))
-            else:
-                exprs.append(pl.col(column_name))
+        schema = df.schema
+        only = set(columns) if columns is not None else None
+        exprs = [
+            expr for name, expr in plan.transform_exprs.items()
+            # Columns parsed into the transform's type already hold its result
+            if name in schema and plan.dtypes.get(name) != schema[name]
+            and (only is None or name in only)
+        ]
+        return df.with_columns(exprs) if exprs else df
+
+    def _take_invalid_values(
+        self, df: pl.DataFrame, plan: SheetPlan, offset: int
+    ) -> pl.DataFrame:
+        """Report the values typed parsing could not convert, and drop their columns.
+
+        Args:
+            df: Chunk read with a scan plan, see ``ScanPlan``
+            plan: Compiled sheet plan
+            offset: Row offset of the chunk
+
+        Returns:
+            Chunk without the invalid-value columns
+        """
+        invalid = [name for name in df.columns if name.startswith(INVALID_PREFIX)]
+        if not invalid:
+            return df
+        for name in invalid:
+            values = df.get_column(name)
+            count = len(values) - values.null_count()
+            if not count:
+                continue
+            column = name[len(INVALID_PREFIX):]
+            datatype = next(
+                (rule.datatype for rule in plan.literal_rules() if rule.column == column and rule.datatype),
+                plan.dtypes.get(column),
+            )
+            rows = values.is_not_null().arg_true().head(10)
+            samples = [
+                (self._row_number(offset, idx), value)
+                for idx, value in zip(rows.to_list(), values.gather(rows).to_list())
+            ]
+            self.report.add_datatype_violations(column, str(datatype), count, samples)
+        return df.drop(invalid)
 
-        return df.select(exprs)
+    def _take_source_rows(self, df: pl.DataFrame) -> pl.DataFrame:
+        """Keep the source positions of a filtered chunk's rows, and drop their column.
+
+        Args:
+            df: Chunk read with a scan plan, see ``ScanPlan``
+
+        Returns:
+            Chunk without the ``SOURCE_ROW`` column
+        """
+        if SOURCE_ROW not in df.columns:
+            self._source_rows = None
+            return df
+        self._source_rows = df.get_column(SOURCE_ROW).to_list()
+        return df.drop(SOURCE_ROW)
 
     def add_dataframe(
         self,
@@ -296,139 +529,274 @@ class RDFGraphBuilder:
         Args:
             df: Polars DataFrame to process
             sheet: Sheet mapping configuration
-            offset: Row offset for error reporting
+            offset: Row offset for error reporting (rows of a filtered chunk
+                report their ``SOURCE_ROW`` instead)
         """
         if len(df) == 0:
             return
 
-        # Apply transforms using Polars expressions
-        df = self._apply_column_transforms(df, sheet)
+        plan = self.compiled.plan_for(sheet)
+        self._use_graph(plan)
+        df = self._take_source_rows(df)
+        df = self._take_invalid_values(df, plan, offset)
 
-        # Convert to Python dictionaries for RDF processing
-        # This is currently necessary for IRI template rendering
-        # Future optimization: implement template rendering directly in Polars
-        rows_data = df.to_dicts()
+        # Apply transforms using Polars expressions
+        df = self._apply_column_transforms(df, plan)
+        df, objects, children = split_child_frames(df, plan)
+        plan.bind(df.columns)
+
+        # Render all subject/object IRIs for the chunk as columns up front
+        templates = plan.templates
+        if children:
+            templates = [plan.subject_template] + [obj.iri_template for obj in objects]
+        rendered = self._render_chunk_iris(df, templates)
+        subject_templates = [e.iri_template for e in plan.entities] if plan.entities else [plan.subject_template]
+        for template in subject_templates:
+            if template in rendered:
+                self._track_duplicates(plan, template, rendered[template], offset)
+        self._validate_chunk(df, plan.literal_rules(), offset)
+        if self.ontology_analyzer is not None:
+            self._count_structural_violations(df, plan)
 
-        # Check if this is a merged sheet with multiple entity types
-        entity_types = getattr(sheet, '_entity_types', None)
+        try:
+            self._add_rows(df.iter_rows(), plan, offset, objects)
+            if children:
+                subjects = self._chunk_iris[plan.subject_template][0]
+                for child in children:
+                    self._add_child_rows(child, plan, subjects, offset)
+        finally:
+            self._chunk_iris = {}
+            self._chunk_rows = None
+            self._source_rows = None
+            self._flush_datatype_violations()
+            self._flush_store_batch()
+            self._reasoning_pending = True
+
+    def _add_rows(
+        self,
+        rows: Iterable[Tuple[Any, ...]],
+        plan: SheetPlan,
+        offset: int,
+        objects: Optional[List[ObjectPlan]] = None,
+    ) -> None:
+        """Emit triples for the rows of one chunk.
 
-        if entity_types:
+        ``objects`` are the linked objects emitted from the rows, all of the
+        plan's by default (the others come from child frames).
+        """
+        if objects is None:
+            objects = plan.objects
+        if plan.entities:
             # Merged sheet - create multiple entities per row
-            for idx, row_data in enumerate(rows_data):
-                row_num = offset + idx + 1
+            for idx, row in enumerate(rows):
+                row_num = self._row_number(offset, idx)
 
                 # Create each entity type for this row
-                for entity_info in entity_types:
-                    self._add_entity_from_merged_sheet(
-                        entity_info,
-                        row_data,
-                        row_num,
-                        sheet
-                    )
+                for entity in plan.entities:
+                    self._add_entity_from_merged_sheet(entity, row, row_num, plan, idx)
 
                 self.report.total_rows += 1
         else:
             # Standard single-entity sheet processing
-            for idx, row_data in enumerate(rows_data):
-                row_num = offset + idx + 1  # 1-indexed for users
+            for idx, row in enumerate(rows):
+                row_num = self._row_number(offset, idx)  # 1-indexed for users
 
                 # Add main resource
-                main_resource = self._add_row_resource(sheet, row_data, row_num)
+                main_resource = self._add_row_resource(plan, row, row_num, idx)
 
                 if main_resource:
                     # Add linked objects
-                    self._add_linked_objects(main_resource, sheet, row_data, row_num)
+                    self._add_linked_objects(main_resource, objects, row, row_num, idx)
 
                     self.report.total_rows += 1
 
+    def _begin_child_frame(self, child: ChildFrame, plan: SheetPlan, offset: int) -> pl.DataFrame:
+        """Switch the chunk state to a child frame.
+
+        The datatype violations of the parent rows are reported, the
+        objects' rules are bound to the child frame's columns and its typed
+        columns are validated; child records report their parent's row.
+
+        Args:
+            child: Child frame of the chunk
+            plan: Compiled sheet plan
+            offset: Row offset of the chunk
+
+        Returns:
+            Child frame with the vectorized transforms of the element columns
+            applied (its parent columns are transformed with the chunk)
+        """
+        self._flush_datatype_violations()
+        frame = self._apply_column_transforms(child.frame, plan, child.element_columns)
+        plan.bind_objects(child.objects, frame.columns)
+        self._chunk_rows = frame.get_column(PARENT_ROW).to_list()
+        rules = [rule for obj in child.objects for rule in obj.properties]
+        self._validate_chunk(frame, rules, offset)
+        return frame
+
+    def _row_number(self, offset: int, position: int) -> int:
+        """Row number reported for a position in the chunk (a child record's parent row).
+
+        Rows of a filtered chunk are numbered by their position in the source.
+        """
+        if self._chunk_rows is not None:
+            position = self._chunk_rows[position]
+        if self._source_rows is not None:
+            return self._source_rows[position] + 1
+        return offset + position + 1
+
+    def _add_child_rows(
+        self,
+        child: ChildFrame,
+        plan: SheetPlan,
+        subjects: List[Optional[str]],
+        offset: int,
+    ) -> None:
+        """Emit the linked objects of a child frame, linked from their parent rows.
+
+        Args:
+            child: Child frame of the chunk
+            plan: Compiled sheet plan
+            subjects: Row resource IRI of each parent row, None where none was created
+            offset: Row offset of the chunk
+        """
+        frame = self._begin_child_frame(child, plan, offset)
+        self._render_chunk_iris(frame, [obj.iri_template for obj in child.objects])
+        parents = [subjects[row] for row in frame.get_column(PARENT_ROW).to_list()]
+        if self.ontology_analyzer is not None:
+            self._chunk_iris[plan.subject_template] = (parents, None)
+            self._count_structural_violations(frame, plan, child.objects)
+
+        for position, row in enumerate(frame.iter_rows()):
+            parent = parents[position]
+            if parent is None:
+                continue
+            main_resource = URIRef(parent)
+            row_num = self._row_number(offset, position)
+            for obj in child.objects:
+                self._add_single_linked_object(main_resource, obj, row, row_num, position)
+
     def _add_entity_from_merged_sheet(
         self,
-        entity_info: Dict[str, Any],
-        row_data: Dict[str, Any],
+        entity: EntityPlan,
+        row: Tuple[Any, ...],
         row_num: int,
-        sheet: SheetMapping,
+        plan: SheetPlan,
+        position: Optional[int] = None,
     ) -> Optional[URIRef]:
         """Create an entity from a merged sheet's entity type info.
 
         Args:
-            entity_info: Entity type configuration with class, iri_template, columns, objects
-            row_data: Row data dictionary
+            entity: Compiled entity type with classes, IRI template, columns and objects
+            row: Row values in the plan's column order
             row_num: Row number for error reporting
-            sheet: Original sheet for namespace resolution
+            plan: Compiled plan of the merged sheet
+            position: Position of the row in the chunk
 
         Returns:
             URIRef of created resource or None if creation failed
         """
         # Generate IRI for this entity
         resource_iri = self._generate_iri(
-            entity_info['iri_template'],
-            row_data,
+            entity.iri_template,
+            row,
             row_num,
-            f"entity {entity_info['class']}",
+            f"entity {entity.class_label}",
+            position,
         )
 
         if not resource_iri:
             return None
 
         # Add rdf:type for declared class(es)
-        entity_class = entity_info['class']
-        if isinstance(entity_class, list):
-            for cls in entity_class:
-                class_uri = self._resolve_class(cls)
-                self.graph.add((resource_iri, RDF.type, class_uri))
-        else:
-            class_uri = self._resolve_class(entity_class)
-            self.graph.add((resource_iri, RDF.type, class_uri))
+        for class_uri in entity.classes:
+            self._add_triple(resource_iri, RDF.type, class_uri)
 
         # Add data properties for this entity's columns
-        for col_name in entity_info.get('columns', []):
-            if col_name in sheet.columns:
-                col_mapping = sheet.columns[col_name]
-                self._add_column_value(
-                    resource_iri,
-                    col_mapping,
-                    row_data.get(col_name),
-                    row_num,
-                    f"{sheet.name}.{col_name}",
-                )
+        self._add_literals(resource_iri, entity.columns, row, row_num, check_required=True)
 
         # Add object properties for this entity
-        for obj_name in entity_info.get('objects', []):
-            if obj_name in sheet.objects:
-                obj_config = sheet.objects[obj_name]
-                self._add_single_linked_object(
-                    resource_iri,
-                    obj_name,
-                    obj_config,
-                    row_data,
-                    row_num,
-                    sheet,
-                )
+        for obj in entity.objects:
+            self._add_single_linked_object(resource_iri, obj, row, row_num, position)
 
         return resource_iri
 
+    def _add_literals(
+        self,
+        subject: URIRef,
+        rules: List[LiteralRule],
+        row: Tuple[Any, ...],
+        row_num: int,
+        check_required: bool,
+    ) -> None:
+        """Add the literal-valued properties of one resource.
+
+        Args:
+            subject: Resource the properties belong to
+            rules: Compiled literal rules
+            row: Row values in the plan's column order
+            row_num: Row number for error reporting
+            check_required: Whether to report empty required columns
+                (row resource columns) or skip them silently (linked objects)
+        """
+        for rule in rules:
+            if rule.index < 0:
+                continue
+            value = row[rule.index]
+
+            if value is None or value == "":
+                # Skip empty required values
+                if check_required and rule.required:
+                    self.report.add_error(
+                        f"Required column '{rule.column}' is empty",
+                        row=row_num,
+                        severity=ErrorSeverity.ERROR,
+                    )
+                # Skip non-required empty values
+                continue
+
+            # Apply transforms not already applied to the whole column
+            if rule.transform is not None:
+                try:
+                    value = rule.transform(value)
+                except Exception as e:
+                    target = "column" if check_required else "linked object column"
+                    self.report.add_error(
+                        f"Transform '{rule.transform_name}' failed for {target} '{rule.column}': {e}",
+                        row=row_num,
+                        severity=ErrorSeverity.WARNING,
+                    )
+                    continue
+
+            literal = self._create_literal(value, rule, row_num)
+            if literal is not None:
+                self._add_triple(subject, rule.predicate, literal)
+
     def _add_row_resource(
         self,
-        sheet: SheetMapping,
-        row_data: Dict[str, Any],
+        plan: SheetPlan,
+        row: Tuple[Any, ...],
         row_num: int,
+        position: Optional[int] = None,
     ) -> Optional[URIRef]:
         """Add main row resource to graph.
 
         Args:
-            sheet: Sheet mapping configuration
-            row_data: Row data dictionary
+            plan: Compiled sheet plan
+            row: Row values in the plan's column order
             row_num: Row number for error reporting
+            position: Position of the row in the chunk
 
         Returns:
             URIRef of created resource or None if creation failed
         """
         # Generate IRI for main resource
         resource_iri = self._generate_iri(
-            sheet.row_resource.iri_template,
-            row_data,
+            plan.subject_template,
+            row,
             row_num,
-            f"row resource (sheet: {sheet.name})",
+            f"row resource (sheet: {plan.name})",
+            position,
         )
 
         if not resource_iri:
@@ -437,228 +805,104 @@ class RDFGraphBuilder:
 
         # Add rdf:type for all declared classes
         # RML spec allows multiple rr:class statements
-        class_type = sheet.row_resource.class_type
-        if isinstance(class_type, list):
-            # Multiple classes declared
-            for cls in class_type:
-                class_uri = self._resolve_class(cls)
-                self._add_triple(resource_iri, RDF.type, class_uri)
-        else:
-            # Single class declared
-            class_uri = self._resolve_class(class_type)
+        for class_uri in plan.classes:
             self._add_triple(resource_iri, RDF.type, class_uri)
 
         # Add column properties
-        for column_name, column_mapping in sheet.columns.items():
-            if column_name in row_data:
-                value = row_data[column_name]
-
-                # Skip empty required values
-                if column_mapping.required and (value is None or value == ""):
-                    self.report.add_error(
-                        f"Required column '{column_name}' is empty",
-                        row=row_num,
-                        severity=ErrorSeverity.ERROR,
-                    )
-                    continue
-
-                # Skip non-required empty values
-                if value is None or value == "":
-                    continue
-
-                # Apply custom transform if needed (fallback for complex transforms)
-                if column_mapping.transform and column_mapping.transform not in [
-                    "to_decimal", "to_integer", "to_date", "to_datetime",
-                    "lowercase", "uppercase", "trim"
-                ]:
-                    try:
-                        value = apply_transform(value, column_mapping.transform, row_data)
-                    except Exception as e:
-                        self.report.add_error(
-                            f"Transform '{column_mapping.transform}' failed for column '{column_name}': {e}",
-                            row=row_num,
-                            severity=ErrorSeverity.WARNING,
-                        )
-                        continue
-
-                # Create literal
-                literal = self._create_literal(
-                    value,
-                    datatype=column_mapping.datatype,
-                    language=column_mapping.language or self.config.defaults.language,
-                    row_num=row_num,
-                    column_name=column_name,
-                )
-
-                if literal is not None:
-                    property_uri = self._resolve_property(column_mapping.as_property)
-                    self._add_triple(resource_iri, property_uri, literal)
-        # Apply reasoning to main resource
-        self._apply_reasoning(resource_iri)
+        self._add_literals(resource_iri, plan.columns, row, row_num, check_required=True)
 
         return resource_iri
 
     def _add_linked_objects(
         self,
         main_resource: URIRef,
-        sheet: SheetMapping,
-        row_data: Dict[str, Any],
+        objects: List[ObjectPlan],
+        row: Tuple[Any, ...],
         row_num: int,
+        position: Optional[int] = None,
     ) -> None:
         """Add linked objects to graph.
 
         Args:
             main_resource: Main resource URI
-            sheet: Sheet mapping configuration
-            row_data: Row data dictionary
+            objects: Compiled linked objects emitted from the row
+            row: Row values in the plan's column order
             row_num: Row number for error reporting
+            position: Position of the row in the chunk
         """
-        for obj_name, obj_mapping in sheet.objects.items():
-            # Generate object IRI
-            object_iri = self._generate_iri(
-                obj_mapping.iri_template,
-                row_data,
-                row_num,
-                f"linked object (class: {obj_mapping.class_type})",
-            )
-
-            if not object_iri:
-                continue
-
-            # Add object class(es) as declared in mapping
-            class_uri = self._resolve_class(obj_mapping.class_type)
-            self._add_triple(object_iri, RDF.type, class_uri)
-
-            # Add object properties
-            for prop_mapping in obj_mapping.properties:
-                column_name = prop_mapping.column
-                if column_name in row_data:
-                    value = row_data[column_name]
-
-                    if value is None or value == "":
-                        continue
-
-                    # Apply transform if needed
-                    if prop_mapping.transform:
-                        try:
-                            value = apply_transform(value, prop_mapping.transform, row_data)
-                        except Exception as e:
-                            self.report.add_error(
-                                f"Transform '{prop_mapping.transform}' failed for linked object column '{column_name}': {e}",
-                                row=row_num,
-                                severity=ErrorSeverity.WARNING,
-                            )
-                            continue
-
-                    # Create literal
-                    literal = self._create_literal(
-                        value,
-                        datatype=prop_mapping.datatype,
-                        language=prop_mapping.language or self.config.defaults.language,
-                        row_num=row_num,
-                        column_name=column_name,
-                    )
-
-                    if literal is not None:
-                        property_uri = self._resolve_property(prop_mapping.as_property)
-                        self._add_triple(object_iri, property_uri, literal)
-
-            # Link main resource to object
-            if obj_mapping.predicate:
-                link_uri = self._resolve_property(obj_mapping.predicate)
-                self._add_triple(main_resource, link_uri, object_iri)
-            # Reason over object
-            self._apply_reasoning(object_iri)
+        for obj in objects:
+            self._add_single_linked_object(main_resource, obj, row, row_num, position)
 
     def _add_single_linked_object(
         self,
         main_resource: URIRef,
-        obj_name: str,
-        obj_mapping: Any,  # LinkedObject type
-        row_data: Dict[str, Any],
+        obj: ObjectPlan,
+        row: Tuple[Any, ...],
         row_num: int,
-        sheet: SheetMapping,
+        position: Optional[int] = None,
     ) -> Optional[URIRef]:
         """Add a single linked object to the graph.
 
-        Helper method extracted for reuse in merged sheet processing.
-
         Args:
             main_resource: Main resource URI
-            obj_name: Object name/key
-            obj_mapping: LinkedObject mapping configuration
-            row_data: Row data dictionary
+            obj: Compiled linked object
+            row: Row values in the plan's column order
             row_num: Row number for error reporting
-            sheet: Sheet mapping for error context
+            position: Position of the row in the chunk (of the child record in a child frame)
 
         Returns:
             URIRef of created object or None if creation failed
         """
         # Generate object IRI
         object_iri = self._generate_iri(
-            obj_mapping.iri_template,
-            row_data,
+            obj.iri_template,
+            row,
             row_num,
-            f"linked object (class: {obj_mapping.class_type})",
+            f"linked object (class: {obj.class_label})",
+            position,
         )
 
         if not object_iri:
             return None
 
-        # Add object class as declared in mapping
-        class_uri = self._resolve_class(obj_mapping.class_type)
-        self._add_triple(object_iri, RDF.type, class_uri)
-
-        # Add object properties
-        for prop_mapping in obj_mapping.properties:
-            column_name = prop_mapping.column
-            if column_name in row_data:
-                value = row_data[column_name]
-
-                if value is None or value == "":
-                    continue
+        cache = self._object_cache(obj)
+        if cache is not None and cache.seen(
+            hash((object_iri, repr([row[rule.index] for rule in obj.properties if rule.index >= 0])))
+        ):
+            # Same object and property values streamed before
+            self.report.object_cache_hits += 1
+        else:
+            if cache is not None:
+                self.report.object_cache_misses += 1
 
-                # Apply transform if needed
-                if prop_mapping.transform:
-                    try:
-                        value = apply_transform(value, prop_mapping.transform, row_data)
-                    except Exception as e:
-                        self.report.add_error(
-                            f"Transform '{prop_mapping.transform}' failed for linked object column '{column_name}': {e}",
-                            row=row_num,
-                            severity=ErrorSeverity.WARNING,
-                        )
-                        continue
-
-                # Create literal
-                literal = self._create_literal(
-                    value,
-                    datatype=prop_mapping.datatype,
-                    language=prop_mapping.language or self.config.defaults.language,
-                    row_num=row_num,
-                    column_name=column_name,
-                )
+            # Add object class(es) as declared in mapping
+            for class_uri in obj.classes:
+                self._add_triple(object_iri, RDF.type, class_uri)
 
-                if literal is not None:
-                    property_uri = self._resolve_property(prop_mapping.as_property)
-                    self._add_triple(object_iri, property_uri, literal)
+            # Add object properties
+            self._add_literals(object_iri, obj.properties, row, row_num, check_required=False)
 
         # Link main resource to object
-        if obj_mapping.predicate:
-            link_uri = self._resolve_property(obj_mapping.predicate)
-            self._add_triple(main_resource, link_uri, object_iri)
-
-        # Reason over object
-        self._apply_reasoning(object_iri)
+        if obj.predicate is not None:
+            self._add_triple(main_resource, obj.predicate, object_iri)
 
         return object_iri
 
     def get_graph(self) -> Optional[Graph]:
         """Get the RDF graph.
 
+        If rows were added since the previous call, triples inferred from the
+        ontology (if one was given) are materialized over the whole graph and
+        its cardinality violations are reported, replacing those of the
+        previous call.
+
         Returns:
             RDF Graph or None if in streaming mode
         """
+        self._flush_store_batch()
+        if self._reasoning_pending:
+            self._reasoning_pending = False
+            self._apply_reasoning()
         return self.graph
 
     def get_triple_count(self) -> int:
@@ -669,87 +913,71 @@ class RDFGraphBuilder:
         """
         if self.streaming_writer:
             return self.streaming_writer.get_triple_count()
-        elif self.graph:
-            return len(self.graph)
-        else:
-            return 0
+        graph = self.get_graph()
+        return len(graph) if graph is not None else 0
 
     def get_duplicate_iris(self) -> Dict[str, List[int]]:
-        """Get IRIs that were generated for multiple rows.
+        """Get subject IRIs that were generated for multiple rows.
+
+        Only sheets with ``detect_duplicates`` enabled are tracked, and each
+        detector keeps a sample of the duplicated IRIs and their rows.
 
         Returns:
-            Dictionary mapping duplicate IRIs to row numbers
+            Dictionary mapping duplicate IRIs to sampled row numbers
         """
-        return {iri: rows for iri, rows in self.iri_registry.items() if len(rows) > 1}
+        duplicates: Dict[str, List[int]] = {}
+        for detector in self._duplicate_detectors.values():
+            duplicates.update(detector.get_duplicate_iris())
+        return duplicates
 
-    # Reasoning expansions (optional lightweight)
-    def _apply_reasoning(self, resource: URIRef):
-        if not self.enable_reasoning:
-            return
-        if not self.ontology_analyzer or not self.graph:
+    def get_duplicate_count(self) -> int:
+        """Get the number of distinct subject IRIs generated for multiple rows."""
+        return sum(detector.duplicate_count for detector in self._duplicate_detectors.values())
+
+    def _apply_reasoning(self) -> None:
+        """Materialize ontology inferences and check cardinalities over the graph.
+
+        Inferences are only counted when they are added, while violations
+        hold for the graph as it is now: the counts of the previous pass are
+        taken back so that a violation is not reported once per pass.
+        """
+        if not self.enable_reasoning or self._reasoning_rules is None or self.graph is None:
             return
-        # Subclass inference: if resource has type T, add superclasses
-        types = {o for s,p,o in self.graph.triples((resource, RDF.type, None))}
-        for t in list(types):
-            for sup in self.ontology_analyzer.get_superclasses(t):
-                if (resource, RDF.type, sup) not in self.graph:
-                    self.graph.add((resource, RDF.type, sup))
-                    self.report.inferred_types += 1
-        # Inverse / symmetric / transitive property expansions
-        for p in list(self._prop_index.values()):
-            if p.inverse_of:
-                # For each triple resource p o, assert o inverse_of resource
-                for _,_,o in self.graph.triples((resource, p.uri, None)):
-                    if (o, p.inverse_of, resource) not in self.graph:
-                        self.graph.add((o, p.inverse_of, resource))
-                        self.report.inverse_links_added += 1
-            if p.is_symmetric:
-                for _,_,o in self.graph.triples((resource, p.uri, None)):
-                    if (o, p.uri, resource) not in self.graph:
-                        self.graph.add((o, p.uri, resource))
-                        self.report.symmetric_links_added += 1
-            if p.is_transitive and self.transitive_depth > 1:
-                frontier = {resource}
-                visited = set()
-                depth = 0
-                while depth < self.transitive_depth:
-                    new_frontier = set()
-                    for node in frontier:
-                        for _,_,nxt in self.graph.triples((node, p.uri, None)):
-                            if (resource, p.uri, nxt) not in self.graph:
-                                self.graph.add((resource, p.uri, nxt))
-                                self.report.transitive_links_added += 1
-                            if nxt not in visited:
-                                new_frontier.add(nxt)
-                        visited.add(node)
-                    frontier = new_frontier
-                    depth += 1
-        # Cardinality checks (basic): count occurrences per functional/inverse functional property
-        for p in list(self._prop_index.values()):
-            if p.is_functional:
-                objs = {o for _,_,o in self.graph.triples((resource, p.uri, None))}
-                if len(objs) > 1:
-                    self.report.add_cardinality_violation(f"Functional property {p.uri} has {len(objs)} values for {resource}")
-        # Cardinality restrictions
-        for prop_uri, restrictions in getattr(self.ontology_analyzer, 'property_restrictions', {}).items():
-            for r in restrictions:
-                if r.get('class') in [str(t) for t in types]:
-                    count = len({o for _,_,o in self.graph.triples((resource, URIRef(prop_uri), None))})
-                    if r.get('cardinality') is not None and count != r['cardinality']:
-                        self.report.add_cardinality_restriction_violation(f"Exact cardinality violation {prop_uri} expected {r['cardinality']} got {count}", 'exact')
-                    if r.get('minCardinality') is not None and count < r['minCardinality']:
-                        self.report.add_cardinality_restriction_violation(f"Min cardinality violation {prop_uri} expected >= {r['minCardinality']} got {count}", 'min')
-                    if r.get('maxCardinality') is not None and count > r['maxCardinality']:
-                        self.report.add_cardinality_restriction_violation(f"Max cardinality violation {prop_uri} expected <= {r['maxCardinality']} got {count}", 'max')
-
-
-def serialize_graph(graph: Graph, format: str, output_path: Path) -> None:
+        check = ProcessingReport()
+        materialize(self.graph, self._reasoning_rules, check, self.transitive_depth)
+        for name in INFERENCE_COUNTERS:
+            setattr(self.report, name, getattr(self.report, name) + getattr(check, name))
+        for name in VIOLATION_COUNTERS:
+            change = getattr(check, name) - getattr(self._reasoning_check, name)
+            setattr(self.report, name, getattr(self.report, name) + change)
+        for message in check.structural_samples:
+            if message not in self.report.structural_samples and len(self.report.structural_samples) < 10:
+                self.report.structural_samples.append(message)
+        self._reasoning_check = check
+
+
+def serialize_graph(
+    graph: Graph,
+    format: str,
+    output_path: Path,
+    namespaces: Optional[Dict[str, str]] = None,
+    compression: Optional[str] = "infer",
+    max_triples_per_file: Optional[int] = None,
+    max_bytes_per_file: Optional[int] = None,
+) -> None:
     """Serialize RDF graph to file.
 
+    All formats but N3 are written one subject at a time by the streaming
+    writers instead of rdflib's whole-graph serializers.
+
     Args:
         graph: RDF graph to serialize
-        format: Output format (ttl, xml, jsonld, nt)
-        output_path: Output file path
+        format: Output format (ttl, trig, xml, jsonld, ndjsonld, nt, nq, parquet-triples)
+        output_path: Output file path, or "-" for standard output
+        namespaces: Prefixes used by the streamed formats (default: the graph's bindings)
+        compression: "gzip", "zstd", None, or "infer" from the file suffix
+        max_triples_per_file: Rotate to numbered shard files of about this many triples
+        max_bytes_per_file: Rotate to numbered shard files of about this many bytes
     """
     format_map = {
         "ttl": "turtle",
@@ -759,11 +987,27 @@ def serialize_graph(graph: Graph, format: str, output_path: Path) -> None:
         "rdfxml": "xml",
         "jsonld": "json-ld",
         "json-ld": "json-ld",
+        "ndjsonld": "ndjson-ld",
+        "ndjson-ld": "ndjson-ld",
         "nt": "nt",
         "ntriples": "nt",
+        "nq": "nq",
+        "nquads": "nq",
+        "trig": "trig",
+        "parquet-triples": "parquet-triples",
+        "parquet": "parquet-triples",
         "n3": "n3",
     }
 
     rdf_format = format_map.get(format.lower(), "turtle")
+    if rdf_format != "n3":
+        if namespaces is None:
+            namespaces = {prefix: str(ns) for prefix, ns in graph.namespaces()}
+        writer = create_stream_writer(
+            rdf_format, output_path, namespaces, compression,
+            max_triples_per_file=max_triples_per_file, max_bytes_per_file=max_bytes_per_file,
+        )
+        write_graph(graph, writer)
+        return
     graph.serialize(destination=str(output_path), format=rdf_format)
 
@@ -0,0 +1,510 @@
+"""Compiled mapping plans: sheet mappings resolved once before the row loop.
+
+A ``SheetPlan`` holds everything the builders need per cell - predicate,
+class and datatype terms as ``URIRef``, effective language tags, transform
+callables and column positions - so emitting a triple involves no CURIE
+parsing, no ``URIRef`` construction and no pydantic attribute access.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import polars as pl
+from rdflib import URIRef
+from rdflib.namespace import XSD
+
+from ..iri.generator import IRITemplate, curie_to_iri
+from ..models.mapping import MappingConfig, SheetMapping
+from ..parsers.data_source import ScanPlan
+from ..transforms.functions import get_transform
+
+
+# Column of a child frame holding the position of the parent row in its chunk
+PARENT_ROW = "__parent_row__"
+
+# Transforms applied to whole columns with Polars before the row loop
+VECTORIZED_TRANSFORMS: Dict[str, Callable[[str], pl.Expr]] = {
+    "to_decimal": lambda c: pl.col(c).cast(pl.Float64),
+    "to_integer": lambda c: pl.col(c).cast(pl.Int64),
+    "to_date": lambda c: pl.col(c).str.strptime(pl.Date, "%Y-%m-%d", strict=False),
+    "to_datetime": lambda c: pl.col(c).str.strptime(pl.Datetime, "%Y-%m-%d %H:%M:%S", strict=False),
+    "lowercase": lambda c: pl.col(c).str.to_lowercase(),
+    "uppercase": lambda c: pl.col(c).str.to_uppercase(),
+    "trim": lambda c: pl.col(c).str.strip_chars(),
+}
+
+
+# Types columns are parsed into, by datatype and by vectorized transform.
+# xsd:decimal and xsd:integer, which are unbounded, stay text so that no
+# digits are lost to a float or an overflowing Int64.
+XSD_DTYPES: Dict[URIRef, pl.DataType] = {
+    XSD.string: pl.String(),
+    XSD.int: pl.Int64(),
+    XSD.long: pl.Int64(),
+    XSD.short: pl.Int64(),
+    XSD.float: pl.Float64(),
+    XSD.double: pl.Float64(),
+    XSD.boolean: pl.Boolean(),
+    XSD.date: pl.Date(),
+}
+TRANSFORM_DTYPES: Dict[str, pl.DataType] = {
+    "to_decimal": pl.Float64(),
+    "to_integer": pl.Int64(),
+    "to_date": pl.Date(),
+    "to_datetime": pl.Datetime(),
+}
+
+
+def resolve_term(ref: str, namespaces: Dict[str, str]) -> URIRef:
+    """Resolve a CURIE or full IRI to a URIRef.
+
+    Args:
+        ref: Term as CURIE (ex:Loan) or full IRI
+        namespaces: Namespace prefix to IRI mappings
+
+    Returns:
+        URIRef for the term
+    """
+    if ":" in ref and not ref.startswith("http"):
+        return URIRef(curie_to_iri(ref, namespaces))
+    return URIRef(ref)
+
+
+def compile_filter(condition: str) -> pl.Expr:
+    """Compile a sheet's ``filter_condition`` into a Polars expression.
+
+    Conditions are SQL boolean expressions over the source columns, such as
+    ``Status = 'Active' AND Amount > 1000``; quote column names that are
+    not plain identifiers (``"Loan Amount" > 1000``).
+
+    Args:
+        condition: SQL boolean expression
+
+    Returns:
+        Filter expression
+
+    Raises:
+        ValueError: If the condition cannot be parsed
+    """
+    try:
+        return pl.sql_expr(condition)
+    except Exception as e:
+        raise ValueError(f"Invalid filter_condition {condition!r}: {e}") from e
+
+
+def _unknown_transform(name: str) -> Callable[[Any], Any]:
+    def transform(value: Any) -> Any:
+        raise ValueError(f"Unknown transform: {name}")
+    return transform
+
+
+@dataclass
+class LiteralRule:
+    """A column emitted as a literal-valued property."""
+
+    column: str
+    predicate: URIRef
+    datatype: Optional[URIRef] = None
+    language: Optional[str] = None
+    transform_name: Optional[str] = None
+    transform: Optional[Callable[[Any], Any]] = None
+    required: bool = False
+    index: int = -1  # Position of the column in the bound DataFrame, -1 if absent
+
+
+@dataclass
+class ObjectPlan:
+    """A linked object resource generated from each row."""
+
+    name: str
+    iri_template: str
+    class_label: str
+    classes: List[URIRef]
+    predicate: Optional[URIRef]
+    properties: List[LiteralRule] = field(default_factory=list)
+
+    def source_columns(self) -> List[str]:
+        """Source columns the object reads: IRI template variables and mapped columns."""
+        columns = sorted(IRITemplate(self.iri_template).variables - {"base_iri"})
+        return list(dict.fromkeys(columns + [rule.column for rule in self.properties]))
+
+
+@dataclass
+class EntityPlan:
+    """One entity type of a merged (multi-TriplesMap) sheet."""
+
+    iri_template: str
+    class_label: str
+    classes: List[URIRef]
+    columns: List[LiteralRule] = field(default_factory=list)
+    objects: List[ObjectPlan] = field(default_factory=list)
+
+
+@dataclass
+class SheetPlan:
+    """Everything needed to emit triples for one sheet mapping."""
+
+    name: str
+    subject_template: str
+    classes: List[URIRef]
+    columns: List[LiteralRule] = field(default_factory=list)
+    objects: List[ObjectPlan] = field(default_factory=list)
+    entities: Optional[List[EntityPlan]] = None
+    transform_exprs: Dict[str, pl.Expr] = field(default_factory=dict)
+    detect_duplicates: bool = False
+    graph: Optional[URIRef] = None
+    filter: Optional[pl.Expr] = None
+    dtypes: Dict[str, pl.DataType] = field(default_factory=dict)
+    column_names: Sequence[str] = ()
+
+    @property
+    def templates(self) -> List[str]:
+        """All IRI templates used by the sheet, subject template first."""
+        templates = [self.subject_template]
+        templates.extend(obj.iri_template for obj in self.objects)
+        if self.entities:
+            templates.extend(entity.iri_template for entity in self.entities)
+        return list(dict.fromkeys(templates))
+
+    def template_columns(self) -> List[str]:
+        """Source columns used as IRI template variables."""
+        columns: List[str] = []
+        for template in self.templates:
+            columns.extend(sorted(IRITemplate(template).variables - {"base_iri"}))
+        return list(dict.fromkeys(columns))
+
+    def source_columns(self) -> List[str]:
+        """Source columns the sheet reads: mapped columns and IRI template variables."""
+        columns = [rule.column for rule in self.literal_rules()]
+        return list(dict.fromkeys(columns + self.template_columns()))
+
+    def nested_columns(self) -> List[str]:
+        """Source columns only linked objects read.
+
+        Nested sources may keep these as child records, one per array
+        element, instead of repeating the row per element. Columns of the
+        row resource and of the filter are read per row, so they never are;
+        merged sheets have none.
+        """
+        if self.entities:
+            return []
+        row_columns = {rule.column for rule in self.columns} | IRITemplate(self.subject_template).variables
+        if self.filter is not None:
+            row_columns.update(self.filter.meta.root_names())
+        columns = [column for obj in self.objects for column in obj.source_columns()]
+        return [column for column in dict.fromkeys(columns) if column not in row_columns]
+
+    def literal_dtypes(self) -> Dict[str, pl.DataType]:
+        """Types to parse literal columns into.
+
+        A column gets the type of its datatype, or of its vectorized transform.
+        Columns with a Python transform, with rules that disagree on the type
+        or used in IRI templates (whose rendering depends on the source text)
+        keep the type the parser infers.
+        """
+        types: Dict[str, set] = {}
+        for rule in self.literal_rules():
+            if rule.transform is not None:
+                dtype = None
+            elif rule.transform_name:
+                dtype = TRANSFORM_DTYPES.get(rule.transform_name)
+            elif rule.datatype is not None:
+                dtype = XSD_DTYPES.get(rule.datatype)
+            else:
+                dtype = None
+            types.setdefault(rule.column, set()).add(dtype)
+        skip = set(self.template_columns())
+        return {
+            column: next(iter(dtypes))
+            for column, dtypes in types.items()
+            if len(dtypes) == 1 and None not in dtypes and column not in skip
+        }
+
+    def text_columns(self) -> List[str]:
+        """Typed columns whose text is kept when the source reads them as text.
+
+        xsd:date values may carry a timezone, which a Date would drop; dates
+        the source reads as datetimes are still converted.
+        """
+        columns = [
+            rule.column for rule in self.literal_rules()
+            if rule.datatype == XSD.date and not rule.transform_name and rule.column in self.dtypes
+        ]
+        return list(dict.fromkeys(columns))
+
+    def scan_plan(self, limit: Optional[int] = None) -> ScanPlan:
+        """Columns, filter and limit to push into the scan of the sheet's source.
+
+        Args:
+            limit: Maximum number of rows to read (after filtering)
+
+        Returns:
+            Scan plan for ``DataSourceParser.parse_plan``
+        """
+        return ScanPlan(
+            columns=self.source_columns(), predicate=self.filter, limit=limit, dtypes=self.dtypes,
+            nested=self.nested_columns(), keep_text=self.text_columns(),
+        )
+
+    def literal_rules(self) -> List[LiteralRule]:
+        """All literal rules of the sheet, including linked object properties."""
+        rules = list(self.columns)
+        for obj in self.objects:
+            rules.extend(obj.properties)
+        for entity in self.entities or []:
+            rules.extend(entity.columns)
+            for obj in entity.objects:
+                rules.extend(obj.properties)
+        return rules
+
+    def bind(self, column_names: Sequence[str]) -> None:
+        """Record the column positions of a DataFrame's schema in every rule.
+
+        Args:
+            column_names: Column names of the DataFrame about to be processed
+        """
+        column_names = tuple(column_names)
+        if column_names == self.column_names:
+            return
+        positions = {name: i for i, name in enumerate(column_names)}
+        for rule in self.literal_rules():
+            rule.index = positions.get(rule.column, -1)
+        self.column_names = column_names
+
+    def bind_objects(self, objects: List[ObjectPlan], column_names: Sequence[str]) -> None:
+        """Record the column positions of a child frame's schema in the rules of its objects.
+
+        Args:
+            objects: Linked objects emitted from the child frame
+            column_names: Column names of the child frame
+        """
+        positions = {name: i for i, name in enumerate(column_names)}
+        for obj in objects:
+            for rule in obj.properties:
+                rule.index = positions.get(rule.column, -1)
+        self.column_names = ()  # The next bind() rebinds every rule
+
+
+@dataclass
+class ChildFrame:
+    """Linked objects emitted from the elements of an array, one row per element.
+
+    ``frame`` holds the element's columns (``element_columns``), the parent
+    columns the objects read and, as ``PARENT_ROW``, the position of the
+    parent row in its chunk. Parent columns are copied from the chunk as
+    they are, transforms included.
+    """
+
+    objects: List[ObjectPlan]
+    frame: pl.DataFrame
+    element_columns: List[str] = field(default_factory=list)
+
+
+def split_child_frames(
+    df: pl.DataFrame, plan: SheetPlan
+) -> Tuple[pl.DataFrame, List[ObjectPlan], List[ChildFrame]]:
+    """Take the child records of a chunk out into child frames.
+
+    A list column of structs (see ``ScanPlan.nested``) becomes the child
+    frame of the linked objects reading its fields, so that the row
+    resource is emitted once per parent row and each object once per
+    element.
+
+    Args:
+        df: Chunk being processed
+        plan: Compiled sheet plan
+
+    Returns:
+        Chunk without its child record columns, the linked objects emitted
+        from its rows, and the child frames
+    """
+    if plan.entities:
+        return df, plan.objects, []
+    children: List[ChildFrame] = []
+    claimed: List[ObjectPlan] = []
+    arrays: List[str] = []
+    for name, dtype in df.schema.items():
+        if not (isinstance(dtype, pl.List) and isinstance(dtype.inner, pl.Struct)):
+            continue
+        fields = {item.name for item in dtype.inner.fields}
+        objects = [
+            obj for obj in plan.objects
+            if not any(obj is other for other in claimed) and fields & set(obj.source_columns())
+        ]
+        if not objects:
+            continue
+        parent_columns = dict.fromkeys(
+            column for obj in objects for column in obj.source_columns()
+            if column in df.columns and column not in fields
+        )
+        frame = (
+            df.select([pl.int_range(pl.len(), dtype=pl.UInt32).alias(PARENT_ROW), *parent_columns, name])
+            .explode(name)
+            .drop_nulls(name)
+            .unnest(name)
+        )
+        children.append(ChildFrame(objects, frame, sorted(fields)))
+        claimed.extend(objects)
+        arrays.append(name)
+    row_objects = [obj for obj in plan.objects if not any(obj is other for other in claimed)]
+    return df.drop(arrays), row_objects, children
+
+
+def _resolve_classes(class_type: Union[str, List[str]], namespaces: Dict[str, str]) -> List[URIRef]:
+    if isinstance(class_type, list):
+        return [resolve_term(cls, namespaces) for cls in class_type]
+    return [resolve_term(class_type, namespaces)]
+
+
+def _literal_rule(column: str, mapping: Any, namespaces: Dict[str, str],
+                  default_language: Optional[str], vectorized: bool) -> LiteralRule:
+    transform_name = mapping.transform
+    transform = None
+    if transform_name and not (vectorized and transform_name in VECTORIZED_TRANSFORMS):
+        transform = get_transform(transform_name) or _unknown_transform(transform_name)
+
+    return LiteralRule(
+        column=column,
+        predicate=resolve_term(mapping.as_property, namespaces),
+        datatype=resolve_term(mapping.datatype, namespaces) if mapping.datatype else None,
+        language=mapping.language or default_language,
+        transform_name=transform_name,
+        transform=transform,
+        required=mapping.required,
+    )
+
+
+def _object_plan(name: str, obj: Any, namespaces: Dict[str, str],
+                 default_language: Optional[str]) -> ObjectPlan:
+    return ObjectPlan(
+        name=name,
+        iri_template=obj.iri_template,
+        class_label=str(obj.class_type),
+        classes=_resolve_classes(obj.class_type, namespaces),
+        predicate=resolve_term(obj.predicate, namespaces) if obj.predicate else None,
+        properties=[
+            # Linked object columns are not transformed in Polars beforehand
+            _literal_rule(prop.column, prop, namespaces, default_language, vectorized=False)
+            for prop in obj.properties
+        ],
+    )
+
+
+def sheet_graph(sheet: SheetMapping, config: MappingConfig) -> Optional[URIRef]:
+    """Resolve the named graph of a sheet's triples.
+
+    The template comes from the sheet or, failing that, the defaults, and
+    may use ``{base_iri}``, ``{sheet}`` (sheet name) and ``{source}`` (source
+    file name without suffix), or be a CURIE.
+
+    Args:
+        sheet: Sheet mapping configuration
+        config: Mapping configuration (namespaces and defaults)
+
+    Returns:
+        Graph IRI, or None for the default graph
+
+    Raises:
+        ValueError: If the template uses another variable
+    """
+    template = getattr(sheet, 'graph', None) or getattr(config.defaults, 'graph', None)
+    if not template:
+        return None
+    base_iri = getattr(config.defaults, 'base_iri', "")
+    iri = IRITemplate(template, base_iri).render({"sheet": sheet.name, "source": Path(sheet.source).stem})
+    return resolve_term(iri, config.namespaces)
+
+
+def compile_sheet(sheet: SheetMapping, config: MappingConfig) -> SheetPlan:
+    """Compile a sheet mapping into a plan for the builders.
+
+    Args:
+        sheet: Sheet mapping configuration
+        config: Mapping configuration (namespaces and defaults)
+
+    Returns:
+        Compiled sheet plan
+
+    Raises:
+        ValueError: If a CURIE uses an undeclared namespace prefix
+    """
+    namespaces = config.namespaces
+    default_language = getattr(config.defaults, 'language', None)
+
+    columns = [
+        _literal_rule(name, mapping, namespaces, default_language, vectorized=True)
+        for name, mapping in sheet.columns.items()
+    ]
+    objects = {
+        name: _object_plan(name, obj, namespaces, default_language)
+        for name, obj in sheet.objects.items()
+    }
+
+    transform_exprs = {
+        name: VECTORIZED_TRANSFORMS[mapping.transform](name).alias(name)
+        for name, mapping in sheet.columns.items()
+        if mapping.transform in VECTORIZED_TRANSFORMS
+    }
+
+    condition = getattr(sheet, 'filter_condition', None)
+
+    entities = None
+    entity_types = getattr(sheet, '_entity_types', None)
+    if entity_types:
+        rules_by_column = {rule.column: rule for rule in columns}
+        entities = [
+            EntityPlan(
+                iri_template=info['iri_template'],
+                class_label=str(info['class']),
+                classes=_resolve_classes(info['class'], namespaces),
+                columns=[rules_by_column[c] for c in info.get('columns', []) if c in rules_by_column],
+                objects=[objects[o] for o in info.get('objects', []) if o in objects],
+            )
+            for info in entity_types
+        ]
+
+    plan = SheetPlan(
+        name=sheet.name,
+        subject_template=sheet.row_resource.iri_template,
+        classes=_resolve_classes(sheet.row_resource.class_type, namespaces),
+        columns=columns,
+        objects=list(objects.values()),
+        entities=entities,
+        transform_exprs=transform_exprs,
+        detect_duplicates=getattr(sheet, 'detect_duplicates', False),
+        graph=sheet_graph(sheet, config),
+        filter=compile_filter(condition) if condition else None,
+    )
+    if getattr(config.options, 'typed_parsing', False):
+        plan.dtypes = plan.literal_dtypes()
+    return plan
+
+
+class CompiledMapping:
+    """Sheet plans for a mapping configuration, compiled on first use."""
+
+    def __init__(self, config: MappingConfig):
+        """Initialize compiled mapping.
+
+        Args:
+            config: Mapping configuration
+        """
+        self.config = config
+        # Keyed by id(); the sheet is kept alongside so the id stays valid
+        self._plans: Dict[int, Tuple[SheetMapping, SheetPlan]] = {}
+
+    def plan_for(self, sheet: SheetMapping) -> SheetPlan:
+        """Get the compiled plan for a sheet mapping.
+
+        Args:
+            sheet: Sheet mapping configuration
+
+        Returns:
+            Compiled sheet plan
+        """
+        entry = self._plans.get(id(sheet))
+        if entry is None:
+            entry = (sheet, compile_sheet(sheet, self.config))
+            self._plans[id(sheet)] = entry
+        return entry[1]
@@ -0,0 +1,437 @@
+"""JSON-LD and RDF/XML streaming writers for large outputs.
+
+Both formats describe one subject per node, so ``NodeStreamWriter`` collects
+the triples of the current subject and writes them as one node when the
+subject changes. Only one node is held in memory at a time. The writers have
+the interface of ``NTriplesStreamWriter`` and accept the same inputs as
+``TurtleStreamWriter``: rdflib terms from the row engine, N-Triples blocks
+from the columnar engine (grouped by subject per block) and sorted lines
+from ``SortedRunWriter``.
+
+- ``JSONLDStreamWriter`` writes a document with a ``@context`` built from the
+  mapping namespaces and a top-level ``@graph`` array, or NDJSON-LD: one
+  node object per line, each with the context entries it uses.
+- ``RDFXMLStreamWriter`` writes one ``rdf:Description`` per subject.
+
+``create_stream_writer`` picks the writer of an output format, optionally
+rotating over shard files, and ``write_graph`` streams an in-memory graph or
+dataset through any of them.
+"""
+
+import json
+import re
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Tuple, Type, Union, cast
+from xml.sax.saxutils import escape, quoteattr
+
+from rdflib import BNode, Dataset, Graph, Literal, URIRef
+from rdflib.graph import DATASET_DEFAULT_GRAPH_ID
+from rdflib.term import Identifier
+from rdflib.namespace import RDF
+
+from .nt_streaming import (
+    QUAD_FORMATS, NQuadsStreamWriter, NTriplesStreamWriter, parse_nt_object, sort_lines_by_subject,
+)
+from .parquet_triples import PARQUET_FORMATS, ParquetTripleWriter
+from .rotating import RotatingStreamWriter
+from .sinks import DEFAULT_BUFFER_SIZE, open_output
+from .turtle_streaming import PrefixTrie, TriGStreamWriter, TurtleStreamWriter
+
+# (kind, value, datatype, language), see parse_nt_object
+Term = Tuple[str, str, Optional[str], Optional[str]]
+
+_RDF_NS = str(RDF)
+_RDF_TYPE = str(RDF.type)
+
+# ASCII subset of XML NCName, used for element names of predicates
+_NCNAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_.\-]*$")
+_NCNAME_TAIL = re.compile(r"[A-Za-z_][A-Za-z0-9_.\-]*$")
+
+
+def _term(obj: Union[URIRef, BNode, Literal]) -> Term:
+    """Convert an rdflib term to the tuple form of ``parse_nt_object``."""
+    if isinstance(obj, Literal):
+        return "literal", str(obj), str(obj.datatype) if obj.datatype else None, obj.language
+    if isinstance(obj, BNode):
+        return "bnode", str(obj), None, None
+    return "iri", str(obj), None, None
+
+
+class NodeStreamWriter:
+    """Base class of writers that write one node per subject."""
+
+    def __init__(
+        self,
+        output_path: Path,
+        namespaces: Optional[Dict[str, str]] = None,
+        encoding: str = 'utf-8',
+        compression: Optional[str] = "infer",
+    ):
+        """Initialize writer.
+
+        Args:
+            output_path: Path to output file, or "-" for standard output
+            namespaces: Mapping of prefix to namespace IRI
+            encoding: File encoding (default: utf-8)
+            compression: "gzip", "zstd", None, or "infer" from the file suffix
+        """
+        self.output_path = output_path
+        self.compression = compression
+        self.namespaces = {prefix: str(ns) for prefix, ns in (namespaces or {}).items()}
+        self.encoding = encoding
+        self.file_handle: Optional[IO[str]] = None
+        self.triple_count = 0
+        self.trie = PrefixTrie(self.namespaces)
+        self._subject: Optional[str] = None  # IRI, or "_:label" for a blank node
+        self._properties: Dict[str, List[Term]] = {}
+
+    def __enter__(self) -> "NodeStreamWriter":
+        """Enter context manager."""
+        self.file_handle = open_output(self.output_path, "w", self.compression, encoding=self.encoding)
+        self._begin()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager."""
+        if self.file_handle:
+            try:
+                self._flush()
+                self._end()
+            finally:
+                self.file_handle.close()
+                self.file_handle = None
+
+    def _add(self, subject: str, predicate: str, obj: Term) -> None:
+        if subject != self._subject:
+            self._flush()
+            self._subject = subject
+        self._properties.setdefault(predicate, []).append(obj)
+        self.triple_count += 1
+
+    def _flush(self) -> None:
+        if self._subject is not None:
+            self._write_node(self._subject, self._properties)
+        self._subject = None
+        self._properties = {}
+
+    def write_triple(self, subject: URIRef, predicate: URIRef, obj: Union[URIRef, Literal]) -> None:
+        """Write a single triple.
+
+        Args:
+            subject: Subject URI
+            predicate: Predicate URI
+            obj: Object (URI or Literal)
+        """
+        if not self.file_handle:
+            raise RuntimeError("Writer not opened (use context manager)")
+        self._add(f"_:{subject}" if isinstance(subject, BNode) else str(subject), str(predicate), _term(obj))
+
+    def write_sorted_lines(self, lines: Iterable[str]) -> None:
+        """Write N-Triples lines that are already in subject order.
+
+        Args:
+            lines: N-Triples lines, with or without their newline
+        """
+        if not self.file_handle:
+            raise RuntimeError("Writer not opened (use context manager)")
+        for line in lines:
+            s, p, rest = line.split(" ", 2)
+            self._add(s[1:-1] if s.startswith("<") else s, p[1:-1], parse_nt_object(rest.rstrip("\n")[:-2]))
+
+    def write_lines(self, lines: Union[str, bytes], count: Optional[int] = None) -> None:
+        """Write a block of pre-formatted N-Triples lines, grouped by subject.
+
+        Args:
+            lines: Complete N-Triples lines, each terminated by a newline, as text or bytes
+            count: Number of triples in the block
+        """
+        self.write_sorted_lines(sort_lines_by_subject(lines))
+
+    def write_resource_triples(self, resource_iri: URIRef, triples: Dict[URIRef, Any]) -> None:
+        """Write all triples for a resource.
+
+        Args:
+            resource_iri: Subject IRI
+            triples: Dictionary of predicate -> object mappings
+        """
+        for predicate, obj in triples.items():
+            for value in (obj if isinstance(obj, list) else [obj]):
+                self.write_triple(resource_iri, predicate, value)
+
+    def get_triple_count(self) -> int:
+        """Get number of triples written.
+
+        Returns:
+            Number of triples written
+        """
+        return self.triple_count
+
+    def _write(self, text: str) -> None:
+        if self.file_handle is None:
+            raise RuntimeError("Writer not opened (use context manager)")
+        self.file_handle.write(text)
+
+    def _begin(self) -> None:
+        """Write the document header."""
+
+    def _end(self) -> None:
+        """Write the document footer."""
+
+    def _write_node(self, subject: str, properties: Dict[str, List[Term]]) -> None:
+        """Write the node of one subject."""
+        raise NotImplementedError
+
+
+class JSONLDStreamWriter(NodeStreamWriter):
+    """JSON-LD writer that streams node objects into a ``@graph`` array or NDJSON-LD lines."""
+
+    def __init__(
+        self,
+        output_path: Path,
+        namespaces: Optional[Dict[str, str]] = None,
+        ndjson: bool = False,
+        encoding: str = 'utf-8',
+        compression: Optional[str] = "infer",
+    ):
+        """Initialize writer.
+
+        Args:
+            output_path: Path to output file, or "-" for standard output
+            namespaces: Mapping of prefix to namespace IRI used for the @context
+            ndjson: Write one node object per line instead of one document
+            encoding: File encoding (default: utf-8)
+            compression: "gzip", "zstd", None, or "infer" from the file suffix
+        """
+        super().__init__(output_path, namespaces, encoding, compression)
+        self.ndjson = ndjson
+        # Prefixes that cannot be used in JSON-LD compact IRIs are left out
+        self.context = {
+            prefix: ns if ns[-1:] in ":/?#[]@" else {"@id": ns, "@prefix": True}
+            for prefix, ns in self.namespaces.items() if prefix and prefix != "_"
+        }
+        self.trie = PrefixTrie({prefix: self.namespaces[prefix] for prefix in self.context})
+        self._used: Set[str] = set()
+        self._first = True
+
+    def _compact(self, iri: str) -> str:
+        found = self.trie.match(iri)
+        if found is not None and not iri.startswith("//", found[1]):
+            self._used.add(found[0])
+            return f"{found[0]}:{iri[found[1]:]}"
+        return iri
+
+    def _value(self, term: Term) -> Any:
+        kind, value, datatype, language = term
+        if kind == "iri":
+            return {"@id": self._compact(value)}
+        if kind == "bnode":
+            return {"@id": f"_:{value}"}
+        if language:
+            return {"@value": value, "@language": language}
+        if datatype:
+            return {"@value": value, "@type": self._compact(datatype)}
+        return value
+
+    def _begin(self) -> None:
+        if not self.ndjson:
+            self._write(f'{{"@context": {json.dumps(self.context)},\n "@graph": [\n')
+
+    def _end(self) -> None:
+        if not self.ndjson:
+            self._write("\n]}\n")
+
+    def _write_node(self, subject: str, properties: Dict[str, List[Term]]) -> None:
+        self._used = set()
+        node: Dict[str, Any] = {"@id": subject if subject.startswith("_:") else self._compact(subject)}
+        for predicate, objects in properties.items():
+            if predicate == _RDF_TYPE and all(obj[0] == "iri" for obj in objects):
+                node["@type"] = [self._compact(obj[1]) for obj in objects]
+            else:
+                node[self._compact(predicate)] = [self._value(obj) for obj in objects]
+
+        if self.ndjson:
+            if self._used:
+                node = {"@context": {prefix: self.context[prefix] for prefix in sorted(self._used)}, **node}
+            self._write(json.dumps(node, ensure_ascii=False) + "\n")
+        else:
+            self._write(("" if self._first else ",\n") + json.dumps(node, ensure_ascii=False))
+        self._first = False
+
+
+class RDFXMLStreamWriter(NodeStreamWriter):
+    """RDF/XML writer that streams one ``rdf:Description`` per subject."""
+
+    def __init__(
+        self,
+        output_path: Path,
+        namespaces: Optional[Dict[str, str]] = None,
+        encoding: str = 'utf-8',
+        compression: Optional[str] = "infer",
+    ):
+        """Initialize writer.
+
+        Args:
+            output_path: Path to output file, or "-" for standard output
+            namespaces: Mapping of prefix to namespace IRI declared on rdf:RDF
+            encoding: File encoding (default: utf-8)
+            compression: "gzip", "zstd", None, or "infer" from the file suffix
+        """
+        namespaces = {
+            prefix: ns for prefix, ns in (namespaces or {}).items()
+            if _NCNAME.match(prefix) and not prefix.lower().startswith("xml") and prefix != "rdf"
+        }
+        super().__init__(output_path, {"rdf": _RDF_NS, **namespaces}, encoding, compression)
+        self._element_names: Dict[str, Tuple[str, str]] = {}
+
+    def _element(self, predicate: str) -> Tuple[str, str]:
+        """Element name of a predicate and the namespace declaration it needs."""
+        name = self._element_names.get(predicate)
+        if name is None:
+            found = self.trie.match(predicate)
+            if found is not None and _NCNAME.match(predicate[found[1]:]):
+                name = (f"{found[0]}:{predicate[found[1]:]}", "")
+            else:
+                tail = _NCNAME_TAIL.search(predicate)
+                if tail is None or tail.start() == 0:
+                    raise ValueError(f"Predicate {predicate} cannot be written as an RDF/XML element")
+                namespace = predicate[:tail.start()]
+                name = (f"ns0:{tail.group()}", f" xmlns:ns0={quoteattr(namespace)}")
+            self._element_names[predicate] = name
+        return name
+
+    def _begin(self) -> None:
+        declarations = "".join(f'\n   xmlns:{prefix}={quoteattr(ns)}' for prefix, ns in self.namespaces.items())
+        self._write(f'<?xml version="1.0" encoding="{self.encoding}"?>\n<rdf:RDF{declarations}>\n')
+
+    def _end(self) -> None:
+        self._write("</rdf:RDF>\n")
+
+    def _write_node(self, subject: str, properties: Dict[str, List[Term]]) -> None:
+        if subject.startswith("_:"):
+            about = f"rdf:nodeID={quoteattr(subject[2:])}"
+        else:
+            about = f"rdf:about={quoteattr(subject)}"
+        parts = [f"  <rdf:Description {about}>\n"]
+        for predicate, objects in properties.items():
+            name, declaration = self._element(predicate)
+            for kind, value, datatype, language in objects:
+                if kind == "iri":
+                    parts.append(f"    <{name}{declaration} rdf:resource={quoteattr(value)}/>\n")
+                elif kind == "bnode":
+                    parts.append(f"    <{name}{declaration} rdf:nodeID={quoteattr(value)}/>\n")
+                else:
+                    if language:
+                        attribute = f" xml:lang={quoteattr(language)}"
+                    elif datatype:
+                        attribute = f" rdf:datatype={quoteattr(datatype)}"
+                    else:
+                        attribute = ""
+                    text = escape(value, {"\r": "&#13;"})
+                    parts.append(f"    <{name}{declaration}{attribute}>{text}</{name}>\n")
+        parts.append("  </rdf:Description>\n")
+        self._write("".join(parts))
+
+
+def create_stream_writer(
+    format: str,
+    output_path: Path,
+    namespaces: Optional[Dict[str, str]] = None,
+    compression: Optional[str] = "infer",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    max_triples_per_file: Optional[int] = None,
+    max_bytes_per_file: Optional[int] = None,
+) -> Any:
+    """Create the streaming writer of an output format.
+
+    Args:
+        format: Output format (nt, nq, ttl, trig, jsonld, ndjsonld, xml, parquet-triples and their aliases)
+        output_path: Output file path, or "-" for standard output
+        namespaces: Mapping of prefix to namespace IRI
+        compression: "gzip", "zstd", None, or "infer" from the file suffix
+        buffer_size: Write buffer size of N-Triples and N-Quads output in bytes
+        max_triples_per_file: Rotate to numbered shard files of about this many triples
+        max_bytes_per_file: Rotate to numbered shard files of about this many bytes
+
+    Returns:
+        Writer with the interface of NTriplesStreamWriter
+
+    Raises:
+        ValueError: If the format cannot be streamed
+    """
+    format = format.lower()
+    if max_triples_per_file or max_bytes_per_file:
+        return RotatingStreamWriter(
+            output_path,
+            lambda path: create_stream_writer(format, path, namespaces, compression, buffer_size),
+            max_triples=max_triples_per_file,
+            max_bytes=max_bytes_per_file,
+            format=format,
+        )
+    if format in ("nt", "ntriples"):
+        return NTriplesStreamWriter(output_path, buffer_size=buffer_size, compression=compression)
+    if format in ("nq", "nquads"):
+        return NQuadsStreamWriter(output_path, buffer_size=buffer_size, compression=compression)
+    if format in ("ttl", "turtle"):
+        return TurtleStreamWriter(output_path, namespaces, compression=compression)
+    if format == "trig":
+        return TriGStreamWriter(output_path, namespaces, compression=compression)
+    if format in ("jsonld", "json-ld"):
+        return JSONLDStreamWriter(output_path, namespaces, compression=compression)
+    if format in ("ndjsonld", "ndjson-ld"):
+        return JSONLDStreamWriter(output_path, namespaces, ndjson=True, compression=compression)
+    if format in ("xml", "rdf", "rdfxml"):
+        return RDFXMLStreamWriter(output_path, namespaces, compression=compression)
+    if format in PARQUET_FORMATS:
+        return ParquetTripleWriter(output_path, namespaces, compression=compression)
+    raise ValueError(f"Output format {format} cannot be streamed")
+
+
+def _writes_graphs(writer: Any) -> bool:
+    if isinstance(writer, RotatingStreamWriter):
+        return writer.format in QUAD_FORMATS
+    return isinstance(writer, (NQuadsStreamWriter, TriGStreamWriter))
+
+
+def _write_subjects(graph: Graph, writer: Any) -> None:
+    for subject in sorted(cast(Iterable[Identifier], graph.subjects(unique=True))):
+        # rdf:type first, then the other predicates in order
+        for predicate, obj in sorted(graph.predicate_objects(subject),
+                                     key=lambda po: (po[0] != RDF.type, po[0], po[1])):
+            writer.write_triple(subject, predicate, obj)
+
+
+def write_graph(graph: Graph, writer: Any) -> int:
+    """Write an in-memory graph through a streaming writer, one subject at a time.
+
+    A dataset is written graph by graph, the default graph first, by writers
+    of quad formats; other writers get the union of its graphs.
+
+    Args:
+        graph: Graph or Dataset to write
+        writer: Unopened writer from ``create_stream_writer``
+
+    Returns:
+        Number of triples written
+
+    Raises:
+        ValueError: If a graph of the dataset that holds triples is named by
+            a blank node
+    """
+    with writer:
+        if isinstance(graph, Dataset) and _writes_graphs(writer):
+            contexts = [context for context in graph.graphs() if len(context)]
+            for context in contexts:
+                if isinstance(context.identifier, BNode):
+                    raise ValueError(f"Graph {context.identifier.n3()} is named by a blank node")
+            for context in sorted(contexts, key=lambda g: (g.identifier != DATASET_DEFAULT_GRAPH_ID, g.identifier)):
+                writer.set_graph(None if context.identifier == DATASET_DEFAULT_GRAPH_ID else context.identifier)
+                _write_subjects(context, writer)
+        else:
+            _write_subjects(graph, writer)
+    return int(writer.get_triple_count())
@@ -1,36 +1,200 @@
-"""N-Triples streaming writer for high-performance RDF output without aggregation."""
+"""N-Triples and N-Quads streaming writers for high-performance RDF output without aggregation."""
 
+import re
 from pathlib import Path
-from typing import Any, Dict, Optional, TextIO, Union
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple, Union
 from rdflib import Graph, Literal, URIRef
 from rdflib.namespace import RDF, OWL
 
+from .sinks import DEFAULT_BUFFER_SIZE, open_output
+
+# Text joined per write by write_sorted_lines
+_BATCH_CHARS = 1 << 16
+
+# Output formats that keep the named graph of each triple
+QUAD_FORMATS = ("nq", "nquads", "trig")
+
+
+def escape_nt_string(value: str) -> str:
+    """Escape string for N-Triples format.
+
+    Args:
+        value: String to escape
+
+    Returns:
+        Escaped string
+    """
+    value = value.replace('\\', '\\\\')  # Backslash
+    value = value.replace('"', '\\"')    # Quote
+    value = value.replace('\n', '\\n')   # Newline
+    value = value.replace('\r', '\\r')   # Carriage return
+    value = value.replace('\t', '\\t')   # Tab
+    return value
+
+
+_NT_UNESCAPE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+_NT_UNESCAPED = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f"}
+
+
+def _unescape_match(match: "re.Match[str]") -> str:
+    code = match.group(1)
+    if len(code) > 1:
+        return chr(int(code[1:], 16))
+    return _NT_UNESCAPED.get(code, code)
+
+
+def unescape_nt_string(value: str) -> str:
+    """Undo N-Triples string escaping.
+
+    Args:
+        value: Escaped lexical form, without the surrounding quotes
+
+    Returns:
+        Unescaped string
+    """
+    if "\\" not in value:
+        return value
+    return _NT_UNESCAPE.sub(_unescape_match, value)
+
+
+def parse_nt_object(term: str) -> Tuple[str, str, Optional[str], Optional[str]]:
+    """Split the object term of an N-Triples line into its parts.
+
+    Args:
+        term: Object term as written in N-Triples
+
+    Returns:
+        Tuple of (kind, value, datatype, language) where kind is "iri",
+        "bnode" or "literal" and value is the IRI, blank node label or
+        unescaped lexical form
+    """
+    if term.startswith("<"):
+        return "iri", term[1:-1], None, None
+    if term.startswith("_:"):
+        return "bnode", term[2:], None, None
+    end = term.rindex('"')
+    value = unescape_nt_string(term[1:end])
+    suffix = term[end + 1:]
+    if suffix.startswith("^^"):
+        return "literal", value, suffix[3:-1], None
+    if suffix.startswith("@"):
+        return "literal", value, None, suffix[1:]
+    return "literal", value, None, None
+
+
+def decode_lines(lines: Union[str, bytes, Iterable[bytes]], encoding: str = 'utf-8') -> str:
+    """Text of a block of N-Triples lines given to a writer's ``write_lines``.
+
+    Args:
+        lines: Lines as text, encoded bytes, or an iterable of encoded chunks
+        encoding: Encoding of the bytes
+
+    Returns:
+        The lines as one string
+    """
+    if isinstance(lines, str):
+        return lines
+    if not isinstance(lines, (bytes, bytearray, memoryview)):
+        lines = b"".join(lines)
+    return bytes(lines).decode(encoding)
+
+
+def sort_lines_by_subject(lines: Union[str, bytes, Iterable[bytes]]) -> List[str]:
+    """Group a block of N-Triples lines by subject.
+
+    The sort is stable, so the triples of a subject keep their order.
+
+    Args:
+        lines: N-Triples lines, each terminated by a newline
+
+    Returns:
+        Lines without their newline, in subject order
+    """
+    return sorted(decode_lines(lines).splitlines(), key=lambda line: line[:line.index(" ")])
+
+
+def format_nt_term(term: Union[URIRef, Literal]) -> str:
+    """Format an object term as it appears in an N-Triples line.
+
+    Args:
+        term: Object (URI or Literal)
+
+    Returns:
+        N-Triples representation of the term
+    """
+    if isinstance(term, Literal):
+        if term.language:
+            return f'"{escape_nt_string(str(term))}"@{term.language}'
+        elif term.datatype:
+            return f'"{escape_nt_string(str(term))}"^^<{term.datatype}>'
+        else:
+            return f'"{escape_nt_string(str(term))}"'
+    return f'<{term}>'
+
 
 class NTriplesStreamWriter:
-    """High-performance N-Triples writer that streams triples directly to file without in-memory aggregation."""
+    """High-performance N-Triples writer that streams triples directly to file without in-memory aggregation.
+
+    Lines are written as bytes through ``open_output``: a plain file, standard
+    output (``-``), or a gzip/zstd stream compressed on a background thread,
+    behind a large write buffer.
+    """
 
-    def __init__(self, output_path: Path, encoding: str = 'utf-8'):
+    def __init__(
+        self,
+        output_path: Path,
+        encoding: str = 'utf-8',
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        compression: Optional[str] = "infer",
+    ):
         """Initialize the N-Triples stream writer.
 
         Args:
-            output_path: Path to output NT file
+            output_path: Path to output NT file, or "-" for standard output
             encoding: File encoding (default: utf-8)
+            buffer_size: Write buffer size in bytes
+            compression: "gzip", "zstd", None, or "infer" from the file suffix
         """
         self.output_path = output_path
         self.encoding = encoding
-        self.file_handle: Optional[TextIO] = None
+        self.buffer_size = buffer_size
+        self.compression = compression
+        self.file_handle: Optional[BinaryIO] = None
         self.triple_count = 0
+        self._iris: Dict[str, str] = {}  # Predicate IRIs and datatypes as written
 
     def __enter__(self):
         """Enter context manager."""
-        self.file_handle = open(self.output_path, 'w', encoding=self.encoding, buffering=8192)
+        self.file_handle = open_output(self.output_path, "wb", self.compression, self.buffer_size)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Exit context manager."""
         if self.file_handle:
-            self.file_handle.close()
-            self.file_handle = None
+            try:
+                self.file_handle.close()
+            finally:
+                self.file_handle = None
+
+    def _iri(self, iri: str) -> str:
+        term = self._iris.get(iri)
+        if term is None:
+            term = f'<{iri}>'
+            if len(self._iris) < 10_000:
+                self._iris[iri] = term
+        return term
+
+    def _line(self, subject: URIRef, predicate: URIRef, obj: Union[URIRef, Literal]) -> str:
+        if isinstance(obj, Literal):
+            if obj.language:
+                term = f'"{escape_nt_string(str(obj))}"@{obj.language}'
+            elif obj.datatype:
+                term = f'"{escape_nt_string(str(obj))}"^^{self._iri(obj.datatype)}'
+            else:
+                term = f'"{escape_nt_string(str(obj))}"'
+        else:
+            term = f'<{obj}>'
+        return f'<{subject}> {self._iri(predicate)} {term} .\n'
 
     def write_triple(self, subject: URIRef, predicate: URIRef, obj: Union[URIRef, Literal]) -> None:
         """Write a single triple to the NT file.
@@ -40,23 +204,55 @@ class NTriplesStreamWriter:
             predicate: Predicate URI
             obj: Object (URI or Literal)
         """
+        self.write_lines(self._line(subject, predicate, obj), 1)
+
+    def write_triples(self, triples: Iterable[Tuple[URIRef, URIRef, Union[URIRef, Literal]]]) -> None:
+        """Format a batch of triples and write them in one call.
+
+        Args:
+            triples: (subject, predicate, object) tuples
+        """
+        lines = [self._line(s, p, o) for s, p, o in triples]
+        if lines:
+            self.write_lines("".join(lines), len(lines))
+
+    def write_lines(self, lines: Union[str, bytes, Iterable[bytes]], count: Optional[int] = None) -> None:
+        """Write a block of pre-formatted N-Triples lines in one call.
+
+        Args:
+            lines: Complete N-Triples lines, each terminated by a newline, as
+                text, encoded bytes, or an iterable of encoded chunks
+            count: Number of triples in the block (default: number of newlines)
+        """
         if not self.file_handle:
             raise RuntimeError("Writer not opened (use context manager)")
 
-        # Format N-Triples line
-        if isinstance(obj, Literal):
-            if obj.language:
-                obj_str = f'"{self._escape_string(str(obj))}"@{obj.language}'
-            elif obj.datatype:
-                obj_str = f'"{self._escape_string(str(obj))}"^^<{obj.datatype}>'
-            else:
-                obj_str = f'"{self._escape_string(str(obj))}"'
+        if isinstance(lines, str):
+            data = lines.encode(self.encoding)
+        elif isinstance(lines, (bytes, bytearray, memoryview)):
+            data = bytes(lines)
         else:
-            obj_str = f'<{obj}>'
+            data = b"".join(lines)
+        self.file_handle.write(data)
+        self.triple_count += data.count(b"\n") if count is None else count
+
+    def write_sorted_lines(self, lines: Iterable[str]) -> None:
+        """Write a stream of N-Triples lines, such as merged sorted runs, in batches.
 
-        line = f'<{subject}> <{predicate}> {obj_str} .\n'
-        self.file_handle.write(line)
-        self.triple_count += 1
+        Args:
+            lines: N-Triples lines, each terminated by a newline
+        """
+        batch: List[str] = []
+        size = 0
+        for line in lines:
+            batch.append(line)
+            size += len(line)
+            if size >= _BATCH_CHARS:
+                self.write_lines("".join(batch), len(batch))
+                batch = []
+                size = 0
+        if batch:
+            self.write_lines("".join(batch), len(batch))
 
     def write_resource_triples(self, resource_iri: URIRef, triples: Dict[URIRef, Any]) -> None:
         """Write all triples for a resource.
@@ -83,13 +279,7 @@ class NTriplesStreamWriter:
         Returns:
             Escaped string
         """
-        # N-Triples string escaping
-        value = value.replace('\\', '\\\\')  # Backslash
-        value = value.replace('"', '\\"')    # Quote
-        value = value.replace('\n', '\\n')   # Newline
-        value = value.replace('\r', '\\r')   # Carriage return
-        value = value.replace('\t', '\\t')   # Tab
-        return value
+        return escape_nt_string(value)
 
     def get_triple_count(self) -> int:
         """Get number of triples written.
@@ -100,6 +290,59 @@ class NTriplesStreamWriter:
         return self.triple_count
 
 
+class NQuadsStreamWriter(NTriplesStreamWriter):
+    """N-Quads writer: N-Triples lines with the graph set by ``set_graph`` as fourth term.
+
+    Blocks of N-Triples lines from the columnar engine get the graph term
+    with one bytes replace of their line ends, as ``" .\\n"`` ends every
+    line and appears nowhere else (newlines in literals are escaped).
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        encoding: str = 'utf-8',
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        compression: Optional[str] = "infer",
+    ):
+        """Initialize the N-Quads stream writer.
+
+        Args:
+            output_path: Path to output NQ file, or "-" for standard output
+            encoding: File encoding (default: utf-8)
+            buffer_size: Write buffer size in bytes
+            compression: "gzip", "zstd", None, or "infer" from the file suffix
+        """
+        super().__init__(output_path, encoding, buffer_size, compression)
+        self.graph: Optional[URIRef] = None
+        self._line_end = b" .\n"
+
+    def set_graph(self, graph: Optional[URIRef]) -> None:
+        """Set the named graph of the triples written next.
+
+        Args:
+            graph: Graph IRI, or None for the default graph
+        """
+        self.graph = graph
+        self._line_end = b" .\n" if graph is None else f" <{graph}> .\n".encode(self.encoding)
+
+    def write_lines(self, lines: Union[str, bytes, Iterable[bytes]], count: Optional[int] = None) -> None:
+        """Write a block of N-Triples lines as quads of the current graph.
+
+        Args:
+            lines: Complete N-Triples lines, each terminated by a newline, as
+                text, encoded bytes, or an iterable of encoded chunks
+            count: Number of triples in the block (default: number of newlines)
+        """
+        if self.graph is not None:
+            if isinstance(lines, str):
+                lines = lines.encode(self.encoding)
+            elif not isinstance(lines, (bytes, bytearray, memoryview)):
+                lines = b"".join(lines)
+            lines = bytes(lines).replace(b" .\n", self._line_end)
+        super().write_lines(lines, count)
+
+
 class StreamingRDFGraphBuilder:
     """RDF graph builder optimized for streaming N-Triples output without aggregation."""
 
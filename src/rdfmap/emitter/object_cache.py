@@ -0,0 +1,89 @@
+"""Bounded cache of linked-object descriptions already streamed.
+
+Without aggregation, a linked object (the same Borrower or Property) is
+described again - its ``rdf:type`` and property triples - on every row that
+references it. ``ObjectDescriptionCache`` remembers the descriptions written
+most recently as 64-bit hashes of the object IRI and its property values, in
+an LRU of at most ``max_entries`` hashes, so a repeated description is
+skipped and only the link to the object is written.
+
+A description evicted from the cache is written again when it comes back,
+so the output keeps every triple; the cache only bounds how many duplicates
+are left. The builders keep one cache per linked object mapping.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+# Approximate size of an LRU entry: OrderedDict slot, link node and int key
+BYTES_PER_ENTRY = 120
+
+
+def cache_entries(memory_mb: int, caches: int) -> int:
+    """Entries per cache for a memory ceiling shared by several caches.
+
+    Args:
+        memory_mb: Memory ceiling of all caches together, in MB
+        caches: Number of caches sharing the ceiling
+
+    Returns:
+        Maximum number of entries of each cache (at least 1)
+    """
+    return max(1, memory_mb * 1024 * 1024 // BYTES_PER_ENTRY // max(caches, 1))
+
+
+class ObjectDescriptionCache:
+    """LRU set of description hashes."""
+
+    def __init__(self, max_entries: int):
+        """Initialize cache.
+
+        Args:
+            max_entries: Hashes kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, None]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def seen(self, key: int) -> bool:
+        """Check a description, remembering it if it was not cached.
+
+        Args:
+            key: Hash of the object IRI and property values
+
+        Returns:
+            True if the description was written before and can be skipped
+        """
+        entries = self._entries
+        if key in entries:
+            entries.move_to_end(key)
+            return True
+        entries[key] = None
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return False
+
+    def new_rows(self, keys: np.ndarray) -> np.ndarray:
+        """Find the rows of a chunk whose description must be written.
+
+        Only the first row of each key in the chunk can be new; these rows
+        are looked up in (and added to) the cache in row order.
+
+        Args:
+            keys: Description hashes of the rows that have an object
+
+        Returns:
+            Boolean mask of the rows to describe
+        """
+        describe = np.zeros(len(keys), dtype=bool)
+        if len(keys) == 0:
+            return describe
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        seen = self.seen
+        for row, key in zip(first.tolist(), keys[first].tolist()):
+            describe[row] = not seen(key)
+        return describe
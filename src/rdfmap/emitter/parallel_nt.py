@@ -0,0 +1,240 @@
+"""Multi-process N-Triples conversion.
+
+CSV sources are split into byte ranges aligned to record boundaries and every
+range is converted by its own worker process, with its own
+``ColumnarNTriplesBuilder`` and ``NTriplesStreamWriter`` writing a numbered
+part file. Other sources are converted whole by a single worker. Each shard
+numbers its rows from 1; the parent folds the shard reports together with
+the number of rows that precede each shard, so error rows refer to the whole
+source.
+
+Workers are started with the ``spawn`` method (forking a process that already
+runs Polars' thread pool is unsafe) and each one sizes its Polars pool to its
+share of the CPUs through ``POLARS_MAX_THREADS``.
+"""
+
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from ..models.errors import ProcessingReport
+from ..models.mapping import MappingConfig
+from ..parsers.data_source import CSVParser, DataSourceParser
+from .sinks import infer_compression, shard_path
+
+
+@dataclass
+class ShardTask:
+    """One part of one sheet's source, converted by a worker process."""
+
+    mapping_path: Path
+    sheet_index: int
+    output: Path
+    byte_range: Optional[Tuple[int, int]] = None  # None converts the whole source
+    schema: Optional[Dict[str, pl.DataType]] = None
+    compression: Optional[str] = "infer"  # Parts of a compressed output are compressed streams
+    object_cache_mb: Optional[int] = None  # Command-line override of the reloaded mapping
+
+
+@dataclass
+class ShardResult:
+    """Outcome of a converted shard."""
+
+    output: Path
+    rows: int  # Source rows of the shard, including those the filter dropped
+    triples: int
+    report: ProcessingReport
+
+
+def worker_thread_count(workers: int) -> int:
+    """Polars threads per worker so that the workers share the CPUs.
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        Threads for each worker's Polars pool (at least 1)
+    """
+    return max(1, (os.cpu_count() or 1) // max(workers, 1))
+
+
+def _load_config(mapping_path: Path) -> MappingConfig:
+    from ..config.loader import load_mapping_config
+
+    config = load_mapping_config(mapping_path)
+    # Streaming N-Triples never aggregates duplicates
+    config.options.aggregate_duplicates = False
+    return config
+
+
+def _csv_parser(source: Path, config: MappingConfig, **kwargs: Any) -> Optional[CSVParser]:
+    """CSVParser for a sheet source, or None if it is not a CSV file."""
+    suffix = source.suffix.lower()
+    if suffix not in (".csv", ".tsv", ".txt"):
+        return None
+    delimiter = "\t" if suffix == ".tsv" else config.options.delimiter
+    return CSVParser(source, delimiter, config.options.header, **kwargs)
+
+
+def convert_shard(task: ShardTask) -> ShardResult:
+    """Convert one shard to an N-Triples part file (runs in a worker process).
+
+    Args:
+        task: Shard to convert
+
+    Returns:
+        Rows, triples and processing report of the shard
+    """
+    from ..parsers.data_source import create_parser
+    from ..parsers.xlsx_stream import mapped_sheet_name
+    from .columnar_nt import ColumnarNTriplesBuilder
+    from .nt_streaming import NTriplesStreamWriter
+
+    config = _load_config(task.mapping_path)
+    if task.object_cache_mb is not None:
+        config.options.object_cache_mb = task.object_cache_mb
+    sheet = (config.sheets or [])[task.sheet_index]
+    source = Path(sheet.source)
+
+    parser: Optional[DataSourceParser] = None
+    if task.byte_range is not None:
+        parser = _csv_parser(source, config, byte_range=task.byte_range, schema=task.schema)
+    if parser is None:
+        parser_kwargs: Dict[str, Any] = {
+            'delimiter': config.options.delimiter,
+            'has_header': config.options.header,
+        }
+        if sheet.iterator:
+            parser_kwargs['iterator'] = sheet.iterator
+        if source.suffix.lower() in ['.xlsx', '.xls']:
+            parser_kwargs['sheet_name'] = mapped_sheet_name(source, sheet.name)
+        parser = create_parser(source, **parser_kwargs)
+
+    report = ProcessingReport()
+    rows = 0
+    with NTriplesStreamWriter(task.output, compression=task.compression) as writer:
+        builder = ColumnarNTriplesBuilder(config, report, writer)
+        scan_plan = builder.compiled.plan_for(sheet).scan_plan()
+        for chunk in parser.parse_plan(scan_plan, chunk_size=config.options.chunk_size):
+            builder.add_dataframe(chunk, sheet, offset=rows)
+            rows += len(chunk)
+    if task.byte_range is not None:
+        # Later shards number their rows after every source row of this one, filtered or not
+        rows = scan_plan.rows_read
+
+    return ShardResult(output=task.output, rows=rows, triples=builder.get_triple_count(), report=report)
+
+
+def plan_shards(
+    mapping_path: Path,
+    config: MappingConfig,
+    output: Path,
+    workers: int,
+    compression: Optional[str] = "infer",
+) -> List[ShardTask]:
+    """Split every sheet of a mapping into shard tasks.
+
+    CSV sources are split into ``workers`` byte ranges sharing the schema
+    inferred for the whole file; other sources become a single task.
+
+    Args:
+        mapping_path: Mapping configuration file (reloaded by the workers)
+        config: Loaded mapping configuration
+        output: Final output path (parts are numbered after it)
+        workers: Number of worker processes
+        compression: Compression of the output, see ``open_output``
+
+    Returns:
+        Tasks in output order
+    """
+    tasks: List[ShardTask] = []
+    for sheet_index, sheet in enumerate(config.sheets or []):
+        parser = _csv_parser(Path(sheet.source), config)
+        schema: Optional[Dict[str, pl.DataType]] = None
+        ranges: List[Optional[Tuple[int, int]]] = [None]
+        if parser is not None:
+            schema = dict(parser.scan().collect_schema())
+            ranges = list(parser.split_byte_ranges(workers))
+
+        for byte_range in ranges:
+            tasks.append(ShardTask(
+                mapping_path=mapping_path,
+                sheet_index=sheet_index,
+                output=shard_path(output, len(tasks) + 1),
+                byte_range=byte_range,
+                schema=schema,
+                compression=infer_compression(output) if compression == "infer" else compression,
+                object_cache_mb=getattr(config.options, 'object_cache_mb', None),
+            ))
+    return tasks
+
+
+def convert_parallel(
+    mapping_path: Path,
+    config: MappingConfig,
+    report: ProcessingReport,
+    output: Path,
+    workers: int,
+    keep_parts: bool = False,
+    compression: Optional[str] = "infer",
+) -> int:
+    """Convert a mapping to N-Triples with a pool of worker processes.
+
+    Args:
+        mapping_path: Mapping configuration file
+        config: Loaded mapping configuration
+        report: Report receiving the merged shard reports
+        output: N-Triples output path
+        workers: Number of worker processes
+        keep_parts: Leave the numbered part files instead of concatenating
+            them into ``output``
+        compression: Compression of the output, see ``open_output``.
+            Compressed parts are concatenated as they are: gzip members and
+            zstd frames can follow each other in one file.
+
+    Returns:
+        Number of triples written
+    """
+    tasks = plan_shards(Path(mapping_path).resolve(), config, output, workers, compression)
+
+    # Spawned workers inherit the environment at start-up, before Polars is
+    # imported and sizes its thread pool
+    previous = os.environ.get("POLARS_MAX_THREADS")
+    os.environ["POLARS_MAX_THREADS"] = str(worker_thread_count(workers))
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            results = list(pool.map(convert_shard, tasks))
+    except BaseException:
+        for task in tasks:
+            task.output.unlink(missing_ok=True)
+        raise
+    finally:
+        if previous is None:
+            os.environ.pop("POLARS_MAX_THREADS", None)
+        else:
+            os.environ["POLARS_MAX_THREADS"] = previous
+
+    # Row numbers restart with each sheet, as in single-process conversion
+    row_offsets: Dict[int, int] = {}
+    for task, result in zip(tasks, results):
+        offset = row_offsets.get(task.sheet_index, 0)
+        report.merge(result.report, row_offset=offset)
+        row_offsets[task.sheet_index] = offset + result.rows
+
+    if not keep_parts:
+        with open(output, "wb") as target:
+            for result in results:
+                with open(result.output, "rb") as part:
+                    shutil.copyfileobj(part, target, 1024 * 1024)
+                result.output.unlink()
+
+    return sum(result.triples for result in results)
@@ -0,0 +1,341 @@
+"""Parquet triple-table output and reader.
+
+``ParquetTripleWriter`` writes triples as a Parquet table with one row per
+triple and the columns of ``TRIPLE_SCHEMA``:
+
+- ``subject``: subject IRI, or ``_:label`` for a blank node
+- ``predicate``: predicate IRI
+- ``object``: object IRI, ``_:label`` blank node or unescaped lexical form
+- ``object_kind``: "iri", "bnode" or "literal"
+- ``datatype``: datatype IRI of typed literals
+- ``lang``: language tag of tagged literals
+
+Columns are dictionary-encoded, which suits the few distinct predicates,
+kinds, datatypes and tags, and the repeated object IRIs of linked objects.
+The columnar engine hands each chunk over as a triple table built from its
+rendered IRI and value columns, written as one row group. Triples written
+one at a time by the row engine are buffered into row groups of
+``ROW_GROUP_ROWS``; blocks of N-Triples text are split into columns.
+
+The reader side memory-maps the file with ``pl.scan_parquet``:
+``scan_parquet_triples`` returns a LazyFrame, ``parquet_triple_stats``
+summarizes a file and ``read_parquet_graph`` loads it into an rdflib graph
+for SHACL validation, all without parsing text RDF.
+
+Writing needs the optional ``pyarrow`` package.
+"""
+
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+import polars as pl
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import RDF
+
+from .nt_streaming import decode_lines, unescape_nt_string
+from .sinks import STDOUT, open_output
+
+TRIPLE_COLUMNS = ("subject", "predicate", "object", "object_kind", "datatype", "lang")
+
+TRIPLE_SCHEMA = {column: pl.String for column in TRIPLE_COLUMNS}
+
+# Rows of a row group when triples are written one at a time
+ROW_GROUP_ROWS = 100_000
+
+PARQUET_FORMATS = ("parquet-triples", "parquet")
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+_LINE = r"^(\S+) (\S+) (.*) \.\n?$"
+_LITERAL = r'^"(.*)"(?:\^\^<([^>]*)>|@([A-Za-z0-9\-]+))?$'
+
+
+def is_parquet_triples(path: Union[str, Path]) -> bool:
+    """Whether a path names a Parquet triple table, judging by its suffix."""
+    return Path(path).suffix.lower() in PARQUET_SUFFIXES
+
+
+def _node(term: Union[URIRef, BNode]) -> str:
+    return f"_:{term}" if isinstance(term, BNode) else str(term)
+
+
+def _row(
+    subject: Union[URIRef, BNode], predicate: URIRef, obj: Union[URIRef, BNode, Literal]
+) -> Tuple[str, str, str, str, Optional[str], Optional[str]]:
+    if isinstance(obj, Literal):
+        datatype = str(obj.datatype) if obj.datatype and not obj.language else None
+        return _node(subject), str(predicate), str(obj), "literal", datatype, obj.language
+    kind = "bnode" if isinstance(obj, BNode) else "iri"
+    return _node(subject), str(predicate), _node(obj), kind, None, None
+
+
+def nt_lines_frame(lines: pl.Series) -> pl.DataFrame:
+    """Split N-Triples lines into the columns of a triple table.
+
+    Used for text handed to ``ParquetTripleWriter.write_lines``; the
+    columnar engine passes its triple tables to ``write_frame``.
+
+    Args:
+        lines: String Series with one N-Triples line per value
+
+    Returns:
+        DataFrame with the columns of ``TRIPLE_SCHEMA``
+    """
+    parts = lines.str.extract_groups(_LINE).struct.unnest()
+    subjects, predicates, objects = parts.get_columns()
+    literal = objects.str.extract_groups(_LITERAL).struct.unnest()
+    values, datatypes, languages = literal.get_columns()
+
+    frame = pl.DataFrame({
+        "subject": subjects, "predicate": predicates, "object": objects, "value": values,
+    }).select(
+        pl.col("subject").str.strip_prefix("<").str.strip_suffix(">"),
+        pl.col("predicate").str.strip_prefix("<").str.strip_suffix(">"),
+        pl.when(pl.col("object").str.starts_with("<"))
+        .then(pl.col("object").str.slice(1, pl.col("object").str.len_chars() - 2))
+        .when(pl.col("object").str.starts_with("_:"))
+        .then(pl.col("object"))
+        .otherwise(pl.col("value"))
+        .alias("object"),
+        pl.when(pl.col("object").str.starts_with("<")).then(pl.lit("iri"))
+        .when(pl.col("object").str.starts_with("_:")).then(pl.lit("bnode"))
+        .otherwise(pl.lit("literal"))
+        .alias("object_kind"),
+    ).with_columns(datatype=datatypes, lang=languages)
+
+    # Escapes are rare; undo them row-wise for just those literals
+    escaped = (
+        (frame.get_column("object_kind") == "literal")
+        & frame.get_column("object").str.contains("\\", literal=True)
+    ).arg_true()
+    if len(escaped):
+        objects = frame.get_column("object")
+        unescaped = [unescape_nt_string(value) for value in objects.gather(escaped).to_list()]
+        frame = frame.with_columns(objects.scatter(escaped, unescaped))
+    return frame
+
+
+class ParquetTripleWriter:
+    """Writes triples as a dictionary-encoded Parquet triple table.
+
+    The writer has the interface of ``NTriplesStreamWriter``.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        namespaces: Optional[Dict[str, str]] = None,
+        encoding: str = 'utf-8',
+        compression: Optional[str] = "infer",
+        row_group_rows: int = ROW_GROUP_ROWS,
+    ):
+        """Initialize writer.
+
+        Args:
+            output_path: Path to output Parquet file, or "-" for standard output
+            namespaces: Accepted for interface compatibility; IRIs are stored in full
+            encoding: Encoding of N-Triples bytes given to ``write_lines``
+            compression: Parquet codec, "gzip" or "zstd" (default), or None
+            row_group_rows: Rows per row group of triples written one at a time
+        """
+        self.output_path = output_path
+        self.encoding = encoding
+        self.compression = "zstd" if compression == "infer" else compression
+        self.row_group_rows = row_group_rows
+        self.triple_count = 0
+        self._rows: List[Tuple] = []
+        self.file_handle: Optional[IO[bytes]] = None
+        self._writer: Optional[Any] = None  # pyarrow.parquet.ParquetWriter
+
+    def __enter__(self) -> "ParquetTripleWriter":
+        """Enter context manager."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("pyarrow is required for parquet-triples output. Install with: pip install pyarrow")
+
+        self.file_handle = open_output(self.output_path, "wb", compression=None)
+        self._writer = pq.ParquetWriter(
+            self.file_handle,
+            pl.DataFrame(schema=TRIPLE_SCHEMA).to_arrow().schema,
+            compression=self.compression or "none",
+            use_dictionary=True,
+        )
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager."""
+        try:
+            if self._writer is not None:
+                if exc_type is None:
+                    self._flush_rows()
+                self._writer.close()
+        finally:
+            self._writer = None
+            if self.file_handle is not None:
+                self.file_handle.close()
+                self.file_handle = None
+
+    def _check_open(self) -> Any:
+        if self._writer is None:
+            raise RuntimeError("Writer not opened (use context manager)")
+        return self._writer
+
+    def _flush_rows(self) -> None:
+        if self._rows:
+            rows, self._rows = self._rows, []
+            self._write_row_group(pl.DataFrame(rows, schema=TRIPLE_SCHEMA, orient="row"))
+
+    def _write_row_group(self, frame: pl.DataFrame) -> None:
+        self._check_open().write_table(frame.select(TRIPLE_COLUMNS).to_arrow(), row_group_size=len(frame))
+
+    def write_frame(self, frame: pl.DataFrame) -> None:
+        """Write a triple table as one row group.
+
+        Args:
+            frame: DataFrame with the columns of ``TRIPLE_SCHEMA``
+        """
+        self._check_open()
+        if len(frame) == 0:
+            return
+        self._flush_rows()
+        self._write_row_group(frame)
+        self.triple_count += len(frame)
+
+    def write_lines(self, lines: Union[str, bytes], count: Optional[int] = None) -> None:
+        """Write a block of N-Triples lines as one row group.
+
+        Args:
+            lines: Complete N-Triples lines, each terminated by a newline
+            count: Number of triples in the block (unused; rows are counted)
+        """
+        text = decode_lines(lines, self.encoding)
+        self.write_frame(nt_lines_frame(pl.Series("line", text.splitlines(), dtype=pl.String)))
+
+    def write_triple(self, subject: URIRef, predicate: URIRef, obj: Union[URIRef, Literal]) -> None:
+        """Write a single triple.
+
+        Args:
+            subject: Subject URI
+            predicate: Predicate URI
+            obj: Object (URI or Literal)
+        """
+        self._check_open()
+        self._rows.append(_row(subject, predicate, obj))
+        self.triple_count += 1
+        if len(self._rows) >= self.row_group_rows:
+            self._flush_rows()
+
+    def write_triples(self, triples: Iterable[Tuple[URIRef, URIRef, Union[URIRef, Literal]]]) -> None:
+        """Write a batch of (subject, predicate, object) triples."""
+        for subject, predicate, obj in triples:
+            self.write_triple(subject, predicate, obj)
+
+    def write_resource_triples(self, resource_iri: URIRef, triples: Dict[URIRef, Any]) -> None:
+        """Write all triples for a resource.
+
+        Args:
+            resource_iri: Subject IRI
+            triples: Dictionary of predicate -> object (or list of objects) mappings
+        """
+        for predicate, obj in triples.items():
+            for value in obj if isinstance(obj, list) else [obj]:
+                self.write_triple(resource_iri, predicate, value)
+
+    def get_triple_count(self) -> int:
+        """Get number of triples written.
+
+        Returns:
+            Number of triples written
+        """
+        return self.triple_count
+
+
+def scan_parquet_triples(path: Union[str, Path]) -> pl.LazyFrame:
+    """Scan a Parquet triple table lazily, memory-mapping the file.
+
+    Args:
+        path: Parquet file written by ``ParquetTripleWriter``
+
+    Returns:
+        LazyFrame with the columns of ``TRIPLE_SCHEMA``
+
+    Raises:
+        ValueError: If the file is not a triple table
+    """
+    if str(path) == STDOUT:
+        raise ValueError("Parquet triple tables cannot be read from standard input")
+    frame = pl.scan_parquet(path)
+    missing = set(TRIPLE_COLUMNS) - set(frame.collect_schema().names())
+    if missing:
+        raise ValueError(f"{path} is not a triple table (missing columns: {', '.join(sorted(missing))})")
+    return frame.select(TRIPLE_COLUMNS)
+
+
+def _term(
+    value: str, kind: Optional[str] = None, datatype: Optional[str] = None, lang: Optional[str] = None
+) -> Union[URIRef, BNode, Literal]:
+    if kind == "literal":
+        return Literal(value, lang=lang, datatype=None if lang else datatype)
+    if value.startswith("_:"):
+        return BNode(value[2:])
+    return URIRef(value)
+
+
+def read_parquet_graph(path: Union[str, Path], graph: Optional[Graph] = None) -> Graph:
+    """Load a Parquet triple table into an rdflib graph.
+
+    Args:
+        path: Parquet file written by ``ParquetTripleWriter``
+        graph: Graph to add the triples to (default: a new graph)
+
+    Returns:
+        Graph with the triples of the file
+    """
+    graph = Graph() if graph is None else graph
+    predicates: Dict[str, URIRef] = {}
+    for subject, predicate, obj, kind, datatype, lang in scan_parquet_triples(path).collect().iter_rows():
+        p = predicates.get(predicate)
+        if p is None:
+            p = predicates[predicate] = URIRef(predicate)
+        graph.add((_term(subject), p, _term(obj, kind, datatype, lang)))
+    return graph
+
+
+def parquet_triple_stats(path: Union[str, Path], top: int = 10) -> Dict[str, Any]:
+    """Summarize a Parquet triple table.
+
+    Args:
+        path: Parquet file written by ``ParquetTripleWriter``
+        top: Number of predicates and classes to list
+
+    Returns:
+        Dictionary with triple, subject and literal counts, and the most
+        frequent predicates, classes and datatypes with their counts
+    """
+    triples = scan_parquet_triples(path)
+    totals = triples.select(
+        pl.len().alias("triples"),
+        pl.col("subject").n_unique().alias("subjects"),
+        pl.col("predicate").n_unique().alias("predicates"),
+        (pl.col("object_kind") == "literal").sum().alias("literals"),
+    ).collect().row(0, named=True)
+
+    def counts(frame: pl.LazyFrame, column: str, limit: Optional[int]) -> List[Tuple[str, int]]:
+        grouped = frame.group_by(column).agg(pl.len().alias("count")).sort(["count", column], descending=[True, False])
+        if limit is not None:
+            grouped = grouped.head(limit)
+        return [tuple(row) for row in grouped.collect().iter_rows()]
+
+    totals["top_predicates"] = counts(triples, "predicate", top)
+    totals["top_classes"] = counts(
+        triples.filter(pl.col("predicate") == str(RDF.type)).select(pl.col("object").alias("class")), "class", top
+    )
+    totals["datatypes"] = counts(triples.filter(pl.col("datatype").is_not_null()), "datatype", None)
+    return totals
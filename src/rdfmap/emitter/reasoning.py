@@ -0,0 +1,193 @@
+"""Set-at-a-time OWL materialization over a finished graph.
+
+Superclass types, inverse, symmetric and transitive links are derived once
+per class or property with rdflib's predicate-indexed lookups instead of once
+per generated resource, so the cost grows with the data and the number of
+ontology axioms that actually apply, not with rows x ontology properties.
+Transitive closure is semi-naive: each round only extends the paths found in
+the previous round.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from rdflib import Dataset, Graph, Literal, RDF, URIRef
+from rdflib.term import Node
+
+from ..generator.ontology_analyzer import OntologyAnalyzer
+from ..models.errors import ProcessingReport
+
+
+Pair = Tuple[Node, Node]
+
+# Report counters of materialize: triples added, and violations of the graph
+INFERENCE_COUNTERS = ("inferred_types", "inverse_links_added", "transitive_links_added", "symmetric_links_added")
+VIOLATION_COUNTERS = (
+    "cardinality_violations", "min_cardinality_violations",
+    "max_cardinality_violations", "exact_cardinality_violations",
+)
+
+
+@dataclass
+class ReasoningRules:
+    """The ontology axioms used for materialization and cardinality checks."""
+
+    superclasses: Dict[Node, List[URIRef]] = field(default_factory=dict)
+    inverses: List[Tuple[URIRef, URIRef]] = field(default_factory=list)
+    symmetric: List[URIRef] = field(default_factory=list)
+    transitive: List[URIRef] = field(default_factory=list)
+    functional: List[URIRef] = field(default_factory=list)
+    restrictions: Dict[URIRef, List[Tuple[URIRef, dict]]] = field(default_factory=dict)  # class -> (property, restriction)
+
+    @classmethod
+    def from_analyzer(cls, analyzer: OntologyAnalyzer) -> "ReasoningRules":
+        """Collect the axioms of an OntologyAnalyzer.
+
+        Args:
+            analyzer: Analyzed ontology
+
+        Returns:
+            Rules with only the properties that carry an axiom
+        """
+        rules = cls(superclasses={c: s for c, s in getattr(analyzer, 'subclass_map', {}).items() if s})
+        for prop in analyzer.properties.values():
+            uri = URIRef(prop.uri)
+            if prop.inverse_of:
+                rules.inverses.append((uri, URIRef(prop.inverse_of)))
+            if prop.is_symmetric:
+                rules.symmetric.append(uri)
+            if prop.is_transitive:
+                rules.transitive.append(uri)
+            if prop.is_functional:
+                rules.functional.append(uri)
+        for prop_uri, restrictions in getattr(analyzer, 'property_restrictions', {}).items():
+            for restriction in restrictions:
+                if restriction.get('class'):
+                    rules.restrictions.setdefault(URIRef(restriction['class']), []).append(
+                        (URIRef(prop_uri), restriction)
+                    )
+        return rules
+
+
+def _pairs(graph: Graph, predicate: URIRef) -> Set[Pair]:
+    """Subject/object pairs of a predicate, skipping literal objects."""
+    return {(s, o) for s, o in graph.subject_objects(predicate) if not isinstance(o, Literal)}
+
+
+def _inferred_graph(graph: Graph) -> Graph:
+    """Graph inferences are added to: a dataset's default graph, or the graph itself."""
+    return graph.default_graph if isinstance(graph, Dataset) else graph
+
+
+def _add_all(graph: Graph, predicate: URIRef, pairs: Iterable[Pair]) -> None:
+    graph.addN((s, predicate, o, _inferred_graph(graph)) for s, o in pairs)
+
+
+def _transitive_closure(edges: Set[Pair], max_length: Optional[int]) -> Set[Pair]:
+    """Semi-naive closure: paths of up to ``max_length`` edges not in ``edges``.
+
+    Args:
+        edges: Asserted (subject, object) pairs
+        max_length: Longest path to materialize; None for the full closure
+
+    Returns:
+        Newly derived pairs
+    """
+    successors: Dict[Node, Set[Node]] = defaultdict(set)
+    for s, o in edges:
+        successors[s].add(o)
+
+    known = set(edges)
+    derived: Set[Pair] = set()
+    delta = edges
+    length = 1
+    while delta and (max_length is None or length < max_length):
+        new: Set[Pair] = set()
+        for s, middle in delta:
+            for o in successors.get(middle, ()):
+                if (s, o) not in known:
+                    new.add((s, o))
+        known |= new
+        derived |= new
+        delta = new
+        length += 1
+    return derived
+
+
+def materialize(
+    graph: Graph,
+    rules: ReasoningRules,
+    report: ProcessingReport,
+    transitive_depth: Optional[int] = 2,
+) -> None:
+    """Add inferred triples to a graph and check cardinalities, in one pass.
+
+    The axioms apply to the union of a dataset's graphs; what they infer is
+    added to its default graph.
+
+    Args:
+        graph: Graph to extend in place
+        rules: Ontology axioms
+        report: Report receiving the inference counters and violations
+        transitive_depth: Longest chain of a transitive property to
+            materialize (1 disables it, None computes the full closure)
+    """
+    asserted_types: Dict[Node, Set[Node]] = defaultdict(set)
+    for s, o in graph.subject_objects(RDF.type):
+        asserted_types[o].add(s)
+
+    # Superclasses: subclass_map is already transitively closed
+    typed = {cls: set(members) for cls, members in asserted_types.items()}
+    for cls, members in asserted_types.items():
+        for superclass in rules.superclasses.get(cls, ()):
+            known = typed.setdefault(superclass, set())
+            added = members - known
+            if added:
+                graph.addN((s, RDF.type, superclass, _inferred_graph(graph)) for s in added)
+                known |= added
+                report.inferred_types += len(added)
+
+    if transitive_depth is None or transitive_depth > 1:
+        for prop in rules.transitive:
+            new = _transitive_closure(_pairs(graph, prop), transitive_depth)
+            _add_all(graph, prop, new)
+            report.transitive_links_added += len(new)
+
+    for prop in rules.symmetric:
+        pairs = _pairs(graph, prop)
+        new = {(o, s) for s, o in pairs} - pairs
+        _add_all(graph, prop, new)
+        report.symmetric_links_added += len(new)
+
+    for prop, inverse in rules.inverses:
+        new = {(o, s) for s, o in _pairs(graph, prop)} - set(graph.subject_objects(inverse))
+        _add_all(graph, inverse, new)
+        report.inverse_links_added += len(new)
+
+    # Functional properties: at most one value per subject
+    for prop in rules.functional:
+        values: Dict[Node, Set[Node]] = defaultdict(set)
+        for s, o in graph.subject_objects(prop):
+            values[s].add(o)
+        for s, objects in values.items():
+            if len(objects) > 1:
+                report.add_cardinality_violation(f"Functional property {prop} has {len(objects)} values for {s}")
+
+    # Cardinality restrictions apply to resources of the restricted class
+    counts: Dict[URIRef, Dict[Node, int]] = {}
+    for cls, restrictions in rules.restrictions.items():
+        for prop, restriction in restrictions:
+            if prop not in counts:
+                per_subject: Dict[Node, Set[Node]] = defaultdict(set)
+                for s, o in graph.subject_objects(prop):
+                    per_subject[s].add(o)
+                counts[prop] = {s: len(objects) for s, objects in per_subject.items()}
+            for s in asserted_types.get(cls, ()):
+                count = counts[prop].get(s, 0)
+                if restriction.get('cardinality') is not None and count != restriction['cardinality']:
+                    report.add_cardinality_restriction_violation(f"Exact cardinality violation {prop} expected {restriction['cardinality']} got {count}", 'exact')
+                if restriction.get('minCardinality') is not None and count < restriction['minCardinality']:
+                    report.add_cardinality_restriction_violation(f"Min cardinality violation {prop} expected >= {restriction['minCardinality']} got {count}", 'min')
+                if restriction.get('maxCardinality') is not None and count > restriction['maxCardinality']:
+                    report.add_cardinality_restriction_violation(f"Max cardinality violation {prop} expected <= {restriction['maxCardinality']} got {count}", 'max')
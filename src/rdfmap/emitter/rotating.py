@@ -0,0 +1,274 @@
+"""Rotating sharded output for parallel bulk loading.
+
+``RotatingStreamWriter`` spreads the output of a streaming writer over
+numbered shard files (``out.part-00001.nt.gz``, ...) so that a triplestore's
+bulk loader can load them in parallel. A new shard is started once the
+current one holds ``max_triples`` triples or ``max_bytes`` bytes, but only
+where the triples of a subject cannot continue:
+
+- between blocks of the columnar engine, which hold the whole chunk of
+  rows they were generated from (lower ``chunk_size`` for finer shards);
+- at a subject change for triples written one at a time (``write_graph``
+  writes an aggregated graph subject by subject) and for subject-sorted
+  lines (the merge of ``SortedRunWriter``).
+
+Every shard is a complete file of its format, with its own prefixes or
+document wrapper. Sizes are counted before compression. When the writer is
+closed, a manifest (``out.manifest.json``) lists each shard with its
+triple count, size on disk and SHA-256 checksum.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
+
+from rdflib import Literal, URIRef
+
+from .nt_streaming import QUAD_FORMATS
+from .sinks import STDOUT, manifest_path, shard_path
+
+_HASH_BLOCK = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _position(writer: Any) -> int:
+    """Bytes a writer has handed to its output stream, before compression."""
+    handle = getattr(writer, "file_handle", None)
+    if handle is None:
+        return 0
+    handle = getattr(handle, "buffer", handle)  # Text writers: the binary stream below
+    return int(handle.tell())
+
+
+class RotatingStreamWriter:
+    """Writer spreading its triples over numbered shard files.
+
+    It has the interface of ``NTriplesStreamWriter`` and is used as a context
+    manager; each shard is written by a writer from ``open_shard``.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        open_shard: Callable[[Path], Any],
+        max_triples: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        format: Optional[str] = None,
+    ):
+        """Initialize writer.
+
+        Args:
+            output_path: Output path the shard and manifest names derive from
+            open_shard: Creates the unopened writer of a shard path
+            max_triples: Triples per shard before rotating
+            max_bytes: Uncompressed bytes per shard before rotating
+            format: Output format recorded in the manifest
+        """
+        if str(output_path) == STDOUT:
+            raise ValueError("Sharded output needs an output file, not standard output")
+        if not max_triples and not max_bytes:
+            raise ValueError("Sharded output needs max_triples or max_bytes")
+        self.output_path = Path(output_path)
+        self.open_shard = open_shard
+        self.max_triples = max_triples
+        self.max_bytes = max_bytes
+        self.format = format
+        self.shards: List[Dict[str, Any]] = []
+        self._writer: Optional[Any] = None
+        self._subject: Optional[URIRef] = None
+        self._graph: Optional[URIRef] = None
+        self._carry: Optional[str] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the manifest written when the writer is closed."""
+        return manifest_path(self.output_path)
+
+    def __enter__(self) -> "RotatingStreamWriter":
+        """Enter context manager."""
+        self.shards = []
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager, closing the last shard and writing the manifest."""
+        if exc_type is not None:
+            if self._writer is not None:
+                writer, self._writer = self._writer, None
+                writer.__exit__(exc_type, exc_val, exc_tb)
+            return
+        if self._writer is not None or not self.shards:
+            self._current()
+            self._rotate()
+        self._write_manifest()
+
+    # Shards
+
+    def _current(self) -> Any:
+        if self._writer is None:
+            writer = self.open_shard(shard_path(self.output_path, len(self.shards) + 1))
+            self._writer = writer.__enter__()
+            if self._graph is not None:
+                self._writer.set_graph(self._graph)
+        return self._writer
+
+    def _full(self, triples: Optional[int] = None) -> bool:
+        """Whether the current shard reached a limit.
+
+        Args:
+            triples: Triples in the shard, if the writer has not counted them all yet
+        """
+        writer = self._writer
+        if writer is None:
+            return False
+        if triples is None:
+            triples = writer.get_triple_count()
+        if self.max_triples and triples >= self.max_triples:
+            return True
+        return bool(self.max_bytes and _position(writer) >= self.max_bytes)
+
+    def _rotate(self) -> None:
+        """Close the current shard and record it for the manifest."""
+        writer = self._current()
+        self._writer = None
+        writer.__exit__(None, None, None)
+        path = Path(writer.output_path)
+        self.shards.append({
+            "path": path.name,
+            "triples": writer.get_triple_count(),
+            "bytes": path.stat().st_size,
+            "sha256": file_sha256(path),
+        })
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "output": self.output_path.name,
+            "format": self.format,
+            "triples": sum(shard["triples"] for shard in self.shards),
+            "max_triples_per_file": self.max_triples,
+            "max_bytes_per_file": self.max_bytes,
+            "shards": self.shards,
+        }
+        with open(self.manifest_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, indent=2)
+            handle.write("\n")
+
+    # Writing
+
+    def set_graph(self, graph: Optional[URIRef]) -> None:
+        """Set the named graph of the triples written next, in this and later shards.
+
+        Ignored by shards of formats without named graphs.
+
+        Args:
+            graph: Graph IRI, or None for the default graph
+        """
+        if self.format not in QUAD_FORMATS:
+            return
+        self._graph = graph
+        if self._writer is not None:
+            self._writer.set_graph(graph)
+
+    def write_triple(self, subject: URIRef, predicate: URIRef, obj: Union[URIRef, Literal]) -> None:
+        """Write a single triple, rotating first if a full shard ends with the previous subject.
+
+        Args:
+            subject: Subject URI
+            predicate: Predicate URI
+            obj: Object (URI or Literal)
+        """
+        if subject != self._subject:
+            if self._full():
+                self._rotate()
+            self._subject = subject
+        self._current().write_triple(subject, predicate, obj)
+
+    def write_triples(self, triples: Iterable[Tuple[URIRef, URIRef, Union[URIRef, Literal]]]) -> None:
+        """Write a batch of (subject, predicate, object) triples."""
+        for subject, predicate, obj in triples:
+            self.write_triple(subject, predicate, obj)
+
+    def write_resource_triples(self, resource_iri: URIRef, triples: Dict[URIRef, Any]) -> None:
+        """Write all triples for a resource into one shard.
+
+        Args:
+            resource_iri: Subject IRI
+            triples: Dictionary of predicate -> object (or list of objects) mappings
+        """
+        if self._full():
+            self._rotate()
+        self._subject = resource_iri
+        self._current().write_resource_triples(resource_iri, triples)
+
+    def write_lines(self, lines: Union[str, bytes], count: Optional[int] = None) -> None:
+        """Write a block of N-Triples lines into the current shard, then rotate if it is full.
+
+        Args:
+            lines: Complete N-Triples lines, each terminated by a newline
+            count: Number of triples in the block
+        """
+        self._current().write_lines(lines, count)
+        self._subject = None
+        if self._full():
+            self._rotate()
+
+    def write_sorted_lines(self, lines: Iterable[str]) -> None:
+        """Write N-Triples lines in subject order, rotating between subjects.
+
+        Args:
+            lines: N-Triples lines, each terminated by a newline
+        """
+        lines = iter(lines)
+        while True:
+            self._current().write_sorted_lines(self._shard_lines(lines))
+            if self._carry is None:
+                return
+            self._rotate()
+
+    def _shard_lines(self, lines: Iterator[str]) -> Iterator[str]:
+        """Lines for the current shard, up to the first subject change once it is full.
+
+        The line that starts the next shard is kept in ``_carry``.
+        """
+        line, self._carry = self._carry, None
+        subject = None
+        # Counted here: writers may batch lines before counting them
+        count = self._current().get_triple_count()
+        start = count
+        while True:
+            if line is None:
+                line = next(lines, None)
+                if line is None:
+                    return
+            line_subject = line[:line.index(" ")]
+            if line_subject != subject:
+                subject = line_subject
+                if count > start and self._full(count):
+                    self._carry = line
+                    return
+            yield line
+            count += 1
+            line = None
+
+    def get_triple_count(self) -> int:
+        """Get number of triples written.
+
+        Returns:
+            Number of triples written to all shards
+        """
+        current = self._writer.get_triple_count() if self._writer is not None else 0
+        return sum(int(shard["triples"]) for shard in self.shards) + int(current)
@@ -0,0 +1,206 @@
+"""Output sinks for the streaming writers.
+
+``open_output`` opens the target of a streaming writer: a file or standard
+output (``-``), optionally compressed with gzip or zstd, behind a large
+write buffer. Compression runs on a background thread that takes buffered
+chunks from a bounded queue, so the writer keeps formatting triples while
+the previous chunk is compressed and written (zlib and zstandard release
+the GIL while compressing).
+
+The compression of a file is inferred from its suffix (``.gz``, ``.zst``)
+unless it is given explicitly. zstd needs the optional ``zstandard``
+package.
+"""
+
+import io
+import queue
+import sys
+import threading
+import zlib
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Optional, Tuple, Union
+
+# Write buffer of the streaming writers
+DEFAULT_BUFFER_SIZE = 1 << 22
+
+# Compressed chunks waiting for the background thread
+_QUEUE_CHUNKS = 4
+
+COMPRESSIONS = ("gzip", "zstd")
+
+_SUFFIXES = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+STDOUT = "-"
+
+
+def infer_compression(target: Union[str, Path]) -> Optional[str]:
+    """Compression implied by an output path's suffix.
+
+    Args:
+        target: Output path
+
+    Returns:
+        "gzip", "zstd" or None
+    """
+    return _SUFFIXES.get(Path(target).suffix.lower())
+
+
+def _split_name(output: Path) -> Tuple[str, str]:
+    """Split a file name into its base and its format (and compression) suffixes."""
+    name = output.name
+    suffix = output.suffix
+    if suffix.lower() in _SUFFIXES:
+        suffix = Path(output.stem).suffix + suffix
+    return name[:len(name) - len(suffix)], suffix
+
+
+def shard_path(output: Union[str, Path], index: int) -> Path:
+    """Path of the numbered part file of an output, e.g. ``out.part-00001.nt.gz``.
+
+    Args:
+        output: Final output path
+        index: Part number, starting at 1
+
+    Returns:
+        Part file path next to the output
+    """
+    output = Path(output)
+    base, suffix = _split_name(output)
+    return output.with_name(f"{base}.part-{index:05d}{suffix}")
+
+
+def manifest_path(output: Union[str, Path]) -> Path:
+    """Path of the shard manifest of an output, e.g. ``out.manifest.json``."""
+    output = Path(output)
+    return output.with_name(f"{_split_name(output)[0]}.manifest.json")
+
+
+def create_compressor(compression: str, level: Optional[int] = None) -> Any:
+    """Create a streaming compressor.
+
+    Args:
+        compression: "gzip" or "zstd"
+        level: Compression level (default: 6 for gzip, 3 for zstd)
+
+    Returns:
+        Compressor with ``compress`` and ``flush`` methods
+
+    Raises:
+        ValueError: If the compression is unknown or its package is missing
+    """
+    if compression == "gzip":
+        return zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ValueError("zstandard is required for zstd output. Install with: pip install zstandard")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+    raise ValueError(f"Unsupported compression: {compression} (expected one of {', '.join(COMPRESSIONS)})")
+
+
+class CompressedWriter(io.RawIOBase):
+    """Binary stream compressing its chunks on a background thread."""
+
+    def __init__(self, raw: BinaryIO, compressor: Any):
+        """Initialize writer.
+
+        Args:
+            raw: Binary stream receiving the compressed data, closed with this stream
+            compressor: Compressor from ``create_compressor``
+        """
+        super().__init__()
+        self.raw = raw
+        self._compressor = compressor
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=_QUEUE_CHUNKS)
+        self._error: Optional[BaseException] = None
+        self._position = 0  # Uncompressed bytes received
+        self._thread = threading.Thread(target=self._run, name="rdfmap-compress", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if self._error is None:
+                try:
+                    if chunk is None:
+                        self.raw.write(self._compressor.flush())
+                    else:
+                        self.raw.write(self._compressor.compress(chunk))
+                except BaseException as e:  # Re-raised by the writing thread
+                    self._error = e
+            if chunk is None:
+                return
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        if self._error is not None:
+            raise self._error
+        chunk = bytes(data)
+        self._queue.put(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        """Number of uncompressed bytes written."""
+        return self._position
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._queue.put(None)
+            self._thread.join()
+            self.raw.close()
+        finally:
+            super().close()
+        if self._error is not None:
+            raise self._error
+
+
+def _open_raw(target: Union[str, Path], buffering: int) -> BinaryIO:
+    """Open a file, or standard output without closing its descriptor."""
+    if str(target) == STDOUT:
+        sys.stdout.flush()
+        return open(sys.stdout.fileno(), "wb", buffering=buffering, closefd=False)
+    return open(target, "wb", buffering=buffering)
+
+
+def open_output(
+    target: Union[str, Path],
+    mode: str = "wb",
+    compression: Optional[str] = "infer",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    encoding: str = "utf-8",
+    compression_level: Optional[int] = None,
+) -> IO:
+    """Open the output of a streaming writer.
+
+    Args:
+        target: Output path, or "-" for standard output
+        mode: "wb" for a binary stream, "w" for a text stream
+        compression: "gzip", "zstd", None, or "infer" to use the path's suffix
+        buffer_size: Write buffer size in bytes
+        encoding: Encoding of text streams
+        compression_level: Compression level (default: 6 for gzip, 3 for zstd)
+
+    Returns:
+        Writable file object; closing it flushes the buffer, finishes the
+        compressed stream and closes the file (standard output stays open)
+    """
+    if compression == "infer":
+        compression = None if str(target) == STDOUT else infer_compression(target)
+
+    if compression is None:
+        stream = _open_raw(target, buffer_size)
+    else:
+        compressor = create_compressor(compression, compression_level)
+        stream = io.BufferedWriter(CompressedWriter(_open_raw(target, -1), compressor), buffer_size)
+
+    if mode == "wb":
+        return stream
+    if mode == "w":
+        return io.TextIOWrapper(stream, encoding=encoding)
+    raise ValueError(f"Unsupported mode: {mode}")
@@ -1,16 +1,21 @@
 """Streaming RDF graph builder leveraging Polars' streaming capabilities."""
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Generator
+from typing import Any, Dict, List, Optional, Generator, Sequence
 import polars as pl
 from rdflib import Graph, Literal, Namespace, RDF, URIRef
 from rdflib.namespace import OWL
 
-from ..iri.generator import IRITemplate, curie_to_iri
+from ..iri.generator import IRITemplate
 from ..models.errors import ErrorSeverity, ProcessingReport
-from ..models.mapping import ColumnMapping, MappingConfig, SheetMapping
-from ..transforms.functions import apply_transform
-from ..validator.datatypes import validate_datatype
+from ..models.mapping import MappingConfig, SheetMapping
+from .mapping_plan import (
+    VECTORIZED_TRANSFORMS,
+    CompiledMapping,
+    LiteralRule,
+    SheetPlan,
+    resolve_term,
+)
 
 
 class StreamingRDFGraphBuilder:
@@ -26,6 +31,8 @@ class StreamingRDFGraphBuilder:
         self.config = config
         self.report = report
         self.graph = Graph()
+        self.compiled = CompiledMapping(config)
+        self._templates: Dict[str, IRITemplate] = {}
 
         # Track generated IRIs to detect duplicates
         self.iri_registry: Dict[str, List[int]] = {}
@@ -62,7 +69,7 @@ class StreamingRDFGraphBuilder:
         Yields:
             Number of triples generated in each batch
         """
-        from .streaming_parser import StreamingCSVParser
+        from ..parsers.streaming_parser import StreamingCSVParser
 
         parser = StreamingCSVParser(file_path)
 
@@ -105,18 +112,11 @@ class StreamingRDFGraphBuilder:
         Returns:
             Dictionary of column transforms
         """
-        transforms = {}
-
-        for column_name, column_mapping in sheet.columns.items():
-            if column_mapping.transform:
-                # Map our transform types to Polars-compatible operations
-                if column_mapping.transform in [
-                    "to_decimal", "to_integer", "to_date",
-                    "lowercase", "uppercase", "trim"
-                ]:
-                    transforms[column_name] = column_mapping.transform
-
-        return transforms
+        return {
+            rule.column: rule.transform_name
+            for rule in self.compiled.plan_for(sheet).columns
+            if rule.transform_name in VECTORIZED_TRANSFORMS
+        }
 
     def _process_streaming_batch(
         self,
@@ -135,25 +135,22 @@ class StreamingRDFGraphBuilder:
             Number of triples generated
         """
         initial_triples = len(self.graph)
+        plan = self.compiled.plan_for(sheet)
+        plan.bind(batch.columns)
+        base_iri = self.config.defaults.base_iri
 
-        # Convert batch to dictionaries for RDF processing
-        # Future optimization: implement direct Polars → RDF conversion
-        rows_data = batch.to_dicts()
-
-        # Process each row efficiently
-        for idx, row_data in enumerate(rows_data):
+        # Rows are tuples; the plan holds each rule's column position
+        for idx, row in enumerate(batch.iter_rows()):
             row_num = offset + idx + 1
+            context = dict(zip(plan.column_names, row))
+            context["base_iri"] = base_iri
 
             # Generate main resource
-            main_resource = self._add_row_resource_streaming(
-                sheet, row_data, row_num
-            )
+            main_resource = self._add_row_resource_streaming(plan, row, context, row_num)
 
             if main_resource:
                 # Add linked objects
-                self._add_linked_objects_streaming(
-                    main_resource, sheet, row_data, row_num
-                )
+                self._add_linked_objects_streaming(main_resource, plan, row, context, row_num)
 
                 self.report.total_rows += 1
 
@@ -161,55 +158,47 @@ class StreamingRDFGraphBuilder:
 
     def _add_row_resource_streaming(
         self,
-        sheet: SheetMapping,
-        row_data: Dict[str, Any],
+        plan: SheetPlan,
+        row: Sequence[Any],
+        context: Dict[str, Any],
         row_num: int,
     ) -> Optional[URIRef]:
         """Add main row resource with streaming optimizations."""
         # Generate IRI for main resource
-        resource_iri = self._generate_iri_fast(
-            sheet.row_resource.iri_template,
-            row_data,
-            row_num,
-        )
+        resource_iri = self._generate_iri_fast(plan.subject_template, context, row_num)
 
         if not resource_iri:
             self.report.failed_rows += 1
             return None
 
         # Add rdf:type efficiently
-        class_uri = self._resolve_property_fast(sheet.row_resource.class_type)
-        self.graph.add((resource_iri, RDF.type, class_uri))
+        for class_uri in plan.classes:
+            self.graph.add((resource_iri, RDF.type, class_uri))
         self.graph.add((resource_iri, RDF.type, OWL.NamedIndividual))
 
         # Add column properties with batched processing
-        self._add_column_properties_batch(
-            resource_iri, sheet.columns, row_data, row_num
-        )
+        self._add_column_properties_batch(resource_iri, plan.columns, row, row_num)
 
         return resource_iri
 
     def _add_column_properties_batch(
         self,
         resource_iri: URIRef,
-        columns: Dict[str, ColumnMapping],
-        row_data: Dict[str, Any],
+        rules: List[LiteralRule],
+        row: Sequence[Any],
         row_num: int,
     ) -> None:
         """Add column properties in batch for efficiency."""
-        # Pre-resolve property URIs for better performance
-        property_cache = {}
-
-        for column_name, column_mapping in columns.items():
-            if column_name not in row_data:
+        for rule in rules:
+            if rule.index < 0:
                 continue
 
-            value = row_data[column_name]
+            value = row[rule.index]
 
             # Skip empty required values
-            if column_mapping.required and (value is None or value == ""):
+            if rule.required and (value is None or value == ""):
                 self.report.add_error(
-                    f"Required column '{column_name}' is empty",
+                    f"Required column '{rule.column}' is empty",
                     row=row_num,
                     severity=ErrorSeverity.ERROR,
                 )
@@ -220,112 +209,73 @@ class StreamingRDFGraphBuilder:
                 continue
 
             # Apply custom transforms (non-Polars transforms)
-            if (column_mapping.transform and
-                column_mapping.transform not in [
-                    "to_decimal", "to_integer", "to_date",
-                    "lowercase", "uppercase", "trim"
-                ]):
+            if rule.transform is not None:
                 try:
-                    value = apply_transform(
-                        value, column_mapping.transform, row_data
-                    )
+                    value = rule.transform(value)
                 except Exception as e:
                     self.report.add_error(
-                        f"Transform '{column_mapping.transform}' failed: {e}",
+                        f"Transform '{rule.transform_name}' failed: {e}",
                         row=row_num,
                         severity=ErrorSeverity.WARNING,
                     )
                     continue
 
-            # Create literal efficiently
-            literal = self._create_literal_fast(
-                value,
-                datatype=column_mapping.datatype,
-                language=column_mapping.language or self.config.defaults.language,
-            )
+            literal = self._create_literal_fast(value, rule.datatype, rule.language)
 
             if literal is not None:
-                # Use cached property URI
-                prop_ref = column_mapping.as_property
-                if prop_ref not in property_cache:
-                    property_cache[prop_ref] = self._resolve_property_fast(prop_ref)
-
-                property_uri = property_cache[prop_ref]
-                self.graph.add((resource_iri, property_uri, literal))
+                self.graph.add((resource_iri, rule.predicate, literal))
 
     def _add_linked_objects_streaming(
         self,
         main_resource: URIRef,
-        sheet: SheetMapping,
-        row_data: Dict[str, Any],
+        plan: SheetPlan,
+        row: Sequence[Any],
+        context: Dict[str, Any],
         row_num: int,
     ) -> None:
         """Add linked objects with streaming optimizations."""
-        for obj_name, obj_mapping in sheet.objects.items():
-            # Check condition if specified
-            if hasattr(obj_mapping, 'condition') and obj_mapping.condition:
-                try:
-                    if not eval(obj_mapping.condition, {"__builtins__": {}}, row_data):
-                        continue
-                except Exception:
-                    continue
-
+        for obj in plan.objects:
             # Generate object IRI efficiently
-            object_iri = self._generate_iri_fast(
-                obj_mapping.iri_template,
-                row_data,
-                row_num,
-            )
+            object_iri = self._generate_iri_fast(obj.iri_template, context, row_num)
 
             if not object_iri:
                 continue
 
             # Add object class
-            class_uri = self._resolve_property_fast(obj_mapping.class_type)
-            self.graph.add((object_iri, RDF.type, class_uri))
+            for class_uri in obj.classes:
+                self.graph.add((object_iri, RDF.type, class_uri))
             self.graph.add((object_iri, RDF.type, OWL.NamedIndividual))
 
             # Add object properties efficiently
-            for prop_mapping in obj_mapping.properties:
-                column_name = prop_mapping.column
-                if column_name in row_data:
-                    value = row_data[column_name]
-
-                    if value is None or value == "":
-                        continue
-
-                    literal = self._create_literal_fast(
-                        value,
-                        datatype=prop_mapping.datatype,
-                        language=prop_mapping.language or self.config.defaults.language,
-                    )
+            for rule in obj.properties:
+                if rule.index < 0:
+                    continue
+                value = row[rule.index]
 
-                    if literal is not None:
-                        property_uri = self._resolve_property_fast(prop_mapping.as_property)
-                        self.graph.add((object_iri, property_uri, literal))
+                if value is None or value == "":
+                    continue
+
+                literal = self._create_literal_fast(value, rule.datatype, rule.language)
+
+                if literal is not None:
+                    self.graph.add((object_iri, rule.predicate, literal))
 
             # Link main resource to object
-            if obj_mapping.predicate:
-                link_uri = self._resolve_property_fast(obj_mapping.predicate)
-                self.graph.add((main_resource, link_uri, object_iri))
+            if obj.predicate is not None:
+                self.graph.add((main_resource, obj.predicate, object_iri))
 
     def _generate_iri_fast(
         self,
         template: str,
-        row_data: Dict[str, Any],
+        context: Dict[str, Any],
         row_num: int,
     ) -> Optional[URIRef]:
         """Fast IRI generation with minimal overhead."""
         try:
-            # Add base_iri to context
-            template_context = row_data.copy()
-            template_context["base_iri"] = self.config.defaults.base_iri
-
-            # Simple template rendering (could be optimized further)
-            iri_gen = IRITemplate(template)
-            iri = iri_gen.render(template_context)
-
-            return URIRef(iri)
+            iri_gen = self._templates.get(template)
+            if iri_gen is None:
+                iri_gen = self._templates[template] = IRITemplate(template)
+            return URIRef(iri_gen.render(context))
 
         except Exception as e:
             self.report.add_error(
@@ -337,18 +287,12 @@ class StreamingRDFGraphBuilder:
 
     def _resolve_property_fast(self, property_ref: str) -> URIRef:
         """Fast property resolution with caching."""
-        if ":" in property_ref and not property_ref.startswith("http"):
-            # CURIE - resolve with namespaces
-            iri = curie_to_iri(property_ref, self.config.namespaces)
-            return URIRef(iri)
-        else:
-            # Full IRI
-            return URIRef(property_ref)
+        return resolve_term(property_ref, self.config.namespaces)
 
     def _create_literal_fast(
         self,
         value: Any,
-        datatype: Optional[str] = None,
+        datatype: Optional[URIRef] = None,
         language: Optional[str] = None,
     ) -> Optional[Literal]:
         """Fast literal creation with minimal validation."""
@@ -359,10 +303,8 @@ class StreamingRDFGraphBuilder:
         if hasattr(value, 'item'):
             value = value.item()
 
-        if datatype:
-            # Quick datatype handling
-            dt_uri = self._resolve_property_fast(datatype)
-            return Literal(value, datatype=dt_uri)
+        if datatype is not None:
+            return Literal(value, datatype=datatype)
         elif language:
             return Literal(value, lang=language)
         else:
@@ -0,0 +1,240 @@
+"""Integer-interned in-memory triple store.
+
+``InternedTripleStore`` is an rdflib ``Store`` for aggregated conversions.
+The default Memory store keeps a tuple per triple and three nested indexes
+of dicts and sets, which costs hundreds of bytes per triple. This store
+interns each distinct term once into an integer ID and keeps the triples as
+three int64 columns:
+
+- added triples are appended to a growable ``array('q')`` buffer;
+- the first lookup after an add sorts the buffer into the (s, p, o) sorted,
+  duplicate-free columns (the SPO index), so subject lookups are binary
+  searches over contiguous arrays;
+- a (p, o, s) permutation is built on the first lookup by predicate and
+  dropped on the next add.
+
+Wrapped in ``Graph(store=InternedTripleStore())`` it serves the builder,
+reasoning, structural validation and the serializers through the usual
+Graph API. Contexts, quoted formulas and transactions are not supported.
+"""
+
+from array import array
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from rdflib.graph import Graph
+from rdflib.store import Store
+from rdflib.term import Identifier, Node, URIRef
+
+Triple = Tuple[Node, Node, Node]
+TriplePattern = Tuple[Optional[Node], Optional[Node], Optional[Node]]
+
+# Triples converted to rdflib terms per step when iterating a large match
+_ITER_BATCH = 65_536
+
+_EMPTY = np.empty(0, dtype=np.int64)
+# Contexts of every triple: the store has none
+_NO_CONTEXTS: Iterator[Optional[Graph]] = iter(())
+
+
+def _coalesce(*values: Any) -> Any:
+    for value in values:
+        if value is not None:
+            return value
+    return None
+
+
+class InternedTripleStore(Store):
+    """rdflib Store keeping triples as sorted int64 columns of interned term IDs."""
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = False
+    graph_aware = False
+
+    def __init__(self, configuration: Optional[str] = None, identifier: Optional[Identifier] = None):
+        """Initialize an empty store.
+
+        Args:
+            configuration: Unused, for rdflib's Store interface
+            identifier: Unused, for rdflib's Store interface
+        """
+        super().__init__(configuration, identifier)
+        self._ids: Dict[Node, int] = {}
+        self._terms: List[Node] = []
+        self._pending = array('q')
+        self._s = self._p = self._o = _EMPTY
+        self._pos: Optional[np.ndarray] = None  # Row order of the (p, o, s) sort
+        self._pos_p = _EMPTY
+        self._namespace: Dict[str, URIRef] = {}
+        self._prefix: Dict[URIRef, str] = {}
+
+    # Interning
+
+    def _id(self, term: Node) -> int:
+        term_id = self._ids.get(term)
+        if term_id is None:
+            term_id = self._ids[term] = len(self._terms)
+            self._terms.append(term)
+        return term_id
+
+    def _lookup(self, term: Optional[Node]) -> Optional[int]:
+        """ID of a bound pattern term, -1 for a term never added, None if unbound."""
+        if term is None:
+            return None
+        return self._ids.get(term, -1)
+
+    # Adding
+
+    def add(self, triple: Triple, context: Optional[Graph] = None, quoted: bool = False) -> None:
+        """Add a triple."""
+        s, p, o = triple
+        self._pending.extend((self._id(s), self._id(p), self._id(o)))
+
+    def addN(self, quads: Iterable[Tuple[Node, Node, Node, Optional[Graph]]]) -> None:  # noqa: N802 - rdflib interface
+        """Add (s, p, o, context) quads, ignoring the context."""
+        self.add_many((s, p, o) for s, p, o, _ in quads)
+
+    def add_many(self, triples: Iterable[Triple]) -> None:
+        """Add a batch of (subject, predicate, object) triples.
+
+        Args:
+            triples: Triples of rdflib terms
+        """
+        intern = self._id
+        self._pending.extend(term_id for s, p, o in triples for term_id in (intern(s), intern(p), intern(o)))
+
+    def remove(self, triple_pattern: TriplePattern, context: Optional[Graph] = None) -> None:
+        """Remove the triples matching a pattern."""
+        self._index()
+        ids = [self._lookup(term) for term in triple_pattern]
+        if -1 in ids:
+            return
+        keep = np.zeros(len(self._s), dtype=bool)
+        for column, term_id in zip((self._s, self._p, self._o), ids):
+            if term_id is not None:
+                keep |= column != term_id
+        if not keep.all():
+            self._s, self._p, self._o = self._s[keep], self._p[keep], self._o[keep]
+            self._pos = None
+
+    # Indexes
+
+    def _index(self) -> None:
+        """Merge added triples into the sorted, duplicate-free SPO columns."""
+        if not self._pending:
+            return
+        added = np.frombuffer(self._pending, dtype=np.int64).reshape(-1, 3)
+        s = np.concatenate([self._s, added[:, 0]])
+        p = np.concatenate([self._p, added[:, 1]])
+        o = np.concatenate([self._o, added[:, 2]])
+        self._pending = array('q')
+
+        order = np.lexsort((o, p, s))
+        s, p, o = s[order], p[order], o[order]
+        if len(s) > 1:
+            keep = np.empty(len(s), dtype=bool)
+            keep[0] = True
+            np.not_equal(s[1:], s[:-1], out=keep[1:])
+            keep[1:] |= p[1:] != p[:-1]
+            keep[1:] |= o[1:] != o[:-1]
+            if not keep.all():
+                s, p, o = s[keep], p[keep], o[keep]
+        self._s, self._p, self._o = s, p, o
+        self._pos = None
+
+    def _pos_index(self) -> np.ndarray:
+        """Row order of the (p, o, s) sort, built if needed."""
+        if self._pos is None:
+            self._pos = np.lexsort((self._s, self._o, self._p))
+            self._pos_p = self._p[self._pos]
+        return self._pos
+
+    def _match(self, s_id: Optional[int], p_id: Optional[int], o_id: Optional[int]) -> np.ndarray:
+        """Row numbers of the SPO columns matching a pattern of term IDs."""
+        self._index()
+        if s_id is not None:
+            lo, hi = np.searchsorted(self._s, [s_id, s_id + 1])
+            if p_id is not None:
+                lo, hi = lo + np.searchsorted(self._p[lo:hi], [p_id, p_id + 1])
+                if o_id is not None:
+                    lo, hi = lo + np.searchsorted(self._o[lo:hi], [o_id, o_id + 1])
+                return np.arange(lo, hi)
+            rows = np.arange(lo, hi)
+            return rows if o_id is None else rows[self._o[lo:hi] == o_id]
+        if p_id is not None:
+            pos = self._pos_index()
+            lo, hi = np.searchsorted(self._pos_p, [p_id, p_id + 1])
+            rows = pos[lo:hi]
+            if o_id is not None:
+                # Objects are sorted within a predicate
+                lo, hi = np.searchsorted(self._o[rows], [o_id, o_id + 1])
+                rows = rows[lo:hi]
+            return rows
+        if o_id is not None:
+            return np.flatnonzero(self._o == o_id)
+        return np.arange(len(self._s))
+
+    # Querying
+
+    def triples(
+        self, triple_pattern: TriplePattern, context: Optional[Graph] = None
+    ) -> Iterator[Tuple[Triple, Iterator[Optional[Graph]]]]:
+        """Yield ((s, p, o), contexts) for the triples matching a pattern."""
+        ids = [self._lookup(term) for term in triple_pattern]
+        if -1 in ids:
+            return
+        rows = self._match(*ids)
+        # Columns as of this call: triples added while iterating are not seen
+        subjects, predicates, objects, terms = self._s, self._p, self._o, self._terms
+        for start in range(0, len(rows), _ITER_BATCH):
+            batch = rows[start:start + _ITER_BATCH]
+            for s, p, o in zip(subjects[batch].tolist(), predicates[batch].tolist(), objects[batch].tolist()):
+                yield (terms[s], terms[p], terms[o]), _NO_CONTEXTS
+
+    def __contains__(self, triple: TriplePattern) -> bool:
+        """Whether a triple, or any triple matching a pattern, is in the store."""
+        ids = [self._lookup(term) for term in triple]
+        return -1 not in ids and len(self._match(*ids)) > 0
+
+    def __len__(self, context: Optional[Graph] = None) -> int:
+        """Number of distinct triples."""
+        self._index()
+        return len(self._s)
+
+    def contexts(self, triple: Optional[Triple] = None) -> Generator[Graph, None, None]:
+        """The store has no contexts."""
+        yield from ()
+
+    @property
+    def term_count(self) -> int:
+        """Number of distinct interned terms."""
+        return len(self._terms)
+
+    # Namespace bindings, as in rdflib's Memory store
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        bound_namespace = self._namespace.get(prefix)
+        bound_prefix = _coalesce(
+            self._prefix.get(namespace),
+            self._prefix.get(bound_namespace) if bound_namespace is not None else None,
+        )
+        if override:
+            if bound_prefix is not None:
+                del self._namespace[bound_prefix]
+            if bound_namespace is not None:
+                del self._prefix[bound_namespace]
+            self._prefix[namespace] = prefix
+            self._namespace[prefix] = namespace
+        else:
+            self._prefix[_coalesce(bound_namespace, namespace)] = _coalesce(bound_prefix, prefix)
+            self._namespace[_coalesce(bound_prefix, prefix)] = _coalesce(bound_namespace, namespace)
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return self._namespace.get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        return self._prefix.get(namespace)
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        yield from self._namespace.items()
@@ -0,0 +1,333 @@
+"""Turtle streaming writer for constant-memory TTL output.
+
+``TurtleStreamWriter`` has the interface of ``NTriplesStreamWriter``. It
+writes ``@prefix`` headers for the mapping namespaces up front, then each
+triple as it arrives: consecutive triples of the same subject are joined
+with ``;`` and consecutive objects of the same predicate with ``,``. IRIs
+are shortened to prefixed names by a character trie over the namespaces,
+so compacting an IRI costs one walk down its namespace part.
+
+Triples should arrive in subject order, as from the row engine, from a
+chunk of the columnar engine (each block is grouped by subject before it
+is written) or from the sorted runs of ``SortedRunWriter``. A subject that
+comes back later simply starts another statement, which is still valid
+Turtle.
+
+``TriGStreamWriter`` writes the same statements inside a ``<graph> { ... }``
+block per named graph set with ``set_graph``.
+"""
+
+import re
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Dict, Iterable, Optional, Tuple, Type, Union
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import RDF
+
+from .nt_streaming import escape_nt_string, sort_lines_by_subject
+from .sinks import open_output
+
+# Local names written as prefixed names: a conservative subset of PN_LOCAL
+_LOCAL_NAME = re.compile(r"^([A-Za-z0-9_]([A-Za-z0-9_.\-]*[A-Za-z0-9_\-])?)?$")
+
+_RDF_TYPE = str(RDF.type)
+
+# Predicates and datatypes compacted once; the cache stops growing at this size
+_CACHE_SIZE = 10_000
+
+
+class PrefixTrie:
+    """Longest-namespace matcher shortening IRIs to prefixed names."""
+
+    _END = ""  # Key of a node's (prefix, namespace) entry; never a character
+
+    def __init__(self, namespaces: Dict[str, str]):
+        """Initialize trie.
+
+        Args:
+            namespaces: Mapping of prefix to namespace IRI
+        """
+        self.root: Dict[str, Any] = {}
+        for prefix, namespace in namespaces.items():
+            node = self.root
+            for char in str(namespace):
+                node = node.setdefault(char, {})
+            node[self._END] = prefix
+
+    def match(self, iri: str) -> Optional[Tuple[str, int]]:
+        """Find the longest namespace an IRI starts with.
+
+        Args:
+            iri: IRI to look up
+
+        Returns:
+            Tuple of (prefix, namespace length), or None if no namespace matches
+        """
+        node = self.root
+        best = None
+        for i, char in enumerate(iri):
+            if self._END in node:
+                best = (node[self._END], i)
+            child = node.get(char)
+            if child is None:
+                return best
+            node = child
+        if self._END in node:
+            best = (node[self._END], len(iri))
+        return best
+
+    def compact(self, iri: str) -> str:
+        """Write an IRI as a prefixed name if possible.
+
+        Args:
+            iri: IRI to shorten
+
+        Returns:
+            ``prefix:local`` or ``<iri>``
+        """
+        found = self.match(iri)
+        if found is not None:
+            prefix, length = found
+            local = iri[length:]
+            if _LOCAL_NAME.match(local):
+                return f"{prefix}:{local}"
+        return f"<{iri}>"
+
+
+class TurtleStreamWriter:
+    """Turtle writer that streams subject-grouped statements directly to file."""
+
+    def __init__(
+        self,
+        output_path: Path,
+        namespaces: Optional[Dict[str, str]] = None,
+        encoding: str = 'utf-8',
+        compression: Optional[str] = "infer",
+    ):
+        """Initialize the Turtle stream writer.
+
+        Args:
+            output_path: Path to output TTL file, or "-" for standard output
+            namespaces: Mapping of prefix to namespace IRI used for @prefix headers
+            encoding: File encoding (default: utf-8)
+            compression: "gzip", "zstd", None, or "infer" from the file suffix
+        """
+        self.output_path = output_path
+        self.compression = compression
+        self.namespaces = {prefix: str(ns) for prefix, ns in (namespaces or {}).items()}
+        self.encoding = encoding
+        self.file_handle: Optional[IO[str]] = None
+        self.triple_count = 0
+        self.trie = PrefixTrie(self.namespaces)
+        self._cache: Dict[str, str] = {}
+        self._subject: Optional[str] = None
+        self._predicate: Optional[str] = None
+        self._indent = ""
+
+    def __enter__(self) -> "TurtleStreamWriter":
+        """Enter context manager."""
+        self.file_handle = open_output(self.output_path, "w", self.compression, encoding=self.encoding)
+        for prefix, namespace in self.namespaces.items():
+            self._write(f"@prefix {prefix}: <{namespace}> .\n")
+        if self.namespaces:
+            self._write("\n")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager."""
+        if self.file_handle:
+            self._end_statement()
+            self.file_handle.close()
+            self.file_handle = None
+        self._subject = self._predicate = None
+
+    def _write(self, text: str) -> None:
+        if self.file_handle is None:
+            raise RuntimeError("Writer not opened (use context manager)")
+        self.file_handle.write(text)
+
+    def _end_statement(self) -> None:
+        """Terminate the open statement, if any."""
+        if self._subject is not None:
+            self._write(" .\n")
+            self._subject = self._predicate = None
+
+    def _cached(self, iri: str) -> str:
+        """Compact a predicate or datatype IRI, remembering the result."""
+        term = self._cache.get(iri)
+        if term is None:
+            term = "a" if iri == _RDF_TYPE else self.trie.compact(iri)
+            if len(self._cache) < _CACHE_SIZE:
+                self._cache[iri] = term
+        return term
+
+    def _node(self, term: Union[URIRef, BNode]) -> str:
+        if isinstance(term, BNode):
+            return f"_:{term}"
+        return self.trie.compact(str(term))
+
+    def _emit(self, subject: str, predicate: str, obj: str) -> None:
+        """Write one triple of formatted terms, continuing the open statement if possible."""
+        if subject != self._subject:
+            if self._subject is not None:
+                self._write(" .\n\n")
+            self._write(f"{self._indent}{subject} {predicate} {obj}")
+            self._subject, self._predicate = subject, predicate
+        elif predicate != self._predicate:
+            self._write(f" ;\n{self._indent}    {predicate} {obj}")
+            self._predicate = predicate
+        else:
+            self._write(f", {obj}")
+        self.triple_count += 1
+
+    def write_triple(self, subject: URIRef, predicate: URIRef, obj: Union[URIRef, Literal]) -> None:
+        """Write a single triple to the TTL file.
+
+        Args:
+            subject: Subject URI
+            predicate: Predicate URI
+            obj: Object (URI or Literal)
+        """
+        if not self.file_handle:
+            raise RuntimeError("Writer not opened (use context manager)")
+
+        if isinstance(obj, Literal):
+            term = f'"{escape_nt_string(str(obj))}"'
+            if obj.language:
+                term += f"@{obj.language}"
+            elif obj.datatype:
+                term += f"^^{self._cached(str(obj.datatype))}"
+        else:
+            term = self._node(obj)
+        self._emit(self._node(subject), self._cached(str(predicate)), term)
+
+    def _nt_term(self, term: str) -> str:
+        """Compact the IRIs of an N-Triples object term."""
+        if term.startswith("<"):
+            return self.trie.compact(term[1:-1])
+        if term.startswith('"') and term.endswith(">"):
+            split = term.rindex('"^^<')
+            return f'{term[:split + 1]}^^{self._cached(term[split + 4:-1])}'
+        return term
+
+    def write_sorted_lines(self, lines: Iterable[str]) -> None:
+        """Write N-Triples lines that are already in subject order.
+
+        Args:
+            lines: N-Triples lines, with or without their newline
+        """
+        if not self.file_handle:
+            raise RuntimeError("Writer not opened (use context manager)")
+
+        subject_nt: Optional[str] = None
+        subject = ""
+        for line in lines:
+            s, p, rest = line.split(" ", 2)
+            if s != subject_nt:
+                subject_nt = s
+                subject = self.trie.compact(s[1:-1]) if s.startswith("<") else s
+            self._emit(subject, self._cached(p[1:-1]), self._nt_term(rest.rstrip("\n")[:-2]))
+
+    def write_lines(self, lines: Union[str, bytes], count: Optional[int] = None) -> None:
+        """Write a block of pre-formatted N-Triples lines, grouped by subject.
+
+        Args:
+            lines: Complete N-Triples lines, each terminated by a newline, as text or bytes
+            count: Number of triples in the block
+        """
+        self.write_sorted_lines(sort_lines_by_subject(lines))
+
+    def write_resource_triples(self, resource_iri: URIRef, triples: Dict[URIRef, Any]) -> None:
+        """Write all triples for a resource.
+
+        Args:
+            resource_iri: Subject IRI
+            triples: Dictionary of predicate -> object mappings
+        """
+        for predicate, obj in triples.items():
+            for value in (obj if isinstance(obj, list) else [obj]):
+                self.write_triple(resource_iri, predicate, value)
+
+    def get_triple_count(self) -> int:
+        """Get number of triples written.
+
+        Returns:
+            Number of triples written
+        """
+        return self.triple_count
+
+
+
+class TriGStreamWriter(TurtleStreamWriter):
+    """TriG writer that streams Turtle statements into one block per named graph.
+
+    A block is opened by the first triple after ``set_graph``, so graphs
+    without triples are not written. Triples of the default graph are
+    written outside any block.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        namespaces: Optional[Dict[str, str]] = None,
+        encoding: str = 'utf-8',
+        compression: Optional[str] = "infer",
+    ):
+        """Initialize the TriG stream writer.
+
+        Args:
+            output_path: Path to output TriG file, or "-" for standard output
+            namespaces: Mapping of prefix to namespace IRI used for @prefix headers
+            encoding: File encoding (default: utf-8)
+            compression: "gzip", "zstd", None, or "infer" from the file suffix
+        """
+        super().__init__(output_path, namespaces, encoding, compression)
+        self.graph: Optional[URIRef] = None
+        self._block: Optional[URIRef] = None  # Graph of the block written to
+        self._switch = False
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager, closing the open graph block."""
+        if self.file_handle and self._block is not None:
+            self._end_block()
+        super().__exit__(exc_type, exc_val, exc_tb)
+
+    def set_graph(self, graph: Optional[URIRef]) -> None:
+        """Set the named graph of the triples written next.
+
+        Args:
+            graph: Graph IRI, or None for the default graph
+        """
+        self.graph = graph
+        self._switch = graph != self._block
+
+    def _end_block(self) -> None:
+        ended = self._subject is not None
+        self._end_statement()
+        if self._block is not None:
+            self._write("}\n\n")
+            self._block = None
+            self._indent = ""
+        elif ended:
+            self._write("\n")
+
+    def _emit(self, subject: str, predicate: str, obj: str) -> None:
+        if self._switch:
+            self._switch = False
+            self._end_block()
+            if self.graph is not None:
+                self._write(f"{self.trie.compact(str(self.graph))} {{\n")
+                self._block = self.graph
+                self._indent = "    "
+        super()._emit(subject, predicate, obj)
@@ -2,6 +2,7 @@
 
 from typing import Dict, List, Optional, Any
 from pathlib import Path
+import itertools
 import polars as pl
 import re
 import json
@@ -10,6 +11,7 @@ import xml.etree.ElementTree as ET
 # Import Polars helper functions
 from .polars_helpers import (_infer_polars_type, _suggest_xsd_datatype_polars,
                            _is_likely_identifier_polars, _detect_pattern_polars)
+from ..parsers.xlsx_stream import iter_sheet_frames, open_workbook
 
 
 class DataFieldAnalysis:
@@ -142,43 +144,21 @@ class DataSourceAnalyzer:
             raise ValueError(f"Failed to analyze CSV file: {e}")
 
     def _analyze_excel(self) -> None:
-        """Analyze Excel data."""
+        """Analyze Excel data.
+
+        Reads the header and the first 100 rows of the first sheet from the
+        workbook shared with the parsers of its sheets (see ``open_workbook``).
+        """
         try:
-            # First, check if file has multiple sheets
-            try:
-                from openpyxl import load_workbook
-                wb = load_workbook(self.file_path, read_only=True)
-                self.sheet_count = len(wb.sheetnames)
-                self.has_multiple_sheets = self.sheet_count > 1
-                wb.close()
-            except ImportError:
-                # If openpyxl not available, assume single sheet
-                self.sheet_count = 1
-                self.has_multiple_sheets = False
-
-            # Read Excel file using Polars - use first sheet for now
-            try:
-                # Use sheet_id instead of sheet_name for compatibility
-                df = pl.read_excel(self.file_path, sheet_id=1)
-                df = df.head(100)  # Sample first 100 rows
-            except (ImportError, AttributeError, ValueError) as e:
-                # Fallback to openpyxl for Excel reading
-                from openpyxl import load_workbook
-                wb = load_workbook(self.file_path, read_only=True)
-                ws = wb.active
-
-                # Extract data as list of lists
-                data = []
-                for row in ws.iter_rows(values_only=True, max_row=101):  # Header + 100 rows
-                    data.append(list(row))
-
-                wb.close()
-
-                if data:
-                    columns = [str(col) if col is not None else f"Column_{i}" for i, col in enumerate(data[0])]
-                    df = pl.DataFrame(data[1:], schema=columns, strict=False)
-                else:
-                    return
+            workbook = open_workbook(self.file_path)
+            self.sheet_count = len(workbook.sheet_names)
+            self.has_multiple_sheets = self.sheet_count > 1
+
+            # Header + 100 rows of the first sheet
+            rows = itertools.islice(workbook.rows(), 101)
+            df = next(iter_sheet_frames(rows), None)
+            if df is None:
+                return
 
             self.total_rows = len(df)
 
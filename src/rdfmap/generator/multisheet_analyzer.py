@@ -6,9 +6,12 @@ enabling automatic generation of cross-sheet mappings and joins.
 
 from typing import Dict, List, Optional, Any
 from pathlib import Path
+import itertools
 import polars as pl
 from dataclasses import dataclass, field
 
+from ..parsers.xlsx_stream import iter_sheet_frames, open_workbook
+
 
 @dataclass
 class SheetInfo:
@@ -52,46 +55,35 @@ class MultiSheetAnalyzer:
         self._load_sheets()
 
     def _load_sheets(self):
-        """Load all sheets from the workbook."""
-        try:
-            from openpyxl import load_workbook
+        """Load all sheets from the workbook.
 
-            # Load workbook
-            wb = load_workbook(self.file_path, read_only=True, data_only=True)
+        The workbook is opened once and shared with the parsers of its
+        sheets (see ``open_workbook``); rows are streamed into the frames.
+        """
+        try:
+            workbook = open_workbook(self.file_path)
 
             # Process each sheet
-            for sheet_name in wb.sheetnames:
-                ws = wb[sheet_name]
+            for sheet_name in workbook.sheet_names:
+                rows = workbook.rows(sheet_name)
 
-                # Extract data
-                data = []
-                for row in ws.iter_rows(values_only=True):
-                    data.append(list(row))
-
-                if not data or len(data) < 2:
+                # First row is header
+                header = next(rows, None)
+                if header is None:
                     continue  # Skip empty sheets
 
-                # First row is header
-                columns = [str(col) if col is not None else f"Column_{i}"
-                          for i, col in enumerate(data[0])]
-
-                # Create DataFrame from remaining rows
-                rows = data[1:]
-                if rows:
-                    try:
-                        # Filter out rows that are all None
-                        valid_rows = [row for row in rows if any(cell is not None for cell in row)]
-
-                        if valid_rows:
-                            df = pl.DataFrame(valid_rows, schema=columns, orient="row")
-                            sheet_info = self._analyze_sheet(sheet_name, df, len(self.sheets))
-                            self.sheets[sheet_name] = sheet_info
-                    except Exception as e:
-                        # If DataFrame creation fails, skip this sheet
-                        print(f"Warning: Could not analyze sheet '{sheet_name}': {e}")
-                        continue
-
-            wb.close()
+                try:
+                    # Filter out rows that are all None
+                    valid_rows = (row for row in rows if any(cell is not None for cell in row))
+                    df = next(iter_sheet_frames(itertools.chain([header], valid_rows)))
+
+                    if len(df):
+                        sheet_info = self._analyze_sheet(sheet_name, df, len(self.sheets))
+                        self.sheets[sheet_name] = sheet_info
+                except Exception as e:
+                    # If DataFrame creation fails, skip this sheet
+                    print(f"Warning: Could not analyze sheet '{sheet_name}': {e}")
+                    continue
 
         except ImportError:
             raise ValueError("openpyxl is required for multi-sheet analysis. Install with: pip install openpyxl")
@@ -2,9 +2,14 @@
 
 import re
 from string import Formatter
-from typing import Any, Dict, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 from urllib.parse import quote
 
+import polars as pl
+
+# Characters that never need percent-encoding in an IRI path (plus "/")
+_PATH_UNSAFE_PATTERN = r"[^A-Za-z0-9_.~/\-]"
+
 
 class IRITemplate:
     """IRI template handler with variable substitution."""
@@ -96,6 +101,170 @@ class IRITemplate:
         return quote(iri, safe=":/#")
 
 
+def _encode_path_component(values: pl.Series) -> pl.Series:
+    """Stringify and percent-encode a column of IRI template values.
+
+    Produces the same text as ``str(value)`` followed by the per-segment
+    ``quote(..., safe="")`` used by ``IRITemplate._encode_iri``; only values
+    that actually contain unsafe characters go through ``quote``.
+    """
+    if values.dtype == pl.String:
+        text = values
+    elif values.dtype.is_integer() or values.dtype == pl.Date:
+        text = values.cast(pl.String)
+    else:
+        text = pl.Series(
+            values.name,
+            [None if value is None else str(value) for value in values.to_list()],
+            dtype=pl.String,
+        )
+
+    unsafe = text.str.contains(_PATH_UNSAFE_PATTERN).fill_null(False)
+    if unsafe.any():
+        indices = unsafe.arg_true()
+        encoded = [quote(value, safe="/") for value in text.gather(indices).to_list()]
+        text = text.scatter(indices, encoded)
+    return text
+
+
+class CompiledIRITemplate:
+    """IRI template compiled once into a Polars expression.
+
+    The template is parsed a single time; ``{base_iri}`` is folded in as a
+    constant and literal path segments are percent-encoded up front, so a
+    whole DataFrame's IRIs are rendered by one ``concat_str`` expression
+    instead of a ``format``/``quote`` call per row.
+    """
+
+    def __init__(self, template: str, base_iri: str = ""):
+        """Compile IRI template.
+
+        Args:
+            template: Template string with {variable} placeholders
+            base_iri: Base IRI to substitute for {base_iri} variable
+        """
+        self.template = template
+        self.base_iri = base_iri
+
+        # (is_column, text) segments with {base_iri} folded into literals
+        segments: List[Tuple[bool, str]] = []
+        vectorizable = True
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if literal:
+                segments.append((False, literal))
+            if field_name is None:
+                continue
+            if field_name == "base_iri":
+                segments.append((False, base_iri))
+            else:
+                segments.append((True, field_name))
+                if format_spec or conversion:
+                    vectorizable = False
+
+        self.variables: List[str] = list(dict.fromkeys(
+            text for is_column, text in segments if is_column
+        ))
+        self._segments = self._encode_literals(segments) if vectorizable else None
+        self.expr = self._build_expr()
+
+    @staticmethod
+    def _encode_literals(segments: List[Tuple[bool, str]]) -> Optional[List[Tuple[bool, str]]]:
+        """Pre-encode literal text, or return None if encoding depends on values.
+
+        ``IRITemplate._encode_iri`` leaves ``scheme://authority/`` untouched and
+        percent-encodes the path. That split is only known at compile time when
+        the literal prefix before the first variable already contains it.
+        """
+        prefix = ""
+        for is_column, text in segments:
+            if is_column:
+                break
+            prefix += text
+
+        if "://" not in prefix:
+            return None
+        authority_end = prefix.find("/", prefix.index("://") + 3)
+        if authority_end == -1:
+            return None
+
+        head = prefix[:authority_end + 1]
+        encoded: List[Tuple[bool, str]] = [(False, head)]
+        remaining = len(head)
+        for is_column, text in segments:
+            if is_column:
+                encoded.append((True, text))
+            elif remaining >= len(text):
+                remaining -= len(text)
+            else:
+                encoded.append((False, quote(text[remaining:], safe="/")))
+                remaining = 0
+        return encoded
+
+    def _build_expr(self) -> pl.Expr:
+        if not self.variables:
+            constant = IRITemplate(self.template, self.base_iri).render({})
+            return pl.lit(constant, dtype=pl.String)
+
+        if self._segments is None:
+            # Encoding boundaries depend on the values: render row by row
+            renderer = IRITemplate(self.template, self.base_iri)
+            rendered = pl.struct(self.variables).map_elements(
+                renderer.render, return_dtype=pl.String
+            )
+            return pl.when(self.null_mask_expr).then(None).otherwise(rendered)
+
+        parts = [
+            pl.col(text).map_batches(_encode_path_component, return_dtype=pl.String)
+            if is_column else pl.lit(text, dtype=pl.String)
+            for is_column, text in self._segments
+        ]
+        return pl.concat_str(parts)
+
+    @property
+    def null_mask_expr(self) -> pl.Expr:
+        """Expression that is True for rows with a null template variable."""
+        if not self.variables:
+            return pl.lit(False)
+        return pl.any_horizontal([pl.col(name).is_null() for name in self.variables])
+
+    def render(self, df: pl.DataFrame) -> Tuple[pl.Series, pl.Series]:
+        """Render the template for every row of a DataFrame.
+
+        Args:
+            df: DataFrame containing the template variables as columns
+
+        Returns:
+            Tuple of (IRI column, null mask). IRIs are null wherever the mask
+            is True, i.e. where at least one template variable is null.
+
+        Raises:
+            ValueError: If template variables are not columns of ``df``
+        """
+        missing = set(self.variables) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required variables for IRI template: {missing}")
+
+        # with_columns broadcasts constant templates to the frame height
+        result = df.with_columns(
+            self.expr.alias("__iri__"),
+            self.null_mask_expr.alias("__null_mask__"),
+        )
+        return result["__iri__"].alias("iri"), result["__null_mask__"].alias("null_mask")
+
+
+def compile_iri_template(template: str, base_iri: str = "") -> CompiledIRITemplate:
+    """Compile an IRI template into a reusable Polars expression.
+
+    Args:
+        template: Template string with {variable} placeholders
+        base_iri: Base IRI to substitute for {base_iri} variable
+
+    Returns:
+        Compiled template
+    """
+    return CompiledIRITemplate(template, base_iri)
+
+
 def validate_iri(iri: str) -> bool:
     """Validate that a string is a valid IRI.
     
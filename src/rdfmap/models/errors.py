@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -29,24 +29,29 @@ class ProcessingError(BaseModel):
 class ProcessingReport(BaseModel):
     """Report of processing execution."""
 
-    total_rows: int = Field(0, description="Total number of rows processed")
-    successful_rows: int = Field(0, description="Successfully processed rows")
-    failed_rows: int = Field(0, description="Failed rows")
-    warnings: int = Field(0, description="Number of warnings")
+    total_rows: int = Field(default=0, description="Total number of rows processed")
+    successful_rows: int = Field(default=0, description="Successfully processed rows")
+    failed_rows: int = Field(default=0, description="Failed rows")
+    warnings: int = Field(default=0, description="Number of warnings")
     errors: List[ProcessingError] = Field(default_factory=list, description="All errors")
     start_time: datetime = Field(default_factory=datetime.now, description="Processing start time")
-    end_time: Optional[datetime] = Field(None, description="Processing end time")
-    domain_violations: int = Field(0, description="Number of domain constraint violations")
-    range_violations: int = Field(0, description="Number of range/datatype constraint violations")
+    end_time: Optional[datetime] = Field(default=None, description="Processing end time")
+    domain_violations: int = Field(default=0, description="Number of domain constraint violations")
+    range_violations: int = Field(default=0, description="Number of range/datatype constraint violations")
+    datatype_violations: Dict[str, int] = Field(
+        default_factory=dict, description="Number of values per column that failed datatype validation"
+    )
     structural_samples: List[str] = Field(default_factory=list, description="Sample structural violation messages")
-    inferred_types: int = Field(0, description="Number of rdf:type inferences added")
-    inverse_links_added: int = Field(0, description="Number of inverse property triples materialized")
-    transitive_links_added: int = Field(0, description="Number of transitive property links materialized")
-    symmetric_links_added: int = Field(0, description="Number of symmetric property links materialized")
-    cardinality_violations: int = Field(0, description="Number of cardinality restriction violations")
-    min_cardinality_violations: int = Field(0, description="Number of minCardinality restriction violations")
-    max_cardinality_violations: int = Field(0, description="Number of maxCardinality restriction violations")
-    exact_cardinality_violations: int = Field(0, description="Number of exact cardinality restriction violations")
+    inferred_types: int = Field(default=0, description="Number of rdf:type inferences added")
+    inverse_links_added: int = Field(default=0, description="Number of inverse property triples materialized")
+    transitive_links_added: int = Field(default=0, description="Number of transitive property links materialized")
+    symmetric_links_added: int = Field(default=0, description="Number of symmetric property links materialized")
+    cardinality_violations: int = Field(default=0, description="Number of cardinality restriction violations")
+    min_cardinality_violations: int = Field(default=0, description="Number of minCardinality restriction violations")
+    max_cardinality_violations: int = Field(default=0, description="Number of maxCardinality restriction violations")
+    exact_cardinality_violations: int = Field(default=0, description="Number of exact cardinality restriction violations")
+    object_cache_hits: int = Field(default=0, description="Linked-object descriptions skipped as already streamed")
+    object_cache_misses: int = Field(default=0, description="Linked-object descriptions streamed and cached")
 
     def add_error(
         self,
@@ -76,6 +81,78 @@ class ProcessingReport(BaseModel):
         self.end_time = datetime.now()
         self.successful_rows = self.total_rows - self.failed_rows
 
+    def add_datatype_violations(
+        self,
+        column: str,
+        datatype: str,
+        count: int,
+        samples: Sequence[Tuple[Optional[int], Any]],
+    ) -> None:
+        """Record the values of a column that failed datatype validation.
+
+        Every invalid value counts as a warning, but only the first 10 per
+        column are kept as errors.
+
+        Args:
+            column: Column name
+            datatype: Datatype the values were validated against
+            count: Number of invalid values
+            samples: (row number, value) pairs of offending rows
+        """
+        if count <= 0:
+            return
+        previous = self.datatype_violations.get(column, 0)
+        self.datatype_violations[column] = previous + count
+        self.warnings += count
+
+        label = str(datatype).rsplit("#", 1)[-1]
+        for row, value in list(samples)[:max(0, 10 - previous)]:
+            self.errors.append(
+                ProcessingError(
+                    row=row,
+                    column=column,
+                    error=f"Datatype validation failed in column '{column}': {value!r} is not a valid {label}",
+                    severity=ErrorSeverity.WARNING,
+                    value=value,
+                )
+            )
+
+    def merge(self, other: "ProcessingReport", row_offset: int = 0) -> None:
+        """Fold the report of a separately processed part of a source into this one.
+
+        Used when a source is converted in shards: each shard numbers its rows
+        from 1, and ``row_offset`` (the number of rows before the shard) turns
+        them back into row numbers of the whole source.
+
+        Args:
+            other: Report of the shard
+            row_offset: Number of source rows preceding the shard
+        """
+        previous_violations = dict(self.datatype_violations)
+        kept_samples: Dict[str, int] = {}
+        for error in other.errors:
+            if error.column in other.datatype_violations and error.error.startswith("Datatype validation failed"):
+                # Keep at most 10 samples per column across all shards
+                kept = kept_samples.get(error.column, 0)
+                if previous_violations.get(error.column, 0) + kept >= 10:
+                    continue
+                kept_samples[error.column] = kept + 1
+            if error.row is not None and row_offset:
+                error = error.model_copy(update={"row": error.row + row_offset})
+            self.errors.append(error)
+
+        for column, count in other.datatype_violations.items():
+            self.datatype_violations[column] = self.datatype_violations.get(column, 0) + count
+
+        for name in (
+            "total_rows", "failed_rows", "warnings", "domain_violations", "range_violations",
+            "inferred_types", "inverse_links_added", "transitive_links_added", "symmetric_links_added",
+            "cardinality_violations", "min_cardinality_violations", "max_cardinality_violations",
+            "exact_cardinality_violations", "object_cache_hits", "object_cache_misses",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.structural_samples.extend(other.structural_samples[:max(0, 10 - len(self.structural_samples))])
+
     def add_structural_violation(self, message: str, is_domain: bool = False) -> None:
         if is_domain:
             self.domain_violations += 1
@@ -85,6 +162,21 @@ class ProcessingReport(BaseModel):
         if len(self.structural_samples) < 10:
             self.structural_samples.append(message)
 
+    def add_structural_violations(self, message: str, count: int, is_domain: bool = False) -> None:
+        """Record ``count`` triples breaking the same domain or range axiom.
+
+        Args:
+            message: Description of the violating mapping rule
+            count: Number of triples the rule produced
+            is_domain: Whether the domain (rather than the range) is violated
+        """
+        if is_domain:
+            self.domain_violations += count
+        else:
+            self.range_violations += count
+        if message not in self.structural_samples and len(self.structural_samples) < 10:
+            self.structural_samples.append(message)
+
     def add_cardinality_violation(self, message: str) -> None:
         self.cardinality_violations += 1
         if len(self.structural_samples) < 10:
@@ -13,6 +13,13 @@ class ErrorHandling(str, Enum):
     FAIL_FAST = "fail-fast"
 
 
+class TripleStoreType(str, Enum):
+    """In-memory stores for aggregated output."""
+
+    MEMORY = "memory"
+    INTERNED = "interned"
+
+
 class TransformType(str, Enum):
     """Built-in transformation types."""
 
@@ -114,7 +121,14 @@ class SheetMapping(BaseModel):
         None, description="Data format (csv, json, xml) - auto-detected if not specified"
     )
     filter_condition: Optional[str] = Field(
-        None, description="Optional condition to filter rows (not implemented in v1)"
+        None, description="SQL condition rows must meet to be converted (e.g. Status = 'Active')"
+    )
+    detect_duplicates: bool = Field(
+        False, description="Report subject IRIs generated for more than one row"
+    )
+    graph: Optional[str] = Field(
+        None,
+        description="Named graph IRI template of this sheet's triples ({base_iri}, {sheet}, {source})",
     )
 
 
@@ -148,6 +162,23 @@ class ProcessingOptions(BaseModel):
     output_format: Optional[str] = Field(
         None, description="Default output format (ttl, nt, xml, jsonld)"
     )
+    triple_store: TripleStoreType = Field(
+        TripleStoreType.MEMORY,
+        description="Store of aggregated triples: rdflib's memory store, or interned term IDs in numpy arrays",
+    )
+    write_buffer_mb: int = Field(4, description="Write buffer of streamed output, in MB")
+    typed_parsing: bool = Field(
+        True,
+        description="Parse columns into the types of their datatype or transform; invalid values become null and are reported",
+    )
+    object_cache_mb: Optional[int] = Field(
+        None,
+        description="Skip linked-object descriptions already streamed, remembering about this many MB of them",
+    )
+    memory_budget_mb: Optional[int] = Field(
+        None,
+        description="Aggregate nt/ttl output out of core through sorted runs on disk, using about this many MB of memory",
+    )
 
 
 class DefaultsConfig(BaseModel):
@@ -155,6 +186,15 @@ class DefaultsConfig(BaseModel):
 
     base_iri: str = Field(..., description="Base IRI for resource generation")
     language: Optional[str] = Field(None, description="Default language tag")
+    enable_reasoning: bool = Field(
+        True, description="Materialize ontology inferences when an ontology is given"
+    )
+    transitive_depth: Optional[int] = Field(
+        2, description="Longest transitive property chain to materialize (null for the full closure)"
+    )
+    graph: Optional[str] = Field(
+        None, description="Named graph IRI template of sheets without their own graph"
+    )
 
 
 class MappingConfig(BaseModel):
@@ -1,13 +1,474 @@
 """High-performance data source parsers using Polars for big data processing."""
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import time
 from pathlib import Path
-from typing import Generator, List, Optional, Any, Dict
+from typing import Generator, Iterable, List, Optional, Any, Dict, Sequence, Set, Tuple
+import io
+import itertools
 import json
 import xml.etree.ElementTree as ET
 
 import polars as pl
 
+from .json_flatten import ChildColumns, child_columns, flatten_frame
+from .json_stream import iter_json_batches, parse_json_path
+from .xlsx_stream import header_names, iter_sheet_frames, open_workbook
+from .xml_stream import iter_row_elements
+
+# Records flattened at a time when a JSON source is read whole
+JSON_BATCH_RECORDS = 10_000
+# Records of a JSON or JSON Lines source its column types are inferred from
+JSON_SCHEMA_ROWS = 10_000
+
+
+def rebatch_frames(
+    frames: Iterable[pl.DataFrame], chunk_size: int
+) -> Generator[pl.DataFrame, None, None]:
+    """Re-slice a stream of DataFrames into frames of exactly ``chunk_size`` rows.
+
+    Readers are free to hand back batches of any size; downstream row
+    numbering and ``--limit`` handling assume the configured chunk size, so
+    every frame except the last one has exactly ``chunk_size`` rows.
+
+    Args:
+        frames: DataFrames in source order; columns missing from some frames are null there
+        chunk_size: Number of rows per yielded frame
+
+    Yields:
+        DataFrames of ``chunk_size`` rows (the last one may be shorter)
+    """
+    pending: List[pl.DataFrame] = []
+    pending_rows = 0
+
+    for frame in frames:
+        if frame.height == 0:
+            continue
+        pending.append(frame)
+        pending_rows += frame.height
+
+        if pending_rows < chunk_size:
+            continue
+
+        buffer = pl.concat(pending, how="diagonal_relaxed") if len(pending) > 1 else pending[0]
+        offset = 0
+        while buffer.height - offset >= chunk_size:
+            yield buffer.slice(offset, chunk_size)
+            offset += chunk_size
+
+        remainder = buffer.slice(offset)
+        pending = [remainder] if remainder.height else []
+        pending_rows = remainder.height
+
+    if pending_rows:
+        yield pl.concat(pending, how="diagonal_relaxed") if len(pending) > 1 else pending[0]
+
+
+def iter_lazy_batches(
+    lazy_frame: pl.LazyFrame, chunk_size: int
+) -> Generator[pl.DataFrame, None, None]:
+    """Collect a LazyFrame incrementally as ``chunk_size``-row DataFrames.
+
+    Uses the streaming engine's batch iterator so the query (scan, filters,
+    projections) is executed once, front to back, instead of being re-run
+    with a growing ``slice`` offset for every chunk.
+
+    Polars releases without ``LazyFrame.collect_batches`` collect the whole
+    result first, so memory is not bounded by the chunk size there; CSV
+    sources avoid this fallback by reading through ``pl.read_csv_batched``
+    (see ``CSVParser._iter_batches``).
+
+    Args:
+        lazy_frame: Query to execute
+        chunk_size: Number of rows per yielded frame
+
+    Yields:
+        DataFrames of ``chunk_size`` rows (the last one may be shorter)
+    """
+    if hasattr(lazy_frame, "collect_batches"):
+        batches = lazy_frame.collect_batches(chunk_size=chunk_size)
+    else:
+        batches = lazy_frame.collect(streaming=True).iter_slices(chunk_size)
+    yield from rebatch_frames(batches, chunk_size)
+
+
+# Prefix of the columns holding the source text of values that did not parse
+INVALID_PREFIX = "__invalid__:"
+# Column of the 0-based position of each row in the source, taken before a filter
+SOURCE_ROW = "__source_row__"
+
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def typed_values_expr(column: str, dtype: pl.DataType, source: pl.DataType = pl.String()) -> pl.Expr:
+    """Convert a column to ``dtype``, with null where a value does not convert.
+
+    Text is parsed as the datatype validators read it: numbers may be
+    surrounded by whitespace, booleans are true/false/1/0 in any case and
+    dates use ``DATE_FORMAT``. Columns of other types are converted from
+    their values: datetimes at midnight become dates, floats without a
+    fraction become integers and 1/0 become booleans.
+
+    Args:
+        column: Column name
+        dtype: Type to convert to
+        source: Type the column has in the source
+
+    Returns:
+        Expression of the converted column
+    """
+    if source != pl.String:
+        values = pl.col(column)
+        if dtype == pl.String:
+            return values.cast(pl.String)
+        if dtype == pl.Boolean and source.is_numeric():
+            return pl.when(values == 1).then(True).when(values == 0).then(False).otherwise(None)
+        if dtype == pl.Date and source == pl.Datetime:
+            return pl.when(values.dt.time() == time(0)).then(values.dt.date()).otherwise(None)
+        if dtype.is_integer() and source.is_float():
+            return pl.when(values == values.floor()).then(values.cast(dtype, strict=False)).otherwise(None)
+        return values.cast(dtype, strict=False)
+
+    text = pl.col(column)
+    if dtype == pl.Boolean:
+        lower = text.str.to_lowercase()
+        return (
+            pl.when(lower.is_in(["true", "1"])).then(True)
+            .when(lower.is_in(["false", "0"])).then(False)
+            .otherwise(None)
+        )
+    if dtype == pl.Date:
+        return text.str.to_date(DATE_FORMAT, strict=False)
+    if dtype == pl.Datetime:
+        return text.str.strptime(pl.Datetime, DATETIME_FORMAT, strict=False)
+    return text.str.strip_chars().cast(dtype, strict=False)
+
+
+@dataclass
+class ScanPlan:
+    """Columns, row filter and row limit pushed down into a source scan.
+
+    Applied to a LazyFrame, the plan becomes scan -> typed parsing ->
+    filter -> select -> limit, so that Polars reads only the projected
+    columns and stops reading once ``limit`` rows passed the filter.
+
+    Columns of ``dtypes`` are read as text and parsed once into their type;
+    sources that give a column a type of its own are converted from it.
+    Values that do not convert become null; their source text is kept in an
+    ``INVALID_PREFIX + column`` column, null where the value converted, so
+    that they can be reported. Columns of ``keep_text`` read as text stay
+    text, for values a type would lose part of, such as a date's timezone.
+
+    With a filter, the position of each row in the source is taken before
+    the filter into a ``SOURCE_ROW`` column, so that the rows that pass are
+    reported under their source row numbers.
+
+    ``nested`` lists the columns only linked objects read. Parsers of
+    nested sources keep an array only these point into as child records
+    instead of repeating the parent row per element: a list column named
+    after the array, whose structs hold those columns of each element.
+    """
+
+    columns: Optional[Sequence[str]] = None  # None keeps every column
+    predicate: Optional[pl.Expr] = None
+    limit: Optional[int] = None
+    dtypes: Dict[str, pl.DataType] = field(default_factory=dict)
+    nested: Sequence[str] = ()
+    keep_text: Sequence[str] = ()
+    # Source rows the last apply_frames read, before the filter
+    rows_read: int = field(default=0, init=False, compare=False)
+
+    def paths(self) -> Optional[Set[str]]:
+        """Columns the plan reads, filter columns included; None for every column."""
+        if self.columns is None:
+            return None
+        paths = set(self.columns)
+        if self.predicate is not None:
+            paths.update(self.predicate.meta.root_names())
+        return paths
+
+    def parent_paths(self) -> Set[str]:
+        """Columns read for the rows themselves, rather than for child records."""
+        return (self.paths() or set()) - set(self.nested)
+
+    def holds_children(self, dtype: pl.DataType) -> bool:
+        """Whether a column of this type holds child records of nested columns."""
+        return (
+            isinstance(dtype, pl.List) and isinstance(dtype.inner, pl.Struct)
+            and any(item.name in self.nested for item in dtype.inner.fields)
+        )
+
+    def apply(self, lazy_frame: pl.LazyFrame, limit: bool = True, row_offset: int = 0) -> pl.LazyFrame:
+        """Add the plan to a query.
+
+        Columns the source does not have are left out of the projection, so
+        that the builders report them as they do for unprojected frames.
+
+        Args:
+            lazy_frame: Query over the source
+            limit: Whether to apply the row limit
+            row_offset: Source position of the query's first row
+
+        Returns:
+            Query with the plan applied
+
+        Raises:
+            ValueError: If the filter references a column the source does not have
+        """
+        if self.predicate is not None:
+            lazy_frame = lazy_frame.with_row_index(SOURCE_ROW, offset=row_offset)
+        schema = lazy_frame.collect_schema()
+        names = schema.names()
+        typed = {
+            name: dtype for name, dtype in self.dtypes.items()
+            if name in schema and schema[name] != dtype
+            and not (schema[name] == pl.String and name in self.keep_text)
+        }
+        if typed:
+            parsed = {name: typed_values_expr(name, dtype, schema[name]) for name, dtype in typed.items()}
+            lazy_frame = lazy_frame.with_columns(
+                [expr.alias(name) for name, expr in parsed.items()]
+                + [
+                    pl.when(pl.col(name).is_not_null() & expr.is_null())
+                    .then(pl.col(name).cast(pl.String))
+                    .alias(INVALID_PREFIX + name)
+                    for name, expr in parsed.items()
+                ]
+            )
+            names = names + [INVALID_PREFIX + name for name in typed]
+        if self.predicate is not None:
+            missing = set(self.predicate.meta.root_names()) - set(names)
+            if missing:
+                raise ValueError(
+                    f"filter_condition references unknown column(s): {', '.join(sorted(missing))}"
+                )
+            lazy_frame = lazy_frame.filter(self.predicate)
+        if self.columns is not None:
+            wanted = set(self.columns) | {INVALID_PREFIX + name for name in typed} | {SOURCE_ROW}
+            selected = [
+                name for name in names
+                if name in wanted or (name in schema and self.holds_children(schema[name]))
+            ]
+            if selected:  # Selecting no column would drop the rows too
+                lazy_frame = lazy_frame.select(selected)
+        if limit and self.limit is not None:
+            lazy_frame = lazy_frame.head(self.limit)
+        return lazy_frame
+
+    def apply_frames(
+        self, frames: Iterable[pl.DataFrame]
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Apply the plan to a stream of eagerly read frames.
+
+        Args:
+            frames: DataFrames in source order
+
+        Yields:
+            Filtered, projected frames, up to ``limit`` rows in total
+        """
+        remaining = self.limit
+        filter_columns = self.predicate.meta.root_names() if self.predicate is not None else []
+        self.rows_read = row_offset = 0
+        for frame in frames:
+            if remaining is not None and remaining <= 0:
+                return
+            # Records of semi-structured sources may lack a key in a whole chunk
+            missing = [name for name in filter_columns if name not in frame.columns]
+            if missing:
+                frame = frame.with_columns([pl.lit(None).alias(name) for name in missing])
+            height = frame.height
+            frame = self.apply(frame.lazy(), limit=False, row_offset=row_offset).collect()
+            self.rows_read = row_offset = row_offset + height
+            if remaining is not None:
+                frame = frame.head(remaining)
+                remaining -= frame.height
+            yield frame
+
+
+def iter_query(
+    lazy_frame: pl.LazyFrame, chunk_size: Optional[int]
+) -> Generator[pl.DataFrame, None, None]:
+    """Collect a query as ``chunk_size``-row DataFrames, or whole if chunk_size is None."""
+    if chunk_size:
+        yield from iter_lazy_batches(lazy_frame, chunk_size)
+    else:
+        yield lazy_frame.collect()
+
+
+def collect_frames(
+    frames: Iterable[pl.DataFrame], chunk_size: Optional[int]
+) -> Generator[pl.DataFrame, None, None]:
+    """Re-slice frames into ``chunk_size``-row DataFrames, or concatenate them if chunk_size is None."""
+    if chunk_size:
+        yield from rebatch_frames(frames, chunk_size)
+        return
+    frames = list(frames)
+    if frames:
+        yield pl.concat(frames, how="diagonal_relaxed")
+
+
+def conform_frame(frame: pl.DataFrame, schema: Dict[str, pl.DataType]) -> pl.DataFrame:
+    """Cast the columns of a chunk to the types inferred for the whole source.
+
+    Chunks of sources that are typed a chunk at a time would otherwise give
+    a column, and so its literals, a type that depends on the chunk size
+    (``100`` in one chunk, ``100.0`` in the next). Values that do not fit the
+    inferred type without loss make their column text, which keeps their
+    lexical form. Columns the schema does not know, or types it left open
+    (nulls, nested values), are kept as they are.
+
+    Args:
+        frame: Chunk of a source
+        schema: Column types inferred from a sample of the source
+
+    Returns:
+        Chunk with the schema's column types where they fit
+    """
+    columns = []
+    for name, dtype in frame.schema.items():
+        target = schema.get(name)
+        if target is None or target == dtype or target == pl.Null or target.is_nested() or dtype.is_nested():
+            continue
+        column = frame[name]
+        try:
+            cast = column.cast(target)
+            if dtype != pl.Null and not cast.cast(dtype).equals(column):
+                cast = column.cast(pl.String)
+        except pl.exceptions.PolarsError:
+            cast = column.cast(pl.String)
+        columns.append(cast)
+    return frame.with_columns(columns) if columns else frame
+
+
+def flatten_structs(lazy_frame: pl.LazyFrame, separator: str = ".") -> pl.LazyFrame:
+    """Replace struct columns by a column per field, named ``parent.field``.
+
+    Args:
+        lazy_frame: Query whose columns may hold (nested) structs
+        separator: Separator of the parent and field names
+
+    Returns:
+        Query without struct columns
+    """
+    schema = lazy_frame.collect_schema()
+    while any(isinstance(dtype, pl.Struct) for dtype in schema.values()):
+        columns: List[pl.Expr] = []
+        for name, dtype in schema.items():
+            if isinstance(dtype, pl.Struct):
+                columns.extend(
+                    pl.col(name).struct.field(item.name).alias(f"{name}{separator}{item.name}")
+                    for item in dtype.fields
+                )
+            else:
+                columns.append(pl.col(name))
+        lazy_frame = lazy_frame.select(columns)
+        schema = lazy_frame.collect_schema()
+    return lazy_frame
+
+
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def find_record_starts(
+    file_path: Path, targets: Iterable[int], quote_char: bytes = b'"', block_size: int = CSV_BLOCK_SIZE
+) -> List[int]:
+    """Find the CSV record boundaries nearest to (at or after) byte offsets.
+
+    The file is read once, front to back, tracking whether each position is
+    inside a quoted field, so newlines embedded in quoted values are never
+    mistaken for record ends. Escaped quotes ("") flip the state twice and
+    need no special handling.
+
+    Args:
+        file_path: Path to CSV file
+        targets: Byte offsets to align
+        quote_char: Quote character of the file
+        block_size: Bytes read at a time
+
+    Returns:
+        Sorted, de-duplicated offsets of the first record starting after each
+        target (the file size when the last record follows a target); targets
+        in the last, unterminated record are dropped
+    """
+    pending = sorted(set(targets))
+    starts: List[int] = []
+    in_quotes = False
+    block_start = 0
+
+    with open(file_path, "rb") as handle:
+        while pending:
+            block = handle.read(block_size)
+            if not block:
+                break
+            cursor = 0  # Quote state is known up to here
+            while pending and pending[0] < block_start + len(block):
+                search = max(pending[0] - block_start, cursor)
+                in_quotes ^= bool(block.count(quote_char, cursor, search) & 1)
+                cursor = search
+                found = None
+                while True:
+                    newline = block.find(b"\n", cursor)
+                    if newline < 0:
+                        break
+                    in_quotes ^= bool(block.count(quote_char, cursor, newline) & 1)
+                    cursor = newline + 1
+                    if not in_quotes:
+                        found = block_start + cursor
+                        break
+                if found is None:
+                    break  # Keep looking in the next block
+                starts.append(found)
+                while pending and pending[0] < found:
+                    pending.pop(0)
+            in_quotes ^= bool(block.count(quote_char, cursor) & 1)
+            block_start += len(block)
+
+    return sorted(set(starts))
+
+
+def iter_record_blocks(
+    file_path: Path, start: int, end: int, quote_char: bytes = b'"', block_size: int = CSV_BLOCK_SIZE
+) -> Generator[bytes, None, None]:
+    """Read a byte range of a CSV file as blocks of whole records.
+
+    Args:
+        file_path: Path to CSV file
+        start: Offset of the first record of the range
+        end: Offset just past the last record of the range
+        quote_char: Quote character of the file
+        block_size: Approximate bytes per block
+
+    Yields:
+        Byte strings each holding complete records
+    """
+    carry = b""
+    with open(file_path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = handle.read(min(block_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            buffer = carry + data
+            if remaining <= 0:
+                carry = buffer
+                break
+            # The buffer starts at a record boundary, so a newline preceded by
+            # an even number of quotes ends a record
+            cut = buffer.rfind(b"\n")
+            while cut >= 0 and buffer.count(quote_char, 0, cut) & 1:
+                cut = buffer.rfind(b"\n", 0, cut)
+            if cut < 0:
+                carry = buffer
+                continue
+            yield buffer[:cut + 1]
+            carry = buffer[cut + 1:]
+    if carry:
+        yield carry
+
 
 class DataSourceParser(ABC):
     """Abstract base class for data source parsers using Polars."""
@@ -24,6 +485,22 @@ class DataSourceParser(ABC):
         """Get list of column names."""
         pass
 
+    def parse_plan(
+        self, plan: ScanPlan, chunk_size: Optional[int] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Parse only the rows and columns a sheet mapping needs.
+
+        Parsers without a lazy reader apply the plan to each parsed chunk.
+
+        Args:
+            plan: Columns, filter and limit to push into the scan
+            chunk_size: Number of rows per chunk. If None, load all rows.
+
+        Yields:
+            Polars DataFrames containing the planned rows and columns
+        """
+        yield from collect_frames(plan.apply_frames(self.parse(chunk_size)), chunk_size)
+
 
 class CSVParser(DataSourceParser):
     """High-performance CSV parser using Polars."""
@@ -34,6 +511,8 @@ class CSVParser(DataSourceParser):
         delimiter: str = ",",
         has_header: bool = True,
         encoding: str = "utf8",
+        byte_range: Optional[Tuple[int, int]] = None,
+        schema: Optional[Dict[str, pl.DataType]] = None,
     ):
         """Initialize CSV parser.
 
@@ -42,88 +521,203 @@ class CSVParser(DataSourceParser):
             delimiter: Column delimiter
             has_header: Whether first row is header
             encoding: File encoding
+            byte_range: Only parse the records in this (start, end) byte range,
+                as returned by split_byte_ranges()
+            schema: Column schema to use instead of inferring one; shards of
+                a file should share the schema of the whole file
         """
         self.file_path = file_path
         self.delimiter = delimiter
         self.has_header = has_header
         self.encoding = encoding
+        self.byte_range = byte_range
 
         if not self.file_path.exists():
             raise FileNotFoundError(f"CSV file not found: {self.file_path}")
 
+        if byte_range is not None and schema is None:
+            schema = dict(self.scan().collect_schema())
+        self.schema = schema
+
+    def _read_options(self) -> Dict[str, Any]:
+        """Polars read options shared by the eager, lazy and batched readers."""
+        return {
+            "separator": self.delimiter,
+            "has_header": self.has_header,
+            "encoding": self.encoding if self.encoding in ['utf8', 'utf8-lossy'] else 'utf8',
+            "null_values": [""],
+            "ignore_errors": True,
+        }
+
+    def scan(self, text_columns: Sequence[str] = ()) -> pl.LazyFrame:
+        """Lazily scan the CSV file without reading any data.
+
+        Args:
+            text_columns: Columns to read as text instead of inferring their type
+        """
+        scan = pl.scan_csv(self.file_path, **self._read_options())
+        overrides = self._text_overrides(scan.collect_schema(), text_columns)
+        if not overrides:
+            return scan
+        return pl.scan_csv(self.file_path, schema_overrides=overrides, **self._read_options())
+
+    @staticmethod
+    def _text_overrides(schema: Dict[str, pl.DataType], text_columns: Sequence[str]) -> Dict[str, pl.DataType]:
+        return {name: pl.String() for name in text_columns if name in schema and schema[name] != pl.String}
+
     def parse(
         self, chunk_size: Optional[int] = None
     ) -> Generator[pl.DataFrame, None, None]:
         """Parse CSV file and yield Polars DataFrames.
 
+        Chunked parsing is a single pass over the file: the reader keeps its
+        position between chunks instead of re-scanning from byte 0, and the
+        schema inferred from the header is reused for every chunk.
+
         Args:
             chunk_size: Number of rows per chunk. If None, load entire file.
 
         Yields:
             Polars DataFrames containing parsed data
         """
+        if self.byte_range is not None:
+            yield from self._iter_range(chunk_size)
+        elif chunk_size:
+            yield from self._iter_batches(chunk_size)
+        else:
+            yield pl.read_csv(self.file_path, **self._read_options())
+
+    def parse_plan(
+        self, plan: ScanPlan, chunk_size: Optional[int] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Parse only the rows and columns a sheet mapping needs.
+
+        Byte ranges are read eagerly, block by block, so the plan is applied
+        to each block; whole files go through the lazy scan.
+
+        Args:
+            plan: Columns, filter and limit to push into the scan
+            chunk_size: Number of rows per chunk. If None, load all rows.
+
+        Yields:
+            Polars DataFrames containing the planned rows and columns
+        """
+        if self.byte_range is None:
+            if chunk_size and not hasattr(pl.LazyFrame, "collect_batches"):
+                # Keep memory bounded by the chunk size on older Polars releases
+                frames = plan.apply_frames(self._iter_batches(chunk_size, list(plan.dtypes)))
+                yield from rebatch_frames(frames, chunk_size)
+                return
+            yield from iter_query(plan.apply(self.scan(list(plan.dtypes))), chunk_size)
+            return
+        frames = plan.apply_frames(self._iter_range(None, blocks=True, text_columns=list(plan.dtypes)))
         if chunk_size:
-            # Get column names from header once
-            if self.has_header:
-                header_df = pl.read_csv(
-                    self.file_path,
-                    separator=self.delimiter,
-                    has_header=True,
-                    n_rows=0,  # Just get column names
-                )
-                column_names = header_df.columns
-            else:
-                column_names = None
+            yield from rebatch_frames(frames, chunk_size)
+            return
+        collected = list(frames)
+        if collected:
+            yield pl.concat(collected, how="vertical_relaxed")
 
-            # True chunked processing without pre-loading entire dataset
-            offset = 0
-            skip_rows_start = 1 if self.has_header else 0  # Skip header row
+    def split_byte_ranges(self, parts: int) -> List[Tuple[int, int]]:
+        """Split the data records of the file into byte ranges of similar size.
 
-            while True:
-                # Read chunk directly without pre-calculating total rows
-                try:
-                    # Calculate how many rows to skip (header + previously read data rows)
-                    actual_skip = skip_rows_start + offset
-
-                    chunk = pl.read_csv(
-                        self.file_path,
-                        separator=self.delimiter,
-                        has_header=False,  # Don't treat any row as header
-                        encoding=self.encoding if self.encoding in ['utf8', 'utf8-lossy'] else 'utf8',
-                        null_values=[""],
-                        ignore_errors=True,
-                        skip_rows=actual_skip,
-                        n_rows=chunk_size,
-                    )
-
-                    if len(chunk) == 0:
-                        break
+        Range boundaries fall on record starts (quoted newlines are handled),
+        and the header row is excluded, so each range can be parsed on its
+        own with ``CSVParser(..., byte_range=r, schema=...)``.
 
-                    # Apply column names if we have header
-                    if column_names:
-                        chunk = chunk.rename({f"column_{i+1}": name for i, name in enumerate(column_names)})
+        Args:
+            parts: Desired number of ranges
 
-                    yield chunk
-                    offset += len(chunk)
+        Returns:
+            (start, end) byte offsets; fewer than ``parts`` for small files
+        """
+        size = self.file_path.stat().st_size
+        data_start = 0
+        if self.has_header:
+            header_end = find_record_starts(self.file_path, [0])
+            data_start = header_end[0] if header_end else size
 
-                    # If we got fewer rows than requested, we've reached the end
-                    if len(chunk) < chunk_size:
-                        break
+        step = (size - data_start) / max(parts, 1)
+        targets = [int(data_start + step * i) for i in range(1, parts)]
+        starts = [b for b in find_record_starts(self.file_path, targets) if data_start < b < size]
+
+        bounds = [data_start] + starts + [size]
+        return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+    def _iter_range(
+        self,
+        chunk_size: Optional[int],
+        blocks: bool = False,
+        text_columns: Sequence[str] = (),
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Yield the records of ``byte_range`` with the shared schema.
 
-                except Exception as e:
-                    # Silent break on empty CSV or EOF
-                    break
+        Args:
+            chunk_size: Number of rows per chunk. If None, one frame of all records.
+            blocks: Yield one frame per block read instead (``chunk_size`` is ignored)
+            text_columns: Columns to read as text instead of with the shared schema's type
+        """
+        if self.byte_range is None or self.schema is None:
+            raise ValueError("Parser was not created for a byte range")
+        options = {**self._read_options(), "has_header": False}
+        start, end = self.byte_range
+        schema = {**self.schema, **self._text_overrides(self.schema, text_columns)}
+        frames = (
+            pl.read_csv(io.BytesIO(block), schema=schema, **options)
+            for block in iter_record_blocks(self.file_path, start, end)
+        )
+        if blocks:
+            empty = True
+            for frame in frames:
+                empty = False
+                yield frame
+            if empty:
+                yield pl.DataFrame(schema=schema)
+            return
+        if chunk_size:
+            yield from rebatch_frames(frames, chunk_size)
+            return
+        collected = list(frames)
+        if collected:
+            yield pl.concat(collected, how="vertical_relaxed")
         else:
-            # Load entire file using lazy evaluation
-            df = pl.read_csv(
-                self.file_path,
-                separator=self.delimiter,
-                has_header=self.has_header,
-                encoding=self.encoding if self.encoding in ['utf8', 'utf8-lossy'] else 'utf8',
-                null_values=[""],
-                ignore_errors=True,
-            )
-            yield df
+            yield pl.DataFrame(schema=self.schema)
+
+    def _iter_batches(
+        self, chunk_size: int, text_columns: Sequence[str] = ()
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Yield ``chunk_size``-row DataFrames from one open reader.
+
+        Args:
+            chunk_size: Number of rows per chunk
+            text_columns: Columns to read as text instead of inferring their type
+        """
+        if hasattr(pl.LazyFrame, "collect_batches"):
+            yield from iter_lazy_batches(self.scan(text_columns), chunk_size)
+            return
+
+        # Older Polars releases only expose the batched eager reader
+        overrides = self._text_overrides(self.scan().collect_schema(), text_columns)
+        reader = pl.read_csv_batched(
+            self.file_path, batch_size=chunk_size,
+            **({"schema_overrides": overrides} if overrides else {}),
+            **self._read_options(),
+        )
+
+        def batches() -> Generator[pl.DataFrame, None, None]:
+            schema = None
+            while True:
+                next_batches = reader.next_batches(1)
+                if not next_batches:
+                    return
+                for batch in next_batches:
+                    if schema is None:
+                        schema = batch.schema
+                    elif batch.schema != schema:
+                        batch = batch.cast(dict(schema), strict=False)
+                    yield batch
+
+        yield from rebatch_frames(batches(), chunk_size)
 
     def get_column_names(self) -> List[str]:
         """Get list of column names from CSV."""
@@ -147,7 +741,12 @@ class CSVParser(DataSourceParser):
 
 
 class XLSXParser(DataSourceParser):
-    """XLSX parser using Polars with openpyxl backend."""
+    """XLSX parser streaming the rows of a sheet into chunks.
+
+    The workbook is opened once and shared with the parsers of its other
+    sheets (see ``open_workbook``), and rows are read one at a time, so
+    that memory holds a chunk of the sheet rather than the whole of it.
+    """
 
     def __init__(
         self,
@@ -180,102 +779,109 @@ class XLSXParser(DataSourceParser):
         Yields:
             Polars DataFrames containing parsed data
         """
-        try:
-            # Use Polars Excel reading
-            df = pl.read_excel(
-                self.file_path,
-                sheet_name=self.sheet_name,
-                has_header=self.has_header,
-            )
-        except (ImportError, AttributeError):
-            # Use openpyxl manually if Polars Excel support not available
-            from openpyxl import load_workbook
+        rows = open_workbook(self.file_path).rows(self.sheet_name)
+        yield from iter_sheet_frames(rows, self.has_header, chunk_size)
 
-            wb = load_workbook(self.file_path, read_only=True)
-            ws = wb[self.sheet_name] if self.sheet_name else wb.active
+    def parse_plan(
+        self, plan: ScanPlan, chunk_size: Optional[int] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Parse only the rows and columns a sheet mapping needs.
 
-            # Extract data as list of lists
-            data = []
-            for row in ws.iter_rows(values_only=True):
-                data.append(list(row))
+        Only the planned columns of each row are converted, and reading
+        stops once ``limit`` rows passed the filter.
 
-            if not data:
-                return
-
-            # Create DataFrame
-            if self.has_header and data:
-                columns = [str(col) if col is not None else f"Column_{i}" for i, col in enumerate(data[0])]
-                df = pl.DataFrame(data[1:], schema=columns)
-            else:
-                df = pl.DataFrame(data)
+        Args:
+            plan: Columns, filter and limit to push into the scan
+            chunk_size: Number of rows per chunk. If None, load all rows.
 
-        if chunk_size and len(df) > chunk_size:
-            # Yield in chunks
-            for i in range(0, len(df), chunk_size):
-                yield df.slice(i, chunk_size)
-        else:
-            # Yield entire DataFrame
-            yield df
+        Yields:
+            Polars DataFrames containing the planned rows and columns
+        """
+        rows = open_workbook(self.file_path).rows(self.sheet_name)
+        frames = iter_sheet_frames(rows, self.has_header, chunk_size, columns=plan.paths())
+        yield from collect_frames(plan.apply_frames(frames), chunk_size)
 
     def get_column_names(self) -> List[str]:
         """Get list of column names from XLSX."""
+        first_row = next(open_workbook(self.file_path).rows(self.sheet_name), ())
         if not self.has_header:
-            # Read first row to determine columns
-            try:
-                df_sample = pl.read_excel(
-                    self.file_path,
-                    sheet_name=self.sheet_name,
-                    has_header=False,
-                    n_rows=1,
-                )
-                return [f"Column_{i}" for i in range(df_sample.width)]
-            except (ImportError, AttributeError):
-                # Fallback to manual reading
-                from openpyxl import load_workbook
-                wb = load_workbook(self.file_path, read_only=True)
-                ws = wb[self.sheet_name] if self.sheet_name else wb.active
-                first_row = next(ws.iter_rows(values_only=True), [])
-                return [f"Column_{i}" for i in range(len(first_row))]
-
-        # Get column names
-        try:
-            df_sample = pl.read_excel(
-                self.file_path,
-                sheet_name=self.sheet_name,
-                has_header=True,
-                n_rows=0,
-            )
-            return df_sample.columns
-        except (ImportError, AttributeError):
-            # Fallback to manual reading
-            from openpyxl import load_workbook
-            wb = load_workbook(self.file_path, read_only=True)
-            ws = wb[self.sheet_name] if self.sheet_name else wb.active
-            first_row = next(ws.iter_rows(values_only=True), [])
-            return [str(col) if col is not None else f"Column_{i}" for i, col in enumerate(first_row)]
+            return [f"Column_{i}" for i in range(len(first_row))]
+        return header_names(first_row)
 
     def list_sheets(self) -> List[str]:
         """List all sheet names in the workbook."""
-        from openpyxl import load_workbook
-        wb = load_workbook(self.file_path, read_only=True)
-        return wb.sheetnames
+        return list(open_workbook(self.file_path).sheet_names)
 
 
 class JSONParser(DataSourceParser):
-    """JSON parser with array expansion using Polars."""
+    """JSON parser with array expansion using Polars.
 
-    def __init__(self, file_path: Path, encoding: str = "utf-8"):
+    The records selected by the iterator are decoded incrementally (see
+    ``iter_json_batches``) and read and flattened a chunk at a time by
+    Polars (see ``flatten_frame``), so memory is bounded by the chunk size
+    rather than the document size.
+    """
+
+    def __init__(self, file_path: Path, encoding: str = "utf-8", iterator: Optional[str] = None):
         """Initialize JSON parser.
 
         Args:
             file_path: Path to JSON file
             encoding: File encoding
+            iterator: JSONPath of the records (e.g. ``$.loans[*]``); by
+                default the elements of a top-level array, or the whole document
         """
         self.file_path = file_path
         self.encoding = encoding
+        self.iterator = iterator
 
         if not self.file_path.exists():
             raise FileNotFoundError(f"JSON file not found: {self.file_path}")
+        parse_json_path(iterator)  # Reject unsupported iterators up front
+
+    def _iter_frames(
+        self, batch_size: int, paths: Optional[Iterable[str]] = None, nested: Sequence[str] = ()
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Flattened frames of the records, ``batch_size`` records at a time.
+
+        Each batch is read by Polars into nested columns and flattened by
+        ``flatten_frame``; batches Polars cannot type are decoded and go
+        through ``_flatten_json_data``. Columns get the types of the first
+        ``JSON_SCHEMA_ROWS`` records (see ``conform_frame``), whatever the
+        batch size.
+        """
+        schema = self._sample_schema(paths, nested)
+        for batch in self._iter_batches(batch_size):
+            frame = self._flatten_batch(batch, paths, nested)
+            if frame is not None and frame.height:
+                yield conform_frame(frame, schema)
+
+    def _iter_batches(self, batch_size: int) -> Generator[bytes, None, None]:
+        """UTF-8 JSON arrays of the records, ``batch_size`` records at a time."""
+        with open(self.file_path, 'r', encoding=self.encoding) as f:
+            yield from iter_json_batches(f, self.iterator, batch_size)
+
+    def _sample_schema(
+        self, paths: Optional[Iterable[str]], nested: Sequence[str]
+    ) -> Dict[str, pl.DataType]:
+        """Column types of the first ``JSON_SCHEMA_ROWS`` records, flattened as the batches are."""
+        batches = self._iter_batches(JSON_SCHEMA_ROWS)
+        sample = next(batches, None)
+        batches.close()
+        frame = self._flatten_batch(sample, paths, nested) if sample else None
+        return dict(frame.schema) if frame is not None else {}
+
+    def _flatten_batch(
+        self, batch: bytes, paths: Optional[Iterable[str]], nested: Sequence[str]
+    ) -> Optional[pl.DataFrame]:
+        try:
+            frame = flatten_frame(pl.read_json(batch, infer_schema_length=None), paths, nested)
+        except pl.exceptions.PolarsError:
+            frame = None
+        if frame is None:
+            rows = self._flatten_json_data(json.loads(batch))
+            frame = pl.DataFrame(rows, infer_schema_length=None) if rows else None
+        return frame
 
     def parse(
         self, chunk_size: Optional[int] = None
@@ -288,24 +894,21 @@ class JSONParser(DataSourceParser):
         Yields:
             Polars DataFrames containing flattened JSON data
         """
-        with open(self.file_path, 'r', encoding=self.encoding) as f:
-            data = json.load(f)
-
-        # Flatten and expand JSON data
-        flattened_data = self._flatten_json_data(data)
-
-        if not flattened_data:
-            return
+        yield from collect_frames(self._iter_frames(chunk_size or JSON_BATCH_RECORDS), chunk_size)
 
-        # Convert to Polars DataFrame
-        df = pl.DataFrame(flattened_data)
+    def parse_plan(
+        self, plan: ScanPlan, chunk_size: Optional[int] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Parse the records, flattening only the columns and arrays a sheet mapping references.
 
-        if chunk_size and len(df) > chunk_size:
-            # Yield in chunks
-            for i in range(0, len(df), chunk_size):
-                yield df.slice(i, chunk_size)
-        else:
-            yield df
+        Arrays no mapped column points into are not expanded, so they do not
+        repeat the record's rows, and arrays only linked objects read are
+        kept as child records (see ``ScanPlan``).
+        """
+        frames = plan.apply_frames(
+            self._iter_frames(chunk_size or JSON_BATCH_RECORDS, plan.paths(), plan.nested)
+        )
+        yield from collect_frames(frames, chunk_size)
 
     def _flatten_json_data(self, data: Any, prefix: str = "") -> List[Dict[str, Any]]:
         """Flatten nested JSON data with array expansion.
@@ -458,22 +1061,94 @@ class JSONParser(DataSourceParser):
 
     def get_column_names(self) -> List[str]:
         """Get list of column names from JSON."""
-        # Parse a sample to determine columns
+        # Flatten a sample of the first records only
+        frame = next(self._iter_frames(100), None)
+        return sorted(frame.columns) if frame is not None else []
+
+
+class NDJSONParser(JSONParser):
+    """JSON Lines parser using Polars' lazy NDJSON scanner.
+
+    Nested objects become ``parent.child`` columns as with ``JSONParser``.
+    Files whose records hold arrays are read a batch of lines at a time and
+    flattened as ``JSONParser`` flattens its batches, so that the same
+    records give the same rows in either format.
+    """
+
+    def __init__(self, file_path: Path):
+        """Initialize JSON Lines parser.
+
+        Args:
+            file_path: Path to .jsonl/.ndjson file (UTF-8)
+        """
+        self.file_path = file_path
+        self.encoding = "utf-8"
+        self.iterator = None
+
+        if not self.file_path.exists():
+            raise FileNotFoundError(f"JSON Lines file not found: {self.file_path}")
+
+    def scan(self) -> pl.LazyFrame:
+        """Lazily scan the file, with nested objects flattened."""
+        return flatten_structs(pl.scan_ndjson(self.file_path, infer_schema_length=JSON_SCHEMA_ROWS))
+
+    def _has_arrays(self) -> bool:
+        """Whether the records hold arrays, which the lazy scan would keep as lists."""
+        return any(isinstance(dtype, pl.List) for dtype in self.scan().collect_schema().values())
+
+    def _iter_batches(self, batch_size: int) -> Generator[bytes, None, None]:
+        """UTF-8 JSON arrays of the records of ``batch_size`` lines at a time."""
         with open(self.file_path, 'r', encoding=self.encoding) as f:
-            data = json.load(f)
+            lines = (line.strip() for line in f)
+            records = (line for line in lines if line)
+            while True:
+                batch = list(itertools.islice(records, batch_size))
+                if not batch:
+                    return
+                yield ("[" + ",".join(batch) + "]").encode("utf-8")
 
-        flattened_data = self._flatten_json_data(data)
-        if flattened_data:
-            # Get all unique keys across all flattened rows
-            all_keys = set()
-            for row in flattened_data[:100]:  # Sample first 100 rows
-                all_keys.update(row.keys())
-            return sorted(list(all_keys))
-        return []
+    def parse(
+        self, chunk_size: Optional[int] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Parse the file and yield Polars DataFrames.
+
+        Args:
+            chunk_size: Number of rows per chunk. If None, load all rows.
+
+        Yields:
+            Polars DataFrames, one row per line and array element
+        """
+        if self._has_arrays():
+            yield from super().parse(chunk_size)
+        else:
+            yield from iter_query(self.scan(), chunk_size)
+
+    def parse_plan(
+        self, plan: ScanPlan, chunk_size: Optional[int] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Parse only the rows and columns a sheet mapping needs, in one lazy query.
+
+        Records with arrays are flattened batch by batch instead, see
+        ``JSONParser.parse_plan``.
+        """
+        if self._has_arrays():
+            yield from super().parse_plan(plan, chunk_size)
+        else:
+            yield from iter_query(plan.apply(self.scan()), chunk_size)
+
+    def get_column_names(self) -> List[str]:
+        """Get list of column names from the inferred schema."""
+        if self._has_arrays():
+            return super().get_column_names()
+        return self.scan().collect_schema().names()
 
 
 class XMLParser(DataSourceParser):
-    """XML parser using Polars."""
+    """XML parser reading row elements incrementally with ``iterparse``.
+
+    Only the row element being converted is held in memory (see
+    ``xml_stream``); chunks are built as the document is read.
+    """
 
     def __init__(
         self,
@@ -506,50 +1181,33 @@ class XMLParser(DataSourceParser):
         Yields:
             Polars DataFrames containing XML data
         """
-        tree = ET.parse(self.file_path)
-        root = tree.getroot()
-
-        # Find all row elements using XPath
-        # ElementTree's XPath support is limited:
-        # - Absolute paths starting with / don't work as expected
-        # - Need to convert to relative paths from root element
-        xpath = self.row_xpath
-
-        if xpath.startswith('/'):
-            # Convert absolute XPath /root/child to relative root/child
-            # But if root element name matches, strip it
-            parts = xpath.lstrip('/').split('/')
-            if parts[0] == root.tag:
-                # Path includes root element name - use remaining parts
-                xpath = '/'.join(parts[1:])
-            else:
-                # Path doesn't include root - use as is
-                xpath = '/'.join(parts)
+        yield from self._parse(chunk_size)
 
-        # Use root.findall for relative paths from root element
-        row_elements = root.findall(xpath) if xpath else []
+    def parse_plan(
+        self, plan: ScanPlan, chunk_size: Optional[int] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Parse the rows a sheet mapping needs.
 
-        # Convert XML elements to dictionaries
-        rows_data = []
-        for element in row_elements:
-            row_dict = self._xml_element_to_dict(element)
+        Repeated elements only linked objects read are kept as child records
+        (see ``ScanPlan``) rather than flattened to their first occurrence.
+        """
+        children = child_columns(plan.nested, plan.parent_paths(), separator="/")
+        yield from collect_frames(plan.apply_frames(self._parse(chunk_size, children)), chunk_size)
+
+    def _parse(
+        self, chunk_size: Optional[int], children: Optional[ChildColumns] = None
+    ) -> Generator[pl.DataFrame, None, None]:
+        """Convert the row elements to flat rows as the document is read, a chunk at a time."""
+        rows = []
+        for element in iter_row_elements(self.file_path, self.row_xpath):
             # Flatten nested dictionaries so XPath-style references work
             # e.g., {'loanInfo': {'amount': 100}} -> {'loanInfo/amount': 100}
-            flattened = self._flatten_xml_dict(row_dict)
-            rows_data.append(flattened)
-
-        if not rows_data:
-            return
-
-        # Convert to Polars DataFrame
-        df = pl.DataFrame(rows_data)
-
-        if chunk_size and len(df) > chunk_size:
-            # Yield in chunks
-            for i in range(0, len(df), chunk_size):
-                yield df.slice(i, chunk_size)
-        else:
-            yield df
+            rows.append(self._flatten_xml_dict(self._xml_element_to_dict(element), children=children))
+            if chunk_size and len(rows) == chunk_size:
+                yield pl.DataFrame(rows, infer_schema_length=None)
+                rows = []
+        if rows:
+            yield pl.DataFrame(rows, infer_schema_length=None)
 
     def _xml_element_to_dict(self, element: ET.Element) -> Any:
         """Convert XML element to dictionary or simple value.
@@ -602,7 +1260,13 @@ class XMLParser(DataSourceParser):
 
         return result
 
-    def _flatten_xml_dict(self, d: Dict[str, Any], prefix: str = "", separator: str = "/") -> Dict[str, Any]:
+    def _flatten_xml_dict(
+        self,
+        d: Dict[str, Any],
+        prefix: str = "",
+        separator: str = "/",
+        children: Optional[ChildColumns] = None,
+    ) -> Dict[str, Any]:
         """Flatten nested XML dictionary to match XPath-style references.
 
         Converts:
@@ -614,6 +1278,8 @@ class XMLParser(DataSourceParser):
             d: Nested dictionary from XML
             prefix: Current path prefix
             separator: Path separator (default: '/')
+            children: Columns to read from each occurrence of the elements kept
+                as child records, see ``child_columns``
 
         Returns:
             Flattened dictionary with XPath-style keys
@@ -624,9 +1290,16 @@ class XMLParser(DataSourceParser):
             # Build the full path
             full_key = f"{prefix}{separator}{key}" if prefix else key
 
-            if isinstance(value, dict):
+            columns = children(full_key) if children is not None else []
+            if columns:
+                # One record per occurrence, whether the element repeats or not
+                result[full_key] = [
+                    {column: record.get(column) for column in columns}
+                    for record in self._xml_records(value, full_key, separator, columns)
+                ]
+            elif isinstance(value, dict):
                 # Recursively flatten nested dicts
-                nested = self._flatten_xml_dict(value, full_key, separator)
+                nested = self._flatten_xml_dict(value, full_key, separator, children)
                 result.update(nested)
             elif isinstance(value, list):
                 # Handle lists - for now, take first item or convert to string
@@ -645,25 +1318,36 @@ class XMLParser(DataSourceParser):
 
         return result
 
-    def get_column_names(self) -> List[str]:
-        """Get list of column names from XML."""
-        tree = ET.parse(self.file_path)
-        root = tree.getroot()
-
-        # Convert absolute XPath to relative from root element
-        xpath = self.row_xpath
-        if xpath.startswith('/'):
-            parts = xpath.lstrip('/').split('/')
-            if parts[0] == root.tag:
-                xpath = '/'.join(parts[1:])
-            else:
-                xpath = '/'.join(parts)
+    def _xml_records(
+        self, value: Any, path: str, separator: str, columns: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Flatten an element kept as child records into one record per occurrence.
 
-        # Sample first few elements to determine columns
-        row_elements = root.findall(xpath)[:10] if xpath else []
+        Repeated elements further down the paths of ``columns`` give a record
+        each too, so that a wrapper such as ``borrowers`` holding repeated
+        ``borrower`` elements yields one record per ``borrower``.
+        """
+        if isinstance(value, list):
+            return [
+                record for item in value
+                for record in self._xml_records(item, path, separator, columns)
+            ]
+        if not isinstance(value, dict):
+            return [{path: value}]
+        records: List[Dict[str, Any]] = [{}]
+        for key, item in value.items():
+            item_path = f"{path}{separator}{key}"
+            if not any(column == item_path or column.startswith(item_path + separator) for column in columns):
+                continue
+            items = self._xml_records(item, item_path, separator, columns)
+            records = [{**record, **values} for record in records for values in items]
+        return records
 
+    def get_column_names(self) -> List[str]:
+        """Get list of column names from the first row elements of the XML."""
         all_keys = set()
-        for element in row_elements:
+        # Sample first few elements to determine columns; the rest is not read
+        for element in itertools.islice(iter_row_elements(self.file_path, self.row_xpath), 10):
             row_dict = self._xml_element_to_dict(element)
             all_keys.update(self._flatten_dict_keys(row_dict))
 
@@ -701,6 +1385,7 @@ def create_parser(
     encoding: str = "utf-8",
     sheet_name: Optional[str] = None,
     row_xpath: str = "./*",
+    iterator: Optional[str] = None,
 ) -> DataSourceParser:
     """Create appropriate parser based on file extension.
 
@@ -711,6 +1396,8 @@ def create_parser(
         encoding: File encoding
         sheet_name: Excel sheet name
         row_xpath: XPath for XML row elements
+        iterator: Sheet iterator, a JSONPath for JSON or an XPath overriding
+            ``row_xpath`` for XML
 
     Returns:
         Appropriate parser instance
@@ -727,8 +1414,10 @@ def create_parser(
     elif suffix in [".xlsx", ".xls"]:
         return XLSXParser(file_path, sheet_name, has_header)
     elif suffix == ".json":
-        return JSONParser(file_path, encoding)
+        return JSONParser(file_path, encoding, iterator)
+    elif suffix in [".jsonl", ".ndjson"]:
+        return NDJSONParser(file_path)
     elif suffix == ".xml":
-        return XMLParser(file_path, row_xpath, encoding)
+        return XMLParser(file_path, iterator or row_xpath, encoding)
     else:
         raise ValueError(f"Unsupported file type: {suffix}")
@@ -0,0 +1,204 @@
+"""Vectorized flattening of nested JSON records.
+
+``flatten_frame`` flattens the nested Struct and List columns Polars reads
+a batch of JSON records into, with Polars expressions, giving the rows and
+dotted column names of ``JSONParser._flatten_json_data``:
+
+- nested objects become ``parent.child`` columns;
+- every element of an array held directly by a record becomes a row, with
+  the record's other values repeated (elements that are objects give
+  ``array.field`` columns); a record with several such arrays gives the
+  rows of one array after the other;
+- arrays inside nested objects become their strings joined with ", ", or
+  null when they hold anything other than strings.
+
+When the paths a mapping references are given, arrays none of them point
+into are dropped instead of expanded, and only referenced columns are
+built. Arrays only ``nested`` paths (columns read by linked objects alone)
+point into are not expanded either: they are kept as child records, a
+list column named after the array whose structs hold those columns (see
+``ChildFrame`` in the mapping plan).
+
+Batches Polars cannot type (records that are not objects, arrays mixing
+objects and values, arrays of arrays) are left to the Python flattener, as
+are batches read from JSON that cannot be typed at all.
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import polars as pl
+from polars.datatypes import DataTypeClass
+
+_RECORD = "__record__"
+_ARRAY = "__array__"
+
+
+ChildColumns = Callable[[str], List[str]]
+
+# Field and element types are given as instances or as classes such as pl.String
+DType = Union[pl.DataType, DataTypeClass]
+
+
+def _nulls(expr: pl.Expr) -> pl.Expr:
+    """A null per value of ``expr``, so that a column keeps the frame's height."""
+    return pl.when(expr.is_null() & False).then(None)
+
+
+def _leaf_columns(
+    expr: pl.Expr, dtype: DType, name: str, children: Optional[ChildColumns] = None
+) -> List[Tuple[str, pl.Expr]]:
+    """Flattened columns of a value nested in a record, as (name, expression) pairs.
+
+    ``children`` gives the columns to read from the elements of an array
+    kept as child records, or none if the array is flattened.
+    """
+    if isinstance(dtype, pl.Struct):
+        return [
+            column
+            for item in dtype.fields
+            for column in _leaf_columns(
+                expr.struct.field(item.name), item.dtype, f"{name}.{item.name}", children
+            )
+        ]
+    if isinstance(dtype, (pl.List, pl.Array)):
+        columns = children(name) if children is not None else []
+        if columns:
+            return [(name, child_records_expr(expr, dtype.inner, name, columns).alias(name))]
+        if dtype.inner == pl.String:
+            joined = pl.when(expr.list.len() > 0).then(expr.list.join(", ", ignore_nulls=False))
+            return [(name, joined.alias(name))]
+        return [(name, _nulls(expr).alias(name))]
+    return [(name, expr.alias(name))]
+
+
+def child_records_expr(expr: pl.Expr, inner: DType, name: str, columns: Sequence[str]) -> pl.Expr:
+    """Turn an array into a list of structs holding the flattened ``columns`` of each element.
+
+    Columns the elements do not have are null, so that every chunk gives
+    the child records the same fields.
+    """
+    leaves = dict(_leaf_columns(pl.element(), inner, name))
+    return expr.list.eval(pl.struct([
+        leaves[column].alias(column) if column in leaves else _nulls(pl.element()).alias(column)
+        for column in columns
+    ]))
+
+
+def child_columns(
+    nested: Iterable[str], parents: Iterable[str], separator: str = "."
+) -> Optional[ChildColumns]:
+    """Columns to read from each array kept as child records.
+
+    Args:
+        nested: Columns only linked objects read
+        parents: Columns anything else reads (row resource, filter)
+        separator: Separator of the parent and child names in column paths
+
+    Returns:
+        Function of an array's name giving the nested columns under it, or
+        none if parent columns point into it; None without nested columns
+    """
+    nested, parents = list(nested), list(parents)
+    if not nested:
+        return None
+
+    def columns(name: str) -> List[str]:
+        def under(path: str) -> bool:
+            return path == name or path.startswith(name + separator)
+        if any(under(path) for path in parents):
+            return []
+        return [path for path in nested if under(path)]
+    return columns
+
+
+def _is_expandable(dtype: pl.List) -> bool:
+    """Whether a record's array has elements Polars typed as objects or plain values."""
+    inner = dtype.inner
+    return not isinstance(inner, (pl.List, pl.Array)) and inner != pl.Object
+
+
+def flatten_frame(
+    frame: pl.DataFrame, paths: Optional[Iterable[str]] = None, nested: Iterable[str] = ()
+) -> Optional[pl.DataFrame]:
+    """Flatten a frame of JSON records read as nested columns.
+
+    Args:
+        frame: One row per record, e.g. from ``pl.read_json``
+        paths: Dotted column names the mapping references; None flattens everything
+        nested: Those of ``paths`` only linked objects read
+
+    Returns:
+        Flattened rows, or None if the batch must be flattened in Python
+    """
+    schema = frame.schema
+    if any(dtype == pl.Object for dtype in schema.values()):
+        return None
+    wanted = set(paths) if paths is not None else None
+    children = child_columns(nested, wanted - set(nested)) if wanted is not None else None
+    lists = {name: dtype for name, dtype in schema.items() if isinstance(dtype, pl.List)}
+    arrays = [name for name in lists if children is None or not children(name)]
+    if not all(_is_expandable(lists[name]) for name in arrays):
+        return None
+
+    base = [
+        column
+        for name, dtype in schema.items()
+        if name not in arrays
+        for column in _leaf_columns(pl.col(name), dtype, name, children)
+    ]
+    # After the explode, an array's column holds one element per row
+    items = {name: _leaf_columns(pl.col(name), lists[name].inner, name, children) for name in arrays}
+    # An empty array is a null value of the array's own name
+    empty = [name for name in arrays if frame.select((pl.col(name).list.len() == 0).any()).item()]
+    if wanted is not None:
+        def keep(column: Tuple[str, pl.Expr]) -> bool:
+            return column[0] in wanted or bool(children and children(column[0]))
+
+        referenced = [
+            name for name in arrays
+            if any(path == name or path.startswith(name + ".") for path in wanted)
+        ]
+        kept_base = [column for column in base if keep(column)]
+        kept_items = {name: [column for column in items[name] if keep(column)] for name in referenced}
+        if kept_base or any(kept_items.values()):  # Otherwise keep everything rather than no column
+            arrays, base, items = referenced, kept_base, kept_items
+            empty = [name for name in empty if name in wanted]
+
+    try:
+        if not arrays:
+            return frame.select([expr for _, expr in base])
+        return _expand_arrays(frame, arrays, [expr for _, expr in base], items, empty)
+    except pl.exceptions.PolarsError:
+        return None
+
+
+def _expand_arrays(
+    frame: pl.DataFrame,
+    arrays: List[str],
+    base: List[pl.Expr],
+    items: Dict[str, List[Tuple[str, pl.Expr]]],
+    empty: List[str],
+) -> pl.DataFrame:
+    """Give every element of the record arrays a row, in record then array order."""
+    lazy = frame.lazy().with_row_index(_RECORD)
+    non_empty = {name: pl.col(name).list.len().fill_null(0) > 0 for name in arrays}
+
+    # Records whose arrays are all empty or null keep one row
+    parts = [
+        lazy.filter(~pl.any_horizontal(list(non_empty.values())))
+        .select([pl.col(_RECORD), pl.lit(-1).alias(_ARRAY)] + base + [pl.lit(None).alias(name) for name in empty])
+    ]
+    for position, name in enumerate(arrays):
+        exploded = (
+            lazy.filter(non_empty[name])
+            .select([pl.col(_RECORD), pl.lit(position).alias(_ARRAY)] + base + [pl.col(name)])
+            .explode(name)
+        )
+        parts.append(exploded.select([pl.exclude(name)] + [expr for _, expr in items[name]]))
+
+    return (
+        pl.concat(parts, how="diagonal_relaxed")
+        .sort([_RECORD, _ARRAY], maintain_order=True)
+        .drop([_RECORD, _ARRAY])
+        .collect()
+    )
@@ -0,0 +1,317 @@
+"""Incremental reading of the records of a JSON document.
+
+``iter_json_records`` follows a JSONPath iterator such as ``$.loans[*]``
+through a document read in blocks, and yields the elements of the array it
+points to one at a time, so that only the record being decoded (and the
+values skipped on the way to the array) are held in memory.
+
+``iter_json_batches`` reads the same records without decoding them: the
+array is scanned for element boundaries with numpy and handed back as the
+UTF-8 JSON text of a batch of records, ready for ``pl.read_json``.
+
+Supported iterators are a ``$`` root followed by object keys, as
+``.key`` or ``['key']``, with an optional ``[*]`` at the end. Without
+``[*]``, an array found at the path is iterated and any other value is a
+single record.
+"""
+
+import json
+import re
+from typing import Any, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+
+BLOCK_SIZE = 1 << 20
+
+_SEGMENT = re.compile(r"\.([^.\[\]]+)|\[\s*'([^']*)'\s*\]|\[\s*\"([^\"]*)\"\s*\]|(\[\s*\*\s*\])")
+_WHITESPACE = " \t\n\r"
+_NUMBER_CONTINUATION = frozenset("0123456789.eE+-")
+
+
+def parse_json_path(iterator: Optional[str]) -> Tuple[List[str], bool]:
+    """Split a JSONPath iterator into object keys.
+
+    Args:
+        iterator: JSONPath such as ``$.data.loans[*]``, or None for the root
+
+    Returns:
+        Keys from the root to the records, and whether the path ends with ``[*]``
+
+    Raises:
+        ValueError: If the iterator uses JSONPath features other than keys and a final [*]
+    """
+    if not iterator or iterator.strip() in ("$", "$[*]"):
+        return [], iterator is not None and iterator.strip() == "$[*]"
+    path = iterator.strip()
+    if not path.startswith("$"):
+        raise ValueError(f"JSONPath iterator must start with '$': {iterator}")
+
+    keys: List[str] = []
+    wildcard = False
+    position = 1
+    while position < len(path):
+        match = _SEGMENT.match(path, position)
+        if match is None or wildcard:
+            raise ValueError(
+                f"Unsupported JSONPath iterator {iterator!r}: only object keys and a final [*] are supported"
+            )
+        if match.group(4):
+            wildcard = True
+        else:
+            keys.append(next(group for group in match.groups()[:3] if group is not None))
+        position = match.end()
+    return keys, wildcard
+
+
+class _Reader:
+    """JSON values decoded one at a time from a text stream read in blocks."""
+
+    def __init__(self, handle: TextIO, block_size: int):
+        self.handle = handle
+        self.block_size = block_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read more text, at least as much as is buffered; False at end of file."""
+        if self.eof:
+            return False
+        data = self.handle.read(max(self.block_size, len(self.buffer) - self.position))
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + data
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, without consuming it ('' at end of file)."""
+        while True:
+            buffer, position = self.buffer, self.position
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            self.position = position
+            if position < len(buffer):
+                return buffer[position]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Invalid JSON: expected {char!r}, found {found or 'end of file'!r}")
+        self.position += 1
+
+    def value(self) -> Any:
+        """Decode the next value, reading more of the file until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number that stops at the end of the buffer, or at a '.', an exponent or
+            # a digit of its own, was cut by a block boundary and continues in the next block
+            if (
+                isinstance(value, (int, float))
+                and (end == len(self.buffer) or self.buffer[end] in _NUMBER_CONTINUATION)
+                and self._fill()
+            ):
+                continue
+            self.position = end
+            return value
+
+    def find_key(self, key: str) -> bool:
+        """Move into an object up to the value of ``key``, skipping the other members.
+
+        Returns:
+            False if the value here is not an object or has no such key
+        """
+        if self.peek() != "{":
+            return False
+        self.position += 1
+        while True:
+            if self.peek() == "}":
+                return False
+            name = self.value()
+            self.expect(":")
+            if name == key:
+                return True
+            self.value()
+            if self.peek() == ",":
+                self.position += 1
+
+    def elements(self) -> Iterator[Any]:
+        """Decode the elements of the array that starts here, one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.position += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Invalid JSON: expected ',' or ']', found {separator or 'end of file'!r}")
+
+
+# Byte classes of the characters that delimit array elements
+_QUOTE, _OPEN, _CLOSE, _COMMA = 1, 2, 3, 4
+_CLASSES = np.zeros(256, dtype=np.uint8)
+_CLASSES[ord('"')] = _QUOTE
+_CLASSES[[ord("["), ord("{")]] = _OPEN
+_CLASSES[[ord("]"), ord("}")]] = _CLOSE
+_CLASSES[ord(",")] = _COMMA
+_BACKSLASH = ord("\\")
+
+
+class _ArrayScanner:
+    """Boundaries of the elements of a JSON array, found in its UTF-8 text a block at a time.
+
+    The text starts right after the array's ``[``. Each byte is scanned
+    once, carrying over whether the scan is inside a string and how deep
+    it is; a block's trailing backslashes are left for the next scan so
+    that an escaped quote is never split from its backslashes.
+    """
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.scanned = 0
+        self.in_string = False
+        self.depth = 0
+        self.ends: List[int] = []  # Offsets of the commas after complete elements
+        self.closed: Optional[int] = None  # Offset of the closing ]
+
+    def feed(self, data: bytes) -> None:
+        self.data += data
+        stop = len(self.data)
+        while stop > self.scanned and self.data[stop - 1] == _BACKSLASH:
+            stop -= 1
+        chars = np.frombuffer(self.data, dtype=np.uint8, count=stop - self.scanned, offset=self.scanned)
+        positions = np.flatnonzero(_CLASSES[chars])
+        kinds = _CLASSES[chars[positions]]
+
+        # A quote after an odd run of backslashes is part of a string
+        quotes = positions[kinds == _QUOTE]
+        candidates = quotes[(quotes > 0) & (chars[quotes - 1] == _BACKSLASH)]
+        escaped = [q for q in candidates.tolist() if self._backslashes_before(chars, q) % 2]
+        if escaped:
+            keep = ~np.isin(positions, escaped)
+            positions, kinds = positions[keep], kinds[keep]
+
+        is_quote = kinds == _QUOTE
+        quotes_before = np.cumsum(is_quote) - is_quote + self.in_string
+        structural = (quotes_before % 2 == 0) & ~is_quote
+        self.in_string = bool((int(is_quote.sum()) + self.in_string) % 2)
+        positions, kinds = positions[structural] + self.scanned, kinds[structural]
+        self.scanned = stop
+
+        depth = self.depth + np.cumsum((kinds == _OPEN).astype(np.int64) - (kinds == _CLOSE))
+        boundaries = (kinds == _COMMA) & (depth == 0)
+        closing = np.flatnonzero((kinds == _CLOSE) & (depth < 0))
+        if len(closing):
+            self.closed = int(positions[closing[0]])
+            boundaries[closing[0]:] = False
+        self.ends.extend(positions[boundaries].tolist())
+        if len(depth):
+            self.depth = int(depth[-1])
+
+    @staticmethod
+    def _backslashes_before(chars: np.ndarray, position: int) -> int:
+        count = 0
+        while position - count > 0 and chars[position - count - 1] == _BACKSLASH:
+            count += 1
+        return count
+
+    def take(self, count: int) -> bytes:
+        """Remove the first ``count`` complete elements, as the text of a JSON array."""
+        stop = self.ends[count - 1]
+        batch = b"[" + bytes(self.data[:stop]) + b"]"
+        del self.data[:stop + 1]
+        self.ends = [end - stop - 1 for end in self.ends[count:]]
+        self.scanned -= stop + 1
+        if self.closed is not None:
+            self.closed -= stop + 1
+        return batch
+
+
+def iter_json_batches(
+    handle: TextIO, iterator: Optional[str] = None, batch_size: int = 10_000, block_size: int = BLOCK_SIZE
+) -> Iterator[bytes]:
+    """Yield the records an iterator selects as JSON arrays, without decoding them.
+
+    Args:
+        handle: Text stream of the document
+        iterator: JSONPath iterator, see ``parse_json_path``; None selects the root
+        batch_size: Records per array (the last one may hold fewer)
+        block_size: Characters read at a time
+
+    Yields:
+        UTF-8 JSON text of arrays of records, in document order
+
+    Raises:
+        ValueError: If the iterator is not supported, does not lead to an array when
+            it ends with [*], or the array is not terminated
+    """
+    keys, wildcard = parse_json_path(iterator)
+    reader = _Reader(handle, block_size)
+    for key in keys:
+        if not reader.find_key(key):
+            return  # Nothing at this path
+    if reader.peek() != "[":
+        if wildcard:
+            raise ValueError(f"JSONPath iterator {iterator!r} does not select an array")
+        if reader.peek():
+            yield b"[" + json.dumps(reader.value()).encode("utf-8") + b"]"
+        return
+
+    reader.expect("[")
+    scanner = _ArrayScanner()
+    scanner.feed(reader.buffer[reader.position:].encode("utf-8"))
+    while True:
+        while len(scanner.ends) >= batch_size:
+            yield scanner.take(batch_size)
+        if scanner.closed is not None:
+            rest = bytes(scanner.data[:scanner.closed])
+            if rest.strip():
+                yield b"[" + rest + b"]"
+            return
+        data = handle.read(block_size)
+        if not data:
+            raise ValueError("Invalid JSON: unterminated array")
+        scanner.feed(data.encode("utf-8"))
+
+
+def iter_json_records(
+    handle: TextIO, iterator: Optional[str] = None, block_size: int = BLOCK_SIZE
+) -> Iterator[Any]:
+    """Yield the records an iterator selects from a JSON document.
+
+    Args:
+        handle: Text stream of the document
+        iterator: JSONPath iterator, see ``parse_json_path``; None selects the root
+        block_size: Characters read at a time
+
+    Yields:
+        Decoded records, in document order
+
+    Raises:
+        ValueError: If the iterator is not supported, or does not lead to an array when it ends with [*]
+    """
+    keys, wildcard = parse_json_path(iterator)
+    reader = _Reader(handle, block_size)
+    for key in keys:
+        if not reader.find_key(key):
+            return  # Nothing at this path
+    if reader.peek() == "[":
+        yield from reader.elements()
+    elif wildcard:
+        raise ValueError(f"JSONPath iterator {iterator!r} does not select an array")
+    elif reader.peek():
+        yield reader.value()
@@ -4,6 +4,8 @@ from pathlib import Path
 from typing import Generator, Optional
 import polars as pl
 
+from .data_source import CSVParser, iter_lazy_batches
+
 
 class StreamingCSVParser:
     """Enhanced CSV parser with native Polars streaming optimizations."""
@@ -23,15 +25,23 @@ class StreamingCSVParser:
         if not self.file_path.exists():
             raise FileNotFoundError(f"CSV file not found: {self.file_path}")
 
+    def _parser(self) -> CSVParser:
+        return CSVParser(
+            self.file_path,
+            delimiter=self.delimiter,
+            has_header=self.has_header,
+            encoding=self.encoding,
+        )
+
     def stream_batches(
         self, batch_size: int = 10000
     ) -> Generator[pl.DataFrame, None, None]:
         """Stream CSV data in batches using true streaming approach.
 
-        This uses a different approach than the regular parser:
-        - Reads file in chunks without loading entire dataset
+        Uses the same single-pass batched engine as ``CSVParser.parse``:
+        - One open reader whose position advances batch by batch
         - No pre-calculation of total rows (avoids memory spike)
-        - True streaming with constant memory usage
+        - Header schema is inferred once and reused for every batch
 
         Args:
             batch_size: Number of rows per batch
@@ -39,49 +49,7 @@ class StreamingCSVParser:
         Yields:
             Polars DataFrames containing batch data
         """
-        try:
-            # Use Polars' batched CSV reader for true streaming
-            # This reads the file incrementally without loading everything
-
-            skip_rows = 0 if not self.has_header else 0  # Header handling
-
-            while True:
-                try:
-                    # Read only a specific number of rows from current position
-                    batch = pl.read_csv(
-                        self.file_path,
-                        separator=self.delimiter,
-                        has_header=self.has_header and skip_rows == 0,  # Only read header on first batch
-                        encoding=self.encoding,
-                        null_values=[""],
-                        ignore_errors=True,
-                        skip_rows=skip_rows,
-                        n_rows=batch_size,
-                    )
-
-                    # If no rows returned, we've reached the end
-                    if len(batch) == 0:
-                        break
-
-                    yield batch
-
-                    # Update skip_rows for next iteration
-                    skip_rows += len(batch)
-                    if self.has_header and skip_rows == batch_size:
-                        skip_rows += 1  # Skip header on subsequent reads
-
-                    # If we got fewer rows than requested, we've reached the end
-                    if len(batch) < batch_size:
-                        break
-
-                except Exception as batch_error:
-                    print(f"Batch read error: {batch_error}")
-                    break
-
-        except Exception as e:
-            # Fallback to non-streaming if needed
-            print(f"Warning: Streaming failed, falling back to chunked reading: {e}")
-            yield from self._fallback_chunked_read(batch_size)
+        yield from self._parser().parse(chunk_size=batch_size)
 
     def stream_with_transforms(
         self,
@@ -97,14 +65,7 @@ class StreamingCSVParser:
         Yields:
             Transformed Polars DataFrames
         """
-        lazy_df = pl.scan_csv(
-            self.file_path,
-            separator=self.delimiter,
-            has_header=self.has_header,
-            encoding=self.encoding,
-            null_values=[""],
-            ignore_errors=True,
-        )
+        lazy_df = self._parser().scan()
 
         # Apply transforms using Polars expressions (vectorized)
         if transforms:
@@ -129,47 +90,15 @@ class StreamingCSVParser:
 
             lazy_df = lazy_df.select(exprs)
 
-        # Stream the transformed data
-        total_rows = lazy_df.select(pl.len()).collect().item()
-
-        for offset in range(0, total_rows, batch_size):
-            batch = (
-                lazy_df
-                .slice(offset, batch_size)
-                .collect(engine="streaming")
-            )
-
-            if len(batch) > 0:
-                yield batch
-
-    def _fallback_chunked_read(self, chunk_size: int) -> Generator[pl.DataFrame, None, None]:
-        """Fallback to chunked reading if streaming fails."""
-        # Read in chunks without streaming optimizations
-        offset = 0
-        while True:
-            try:
-                chunk = pl.read_csv(
-                    self.file_path,
-                    separator=self.delimiter,
-                    has_header=self.has_header,
-                    encoding=self.encoding,
-                    skip_rows=offset if not self.has_header or offset == 0 else offset,
-                    n_rows=chunk_size,
-                    null_values=[""],
-                    ignore_errors=True,
-                )
-
-                if len(chunk) == 0:
-                    break
-
-                yield chunk
-                offset += chunk_size
-
-                if len(chunk) < chunk_size:
-                    break
-
-            except Exception:
-                break
+        if not hasattr(pl.LazyFrame, "collect_batches"):
+            # Older Polars releases: transform each batch of the batched reader,
+            # as collecting the whole scan would not be bounded in memory
+            for batch in self._parser().parse(chunk_size=batch_size):
+                yield batch.select(exprs) if transforms else batch
+            return
+
+        # Execute the transformed scan once and hand it out batch by batch
+        yield from iter_lazy_batches(lazy_df, batch_size)
 
 
 def demonstrate_streaming_benefits():
@@ -0,0 +1,266 @@
+"""Chunked reading of the sheets of an Excel workbook.
+
+``open_workbook`` opens a workbook once per process and hands the same
+handle to every reader of its sheets: the parser of each sheet a mapping
+reads from the file and the generator's analyzers. Opening a workbook
+reads its sheet index and shared strings, which for a large workbook
+costs more than reading the first rows of a sheet.
+
+Rows are read one at a time, with python-calamine when it is installed and
+with openpyxl in read-only mode otherwise, and ``iter_sheet_frames``
+turns them into DataFrames of ``chunk_size`` rows, so that memory holds a
+chunk of a sheet rather than the whole of it. Every chunk gets the column
+types of the first ``SHEET_SCHEMA_ROWS`` rows, whatever the chunk size.
+"""
+
+import itertools
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+# Workbooks kept open by open_workbook; the least recently used is closed first
+MAX_OPEN_WORKBOOKS = 8
+# Rows of a sheet its column types are inferred from
+SHEET_SCHEMA_ROWS = 10_000
+
+Row = Sequence[Any]
+
+
+class Workbook:
+    """A workbook opened for reading its sheets row by row."""
+
+    def __init__(self, path: Path):
+        """Open a workbook.
+
+        Args:
+            path: Path to the workbook
+
+        Raises:
+            ImportError: If neither python-calamine nor openpyxl is installed
+        """
+        self.path = path
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError:
+            from openpyxl import load_workbook
+
+            self._calamine: Any = None
+            self._openpyxl: Any = load_workbook(path, read_only=True, data_only=True)
+            self.sheet_names: List[str] = list(self._openpyxl.sheetnames)
+        else:
+            self._openpyxl = None
+            self._calamine = CalamineWorkbook.from_path(str(path))
+            self.sheet_names = list(self._calamine.sheet_names)
+
+    def rows(self, sheet_name: Optional[str] = None) -> Iterator[Tuple[Any, ...]]:
+        """Yield the rows of a sheet as openpyxl reads them.
+
+        Empty cells are None and whole numbers are ints, whichever library
+        reads the workbook.
+
+        Args:
+            sheet_name: Name of the sheet. If None, reads the first sheet.
+
+        Yields:
+            Tuples of cell values, from the first row and column of the sheet
+
+        Raises:
+            ValueError: If the workbook has no sheet of that name
+        """
+        if sheet_name is None:
+            if not self.sheet_names:
+                return
+            sheet_name = self.sheet_names[0]
+        elif sheet_name not in self.sheet_names:
+            raise ValueError(
+                f"Sheet '{sheet_name}' not found in {self.path.name}; "
+                f"sheets: {', '.join(self.sheet_names)}"
+            )
+
+        if self._openpyxl is not None:
+            yield from self._openpyxl[sheet_name].iter_rows(values_only=True)
+            return
+
+        sheet = self._calamine.get_sheet_by_name(sheet_name)
+        # Calamine rows start at the first used column
+        padding = (None,) * (sheet.start or (0, 0))[1]
+        for row in sheet.iter_rows():
+            yield padding + tuple(_calamine_value(value) for value in row)
+
+    def close(self) -> None:
+        """Release the workbook file."""
+        (self._openpyxl or self._calamine).close()
+
+
+def _calamine_value(value: Any) -> Any:
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+_OPEN: "OrderedDict[Tuple[str, int, int], Workbook]" = OrderedDict()
+
+
+def open_workbook(path: Path) -> Workbook:
+    """Open a workbook, or return the one already opened for the same file.
+
+    A workbook is opened again if the file changed since.
+
+    Args:
+        path: Path to the workbook
+
+    Returns:
+        Shared workbook handle; close it with ``close_workbooks``
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    workbook = _OPEN.get(key)
+    if workbook is not None:
+        _OPEN.move_to_end(key)
+        return workbook
+
+    workbook = Workbook(path)
+    _OPEN[key] = workbook
+    while len(_OPEN) > MAX_OPEN_WORKBOOKS:
+        _, evicted = _OPEN.popitem(last=False)
+        evicted.close()
+    return workbook
+
+
+def close_workbooks() -> None:
+    """Close every workbook ``open_workbook`` opened; commands call it when they end."""
+    while _OPEN:
+        _, workbook = _OPEN.popitem()
+        workbook.close()
+
+
+def mapped_sheet_name(path: Path, name: str) -> Optional[str]:
+    """Sheet of a workbook a sheet mapping reads.
+
+    Mappings generated from a workbook are named after its sheets; other
+    mappings read the first sheet, as they always did.
+
+    Args:
+        path: Path to the workbook
+        name: Name of the sheet mapping
+
+    Returns:
+        ``name`` if the workbook has a sheet of that name, else None
+    """
+    return name if name in open_workbook(path).sheet_names else None
+
+
+def header_names(row: Row) -> List[str]:
+    """Column names of a header row; ``Column_<i>`` for empty cells."""
+    return [str(value) if value is not None else f"Column_{i}" for i, value in enumerate(row)]
+
+
+def rows_frame(
+    rows: Sequence[Row],
+    columns: Sequence[str],
+    indices: Optional[Sequence[int]] = None,
+    schema: Optional[Dict[str, pl.DataType]] = None,
+) -> pl.DataFrame:
+    """Build a DataFrame from rows of cell values.
+
+    Columns holding values of different types become the type they have
+    in common, text if there is none, instead of failing as a row-wise
+    constructor does.
+
+    Args:
+        rows: Rows of cell values, at least as wide as the positions read
+        columns: Names of the columns
+        indices: Positions of the columns in the rows; None for the first ``len(columns)``
+        schema: Column types to give the columns where their values fit
+            them without loss; the others become text. None to infer them.
+
+    Returns:
+        DataFrame with a column per name
+    """
+    if indices is None:
+        indices = range(len(columns))
+    schema = schema or {}
+    return pl.DataFrame([
+        _column(name, [row[index] for row in rows], schema.get(name))
+        for name, index in zip(columns, indices)
+    ])
+
+
+def _column(name: str, values: List[Any], dtype: Optional[pl.DataType]) -> pl.Series:
+    series = pl.Series(name, values, strict=False)
+    if dtype is None or dtype == pl.Null or series.dtype == dtype:
+        return series
+    # Text stays text, and is built from the cells rather than cast so that
+    # numbers keep the form they have in the sheet (100, not 100.0)
+    if dtype != pl.String and series.dtype != pl.String:
+        try:
+            cast = series.cast(dtype)
+            if series.dtype == pl.Null or cast.cast(series.dtype).equals(series):
+                return cast
+        except pl.exceptions.PolarsError:
+            pass
+    return pl.Series(name, values, dtype=pl.String, strict=False)
+
+
+def iter_sheet_frames(
+    rows: Iterable[Row],
+    has_header: bool = True,
+    chunk_size: Optional[int] = None,
+    columns: Optional[Iterable[str]] = None,
+) -> Iterator[pl.DataFrame]:
+    """Turn the rows of a sheet into DataFrames.
+
+    Rows are padded with nulls to the width of the first row and cells
+    beyond it are dropped. Columns get the types of the first
+    ``SHEET_SCHEMA_ROWS`` rows (see ``rows_frame``), so that the type of a
+    column, and the form of its values, do not depend on ``chunk_size``.
+
+    Args:
+        rows: Rows of cell values, see ``Workbook.rows``
+        has_header: Whether the first row names the columns; if not they
+            are named ``Column_<i>``
+        chunk_size: Number of rows per frame. If None, one frame of every row.
+        columns: Columns to read; None for all of them. Names the sheet
+            does not have are ignored.
+
+    Yields:
+        DataFrames of ``chunk_size`` rows (the last one may be shorter); a
+        frame without rows if the sheet has a header and nothing else
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    names = header_names(first) if has_header else [f"Column_{i}" for i in range(len(first))]
+    if not has_header:
+        rows = itertools.chain([first], rows)
+    width = len(names)
+    rows = (tuple(row) + (None,) * (width - len(row)) if len(row) < width else row for row in rows)
+
+    indices = list(range(width))
+    if columns is not None:
+        wanted = set(columns)
+        selected = [i for i in indices if names[i] in wanted]
+        if selected:  # Reading no column would drop the rows too
+            indices = selected
+    selected_names = [names[i] for i in indices]
+
+    sample = list(itertools.islice(rows, SHEET_SCHEMA_ROWS))
+    schema = dict(rows_frame(sample, selected_names, indices).schema)
+    rows = itertools.chain(sample, rows)
+
+    batch: List[Row] = []
+    emitted = False
+    for row in rows:
+        batch.append(row)
+        if chunk_size and len(batch) == chunk_size:
+            yield rows_frame(batch, selected_names, indices, schema)
+            emitted = True
+            batch = []
+    if batch or not emitted:
+        yield rows_frame(batch, selected_names, indices, schema)
@@ -0,0 +1,194 @@
+"""Incremental reading of the row elements of an XML document.
+
+``iter_row_elements`` matches a row XPath against the path of every
+element while ``iterparse`` reads the document, and hands back each
+matched element once it is complete. Elements no row still needs are
+cleared and detached from their parent, so that memory holds about one
+row element at a time instead of the whole tree.
+
+Paths are interpreted as ``Element.findall`` does from the root element:
+steps are tags (``loan``, ``{http://example.org/ns}loan``, ``ns:loan`` with
+a prefix declared in the document, ``{*}loan``) or ``*``, joined by ``/``
+for children and ``//`` for descendants. An absolute path naming the
+root element is made relative to it. Paths with other XPath features
+(predicates, ``..``) fall back to ``findall`` on the whole tree.
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+# One step of a path: an optional {namespace} followed by anything up to the next /
+_STEP = re.compile(r"(?:\{[^}]*\})?[^/{]*")
+_NAME = re.compile(r"^(?:\{[^}]*\}|[^\W\d][\w.-]*:)?[^\W\d][\w.-]*$")
+
+Step = Tuple[bool, str]  # (descendant axis, tag test)
+
+
+def split_path(path: str) -> Optional[List[str]]:
+    """Split a path on the slashes outside ``{namespace}`` parts; None if it cannot be."""
+    parts = []
+    position = 0
+    while True:
+        match = _STEP.match(path, position)
+        if match is None:
+            return None
+        parts.append(match.group())
+        position = match.end()
+        if position == len(path):
+            return parts
+        if path[position] != "/":
+            return None
+        position += 1
+
+
+def relative_row_path(row_xpath: str, root_tag: str) -> str:
+    """Make a row XPath relative to the root element, as ``XMLParser`` always did.
+
+    ``/root/loans/loan`` becomes ``loans/loan`` when the root element is
+    ``root``; other absolute paths are taken from the root element as they are.
+    """
+    if not row_xpath.startswith("/"):
+        return row_xpath
+    parts = split_path(row_xpath.lstrip("/")) or row_xpath.lstrip("/").split("/")
+    if parts[0] == root_tag:
+        parts = parts[1:]
+    return "/".join(parts)
+
+
+def compile_row_path(path: str, namespaces: Dict[str, str]) -> Optional[List[Step]]:
+    """Compile a relative path into steps.
+
+    Args:
+        path: Path relative to the root element
+        namespaces: Prefixes declared in the document
+
+    Returns:
+        Steps to match, none for ``.`` (the root itself), or None if the
+        path uses features that need the whole tree
+
+    Raises:
+        ValueError: If a step uses an undeclared namespace prefix
+    """
+    parts = split_path(path)
+    if parts is None:
+        return None
+    steps: List[Step] = []
+    descendant = False
+    for position, part in enumerate(parts):
+        if part == "":
+            # "a//b": the next step may be any number of levels down
+            if position == 0 or position == len(parts) - 1 or descendant:
+                return None
+            descendant = True
+            continue
+        if part == ".":
+            if steps or descendant:
+                return None
+            continue
+        if part != "*" and not _NAME.match(part):
+            return None
+        if not part.startswith("{") and ":" in part:
+            prefix, local = part.split(":", 1)
+            if prefix not in namespaces:
+                raise ValueError(f"Namespace prefix {prefix!r} of row XPath is not declared in the document")
+            part = f"{{{namespaces[prefix]}}}{local}"
+        steps.append((descendant, part))
+        descendant = False
+    return steps
+
+
+def _tag_matches(test: str, tag: str) -> bool:
+    if test == "*" or test == tag:
+        return True
+    return test.startswith("{*}") and tag.rpartition("}")[2] == test[3:]
+
+
+def _advance(steps: List[Step], states: FrozenSet[int], tag: str) -> FrozenSet[int]:
+    """Steps the children of an element may match next, given those the element could.
+
+    A state is the number of steps matched so far; an element whose states
+    include every step is a row.
+    """
+    advanced = set()
+    for index in states:
+        if index == len(steps):
+            continue
+        descendant, test = steps[index]
+        if descendant:
+            advanced.add(index)  # The element is one of the levels a // step skips
+        if _tag_matches(test, tag):
+            advanced.add(index + 1)
+    return frozenset(advanced)
+
+
+def iter_row_elements(path: Path, row_xpath: str) -> Iterator[ET.Element]:
+    """Yield the elements a row XPath selects, in document order.
+
+    Each element is complete when it is yielded and is cleared once the
+    next one is requested, so it must be converted before then.
+
+    Args:
+        path: Path of the XML document
+        row_xpath: Row XPath, see the module docstring
+
+    Yields:
+        Row elements
+
+    Raises:
+        ValueError: If the path uses an undeclared namespace prefix
+    """
+    with open(path, "rb") as source:
+        namespaces: Dict[str, str] = {}
+        steps: List[Step] = []
+        transitions: Dict[Tuple[FrozenSet[int], str], FrozenSet[int]] = {}
+        # Open elements with the steps their children may match next, and
+        # whether they are rows; rows in start order until the outermost ends
+        stack: List[Tuple[ET.Element, FrozenSet[int], bool]] = []
+        rows: List[ET.Element] = []
+        open_rows = 0
+
+        for event, item in ET.iterparse(source, events=("start-ns", "start", "end")):
+            if event == "start-ns":
+                prefix, uri = item
+                namespaces[prefix] = uri
+            elif event == "start":
+                if not stack:
+                    relative = relative_row_path(row_xpath, item.tag)
+                    if not relative:
+                        return
+                    compiled = compile_row_path(relative, namespaces)
+                    if compiled is None:
+                        break
+                    steps = compiled
+                    states, is_row = frozenset({0}), not steps
+                else:
+                    key = (stack[-1][1], item.tag)
+                    cached = transitions.get(key)
+                    if cached is None:
+                        cached = transitions[key] = _advance(steps, key[0], item.tag)
+                    states = cached
+                    is_row = len(steps) in states
+                stack.append((item, states, is_row))
+                if is_row:
+                    rows.append(item)
+                    open_rows += 1
+            else:
+                _, _, is_row = stack.pop()
+                if is_row:
+                    open_rows -= 1
+                if open_rows:
+                    continue  # Still part of a row
+                if rows:
+                    yield from rows
+                    rows = []
+                item.clear()
+                if stack:
+                    stack[-1][0].remove(item)
+        else:
+            return
+
+    # Paths iterparse cannot follow are evaluated on the whole tree
+    root = ET.parse(path).getroot()
+    yield from root.findall(relative_row_path(row_xpath, root.tag))
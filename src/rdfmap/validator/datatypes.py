@@ -1,9 +1,20 @@
 """XSD datatype validation."""
 
 import re
+from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple
+
+import polars as pl
+
+XSD_NS = "http://www.w3.org/2001/XMLSchema#"
+
+_DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_DATETIME_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}')
+_TIME_PATTERN = re.compile(r'^\d{2}:\d{2}:\d{2}$')
+_URI_SCHEME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+_URI_INVALID_CHARS = frozenset(' <>"{}|\\^`')
 
 
 def validate_xsd_string(value: Any) -> tuple[bool, Optional[str]]:
@@ -23,7 +34,7 @@ def validate_xsd_integer(value: Any) -> tuple[bool, Optional[str]]:
         if isinstance(value, float) and value != int_val:
             return False, f"Value {value} is not an integer"
         return True, None
-    except (ValueError, TypeError) as e:
+    except (ValueError, TypeError, OverflowError) as e:
         return False, f"Cannot convert to integer: {e}"
 
 
@@ -73,8 +84,7 @@ def validate_xsd_date(value: Any) -> tuple[bool, Optional[str]]:
     
     if isinstance(value, str):
         # Basic ISO 8601 date format validation
-        date_pattern = r'^\d{4}-\d{2}-\d{2}$'
-        if re.match(date_pattern, value):
+        if _DATE_PATTERN.match(value):
             try:
                 # Validate it's a real date
                 year, month, day = map(int, value.split('-'))
@@ -94,8 +104,7 @@ def validate_xsd_datetime(value: Any) -> tuple[bool, Optional[str]]:
     
     if isinstance(value, str):
         # Basic ISO 8601 datetime format validation
-        datetime_pattern = r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}'
-        if re.match(datetime_pattern, value):
+        if _DATETIME_PATTERN.match(value):
             return True, None
         return False, f"DateTime must be in ISO 8601 format, got '{value}'"
     
@@ -106,8 +115,7 @@ def validate_xsd_time(value: Any) -> tuple[bool, Optional[str]]:
     """Validate value can be represented as xsd:time."""
     if isinstance(value, str):
         # Basic time format validation HH:MM:SS
-        time_pattern = r'^\d{2}:\d{2}:\d{2}$'
-        if re.match(time_pattern, value):
+        if _TIME_PATTERN.match(value):
             return True, None
         return False, f"Time must be in HH:MM:SS format, got '{value}'"
     
@@ -120,12 +128,11 @@ def validate_xsd_anyuri(value: Any) -> tuple[bool, Optional[str]]:
         return False, "URI must be a string"
     
     # Basic URI validation
-    uri_pattern = r'^[a-zA-Z][a-zA-Z0-9+.-]*:'
-    if not re.match(uri_pattern, value):
+    if not _URI_SCHEME_PATTERN.match(value):
         return False, f"Invalid URI format: '{value}' (must have a scheme)"
     
     # Check for invalid characters
-    if any(c in value for c in [' ', '<', '>', '"', '{', '}', '|', '\\', '^', '`']):
+    if not _URI_INVALID_CHARS.isdisjoint(value):
         return False, f"URI contains invalid characters: '{value}'"
     
     return True, None
@@ -154,7 +161,7 @@ def validate_datatype(value: Any, datatype: str) -> tuple[bool, Optional[str]]:
     
     Args:
         value: Value to validate
-        datatype: XSD datatype URI or CURIE (e.g., "xsd:string")
+        datatype: XSD datatype URI, URIRef or CURIE (e.g., "xsd:string")
         
     Returns:
         Tuple of (is_valid, error_message)
@@ -165,9 +172,147 @@ def validate_datatype(value: Any, datatype: str) -> tuple[bool, Optional[str]]:
         if prefix == "xsd":
             datatype = f"http://www.w3.org/2001/XMLSchema#{local}"
     
-    validator = DATATYPE_VALIDATORS.get(datatype)
+    # URIRef does not compare equal to plain strings
+    validator = DATATYPE_VALIDATORS.get(str(datatype))
     if validator:
         return validator(value)
     
     # Unknown datatype - allow it (permissive)
     return True, None
+
+
+# Vectorized validation -------------------------------------------------------
+#
+# Polars regex mirrors of what int(), Decimal() and float() accept, so that a
+# Series validates exactly like its values do one at a time.
+
+_DIGITS = r"\d+(?:_\d+)*"
+_NUMBER = rf"(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?"
+_SERIES_INTEGER = rf"^\s*[+-]?{_DIGITS}\s*$"
+# Decimal() drops every underscore before parsing, so this is matched
+# against the value with underscores removed
+_SERIES_DECIMAL = r"^\s*[+-]?(?:(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?|(?i:inf(?:inity)?|s?nan\d*))\s*$"
+_SERIES_FLOAT = rf"^\s*[+-]?(?:{_NUMBER}|(?i:inf(?:inity)?|nan))\s*$"
+_SERIES_DATE = r"^[0-9]{4}-[0-9]{2}-[0-9]{2}$"
+_SERIES_DATETIME = r"^[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}"
+_SERIES_TIME = r"^[0-9]{2}:[0-9]{2}:[0-9]{2}$"
+_SERIES_URI_SCHEME = r"^[a-zA-Z][a-zA-Z0-9+.-]*:"
+_SERIES_URI_INVALID = r"[ <>\"{}|\\^`]"
+
+_INTEGER_TYPES = {"integer", "int", "long", "short"}
+_FLOAT_TYPES = {"float", "double"}
+
+
+@dataclass
+class ColumnValidation:
+    """Result of validating a whole column against an XSD datatype."""
+
+    valid: pl.Series  # True where the value is valid or null
+    invalid_count: int = 0
+    samples: List[Tuple[int, Any]] = field(default_factory=list)  # (row index, value)
+
+
+def _xsd_local_name(datatype: str) -> Optional[str]:
+    """Local name of an XSD datatype given as URI, URIRef or CURIE."""
+    datatype = str(datatype)
+    if datatype.startswith(XSD_NS):
+        return datatype[len(XSD_NS):]
+    if datatype.startswith("xsd:"):
+        return datatype[4:]
+    return None
+
+
+def _string_validity(values: pl.Expr, local: str) -> Optional[pl.Expr]:
+    """Validity expression for a String column."""
+    if local in _INTEGER_TYPES:
+        return values.str.contains(_SERIES_INTEGER)
+    if local == "decimal":
+        return values.str.replace_all("_", "", literal=True).str.contains(_SERIES_DECIMAL)
+    if local in _FLOAT_TYPES:
+        return values.str.contains(_SERIES_FLOAT)
+    if local == "boolean":
+        return values.str.to_lowercase().is_in(["true", "false", "1", "0"])
+    if local == "date":
+        # The pattern checks the shape, the parse rejects impossible dates
+        return (
+            values.str.contains(_SERIES_DATE)
+            & values.str.to_date("%Y-%m-%d", strict=False).is_not_null()
+            & ~values.str.starts_with("0000")
+        )
+    if local == "dateTime":
+        return values.str.contains(_SERIES_DATETIME)
+    if local == "time":
+        return values.str.contains(_SERIES_TIME)
+    if local == "anyURI":
+        return values.str.contains(_SERIES_URI_SCHEME) & ~values.str.contains(_SERIES_URI_INVALID)
+    return None
+
+
+def _native_validity(values: pl.Expr, dtype: pl.DataType, local: str) -> Optional[pl.Expr]:
+    """Validity expression for a column of native (non-string) values."""
+    numeric = dtype.is_numeric()
+    if local in _INTEGER_TYPES:
+        if dtype.is_float():
+            return values.is_finite() & (values == values.floor())
+        return pl.lit(numeric or dtype == pl.Boolean)
+    if local == "decimal":
+        return pl.lit(numeric)
+    if local in _FLOAT_TYPES:
+        return pl.lit(numeric or dtype == pl.Boolean)
+    if local == "boolean":
+        if dtype == pl.Boolean:
+            return pl.lit(True)
+        return ((values == 0) | (values == 1)) if numeric else pl.lit(False)
+    if local == "date":
+        return pl.lit(dtype == pl.Date)
+    if local == "dateTime":
+        return pl.lit(isinstance(dtype, pl.Datetime))
+    if local in ("time", "anyURI"):
+        return pl.lit(False)
+    return None
+
+
+def validate_series(values: pl.Series, datatype: str, max_samples: int = 10) -> ColumnValidation:
+    """Validate a whole Series against an XSD datatype.
+
+    Equivalent to calling ``validate_datatype`` on every non-null value, but
+    evaluated with Polars casts and regular expressions.
+
+    Args:
+        values: Column to validate
+        datatype: XSD datatype URI, URIRef or CURIE (e.g., "xsd:integer")
+        max_samples: Maximum number of offending rows to return
+
+    Returns:
+        ColumnValidation with the validity mask, invalid count and samples
+    """
+    local = _xsd_local_name(datatype)
+    dtype = values.dtype
+    if dtype in (pl.Categorical, pl.Enum):
+        values = values.cast(pl.String)
+        dtype = pl.String()
+
+    col = pl.col("value")
+    validity = None
+    if local is not None and local != "string" and dtype != pl.Null:
+        if dtype == pl.String:
+            validity = _string_validity(col, local)
+        else:
+            validity = _native_validity(col, dtype, local)
+
+    if validity is None:
+        # xsd:string and unknown datatypes accept every value
+        return ColumnValidation(valid=pl.Series(values.name, [True] * len(values)))
+
+    valid = (
+        values.to_frame("value")
+        .select((validity.fill_null(False) | col.is_null()).alias(values.name))
+        .to_series()
+    )
+
+    invalid_count = len(valid) - int(valid.sum())
+    samples: List[Tuple[int, Any]] = []
+    if invalid_count and max_samples > 0:
+        indices = (~valid).arg_true().head(max_samples)
+        samples = list(zip(indices.to_list(), values.gather(indices).to_list()))
+    return ColumnValidation(valid=valid, invalid_count=invalid_count, samples=samples)
@@ -2,10 +2,16 @@
 
 Provides a focused structural check separate from SHACL shapes and closed-world ontology term checks.
 """
-from rdflib import Graph, RDF, RDFS, Literal, XSD
+from dataclasses import dataclass
+from rdflib import Graph, RDF, RDFS, Literal, URIRef, XSD
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
 
+import polars as pl
+from rdflib.term import Node
+
+from ..emitter.mapping_plan import LiteralRule, ObjectPlan, SheetPlan
+from ..generator.ontology_analyzer import OntologyAnalyzer
 from ..models.errors import ValidationReport, ValidationResult
 
 def structural_validate(
@@ -28,22 +34,22 @@ def structural_validate(
         ontology_graph.parse(ontology_file)
 
     # Build domain/range index
-    prop_domains = {}
-    prop_ranges = {}
+    prop_domains: Dict[Node, Set[Node]] = {}
+    prop_ranges: Dict[Node, Set[Node]] = {}
     for s,_,o in ontology_graph.triples((None, RDFS.domain, None)):
         prop_domains.setdefault(s, set()).add(o)
     for s,_,o in ontology_graph.triples((None, RDFS.range, None)):
         prop_ranges.setdefault(s, set()).add(o)
 
     # Cache types in data graph
-    type_cache = {}
+    type_cache: Dict[Node, Set[Node]] = {}
     for s,_,o in data_graph.triples((None, RDF.type, None)):
         type_cache.setdefault(s, set()).add(o)
 
     violations: list[ValidationResult] = []
     checked = 0
 
-    def short(u):
+    def short(u: Node) -> str:
         if isinstance(u, Literal):
             return f'"{u}"^^{u.datatype}' if u.datatype else f'"{u}"'
         txt = str(u)
@@ -96,3 +102,102 @@ def structural_validate(
     )
     return report
 
+
+# Datatype rdflib gives untyped literals of a Polars column type
+_INFERRED_DATATYPES: Dict[Any, URIRef] = {
+    pl.Int8: XSD.integer, pl.Int16: XSD.integer, pl.Int32: XSD.integer, pl.Int64: XSD.integer,
+    pl.UInt8: XSD.integer, pl.UInt16: XSD.integer, pl.UInt32: XSD.integer, pl.UInt64: XSD.integer,
+    pl.Float32: XSD.double, pl.Float64: XSD.double, pl.Boolean: XSD.boolean, pl.Date: XSD.date,
+}
+
+
+@dataclass
+class RuleViolation:
+    """A mapping rule whose every triple breaks a domain or range axiom."""
+
+    message: str
+    is_domain: bool
+    subject_template: str
+    column: Optional[str] = None  # Literal rules: triples need a value in this column
+    object_template: Optional[str] = None  # Object links: triples need an object IRI
+
+
+def _conforms(classes: Iterable[URIRef], expected: URIRef, analyzer: OntologyAnalyzer) -> bool:
+    """Whether any of the classes is the expected class or one of its subclasses."""
+    return any(cls == expected or expected in analyzer.get_superclasses(cls) for cls in classes)
+
+
+def _literal_datatype(rule: LiteralRule, dtype: Optional[pl.DataType]) -> Optional[URIRef]:
+    if rule.language:
+        return None
+    if rule.datatype is not None:
+        return rule.datatype
+    if rule.transform is not None or dtype is None:
+        return None
+    return _INFERRED_DATATYPES.get(dtype)
+
+
+def check_plan_structure(
+    plan: SheetPlan, analyzer: OntologyAnalyzer, schema: Optional[Dict[str, pl.DataType]] = None
+) -> List[RuleViolation]:
+    """Check the rules of a compiled sheet plan against ontology domains and ranges.
+
+    Every triple of a rule shares the subject classes, the predicate and the
+    object classes (or literal datatype), so conformance is decided once per
+    rule, with the ontology's superclass closure, instead of per triple.
+
+    Args:
+        plan: Compiled SheetPlan
+        analyzer: OntologyAnalyzer with the property axioms
+        schema: Column types of the data, used for the datatype of untyped literals
+
+    Returns:
+        Violating rules, to be counted per emitted triple
+    """
+    schema = schema or {}
+    properties = {str(uri): prop for uri, prop in analyzer.properties.items()}
+    violations: List[RuleViolation] = []
+
+    def check_literals(template: str, classes: List[URIRef], rules: List[LiteralRule]) -> None:
+        for rule in rules:
+            prop = properties.get(str(rule.predicate))
+            if prop is None:
+                continue
+            if prop.domain and not _conforms(classes, prop.domain, analyzer):
+                violations.append(RuleViolation(
+                    f"Domain violation: column '{rule.column}' puts {rule.predicate} on {', '.join(map(str, classes))}, outside its domain {prop.domain}",
+                    True, template, column=rule.column,
+                ))
+            if prop.range_type and str(prop.range_type).startswith(str(XSD)):
+                datatype = _literal_datatype(rule, schema.get(rule.column))
+                if datatype != prop.range_type:
+                    violations.append(RuleViolation(
+                        f"Range datatype violation: column '{rule.column}' gives {rule.predicate} literals of {datatype}, expected {prop.range_type}",
+                        False, template, column=rule.column,
+                    ))
+
+    def check_objects(template: str, classes: List[URIRef], objects: List[ObjectPlan]) -> None:
+        for obj in objects:
+            check_literals(obj.iri_template, obj.classes, obj.properties)
+            prop = properties.get(str(obj.predicate)) if obj.predicate is not None else None
+            if prop is None:
+                continue
+            if prop.domain and not _conforms(classes, prop.domain, analyzer):
+                violations.append(RuleViolation(
+                    f"Domain violation: object '{obj.name}' links {obj.predicate} from {', '.join(map(str, classes))}, outside its domain {prop.domain}",
+                    True, template, object_template=obj.iri_template,
+                ))
+            if prop.range_type and not str(prop.range_type).startswith(str(XSD)) and not _conforms(obj.classes, prop.range_type, analyzer):
+                violations.append(RuleViolation(
+                    f"Range class violation: object '{obj.name}' of class {obj.class_label} is outside the range {prop.range_type} of {obj.predicate}",
+                    False, template, object_template=obj.iri_template,
+                ))
+
+    if plan.entities:
+        for entity in plan.entities:
+            check_literals(entity.iri_template, entity.classes, entity.columns)
+            check_objects(entity.iri_template, entity.classes, entity.objects)
+    else:
+        check_literals(plan.subject_template, plan.classes, plan.columns)
+        check_objects(plan.subject_template, plan.classes, plan.objects)
+    return violations
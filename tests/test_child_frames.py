@@ -0,0 +1,205 @@
+"""Tests for emitting the linked objects of nested arrays from child frames.
+
+This module checks that arrays only linked objects read are kept as child
+records by the JSON, JSON Lines and XML parsers, that ``split_child_frames``
+turns them into one row per element keyed by the parent row, and that both
+builders then emit the row resource once per record and an object per
+element, reporting errors on the parent's row.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from rdflib import Graph, Namespace, XSD
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.emitter.mapping_plan import PARENT_ROW, split_child_frames
+from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+from rdfmap.parsers.data_source import JSONParser, ScanPlan, XMLParser, create_parser
+
+EX = Namespace("http://example.org/")
+
+APPLICATIONS = [
+    {"id": "A1", "status": "open",
+     "borrowers": [{"bid": "B1", "name": "Ann"}, {"bid": "B2", "name": "Bob"}],
+     "payments": [{"pid": "P1", "amount": 10}, {"pid": "P2", "amount": 20}, {"pid": "P3", "amount": 30}]},
+    {"id": "A2", "status": "closed", "borrowers": [{"bid": "B3", "name": "Cy"}], "payments": []},
+    {"id": "A3", "status": "open", "borrowers": [{"bid": None, "name": "Nobody"}], "payments": [{"pid": "P4"}]},
+]
+
+
+def _config(source, separator="."):
+    def path(*parts):
+        return separator.join(parts)
+
+    return MappingConfig(
+        namespaces={"ex": str(EX), "xsd": str(XSD)},
+        defaults={"base_iri": str(EX)},
+        sheets=[{
+            "name": "applications",
+            "source": str(source),
+            "row_resource": {"class": "ex:Application", "iri_template": "{base_iri}app/{id}"},
+            "columns": {"status": {"as": "ex:status"}},
+            "objects": {
+                "borrower": {
+                    "predicate": "ex:hasBorrower", "class": "ex:Borrower",
+                    "iri_template": "{base_iri}borrower/{%s}" % path("borrowers", "bid"),
+                    "properties": [{"column": path("borrowers", "name"), "as": "ex:name"}],
+                },
+                "payment": {
+                    "predicate": "ex:hasPayment", "class": "ex:Payment",
+                    "iri_template": "{base_iri}payment/{%s}" % path("payments", "pid"),
+                    "properties": [{"column": path("payments", "amount"), "as": "ex:amount",
+                                    "datatype": "xsd:integer"}],
+                },
+            },
+        }],
+    )
+
+
+@pytest.fixture
+def applications_json(tmp_path):
+    path = tmp_path / "applications.json"
+    path.write_text(json.dumps(APPLICATIONS))
+    return path
+
+
+def _stream(builder_class, config, output, chunk_size=2):
+    sheet = config.sheets[0]
+    report = ProcessingReport()
+    parser = create_parser(Path(sheet.source))
+    with NTriplesStreamWriter(output) as writer:
+        builder = builder_class(config, report, streaming_writer=writer)
+        offset = 0
+        for chunk in parser.parse_plan(builder.compiled.plan_for(sheet).scan_plan(), chunk_size=chunk_size):
+            builder.add_dataframe(chunk, sheet, offset=offset)
+            offset += len(chunk)
+    return report, output.read_text().splitlines()
+
+
+def test_nested_columns_exclude_row_columns(applications_json):
+    config = _config(applications_json)
+    builder = RDFGraphBuilder(config, ProcessingReport())
+    plan = builder.compiled.plan_for(config.sheets[0])
+    assert plan.scan_plan().nested == ["borrowers.bid", "borrowers.name", "payments.pid", "payments.amount"]
+
+
+def test_json_parser_keeps_child_records(applications_json):
+    plan = ScanPlan(columns=["id", "borrowers.bid"], nested=["borrowers.bid"])
+    frame = next(JSONParser(applications_json).parse_plan(plan))
+    # One row per application, unreferenced payments are dropped
+    assert frame.columns == ["id", "borrowers"]
+    assert frame["borrowers"].to_list()[0] == [{"borrowers.bid": "B1"}, {"borrowers.bid": "B2"}]
+
+
+def test_split_child_frames(applications_json):
+    config = _config(applications_json)
+    plan = RDFGraphBuilder(config, ProcessingReport()).compiled.plan_for(config.sheets[0])
+    chunk = next(JSONParser(applications_json).parse_plan(plan.scan_plan()))
+    df, objects, children = split_child_frames(chunk, plan)
+
+    assert df.columns == ["id", "status"] and objects == []
+    borrowers, payments = (child.frame for child in children)
+    assert borrowers.select(PARENT_ROW, "borrowers.bid").rows() == [(0, "B1"), (0, "B2"), (1, "B3"), (2, None)]
+    # Empty arrays give no child rows
+    assert payments[PARENT_ROW].to_list() == [0, 0, 0, 2]
+
+
+@pytest.mark.parametrize("builder_class", [RDFGraphBuilder, ColumnarNTriplesBuilder])
+def test_parent_triples_once_per_record(tmp_path, applications_json, builder_class):
+    report, lines = _stream(builder_class, _config(applications_json), tmp_path / "out.nt")
+
+    assert len(lines) == len(set(lines))
+    assert sum(" <http://example.org/status> " in line for line in lines) == 3
+    assert sum(" <http://example.org/hasBorrower> " in line for line in lines) == 3
+    assert sum(" <http://example.org/hasPayment> " in line for line in lines) == 4
+    assert report.total_rows == 3
+    # The borrower without an id is reported on its application's row
+    assert [error.row for error in report.errors] == [3]
+
+
+def test_builders_agree(tmp_path, applications_json):
+    _stream(RDFGraphBuilder, _config(applications_json), tmp_path / "rows.nt")
+    _stream(ColumnarNTriplesBuilder, _config(applications_json), tmp_path / "columnar.nt")
+    assert isomorphic(
+        Graph().parse(tmp_path / "rows.nt", format="nt"),
+        Graph().parse(tmp_path / "columnar.nt", format="nt"),
+    )
+
+
+def test_json_lines(tmp_path, applications_json):
+    path = tmp_path / "applications.jsonl"
+    path.write_text("\n".join(json.dumps(record) for record in APPLICATIONS) + "\n")
+    _, lines = _stream(ColumnarNTriplesBuilder, _config(path), tmp_path / "lines.nt")
+    _, expected = _stream(ColumnarNTriplesBuilder, _config(applications_json), tmp_path / "json.nt")
+    assert sorted(lines) == sorted(expected)
+
+
+def test_xml_repeated_elements(tmp_path):
+    path = tmp_path / "applications.xml"
+    path.write_text(
+        "<applications>"
+        "<application><id>A1</id><status>open</status>"
+        "<borrowers><bid>B1</bid><name>Ann</name></borrowers>"
+        "<borrowers><bid>B2</bid><name>Bob</name></borrowers></application>"
+        "<application><id>A2</id><status>closed</status>"
+        "<borrowers><bid>B3</bid><name>Cy</name></borrowers></application>"
+        "</applications>"
+    )
+    config = _config(path, separator="/")
+    config.sheets[0].objects.pop("payment")
+    report, _ = _stream(RDFGraphBuilder, config, tmp_path / "xml.nt")
+
+    graph = Graph().parse(tmp_path / "xml.nt", format="nt")
+    assert set(graph.objects(EX["app/A1"], EX.hasBorrower)) == {EX["borrower/B1"], EX["borrower/B2"]}
+    assert graph.value(EX["borrower/B2"], EX.name).toPython() == "Bob"
+    assert report.total_rows == 2
+
+
+def test_xml_records_under_a_wrapper(tmp_path):
+    path = tmp_path / "wrapped.xml"
+    path.write_text(
+        "<root><row><id>A1</id><borrowers>"
+        "<borrower><bid>B1</bid></borrower><borrower><bid>B2</bid></borrower>"
+        "</borrowers></row></root>"
+    )
+    plan = ScanPlan(columns=["id", "borrowers/borrower/bid"], nested=["borrowers/borrower/bid"])
+    frame = next(XMLParser(path).parse_plan(plan))
+    assert frame["borrowers"].to_list() == [[{"borrowers/borrower/bid": "B1"}, {"borrowers/borrower/bid": "B2"}]]
+
+
+@pytest.mark.parametrize("typed_parsing", [True, False])
+@pytest.mark.parametrize("builder_class", [RDFGraphBuilder, ColumnarNTriplesBuilder])
+def test_parent_columns_transformed_once(tmp_path, builder_class, typed_parsing):
+    path = tmp_path / "loans.json"
+    path.write_text(json.dumps([{"id": "L1", "opened": "2024-01-15", "borrowers": [{"bid": "B1"}]}]))
+    config = MappingConfig(
+        namespaces={"ex": str(EX), "xsd": str(XSD)},
+        defaults={"base_iri": str(EX)},
+        sheets=[{
+            "name": "loans",
+            "source": str(path),
+            "row_resource": {"class": "ex:Loan", "iri_template": "{base_iri}loan/{id}"},
+            "columns": {"opened": {"as": "ex:opened", "datatype": "xsd:date", "transform": "to_date"}},
+            "objects": {
+                "borrower": {
+                    "predicate": "ex:hasBorrower", "class": "ex:Borrower",
+                    "iri_template": "{base_iri}borrower/{borrowers.bid}",
+                    "properties": [{"column": "opened", "as": "ex:since", "datatype": "xsd:date"}],
+                },
+            },
+        }],
+        # Without typed parsing the dates are parsed by the transform
+        options={"typed_parsing": typed_parsing},
+    )
+    report, _ = _stream(builder_class, config, tmp_path / "out.nt")
+
+    graph = Graph().parse(tmp_path / "out.nt", format="nt")
+    assert str(graph.value(EX["borrower/B1"], EX.since)) == "2024-01-15"
+    assert str(graph.value(EX["loan/L1"], EX.opened)) == "2024-01-15"
+    assert report.errors == []
@@ -0,0 +1,156 @@
+"""Tests for the columnar N-Triples emission engine.
+
+This module checks that ColumnarNTriplesBuilder writes exactly the triples
+and errors of the row-wise RDFGraphBuilder streaming path.
+"""
+
+from datetime import date
+
+import pytest
+import polars as pl
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+from rdfmap.emitter.parquet_triples import ParquetTripleWriter, read_parquet_graph, scan_parquet_triples
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+
+
+def _column(name, datatype=None, **extra):
+    mapping = {"as": f"ex:{name}", **extra}
+    if datatype:
+        mapping["datatype"] = datatype
+    return mapping
+
+
+@pytest.fixture
+def config():
+    """Create a mapping that exercises every literal conversion path."""
+    columns = {
+        "id": _column("id", "xsd:string", required=True),
+        "int_str": _column("int_str", "xsd:integer"),
+        "dec_str": _column("dec_str", "xsd:decimal"),
+        "bool_str": _column("bool_str", "xsd:boolean"),
+        "date_str": _column("date_str", "xsd:date", required=True),
+        "double_str": _column("double_str", "xsd:double"),
+        "custom_str": _column("custom_str", "ex:code"),
+        "text": _column("text", language="fr"),
+        "plain": _column("plain"),
+        "int_col": _column("int_col"),
+        "int_lang": _column("int_lang"),
+        "float_col": _column("float_col", "xsd:decimal"),
+        "float_int": _column("float_int", "xsd:integer"),
+        "bool_col": _column("bool_col"),
+        "date_col": _column("date_col", "xsd:date"),
+        "padded": _column("padded", "xsd:string", transform="strip"),
+        "amount": _column("amount", "xsd:decimal", transform="to_decimal"),
+    }
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        defaults={"base_iri": "http://example.org/", "language": "en"},
+        sheets=[{
+            "name": "things",
+            "source": "things.csv",
+            "row_resource": {"class": ["ex:Thing", "ex:Item"], "iri_template": "{base_iri}thing/{id}"},
+            "columns": columns,
+            "objects": {
+                "owner": {
+                    "predicate": "ex:owner",
+                    "class": "ex:Owner",
+                    "iri_template": "{base_iri}owner/{owner_id}",
+                    "properties": [{"column": "owner_name", "as": "ex:name", "datatype": "xsd:string"}],
+                },
+            },
+        }],
+    )
+
+
+@pytest.fixture
+def frame():
+    """Create a chunk with clean, non-canonical and invalid values."""
+    return pl.DataFrame({
+        "id": ["a", "b", "c", None, "e f", "g"],
+        "int_str": ["1", "007", "-0", "abc", "", "+5"],
+        "dec_str": ["0.0650", ".5", "1e3", "-2", "x", None],
+        "bool_str": ["true", "1", "False", "maybe", "false", "0"],
+        "date_str": ["2021-01-05", "2021-13-45", "2021-1-5", "2020-02-29", "", "2021-02-30"],
+        "double_str": ["1.5", "1.50", "x", "2", None, "-0"],
+        "custom_str": ["A\\B", 'say "hi"', "line\nbreak", "tab\t", "\r", "ok"],
+        "text": ["bonjour", "", None, "é", "x", "y"],
+        "plain": ["p", "q", "r", "s", "t", "u"],
+        "int_col": [1, None, -3, 0, 5, 6],
+        "int_lang": [1, 2, 3, 4, 5, 6],
+        "float_col": [0.0653, 250000.0, 1e-05, 1e20, float("nan"), -0.0],
+        "float_int": [3.0, 3.5, None, 0.0, 1.0, 2.0],
+        "bool_col": [True, False, None, True, False, True],
+        "date_col": [date(2021, 1, 5), None, date(1999, 12, 31), date(2021, 1, 5), date(2000, 1, 1), date(2000, 2, 29)],
+        "padded": ["  x ", "y", "", None, " ", "z"],
+        "amount": ["1.5", "7", "2", None, "3.25", "4"],
+        "owner_id": ["o1", None, "o3", "o4", "o5", "o6"],
+        "owner_name": ["Ann", "Bob", "", "Dee", None, "Fay"],
+    })
+
+
+def _emit(builder_class, config, frames, tmp_path, name):
+    report = ProcessingReport()
+    out = tmp_path / f"{name}.nt"
+    with NTriplesStreamWriter(out) as writer:
+        if builder_class is RDFGraphBuilder:
+            builder = RDFGraphBuilder(config, report, streaming_writer=writer)
+        else:
+            builder = builder_class(config, report, writer)
+        offset = 0
+        for df in frames:
+            builder.add_dataframe(df, config.sheets[0], offset=offset)
+            offset += len(df)
+    errors = sorted((e.row, e.error, e.severity) for e in report.errors)
+    counts = (builder.get_triple_count(), report.total_rows, report.failed_rows, report.warnings)
+    return sorted(out.read_text().splitlines()), errors, counts
+
+
+class TestColumnarNTriplesBuilder:
+    """Test suite comparing columnar and row-wise N-Triples output."""
+
+    def test_matches_row_wise_builder(self, config, frame, tmp_path):
+        expected = _emit(RDFGraphBuilder, config, [frame], tmp_path, "rows")
+        actual = _emit(ColumnarNTriplesBuilder, config, [frame], tmp_path, "columns")
+        assert actual == expected
+
+    def test_matches_row_wise_builder_across_chunks(self, config, frame, tmp_path):
+        chunks = [frame.slice(0, 4), frame.slice(4)]
+        expected = _emit(RDFGraphBuilder, config, chunks, tmp_path, "rows")
+        actual = _emit(ColumnarNTriplesBuilder, config, chunks, tmp_path, "columns")
+        assert actual == expected
+        assert any(row == 6 for row, _, _ in actual[1])
+
+    def test_missing_template_column(self, config, frame, tmp_path):
+        df = frame.drop("owner_id")
+        expected = _emit(RDFGraphBuilder, config, [df], tmp_path, "rows")
+        actual = _emit(ColumnarNTriplesBuilder, config, [df], tmp_path, "columns")
+        assert actual == expected
+
+    def test_lines_are_escaped(self, config, frame, tmp_path):
+        lines, _, _ = _emit(ColumnarNTriplesBuilder, config, [frame], tmp_path, "columns")
+        custom = [line for line in lines if "custom_str" in line]
+        assert '<http://example.org/thing/a> <http://example.org/custom_str> "A\\\\B"^^<http://example.org/code> .' in custom
+        assert all(line.endswith(" .") for line in lines)
+
+    def test_parquet_table_matches_lines(self, config, frame, tmp_path):
+        pytest.importorskip("pyarrow")
+        lines, errors, _ = _emit(ColumnarNTriplesBuilder, config, [frame], tmp_path, "columns")
+        report = ProcessingReport()
+        out = tmp_path / "columns.parquet"
+        with ParquetTripleWriter(out) as writer:
+            ColumnarNTriplesBuilder(config, report, writer).add_dataframe(frame, config.sheets[0])
+
+        assert sorted((e.row, e.error, e.severity) for e in report.errors) == errors
+        assert isomorphic(read_parquet_graph(out), Graph().parse(data="\n".join(lines), format="nt"))
+        # Literals are stored unescaped, with their datatype or language in their own columns
+        table = scan_parquet_triples(out).collect()
+        custom = table.filter(pl.col("predicate") == "http://example.org/custom_str")
+        assert set(custom["object"]) >= {"A\\B", 'say "hi"', "line\nbreak"}
+        assert set(custom["datatype"]) == {"http://example.org/code"}
+        assert set(table.filter(pl.col("predicate") == "http://example.org/text")["lang"]) == {"fr"}
@@ -0,0 +1,129 @@
+"""Tests for chunked CSV parsing.
+
+This module tests that CSVParser and StreamingCSVParser read chunked input
+in a single pass with stable chunk sizes and a consistent schema.
+"""
+
+import pytest
+import polars as pl
+
+from rdfmap.parsers.data_source import CSVParser, find_record_starts, iter_record_blocks, rebatch_frames
+from rdfmap.parsers.streaming_parser import StreamingCSVParser
+
+
+@pytest.fixture
+def loans_csv(tmp_path):
+    """Create a CSV file with 2,500 loan rows."""
+    csv_file = tmp_path / "loans.csv"
+    lines = ["LoanID,Principal,Notes"]
+    for i in range(2500):
+        lines.append(f'L-{i:05d},{100000 + i},"note, with comma {i}"')
+    csv_file.write_text("\n".join(lines) + "\n")
+    return csv_file
+
+
+class TestCSVParserChunking:
+    """Test suite for single-pass chunked CSV reading."""
+
+    def test_chunks_have_configured_size(self, loans_csv):
+        parser = CSVParser(loans_csv)
+        sizes = [len(chunk) for chunk in parser.parse(chunk_size=1000)]
+        assert sizes == [1000, 1000, 500]
+
+    def test_chunks_preserve_order_and_content(self, loans_csv):
+        parser = CSVParser(loans_csv)
+        chunked = pl.concat(list(parser.parse(chunk_size=300)))
+        full = next(CSVParser(loans_csv).parse())
+        assert chunked.equals(full)
+
+    def test_header_schema_carried_through_chunks(self, loans_csv):
+        parser = CSVParser(loans_csv)
+        schemas = {tuple(chunk.schema.items()) for chunk in parser.parse(chunk_size=400)}
+        assert len(schemas) == 1
+        assert next(iter(schemas))[0] == ("LoanID", pl.String)
+
+    def test_exact_multiple_of_chunk_size(self, loans_csv):
+        parser = CSVParser(loans_csv)
+        sizes = [len(chunk) for chunk in parser.parse(chunk_size=500)]
+        assert sizes == [500] * 5
+
+    def test_header_only_file_yields_nothing(self, tmp_path):
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_text("a,b\n")
+        assert list(CSVParser(csv_file).parse(chunk_size=10)) == []
+
+    def test_streaming_parser_uses_same_engine(self, loans_csv):
+        batches = list(StreamingCSVParser(loans_csv).stream_batches(batch_size=1000))
+        assert [len(b) for b in batches] == [1000, 1000, 500]
+        assert batches[1]["LoanID"][0] == "L-01000"
+
+    def test_streaming_transforms_are_batched(self, loans_csv):
+        parser = StreamingCSVParser(loans_csv)
+        batches = list(parser.stream_with_transforms(batch_size=1000, transforms={"Principal": "to_decimal"}))
+        assert [len(b) for b in batches] == [1000, 1000, 500]
+        assert batches[0].schema["Principal"] == pl.Float64
+
+
+class TestRebatchFrames:
+    """Test suite for re-slicing arbitrary batches."""
+
+    def test_merges_small_and_splits_large_batches(self):
+        frames = [pl.DataFrame({"x": list(range(start, start + n))}) for start, n in [(0, 3), (3, 10), (13, 1)]]
+        out = list(rebatch_frames(frames, 4))
+        assert [len(f) for f in out] == [4, 4, 4, 2]
+        assert pl.concat(out)["x"].to_list() == list(range(14))
+
+
+@pytest.fixture
+def multiline_csv(tmp_path):
+    """Create a CSV file whose quoted values contain newlines and quotes."""
+    csv_file = tmp_path / "notes.csv"
+    lines = ["id,note,amount"]
+    for i in range(600):
+        note = ['plain', '"multi\nline, quoted"', '"say ""hi""\nthen\nleave"'][i % 3]
+        lines.append(f"{i},{note},{i * 1.5}")
+    csv_file.write_text("\n".join(lines) + "\n")
+    return csv_file
+
+
+class TestCSVByteRanges:
+    """Test suite for record-aligned byte-range sharding."""
+
+    def test_ranges_cover_all_records(self, multiline_csv):
+        full = next(CSVParser(multiline_csv).parse())
+        parser = CSVParser(multiline_csv)
+        schema = dict(parser.scan().collect_schema())
+        for parts in (1, 2, 7, 50):
+            ranges = parser.split_byte_ranges(parts)
+            assert len(ranges) == parts
+            frames = [
+                chunk
+                for byte_range in ranges
+                for chunk in CSVParser(multiline_csv, byte_range=byte_range, schema=schema).parse(chunk_size=64)
+            ]
+            assert pl.concat(frames).equals(full)
+
+    def test_boundaries_skip_quoted_newlines(self, multiline_csv):
+        data = multiline_csv.read_bytes()
+        starts = find_record_starts(multiline_csv, range(0, len(data), 97), block_size=256)
+        assert starts[-1] == len(data)
+        for start in starts[:-1]:
+            assert data[start - 1:start] == b"\n"
+            # Every record start is followed by an id and a comma
+            assert data[start:].split(b",", 1)[0].isdigit()
+
+    def test_blocks_hold_whole_records(self, multiline_csv):
+        parser = CSVParser(multiline_csv)
+        start, end = parser.split_byte_ranges(1)[0]
+        blocks = list(iter_record_blocks(multiline_csv, start, end, block_size=100))
+        assert len(blocks) > 1
+        assert b"".join(blocks) == multiline_csv.read_bytes()[start:end]
+        assert all(block.count(b'"') % 2 == 0 for block in blocks)
+
+    def test_more_parts_than_records(self, tmp_path):
+        csv_file = tmp_path / "small.csv"
+        csv_file.write_text("a,b\n1,2\n3,4\n")
+        ranges = CSVParser(csv_file).split_byte_ranges(8)
+        assert ranges[0][0] == 4
+        assert ranges[-1][1] == csv_file.stat().st_size
+        assert len(ranges) <= 2
@@ -0,0 +1,121 @@
+"""Tests for out-of-core aggregation through sorted runs.
+
+This module checks that spilling N-Triples lines to sorted runs and merging
+them gives the deduplicated triples of an in-memory graph, as N-Triples and
+as subject-grouped Turtle.
+"""
+
+import polars as pl
+import pytest
+from rdflib import Graph, Literal, URIRef
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter import external_sort
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.external_sort import SortedRunWriter, merge_sorted_lines
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+
+
+@pytest.fixture
+def config():
+    """Create a mapping where a person's rows repeat across chunks."""
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        defaults={"base_iri": "http://example.org/"},
+        sheets=[{
+            "name": "people",
+            "source": "people.csv",
+            "row_resource": {"class": "ex:Person", "iri_template": "{base_iri}person/{id}"},
+            "columns": {
+                "name": {"as": "ex:name", "datatype": "xsd:string"},
+                "tag": {"as": "ex:tag"},
+            },
+        }],
+    )
+
+
+def _chunks():
+    for start in range(0, 300, 50):
+        ids = [f"p{i % 40}" for i in range(start, start + 50)]
+        yield pl.DataFrame({
+            "id": ids,
+            "name": [f"Person {i}" for i in ids],
+            "tag": [f'tag "{i % 3}"' for i in range(start, start + 50)],
+        })
+
+
+def _convert(config, writer):
+    builder = ColumnarNTriplesBuilder(config, ProcessingReport(), writer)
+    with writer:
+        offset = 0
+        for chunk in _chunks():
+            builder.add_dataframe(chunk, config.sheets[0], offset=offset)
+            offset += len(chunk)
+    return builder
+
+
+def _expected(config, tmp_path):
+    from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+    path = tmp_path / "raw.nt"
+    _convert(config, NTriplesStreamWriter(path))
+    return Graph().parse(path, format="nt")
+
+
+class TestSortedRunWriter:
+    """Test suite for the spilling, merging writer."""
+
+    def test_deduplicated_ntriples(self, config, tmp_path):
+        output = tmp_path / "out.nt"
+        writer = SortedRunWriter(output, spill_dir=tmp_path / "spill")
+        writer.spill_threshold = 2000
+        _convert(config, writer)
+
+        lines = output.read_text().splitlines()
+        assert len(writer.runs) > 1
+        assert lines == sorted(set(lines))
+        assert writer.get_triple_count() == len(lines) < writer.input_triples
+        assert isomorphic(Graph().parse(output, format="nt"), _expected(config, tmp_path))
+        assert list((tmp_path / "spill").iterdir()) == []
+
+    def test_multi_pass_merge(self, config, tmp_path, monkeypatch):
+        monkeypatch.setattr(external_sort, "MERGE_FAN_IN", 2)
+        output = tmp_path / "out.nt"
+        writer = SortedRunWriter(output)
+        writer.spill_threshold = 1000
+        _convert(config, writer)
+
+        assert len(writer.runs) > 4
+        assert isomorphic(Graph().parse(output, format="nt"), _expected(config, tmp_path))
+
+    def test_subject_grouped_turtle(self, config, tmp_path):
+        output = tmp_path / "out.ttl"
+        writer = SortedRunWriter(output, output_format="ttl")
+        writer.spill_threshold = 2000
+        _convert(config, writer)
+
+        text = output.read_text()
+        assert text.count("<http://example.org/person/p1> ") == 1
+        graph = Graph().parse(output, format="turtle")
+        assert len(graph) == writer.get_triple_count()
+        assert isomorphic(graph, _expected(config, tmp_path))
+
+    def test_write_triple(self, tmp_path):
+        output = tmp_path / "out.nt"
+        with SortedRunWriter(output) as writer:
+            for _ in range(2):
+                writer.write_triple(URIRef("http://example.org/b"), URIRef("http://example.org/p"), Literal("x"))
+                writer.write_triple(URIRef("http://example.org/a"), URIRef("http://example.org/p"), Literal("y"))
+        assert output.read_text().splitlines() == [
+            '<http://example.org/a> <http://example.org/p> "y" .',
+            '<http://example.org/b> <http://example.org/p> "x" .',
+        ]
+        assert (writer.input_triples, writer.get_triple_count()) == (4, 2)
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            SortedRunWriter(tmp_path / "out.jsonld", output_format="jsonld")
+
+    def test_merge_sorted_lines(self):
+        merged = merge_sorted_lines([["a\n", "c\n"], ["a\n", "b\n", "c\n"]])
+        assert list(merged) == ["a\n", "b\n", "c\n"]
@@ -344,6 +344,36 @@ class TestGraphBuilderEdgeCases:
         except AttributeError:
             pytest.skip("Build method not found")
 
+    def test_null_iri_variable_reports_row(self, sample_config, processing_report):
+        """Rows whose IRI template variable is null fail with a row-numbered error."""
+        if not isinstance(sample_config, MappingConfig):
+            pytest.skip("Requires real MappingConfig")
+        df = pl.DataFrame({"id": [1, None, 3], "name": ["a", "b", "c"], "age": [1, 2, 3]})
+
+        builder = RDFGraphBuilder(sample_config, processing_report)
+        builder.add_dataframe(df, sample_config.sheets[0])
+
+        subjects = {str(s) for s in builder.graph.subjects(RDF.type, None)}
+        assert subjects == {"http://example.org/person/1", "http://example.org/person/3"}
+        assert [e.row for e in processing_report.errors] == [2]
+        assert "null value" in processing_report.errors[0].error
+
+    def test_columnwise_builder_general_templates(self, sample_config, processing_report):
+        """ColumnWiseRDFBuilder renders arbitrary templates, keeping rows aligned."""
+        if not isinstance(sample_config, MappingConfig):
+            pytest.skip("Requires real MappingConfig")
+        from rdfmap.emitter.columnwise_builder import ColumnWiseRDFBuilder
+
+        df = pl.DataFrame({"id": [1, None, 3], "name": ["a", "b", "c"], "age": [1, 2, 3]})
+        builder = ColumnWiseRDFBuilder(sample_config, processing_report)
+        plan = builder.compiled.plan_for(sample_config.sheets[0])
+        iris = builder._generate_subject_iris_vectorized(df, plan, offset=10)
+
+        assert [str(i) if i else None for i in iris] == [
+            "http://example.org/person/1", None, "http://example.org/person/3"
+        ]
+        assert [e.row for e in processing_report.errors] == [12]
+
 
 class TestGraphBuilderLinkedObjects:
     """Test graph builder with linked objects."""
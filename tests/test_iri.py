@@ -1,9 +1,11 @@
 """Tests for IRI generation and templating."""
 
+import polars as pl
 import pytest
 
 from rdfmap.iri.generator import (
     IRITemplate,
+    compile_iri_template,
     validate_iri,
     curie_to_iri,
     iri_to_curie,
@@ -64,6 +66,56 @@ class TestIRITemplate:
         assert "hello%20world" in result
 
 
+class TestCompiledIRITemplate:
+    """Tests for vectorized IRI template rendering."""
+
+    def test_matches_row_wise_rendering(self):
+        df = pl.DataFrame({
+            "id": [1, 2, 3],
+            "name": ["hello world", "a/b", "café"],
+        })
+        template = "{base_iri}person/{name}-{id}"
+        compiled = compile_iri_template(template, base_iri="https://example.com/")
+        iris, null_mask = compiled.render(df)
+
+        expected = [
+            IRITemplate(template, base_iri="https://example.com/").render(row)
+            for row in df.to_dicts()
+        ]
+        assert iris.to_list() == expected
+        assert not null_mask.any()
+
+    def test_literal_path_segments_are_encoded(self):
+        df = pl.DataFrame({"id": ["x y"]})
+        compiled = compile_iri_template("https://example.com/my loans/{id}")
+        iris, _ = compiled.render(df)
+        assert iris.to_list() == ["https://example.com/my%20loans/x%20y"]
+
+    def test_null_variables_are_masked(self):
+        df = pl.DataFrame({"type": ["loan", None, "loan"], "id": [1, 2, None]})
+        compiled = compile_iri_template("{base_iri}{type}/{id}", base_iri="https://example.com/")
+        iris, null_mask = compiled.render(df)
+        assert null_mask.to_list() == [False, True, True]
+        assert iris.to_list() == ["https://example.com/loan/1", None, None]
+
+    def test_missing_column(self):
+        compiled = compile_iri_template("{base_iri}{id}", base_iri="https://example.com/")
+        with pytest.raises(ValueError, match="Missing required variables"):
+            compiled.render(pl.DataFrame({"other": [1]}))
+
+    def test_constant_template_broadcasts(self):
+        compiled = compile_iri_template("{base_iri}dataset", base_iri="https://example.com/")
+        iris, null_mask = compiled.render(pl.DataFrame({"id": [1, 2]}))
+        assert iris.to_list() == ["https://example.com/dataset"] * 2
+        assert null_mask.to_list() == [False, False]
+
+    def test_value_dependent_authority_falls_back(self):
+        df = pl.DataFrame({"host": ["example.com"], "id": ["a b"]})
+        compiled = compile_iri_template("https://{host}/{id}")
+        iris, _ = compiled.render(df)
+        assert iris.to_list() == ["https://example.com/a%20b"]
+
+
 class TestValidateIRI:
     """Tests for validate_iri function."""
     
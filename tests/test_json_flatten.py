@@ -0,0 +1,86 @@
+"""Tests for flattening nested JSON records with Polars.
+
+This module checks that ``flatten_frame`` gives the rows and dotted column
+names of the Python flattener, that only the arrays and columns a mapping
+references are built, and that batches Polars cannot type fall back to the
+Python flattener.
+"""
+
+import json
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from rdfmap.parsers.data_source import SOURCE_ROW, JSONParser, ScanPlan
+from rdfmap.parsers.json_flatten import flatten_frame
+
+NESTED_SAMPLE = Path(__file__).parent.parent / "test_formats" / "mortgage_applications_nested.json"
+
+RECORDS = [
+    {"id": 1, "tags": ["a", "b"], "courses": [{"code": "C1", "meta": {"level": 1}}, {"code": "C2"}],
+     "profile": {"name": "Ann", "aliases": ["A", "Annie"], "scores": [1, 2], "none": []}},
+    {"id": 2, "tags": [], "courses": [], "profile": {"name": "Bob"}},
+    {"id": 3, "tags": ["c"], "profile": {"name": "Cy", "aliases": []}},
+]
+
+
+def _python_flatten(records):
+    rows = JSONParser.__new__(JSONParser)._flatten_json_data(records)
+    return pl.DataFrame(rows, infer_schema_length=None)
+
+
+def _assert_same(expected, actual):
+    assert set(actual.columns) == set(expected.columns)
+    assert actual.select(expected.columns).equals(expected)
+
+
+@pytest.mark.parametrize("records", [
+    RECORDS,
+    json.loads(NESTED_SAMPLE.read_text()),
+    [{"id": i, "amount": i * 1.5, "note": None} for i in range(5)],
+])
+def test_same_rows_as_python_flattener(records):
+    frame = pl.read_json(json.dumps(records).encode(), infer_schema_length=None)
+    _assert_same(_python_flatten(records), flatten_frame(frame))
+
+
+def test_rows_of_each_array_in_record_order():
+    frame = flatten_frame(pl.read_json(json.dumps(RECORDS).encode(), infer_schema_length=None))
+    assert frame.select("id", "tags", "courses.code").rows() == [
+        (1, "a", None), (1, "b", None), (1, None, "C1"), (1, None, "C2"), (2, None, None), (3, "c", None),
+    ]
+    # Arrays inside objects are joined strings, or null
+    assert frame["profile.aliases"].to_list()[:2] == ["A, Annie", "A, Annie"]
+    assert frame["profile.scores"].null_count() == frame.height
+
+
+def test_referenced_paths_only():
+    frame = pl.read_json(json.dumps(RECORDS).encode(), infer_schema_length=None)
+    flat = flatten_frame(frame, paths=["id", "courses.code"])
+    # tags is not referenced, so it does not repeat the records' rows
+    assert flat.columns == ["id", "courses.code"]
+    assert flat.rows() == [(1, "C1"), (1, "C2"), (2, None), (3, None)]
+
+
+def test_untyped_arrays_fall_back():
+    frame = pl.DataFrame({"id": [1], "matrix": [[[1], [2]]]})
+    assert flatten_frame(frame) is None
+
+
+def test_parser_falls_back_to_python(tmp_path):
+    path = tmp_path / "mixed.json"
+    records = [{"id": 1, "items": [1, {"a": 2}]}, {"id": 2, "items": [3]}]
+    path.write_text(json.dumps(records))
+    frame = next(JSONParser(path).parse())
+    _assert_same(_python_flatten(records), frame)
+
+
+def test_parse_plan_expands_referenced_arrays(tmp_path):
+    path = tmp_path / "students.json"
+    path.write_text(json.dumps(RECORDS))
+    plan = ScanPlan(columns=["id", "profile.name"], predicate=pl.col("courses.code") == "C2")
+    frame = pl.concat(list(JSONParser(path).parse_plan(plan, chunk_size=2)))
+    # The matching row is the second one of the expanded records
+    assert frame.drop(SOURCE_ROW).rows() == [(1, "Ann")]
+    assert frame[SOURCE_ROW].to_list() == [1]
@@ -0,0 +1,226 @@
+"""Tests for streaming JSON and JSON Lines sources.
+
+This module checks JSONPath iterator parsing, incremental decoding and
+undecoded batching across block boundaries, chunked parsing of the records
+an iterator selects, and the lazy JSON Lines parser.
+"""
+
+import io
+import json
+
+import polars as pl
+import pytest
+
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+from rdfmap.parsers.data_source import SOURCE_ROW, JSONParser, NDJSONParser, ScanPlan, create_parser
+from rdfmap.parsers.json_stream import iter_json_batches, iter_json_records, parse_json_path
+
+DOCUMENT = {
+    "meta": {"note": "skip [me] {please}", "counts": [1, 2, 3]},
+    "data": {
+        "loans": [
+            {"id": "L1", "amount": 1234567, "borrower": {"name": "Ann \"A\" \\ B"}},
+            {"id": "L2", "amount": -0.5e3, "borrower": {"name": "Bob"}},
+            {"id": "L3", "amount": None, "borrower": {"name": "Cyé"}},
+        ],
+        "total": 3,
+    },
+}
+
+
+class TestJSONPath:
+    """Test suite for iterator parsing."""
+
+    @pytest.mark.parametrize("iterator,expected", [
+        (None, ([], False)),
+        ("$", ([], False)),
+        ("$[*]", ([], True)),
+        ("$.data.loans[*]", (["data", "loans"], True)),
+        ("$['data'][\"loans\"]", (["data", "loans"], False)),
+    ])
+    def test_supported(self, iterator, expected):
+        assert parse_json_path(iterator) == expected
+
+    @pytest.mark.parametrize("iterator", ["data.loans", "$.loans[*].payments[*]", "$..id", "$.loans[0]"])
+    def test_unsupported(self, iterator):
+        with pytest.raises(ValueError):
+            parse_json_path(iterator)
+
+
+class TestIterJSONRecords:
+    """Test suite for incremental decoding."""
+
+    @pytest.mark.parametrize("block_size", [1, 3, 7, 1 << 20])
+    def test_records_across_blocks(self, block_size):
+        text = json.dumps(DOCUMENT, indent=1)
+        records = list(iter_json_records(io.StringIO(text), "$.data.loans[*]", block_size=block_size))
+        assert records == DOCUMENT["data"]["loans"]
+
+    def test_number_at_block_end(self):
+        assert list(iter_json_records(io.StringIO("[12345, 6]"), block_size=3)) == [12345, 6]
+
+    @pytest.mark.parametrize("block_size", range(1, 12))
+    def test_floats_and_exponents_at_block_end(self, block_size):
+        text = "[1.5, 2e3, -0.25E-2, 10, 7.125e+10]"
+        records = list(iter_json_records(io.StringIO(text), block_size=block_size))
+        assert records == [1.5, 2e3, -0.25e-2, 10, 7.125e10]
+
+    def test_root_values(self):
+        assert list(iter_json_records(io.StringIO(" [ ] "))) == []
+        assert list(iter_json_records(io.StringIO('{"a": 1}'))) == [{"a": 1}]
+        assert list(iter_json_records(io.StringIO(""))) == []
+
+    def test_path_without_wildcard(self):
+        text = json.dumps(DOCUMENT)
+        assert list(iter_json_records(io.StringIO(text), "$.data.total")) == [3]
+        assert len(list(iter_json_records(io.StringIO(text), "$.data.loans"))) == 3
+        assert list(iter_json_records(io.StringIO(text), "$.data.missing[*]")) == []
+
+    def test_wildcard_needs_an_array(self):
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO(json.dumps(DOCUMENT)), "$.data[*]"))
+
+    def test_invalid_json(self):
+        with pytest.raises(ValueError):
+            list(iter_json_records(io.StringIO('[{"a": 1} {"a": 2}]')))
+
+
+class TestIterJSONBatches:
+    """Test suite for batches of undecoded records."""
+
+    @pytest.mark.parametrize("block_size", [1, 2, 5, 1 << 20])
+    def test_batches_across_blocks(self, block_size):
+        loans = DOCUMENT["data"]["loans"] + [{"id": "L4", "note": "a \\\" ] } , \\"}, [1, [2]], "x,]"]
+        text = json.dumps({"data": {"loans": loans, "tail": "]"}}, indent=1)
+        batches = list(iter_json_batches(io.StringIO(text), "$.data.loans[*]", batch_size=2, block_size=block_size))
+        assert [len(json.loads(batch)) for batch in batches] == [2, 2, 2]
+        assert [record for batch in batches for record in json.loads(batch)] == loans
+
+    @pytest.mark.parametrize("block_size", range(1, 12))
+    def test_skipped_floats_at_block_end(self, block_size):
+        text = '{"a": 1.5, "c": -2.5e-3, "b": [1]}'
+        assert list(iter_json_batches(io.StringIO(text), "$.b[*]", block_size=block_size)) == [b"[1]"]
+
+    def test_single_record_and_empty_array(self):
+        assert list(iter_json_batches(io.StringIO('{"a": 1}'))) == [b'[{"a": 1}]']
+        assert list(iter_json_batches(io.StringIO(" [ ] "))) == []
+        assert list(iter_json_batches(io.StringIO(json.dumps(DOCUMENT)), "$.data.missing[*]")) == []
+
+    def test_unterminated_array(self):
+        with pytest.raises(ValueError):
+            list(iter_json_batches(io.StringIO('[{"a": 1}, {"a": '), block_size=4))
+
+
+@pytest.fixture
+def loans_json(tmp_path):
+    """Create 25 loans under $.data.loans, each with a nested borrower."""
+    path = tmp_path / "loans.json"
+    loans = [{"id": f"L{i}", "amount": i, "borrower": {"name": f"B{i}"}} for i in range(25)]
+    path.write_text(json.dumps({"meta": {"count": 25}, "data": {"loans": loans}}))
+    return path
+
+
+class TestJSONParser:
+    """Test suite for chunked parsing of iterated records."""
+
+    def test_chunks_of_iterated_records(self, loans_json):
+        parser = JSONParser(loans_json, iterator="$.data.loans[*]")
+        chunks = list(parser.parse(chunk_size=10))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        # Columns are relative to the iterated records
+        assert chunks[0].columns == ["id", "amount", "borrower.name"]
+        assert pl.concat(chunks)["id"].to_list() == [f"L{i}" for i in range(25)]
+        assert parser.get_column_names() == ["amount", "borrower.name", "id"]
+
+    def test_expanded_arrays_are_rebatched(self, tmp_path):
+        path = tmp_path / "students.json"
+        students = [{"id": i, "courses": [{"code": "A"}, {"code": "B"}, {"code": "C"}]} for i in range(5)]
+        path.write_text(json.dumps(students))
+        sizes = [len(chunk) for chunk in JSONParser(path).parse(chunk_size=4)]
+        assert sizes == [4, 4, 4, 3]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, None])
+    def test_types_do_not_depend_on_chunks(self, tmp_path, chunk_size):
+        path = tmp_path / "amounts.json"
+        path.write_text(json.dumps([{"amt": 100}, {"amt": 200}, {"amt": 2.5}, {"amt": "n/a"}]))
+        frames = list(JSONParser(path).parse(chunk_size=chunk_size))
+        # The column has one type across chunks, here text for the mixed values
+        assert {frame["amt"].dtype for frame in frames} == {pl.String}
+        assert pl.concat(frames)["amt"].to_list() == ["100", "200", "2.5", "n/a"]
+
+        path.write_text(json.dumps([{"amt": 100}, {"amt": 200}, {"amt": 2.5}]))
+        frames = list(JSONParser(path).parse_plan(ScanPlan(columns=["amt"]), chunk_size=chunk_size))
+        assert pl.concat(frames)["amt"].to_list() == [100.0, 200.0, 2.5]
+        assert {frame["amt"].dtype for frame in frames} == {pl.Float64}
+
+    def test_unsupported_iterator(self, loans_json):
+        with pytest.raises(ValueError):
+            JSONParser(loans_json, iterator="$..loans")
+
+    def test_create_parser_uses_iterator(self, loans_json):
+        parser = create_parser(loans_json, iterator="$.data.loans[*]")
+        plan = ScanPlan(columns=["id"], limit=3)
+        frame = pl.concat(list(parser.parse_plan(plan, chunk_size=2)))
+        assert frame.columns == ["id"] and frame.height == 3
+
+
+@pytest.fixture
+def loans_jsonl(tmp_path):
+    """Create 30 loans in JSON Lines, each with a nested borrower and address."""
+    path = tmp_path / "loans.jsonl"
+    lines = [
+        json.dumps({"id": f"L{i}", "amount": i, "borrower": {"name": f"B{i}", "address": {"city": "X"}}})
+        for i in range(30)
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestNDJSONParser:
+    """Test suite for the lazy JSON Lines parser."""
+
+    def test_nested_objects_are_flattened(self, loans_jsonl):
+        parser = create_parser(loans_jsonl)
+        assert isinstance(parser, NDJSONParser)
+        assert parser.get_column_names() == ["id", "amount", "borrower.name", "borrower.address.city"]
+        assert [len(chunk) for chunk in parser.parse(chunk_size=12)] == [12, 12, 6]
+
+    def test_scan_plan(self, loans_jsonl):
+        plan = ScanPlan(columns=["id", "borrower.name"], predicate=pl.col("amount") >= 20, limit=5)
+        frame = pl.concat(list(NDJSONParser(loans_jsonl).parse_plan(plan, chunk_size=2)))
+        assert frame.columns == [SOURCE_ROW, "id", "borrower.name"]
+        assert frame["id"].to_list() == [f"L{i}" for i in range(20, 25)]
+        assert frame[SOURCE_ROW].to_list() == list(range(20, 25))
+
+    @pytest.mark.parametrize("chunk_size", [2, None])
+    def test_arrays_as_in_json(self, tmp_path, chunk_size):
+        records = [
+            {"id": "L1", "tags": ["t0", "t1"], "borrower": {"name": "Ann"}},
+            {"id": "L2", "tags": [], "borrower": {"name": "Bob"}},
+            {"id": "L3", "tags": ["t2"], "borrower": {"name": "Cy"}},
+        ]
+        (tmp_path / "loans.json").write_text(json.dumps(records))
+        (tmp_path / "loans.jsonl").write_text("".join(json.dumps(record) + "\n" for record in records))
+        graphs = []
+        for name in ("loans.json", "loans.jsonl"):
+            config = MappingConfig(
+                namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+                defaults={"base_iri": "http://example.org/"},
+                sheets=[{
+                    "name": "loans", "source": name,
+                    "row_resource": {"class": "ex:Loan", "iri_template": "{base_iri}loan/{id}"},
+                    "columns": {"tags": {"as": "ex:tag"}, "borrower.name": {"as": "ex:borrowerName"}},
+                }],
+            )
+            builder = RDFGraphBuilder(config, ProcessingReport())
+            sheet = config.sheets[0]
+            plan = builder.compiled.plan_for(sheet).scan_plan()
+            for chunk in create_parser(tmp_path / name).parse_plan(plan, chunk_size=chunk_size):
+                builder.add_dataframe(chunk, sheet)
+            graphs.append(set(builder.get_graph()))
+
+        assert graphs[0] == graphs[1]
+        tags = {str(o) for s, p, o in graphs[1] if str(p) == "http://example.org/tag"}
+        assert tags == {"t0", "t1", "t2"}
@@ -0,0 +1,88 @@
+"""Tests for compiled mapping plans.
+
+This module tests that sheet mappings are resolved once into plans holding
+URIRef terms, transforms and column positions.
+"""
+
+import pytest
+import polars as pl
+from rdflib import URIRef
+from rdflib.namespace import XSD
+
+from rdfmap.emitter.mapping_plan import CompiledMapping, compile_sheet, resolve_term
+from rdfmap.models.mapping import MappingConfig
+
+
+@pytest.fixture
+def config():
+    """Create a mapping config with a linked object and transforms."""
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        defaults={"base_iri": "http://example.org/", "language": "en"},
+        sheets=[{
+            "name": "loans",
+            "source": "loans.csv",
+            "row_resource": {"class": "ex:Loan", "iri_template": "{base_iri}loan/{id}"},
+            "columns": {
+                "id": {"as": "ex:id", "datatype": "xsd:string"},
+                "amount": {"as": "ex:amount", "datatype": "xsd:decimal", "transform": "to_decimal"},
+                "note": {"as": "http://example.org/note", "transform": "strip"},
+            },
+            "objects": {
+                "borrower": {
+                    "predicate": "ex:hasBorrower",
+                    "class": "ex:Borrower",
+                    "iri_template": "{base_iri}borrower/{borrower_id}",
+                    "properties": [{"column": "borrower_name", "as": "ex:name"}],
+                },
+            },
+        }],
+    )
+
+
+class TestCompileSheet:
+    """Test suite for compile_sheet."""
+
+    def test_terms_are_resolved(self, config):
+        plan = compile_sheet(config.sheets[0], config)
+        assert plan.classes == [URIRef("http://example.org/Loan")]
+        rules = {rule.column: rule for rule in plan.columns}
+        assert rules["amount"].predicate == URIRef("http://example.org/amount")
+        assert rules["amount"].datatype == XSD.decimal
+        assert rules["note"].predicate == URIRef("http://example.org/note")
+        assert rules["note"].language == "en"
+
+    def test_vectorized_transforms_move_to_polars(self, config):
+        plan = compile_sheet(config.sheets[0], config)
+        rules = {rule.column: rule for rule in plan.columns}
+        assert "amount" in plan.transform_exprs
+        assert rules["amount"].transform is None
+        assert rules["note"].transform("  hi ") == "hi"
+
+    def test_linked_objects_and_templates(self, config):
+        plan = compile_sheet(config.sheets[0], config)
+        obj = plan.objects[0]
+        assert obj.predicate == URIRef("http://example.org/hasBorrower")
+        assert obj.properties[0].predicate == URIRef("http://example.org/name")
+        assert plan.templates == ["{base_iri}loan/{id}", "{base_iri}borrower/{borrower_id}"]
+
+    def test_bind_records_column_positions(self, config):
+        plan = compile_sheet(config.sheets[0], config)
+        plan.bind(pl.DataFrame({"borrower_name": ["x"], "id": ["1"]}).columns)
+        positions = {rule.column: rule.index for rule in plan.literal_rules()}
+        assert positions == {"id": 1, "amount": -1, "note": -1, "borrower_name": 0}
+
+    def test_undeclared_prefix_fails_at_compile_time(self, config):
+        config.sheets[0].columns["id"].as_property = "missing:id"
+        with pytest.raises(ValueError):
+            compile_sheet(config.sheets[0], config)
+
+
+def test_compiled_mapping_caches_plans(config):
+    compiled = CompiledMapping(config)
+    assert compiled.plan_for(config.sheets[0]) is compiled.plan_for(config.sheets[0])
+
+
+def test_resolve_term_accepts_full_iris():
+    assert resolve_term("http://example.org/x", {}) == URIRef("http://example.org/x")
+    assert resolve_term("ex:x", {"ex": "http://example.org/"}) == URIRef("http://example.org/x")
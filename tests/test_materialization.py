@@ -0,0 +1,158 @@
+"""Tests for set-at-a-time ontology materialization.
+
+This module checks the superclass, transitive, symmetric and inverse
+inferences that RDFGraphBuilder adds in one pass over the finished graph.
+"""
+
+import pytest
+import polars as pl
+from rdflib import Graph, Namespace, RDF, URIRef
+
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.emitter.reasoning import ReasoningRules, materialize
+from rdfmap.generator.ontology_analyzer import OntologyAnalyzer
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+
+EX = Namespace("http://example.org/")
+
+ONTOLOGY = """
+@prefix ex: <http://example.org/> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Agent a owl:Class .
+ex:Person a owl:Class ; rdfs:subClassOf ex:Agent .
+ex:Employee a owl:Class ; rdfs:subClassOf ex:Person .
+
+ex:reportsTo a owl:ObjectProperty, owl:TransitiveProperty ; owl:inverseOf ex:manages .
+ex:manages a owl:ObjectProperty .
+ex:colleague a owl:ObjectProperty, owl:SymmetricProperty .
+ex:badge a owl:DatatypeProperty, owl:FunctionalProperty .
+"""
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    """Create an analyzer for a small ontology with property axioms."""
+    path = tmp_path / "ontology.ttl"
+    path.write_text(ONTOLOGY)
+    return OntologyAnalyzer(str(path))
+
+
+@pytest.fixture
+def config():
+    """Create a mapping linking employees to their managers and peers."""
+    def person(predicate, column):
+        return {"predicate": predicate, "class": "ex:Employee", "iri_template": f"{{base_iri}}person/{{{column}}}"}
+
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        defaults={"base_iri": "http://example.org/"},
+        sheets=[{
+            "name": "people",
+            "source": "people.csv",
+            "row_resource": {"class": "ex:Employee", "iri_template": "{base_iri}person/{id}"},
+            "columns": {"badge": {"as": "ex:badge"}},
+            "objects": {
+                "manager": person("ex:reportsTo", "manager_id"),
+                "peer": person("ex:colleague", "peer_id"),
+            },
+        }],
+    )
+
+
+@pytest.fixture
+def frame():
+    """Create a reporting chain p1 -> p2 -> p3 -> p4."""
+    return pl.DataFrame({
+        "id": ["p1", "p2", "p3", "p4"],
+        "badge": ["b1", "b2", "b3", "b4"],
+        "manager_id": ["p2", "p3", "p4", None],
+        "peer_id": ["p2", None, None, None],
+    })
+
+
+def _build(config, frame, analyzer):
+    report = ProcessingReport()
+    builder = RDFGraphBuilder(config, report, ontology_analyzer=analyzer)
+    builder.add_dataframe(frame, config.sheets[0])
+    return builder.get_graph(), report
+
+
+class TestMaterialization:
+    """Test suite for the batch reasoning post-pass."""
+
+    def test_superclass_types(self, config, frame, analyzer):
+        graph, report = _build(config, frame, analyzer)
+        for person in ("p1", "p2", "p3", "p4"):
+            assert (EX[f"person/{person}"], RDF.type, EX.Person) in graph
+            assert (EX[f"person/{person}"], RDF.type, EX.Agent) in graph
+        assert report.inferred_types == 8
+
+    def test_property_links(self, config, frame, analyzer):
+        graph, report = _build(config, frame, analyzer)
+        p = {n: EX[f"person/p{n}"] for n in range(1, 5)}
+
+        # Chains of up to two edges (transitive_depth=2)
+        assert (p[1], EX.reportsTo, p[3]) in graph
+        assert (p[2], EX.reportsTo, p[4]) in graph
+        assert (p[1], EX.reportsTo, p[4]) not in graph
+        assert report.transitive_links_added == 2
+
+        assert (p[2], EX.colleague, p[1]) in graph
+        assert report.symmetric_links_added == 1
+
+        # Inverses include the inferred transitive links
+        assert (p[3], EX.manages, p[1]) in graph
+        assert report.inverse_links_added == 5
+
+    def test_unbounded_transitive_closure(self, config, frame, analyzer):
+        config.defaults.transitive_depth = None
+        graph, report = _build(config, frame, analyzer)
+        assert (EX["person/p1"], EX.reportsTo, EX["person/p4"]) in graph
+        assert report.transitive_links_added == 3
+
+    def test_materialized_once_per_graph(self, config, frame, analyzer):
+        report = ProcessingReport()
+        builder = RDFGraphBuilder(config, report, ontology_analyzer=analyzer)
+        builder.add_dataframe(frame, config.sheets[0])
+        size = builder.get_triple_count()
+        builder.get_graph()
+        assert len(builder.get_graph()) == size
+        assert report.inferred_types == 8
+
+    def test_reasoning_disabled(self, config, frame, analyzer):
+        config.defaults.enable_reasoning = False
+        graph, report = _build(config, frame, analyzer)
+        assert (EX["person/p1"], RDF.type, EX.Agent) not in graph
+        assert report.inferred_types == 0
+
+    def test_functional_and_cardinality_checks(self):
+        graph = Graph()
+        graph.add((EX.a, RDF.type, EX.Person))
+        graph.add((EX.a, EX.badge, EX.b1))
+        graph.add((EX.a, EX.badge, EX.b2))
+        rules = ReasoningRules(
+            functional=[EX.badge],
+            restrictions={EX.Person: [(EX.badge, {"maxCardinality": 1}), (URIRef(EX.name), {"minCardinality": 1})]},
+        )
+        report = ProcessingReport()
+        materialize(graph, rules, report)
+        assert report.cardinality_violations == 1
+        assert report.max_cardinality_violations == 1
+        assert report.min_cardinality_violations == 1
+
+    def test_violations_reported_once_across_calls(self, config, frame, analyzer):
+        report = ProcessingReport()
+        builder = RDFGraphBuilder(config, report, ontology_analyzer=analyzer)
+        builder.add_dataframe(frame, config.sheets[0])
+        builder.add_dataframe(frame.head(1).with_columns(pl.lit("b9").alias("badge")), config.sheets[0], offset=4)
+        builder.get_graph()
+        assert report.cardinality_violations == 1
+
+        # Later chunks trigger a new pass that sees the same violation
+        builder.add_dataframe(frame.tail(1), config.sheets[0], offset=5)
+        builder.get_graph()
+        assert report.cardinality_violations == 1
+        assert report.inferred_types == 8
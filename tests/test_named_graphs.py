@@ -0,0 +1,198 @@
+"""Tests for per-source named graphs.
+
+This module checks how sheet graph IRIs are resolved, the N-Quads and TriG
+writers, and that the row, columnar and rotating paths keep each sheet's
+triples in its own graph.
+"""
+
+import json
+
+import polars as pl
+import pytest
+from rdflib import Dataset, Graph, Literal, Namespace, RDF, URIRef, XSD
+
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.graph_builder import RDFGraphBuilder, serialize_graph
+from rdfmap.emitter.mapping_plan import sheet_graph
+from rdfmap.emitter.node_streaming import create_stream_writer
+from rdfmap.emitter.nt_streaming import NQuadsStreamWriter
+from rdfmap.emitter.sinks import manifest_path
+from rdfmap.emitter.turtle_streaming import TriGStreamWriter
+from rdfmap.generator.ontology_analyzer import OntologyAnalyzer
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+
+EX = Namespace("http://example.org/")
+PEOPLE = EX["graph/people"]
+TEAMS = URIRef("http://example.org/teams")
+
+
+def _config(**options):
+    return MappingConfig(
+        namespaces={"ex": str(EX), "xsd": str(XSD)},
+        defaults={"base_iri": str(EX), "graph": "{base_iri}graph/{sheet}"},
+        options=options,
+        sheets=[
+            {
+                "name": "people",
+                "source": "data/people.csv",
+                "row_resource": {"class": "ex:Person", "iri_template": "{base_iri}person/{id}"},
+                "columns": {"name": {"as": "ex:name"}},
+            },
+            {
+                "name": "teams",
+                "source": "data/teams.csv",
+                "graph": "ex:{source}",
+                "row_resource": {"class": "ex:Team", "iri_template": "{base_iri}team/{id}"},
+                "columns": {"name": {"as": "ex:name"}},
+            },
+        ],
+    )
+
+
+FRAMES = {
+    "people": pl.DataFrame({"id": ["p1", "p2"], "name": ["Ann", "Bob"]}),
+    "teams": pl.DataFrame({"id": ["t1"], "name": ["Core"]}),
+}
+
+
+def _build(builder, config):
+    for sheet in config.sheets:
+        builder.add_dataframe(FRAMES[sheet.name], sheet)
+
+
+def _assert_sheet_graphs(dataset):
+    people, teams = dataset.graph(PEOPLE), dataset.graph(TEAMS)
+    assert len(people) == 4 and len(teams) == 2
+    assert (EX["person/p1"], EX.name, Literal("Ann")) in people
+    assert (EX["team/t1"], RDF.type, EX.Team) in teams
+    assert len(dataset.default_graph) == 0
+
+
+def test_sheet_graph_templates():
+    config = _config()
+    people, teams = config.sheets
+    assert sheet_graph(people, config) == PEOPLE
+    assert sheet_graph(teams, config) == TEAMS
+
+    config.defaults.graph = None
+    assert sheet_graph(people, config) is None
+
+
+def test_nquads_writer(tmp_path):
+    output = tmp_path / "out.nq"
+    with NQuadsStreamWriter(output) as writer:
+        writer.write_triple(EX.a, EX.name, Literal("x .\ny"))
+        writer.set_graph(PEOPLE)
+        writer.write_lines(b'<http://example.org/b> <http://example.org/name> "b ." .\n', 1)
+        writer.write_triple(EX.c, RDF.type, EX.Person)
+
+    lines = output.read_text().splitlines()
+    assert lines[0].endswith('"x .\\ny" .')
+    assert lines[1].endswith(f'"b ." <{PEOPLE}> .')
+    assert lines[2].endswith(f"<{PEOPLE}> .")
+    dataset = Dataset()
+    dataset.parse(output, format="nquads")
+    assert len(dataset.graph(PEOPLE)) == 2
+
+
+def test_trig_writer(tmp_path):
+    output = tmp_path / "out.trig"
+    with TriGStreamWriter(output, {"ex": str(EX)}) as writer:
+        writer.write_triple(EX.a, EX.name, Literal("a"))
+        writer.set_graph(PEOPLE)
+        writer.write_triple(EX.b, EX.name, Literal("b"))
+        writer.write_triple(EX.b, EX.age, Literal(3))
+        writer.set_graph(TEAMS)  # Empty graph: no block
+        writer.set_graph(PEOPLE)
+        writer.write_triple(EX.c, EX.name, Literal("c"))
+
+    text = output.read_text()
+    assert text.count("{") == 1
+    assert f"<{PEOPLE}> {{\n    ex:b ex:name \"b\" ;\n        ex:age" in text
+    dataset = Dataset()
+    dataset.parse(output, format="trig")
+    assert len(dataset.graph(PEOPLE)) == 3
+    assert (EX.a, EX.name, Literal("a")) in dataset.default_graph
+
+
+@pytest.mark.parametrize("format,parse_format", [("nq", "nquads"), ("trig", "trig")])
+def test_aggregated_dataset(tmp_path, format, parse_format):
+    config = _config()
+    builder = RDFGraphBuilder(config, ProcessingReport())
+    _build(builder, config)
+    dataset = builder.get_graph()
+    assert isinstance(dataset, Dataset) and builder.get_triple_count() == 6
+
+    output = tmp_path / f"out.{format}"
+    serialize_graph(dataset, format, output, namespaces=config.namespaces)
+    parsed = Dataset()
+    parsed.parse(output, format=parse_format)
+    _assert_sheet_graphs(parsed)
+
+    # Triple formats get the union of the graphs
+    union = tmp_path / "out.nt"
+    serialize_graph(dataset, "nt", union)
+    assert len(Graph().parse(union, format="nt")) == 6
+
+
+@pytest.mark.parametrize("format,parse_format", [("nq", "nquads"), ("trig", "trig")])
+def test_inferences_in_default_graph(tmp_path, format, parse_format):
+    ontology = tmp_path / "ontology.ttl"
+    ontology.write_text(
+        "@prefix ex: <http://example.org/> .\n"
+        "@prefix owl: <http://www.w3.org/2002/07/owl#> .\n"
+        "@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n"
+        "ex:Agent a owl:Class .\n"
+        "ex:Person a owl:Class ; rdfs:subClassOf ex:Agent .\n"
+    )
+    config = _config()
+    report = ProcessingReport()
+    builder = RDFGraphBuilder(config, report, ontology_analyzer=OntologyAnalyzer(str(ontology)))
+    _build(builder, config)
+    dataset = builder.get_graph()
+    assert report.inferred_types == 2
+
+    output = tmp_path / f"out.{format}"
+    serialize_graph(dataset, format, output, namespaces=config.namespaces)
+    parsed = Dataset()
+    parsed.parse(output, format=parse_format)
+    people, teams = parsed.graph(PEOPLE), parsed.graph(TEAMS)
+    assert len(people) == 4 and len(teams) == 2
+    # Inferences hold for the union of the graphs, and go to the default graph
+    assert set(parsed.default_graph) == {
+        (EX["person/p1"], RDF.type, EX.Agent), (EX["person/p2"], RDF.type, EX.Agent),
+    }
+    assert len(list(parsed.graphs())) == 3
+
+
+def test_interned_store_rejects_named_graphs():
+    with pytest.raises(ValueError):
+        RDFGraphBuilder(_config(triple_store="interned"), ProcessingReport())
+
+
+@pytest.mark.parametrize("format,parse_format", [("nq", "nquads"), ("trig", "trig")])
+def test_streamed_sheet_graphs(tmp_path, format, parse_format):
+    config = _config()
+    output = tmp_path / f"out.{format}"
+    with create_stream_writer(format, output, config.namespaces) as writer:
+        _build(ColumnarNTriplesBuilder(config, ProcessingReport(), writer), config)
+
+    dataset = Dataset()
+    dataset.parse(output, format=parse_format)
+    _assert_sheet_graphs(dataset)
+
+
+def test_rotated_shards_keep_graph(tmp_path):
+    config = _config()
+    output = tmp_path / "out.nq"
+    with create_stream_writer("nq", output, max_triples_per_file=1) as writer:
+        builder = RDFGraphBuilder(config, ProcessingReport(), streaming_writer=writer)
+        _build(builder, config)
+
+    dataset = Dataset()
+    shards = json.loads(manifest_path(output).read_text())["shards"]
+    assert len(shards) == 3
+    for shard in shards:
+        dataset.parse(tmp_path / shard["path"], format="nquads")
+    _assert_sheet_graphs(dataset)
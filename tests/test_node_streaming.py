@@ -0,0 +1,116 @@
+"""Tests for the streaming JSON-LD and RDF/XML writers.
+
+This module checks that streamed node-per-subject output parses back to
+the triples that were written, from rdflib terms and from N-Triples blocks.
+"""
+
+import json
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter.graph_builder import serialize_graph
+from rdfmap.emitter.node_streaming import (
+    JSONLDStreamWriter,
+    RDFXMLStreamWriter,
+    create_stream_writer,
+    write_graph,
+)
+from rdfmap.emitter.nt_streaming import escape_nt_string, parse_nt_object, unescape_nt_string
+
+EX = Namespace("http://example.org/")
+NAMESPACES = {"ex": "http://example.org/", "xsd": str(XSD)}
+
+
+@pytest.fixture
+def graph():
+    """Create a graph with typed, tagged and escaped literals and a blank node."""
+    g = Graph()
+    node = BNode()
+    g.add((EX["person/p1"], RDF.type, EX.Person))
+    g.add((EX["person/p1"], EX.name, Literal('Ann "Annie"\r\n<Smith> & co', lang="en")))
+    g.add((EX["person/p1"], EX.address, node))
+    g.add((EX["person/p1"], EX.age, Literal("30", datatype=XSD.integer)))
+    g.add((node, EX.city, Literal("Zürich")))
+    g.add((EX["person/p2"], EX.knows, EX["person/p1"]))
+    g.add((EX["person/p2"], Namespace("http://other.org/vocab#")["rank"], Literal("1")))
+    return g
+
+
+def _parse_ndjson(path):
+    g = Graph()
+    for line in path.read_text().splitlines():
+        g.parse(data=line, format="json-ld")
+    return g
+
+
+class TestNodeStreamWriters:
+    """Test suite for node-per-subject output."""
+
+    def test_jsonld_document(self, graph, tmp_path):
+        output = tmp_path / "out.jsonld"
+        assert write_graph(graph, JSONLDStreamWriter(output, NAMESPACES)) == len(graph)
+
+        document = json.loads(output.read_text())
+        assert document["@context"] == NAMESPACES
+        assert {"@id": "ex:person/p2", "ex:knows": [{"@id": "ex:person/p1"}],
+                "http://other.org/vocab#rank": ["1"]} in document["@graph"]
+        assert isomorphic(Graph().parse(output, format="json-ld"), graph)
+
+    def test_ndjsonld_lines(self, graph, tmp_path):
+        output = tmp_path / "out.ndjsonld"
+        write_graph(graph, JSONLDStreamWriter(output, NAMESPACES, ndjson=True))
+
+        lines = output.read_text().splitlines()
+        assert len(lines) == 3
+        assert all(json.loads(line)["@id"] for line in lines)
+        assert isomorphic(_parse_ndjson(output), graph)
+
+    def test_rdfxml_descriptions(self, graph, tmp_path):
+        output = tmp_path / "out.rdf"
+        write_graph(graph, RDFXMLStreamWriter(output, NAMESPACES))
+
+        text = output.read_text()
+        assert text.count("<rdf:Description ") == 3
+        assert '<ns0:rank xmlns:ns0="http://other.org/vocab#">1</ns0:rank>' in text
+        assert isomorphic(Graph().parse(output, format="xml"), graph)
+
+    @pytest.mark.parametrize("format", ["jsonld", "ndjsonld", "xml"])
+    def test_ntriples_blocks(self, graph, tmp_path, format):
+        blocks = graph.serialize(format="nt")
+        output = tmp_path / f"out.{format}"
+        with create_stream_writer(format, output, NAMESPACES) as writer:
+            writer.write_lines(blocks, len(graph))
+
+        if format == "ndjsonld":
+            result = _parse_ndjson(output)
+        else:
+            result = Graph().parse(output, format="xml" if format == "xml" else "json-ld")
+        assert writer.get_triple_count() == len(graph)
+        assert isomorphic(result, graph)
+
+    def test_serialize_graph_formats(self, graph, tmp_path):
+        for format, parse_format in [("jsonld", "json-ld"), ("xml", "xml")]:
+            output = tmp_path / f"out.{format}"
+            serialize_graph(graph, format, output, namespaces=NAMESPACES)
+            assert isomorphic(Graph().parse(output, format=parse_format), graph)
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            create_stream_writer("n3", tmp_path / "out.n3")
+
+
+class TestNTriplesTerms:
+    """Test suite for reading N-Triples terms back."""
+
+    def test_unescape_round_trip(self):
+        value = 'tab\there "quote" back\\slash\nline'
+        assert unescape_nt_string(escape_nt_string(value)) == value
+        assert unescape_nt_string("caf\\u00e9 \\U0001F600") == "café 😀"
+
+    def test_parse_object(self):
+        assert parse_nt_object("<http://example.org/a>") == ("iri", "http://example.org/a", None, None)
+        assert parse_nt_object("_:b1") == ("bnode", "b1", None, None)
+        assert parse_nt_object('"a\\"^^<x>"^^<http://dt>') == ("literal", 'a"^^<x>', "http://dt", None)
+        assert parse_nt_object('"hi"@en') == ("literal", "hi", None, "en")
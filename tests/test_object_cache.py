@@ -0,0 +1,100 @@
+"""Tests for skipping repeated linked-object descriptions in streamed output.
+
+This module checks the LRU cache itself, and that the row and columnar
+builders write each object description once while keeping every link,
+with hit and miss counts in the processing report.
+"""
+
+import numpy as np
+import polars as pl
+import pytest
+from rdflib import Graph, Namespace, XSD
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+from rdfmap.emitter.object_cache import ObjectDescriptionCache, cache_entries
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+
+EX = Namespace("http://example.org/")
+
+
+class TestObjectDescriptionCache:
+    """Test suite for the LRU of description hashes."""
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ObjectDescriptionCache(max_entries=2)
+        assert not cache.seen(1) and not cache.seen(2)
+        assert cache.seen(1)  # 2 is now the least recently used
+        assert not cache.seen(3)
+        assert len(cache) == 2
+        assert cache.seen(1) and not cache.seen(2)
+
+    def test_new_rows_of_a_chunk(self):
+        cache = ObjectDescriptionCache(max_entries=10)
+        assert cache.new_rows(np.array([5, 7, 5, 5, 8], dtype=np.uint64)).tolist() == [
+            True, True, False, False, True,
+        ]
+        assert cache.new_rows(np.array([8, 9, 9], dtype=np.uint64)).tolist() == [False, True, False]
+
+    def test_entries_share_the_ceiling(self):
+        assert cache_entries(1, 2) == cache_entries(2, 4)
+        assert cache_entries(1, 10**9) == 1
+
+
+def _config(object_cache_mb):
+    return MappingConfig(
+        namespaces={"ex": str(EX), "xsd": str(XSD)},
+        defaults={"base_iri": str(EX)},
+        options={"object_cache_mb": object_cache_mb},
+        sheets=[{
+            "name": "loans",
+            "source": "loans.csv",
+            "row_resource": {"class": "ex:Loan", "iri_template": "{base_iri}loan/{id}"},
+            "columns": {"amount": {"as": "ex:amount", "datatype": "xsd:integer"}},
+            "objects": {"borrower": {
+                "predicate": "ex:hasBorrower", "class": "ex:Borrower",
+                "iri_template": "{base_iri}borrower/{borrower_id}",
+                "properties": [{"column": "borrower_name", "as": "ex:name"}],
+            }},
+        }],
+    )
+
+
+# Borrower B1 comes back in the second chunk, renamed in the third
+CHUNKS = [
+    pl.DataFrame({"id": ["L1", "L2", "L3"], "amount": ["10", "20", "30"],
+                  "borrower_id": ["B1", "B1", "B2"], "borrower_name": ["Ann", "Ann", "Bob"]}),
+    pl.DataFrame({"id": ["L4", "L5"], "amount": ["40", "50"],
+                  "borrower_id": ["B1", None], "borrower_name": ["Ann", "Eve"]}),
+    pl.DataFrame({"id": ["L6"], "amount": ["60"], "borrower_id": ["B1"], "borrower_name": ["Anna"]}),
+]
+
+
+def _stream(builder_class, object_cache_mb, output):
+    config = _config(object_cache_mb)
+    report = ProcessingReport()
+    with NTriplesStreamWriter(output) as writer:
+        builder = builder_class(config, report, streaming_writer=writer)
+        offset = 0
+        for chunk in CHUNKS:
+            builder.add_dataframe(chunk, config.sheets[0], offset=offset)
+            offset += len(chunk)
+    return report, output.read_text().splitlines()
+
+
+@pytest.mark.parametrize("builder_class", [RDFGraphBuilder, ColumnarNTriplesBuilder])
+def test_repeated_descriptions_are_skipped(tmp_path, builder_class):
+    report, lines = _stream(builder_class, 1, tmp_path / "cached.nt")
+    plain_report, plain_lines = _stream(builder_class, None, tmp_path / "plain.nt")
+
+    assert (report.object_cache_hits, report.object_cache_misses) == (2, 3)
+    assert (plain_report.object_cache_hits, plain_report.object_cache_misses) == (0, 0)
+    assert len(plain_lines) - len(lines) == 2 * 2  # Type and name of two repeats
+    assert sum(" <http://example.org/hasBorrower> " in line for line in lines) == 5
+    assert isomorphic(
+        Graph().parse(tmp_path / "cached.nt", format="nt"),
+        Graph().parse(tmp_path / "plain.nt", format="nt"),
+    )
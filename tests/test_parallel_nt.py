@@ -0,0 +1,157 @@
+"""Tests for multi-process N-Triples conversion.
+
+This module checks that converting byte-range shards of a CSV source and
+merging their reports gives the output and row-numbered errors of a
+single-process conversion.
+"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from rdfmap.config.loader import load_mapping_config
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+from rdfmap.emitter.parallel_nt import (
+    convert_parallel,
+    convert_shard,
+    plan_shards,
+    shard_path,
+    worker_thread_count,
+)
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.parsers.data_source import CSVParser
+
+
+@pytest.fixture
+def mapping_file(tmp_path):
+    """Create a CSV with multi-line values and bad rows, and its mapping."""
+    lines = ["id,name,amount"]
+    for i in range(1, 301):
+        ident = "" if i % 50 == 0 else f"P{i}"  # Rows without an IRI fail
+        name = f'"Person\n{i}"' if i % 7 == 0 else f"Person {i}"
+        amount = "n/a" if i % 40 == 0 else str(i * 10)
+        lines.append(f"{ident},{name},{amount}")
+    source = tmp_path / "people.csv"
+    source.write_text("\n".join(lines) + "\n")
+
+    mapping = {
+        "namespaces": {"ex": "http://example.org/", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        "defaults": {"base_iri": "http://example.org/"},
+        "sheets": [{
+            "name": "people",
+            "source": str(source),
+            "row_resource": {"class": "ex:Person", "iri_template": "{base_iri}person/{id}"},
+            "columns": {
+                "name": {"as": "ex:name", "datatype": "xsd:string"},
+                "amount": {"as": "ex:amount", "datatype": "xsd:long"},
+            },
+        }],
+        "options": {"chunk_size": 40},
+    }
+    path = tmp_path / "mapping.yaml"
+    path.write_text(yaml.safe_dump(mapping))
+    return path
+
+
+def _single_process(mapping_file, output):
+    config = load_mapping_config(mapping_file)
+    sheet = config.sheets[0]
+    report = ProcessingReport()
+    with NTriplesStreamWriter(output) as writer:
+        builder = ColumnarNTriplesBuilder(config, report, writer)
+        offset = 0
+        scan_plan = builder.compiled.plan_for(sheet).scan_plan()
+        for chunk in CSVParser(Path(sheet.source)).parse_plan(scan_plan, chunk_size=config.options.chunk_size):
+            builder.add_dataframe(chunk, sheet, offset=offset)
+            offset += len(chunk)
+    return report
+
+
+def _errors(report):
+    return sorted((e.row, e.error, e.severity) for e in report.errors)
+
+
+class TestParallelConversion:
+    """Test suite for sharded N-Triples conversion."""
+
+    def test_shards_match_single_process(self, mapping_file, tmp_path):
+        expected = _single_process(mapping_file, tmp_path / "single.nt")
+
+        config = load_mapping_config(mapping_file)
+        output = tmp_path / "out.nt"
+        tasks = plan_shards(mapping_file, config, output, workers=4)
+        assert len(tasks) == 4
+        assert [task.output for task in tasks] == [shard_path(output, i) for i in range(1, 5)]
+
+        report = ProcessingReport()
+        lines = []
+        offset = 0
+        for task in tasks:
+            result = convert_shard(task)
+            report.merge(result.report, row_offset=offset)
+            offset += result.rows
+            lines.extend(result.output.read_text().splitlines())
+
+        assert offset == 300
+        assert sorted(lines) == sorted((tmp_path / "single.nt").read_text().splitlines())
+        assert _errors(report) == _errors(expected)
+        # Values that fail typed parsing are reported for rows without an IRI too
+        assert report.datatype_violations == expected.datatype_violations == {"amount": 7}
+        assert (report.total_rows, report.failed_rows, report.warnings) == (
+            expected.total_rows, expected.failed_rows, expected.warnings
+        )
+
+    def test_convert_parallel(self, mapping_file, tmp_path):
+        _single_process(mapping_file, tmp_path / "single.nt")
+        config = load_mapping_config(mapping_file)
+        output = tmp_path / "out.nt"
+        report = ProcessingReport()
+
+        triples = convert_parallel(mapping_file, config, report, output, workers=2)
+
+        lines = output.read_text().splitlines()
+        assert triples == len(lines)
+        assert sorted(lines) == sorted((tmp_path / "single.nt").read_text().splitlines())
+        assert not list(tmp_path.glob("out.part-*"))
+        assert [e.row for e in report.errors if e.severity == "error"] == [50, 100, 150, 200, 250, 300]
+
+    def test_filtered_shards_report_source_rows(self, mapping_file, tmp_path):
+        mapping = yaml.safe_load(mapping_file.read_text())
+        mapping["sheets"][0]["filter_condition"] = "name != 'Person 1' AND name != 'Person 41'"
+        mapping_file.write_text(yaml.safe_dump(mapping))
+        expected = _single_process(mapping_file, tmp_path / "single.nt")
+
+        config = load_mapping_config(mapping_file)
+        report = ProcessingReport()
+        convert_parallel(mapping_file, config, report, tmp_path / "out.nt", workers=3)
+
+        assert _errors(report) == _errors(expected)
+        # Rows keep their numbers in the file although two earlier rows were filtered out
+        assert [e.row for e in report.errors if e.severity == "error"] == [50, 100, 150, 200, 250, 300]
+        assert report.total_rows == expected.total_rows == 292
+
+    def test_worker_thread_count(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 32)
+        assert worker_thread_count(4) == 8
+        assert worker_thread_count(64) == 1
+
+
+class TestReportMerge:
+    """Test suite for folding shard reports together."""
+
+    def test_datatype_samples_capped_across_shards(self):
+        merged = ProcessingReport()
+        for shard in range(3):
+            report = ProcessingReport()
+            report.add_datatype_violations("amount", "xsd:integer", 6, [(i + 1, "x") for i in range(6)])
+            report.add_error("IRI generation failed", row=2)
+            merged.merge(report, row_offset=shard * 100)
+
+        assert merged.datatype_violations == {"amount": 18}
+        assert merged.warnings == 18
+        assert merged.failed_rows == 3
+        samples = [e for e in merged.errors if e.column == "amount"]
+        assert [e.row for e in samples] == [1, 2, 3, 4, 5, 6, 101, 102, 103, 104]
+        assert [e.row for e in merged.errors if e.column is None] == [2, 102, 202]
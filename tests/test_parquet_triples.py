@@ -0,0 +1,109 @@
+"""Tests for the Parquet triple-table writer and reader.
+
+This module checks that triples written from rdflib terms and from the
+columnar engine's N-Triples lines read back to the same graph, and the
+validate and stats commands on triple tables.
+"""
+
+import polars as pl
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+from rdflib.compare import isomorphic
+from typer.testing import CliRunner
+
+from rdfmap.cli.main import app
+from rdfmap.emitter.graph_builder import serialize_graph
+from rdfmap.emitter.parquet_triples import (
+    ParquetTripleWriter,
+    nt_lines_frame,
+    parquet_triple_stats,
+    read_parquet_graph,
+    scan_parquet_triples,
+)
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+EX = Namespace("http://example.org/")
+
+
+@pytest.fixture
+def graph():
+    """Create a graph with typed, tagged and escaped literals and a blank node."""
+    g = Graph()
+    node = BNode()
+    g.add((EX.p1, RDF.type, EX.Person))
+    g.add((EX.p2, RDF.type, EX.Person))
+    g.add((EX.p1, EX.name, Literal('Ann "Annie"\\\n"^^<x>', lang="en-GB")))
+    g.add((EX.p1, EX.age, Literal("30", datatype=XSD.integer)))
+    g.add((EX.p1, EX.address, node))
+    g.add((node, EX.city, Literal("Zürich")))
+    g.add((EX.p2, EX.knows, EX.p1))
+    return g
+
+
+class TestParquetTripleWriter:
+    """Test suite for triple-table output."""
+
+    def test_lines_split_into_columns(self, graph):
+        frame = nt_lines_frame(pl.Series(graph.serialize(format="nt").splitlines()))
+        row = frame.filter(pl.col("lang").is_not_null()).row(0, named=True)
+        assert row == {
+            "subject": str(EX.p1), "predicate": str(EX.name), "object": 'Ann "Annie"\\\n"^^<x>',
+            "object_kind": "literal", "datatype": None, "lang": "en-GB",
+        }
+        assert set(frame["object_kind"]) == {"iri", "bnode", "literal"}
+
+    def test_round_trip_from_terms_and_lines(self, graph, tmp_path):
+        output = tmp_path / "out.parquet"
+        triples = sorted(graph)
+        lines = Graph()
+        for triple in triples[4:]:
+            lines.add(triple)
+        with ParquetTripleWriter(output, row_group_rows=3) as writer:
+            writer.write_triples(triples[:4])
+            writer.write_lines(lines.serialize(format="nt").encode())
+
+        assert writer.get_triple_count() == len(graph)
+        metadata = pq.ParquetFile(output).metadata
+        assert metadata.num_row_groups == 3
+        assert "RLE_DICTIONARY" in metadata.row_group(0).column(1).encodings
+        assert isomorphic(read_parquet_graph(output), graph)
+
+    def test_serialize_graph_and_stats(self, graph, tmp_path):
+        output = tmp_path / "out.parquet"
+        serialize_graph(graph, "parquet-triples", output)
+
+        assert scan_parquet_triples(output).collect().height == len(graph)
+        stats = parquet_triple_stats(output)
+        assert stats["triples"] == 7 and stats["subjects"] == 3 and stats["literals"] == 3
+        assert stats["top_classes"] == [(str(EX.Person), 2)]
+        assert stats["datatypes"] == [(str(XSD.integer), 1)]
+
+    def test_not_a_triple_table(self, tmp_path):
+        path = tmp_path / "other.parquet"
+        pl.DataFrame({"a": [1]}).write_parquet(path)
+        with pytest.raises(ValueError):
+            scan_parquet_triples(path)
+
+
+def test_validate_and_stats_commands(graph, tmp_path):
+    data = tmp_path / "out.parquet"
+    serialize_graph(graph, "parquet-triples", data)
+    shapes = tmp_path / "shapes.ttl"
+    shapes.write_text("""
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix ex: <http://example.org/> .
+ex:PersonShape a sh:NodeShape ;
+    sh:targetClass ex:Person ;
+    sh:property [ sh:path ex:name ; sh:minCount 1 ] .
+""")
+
+    runner = CliRunner()
+    result = runner.invoke(app, ["validate", "--rdf", str(data), "--shapes", str(shapes)])
+    assert result.exit_code == 1  # ex:p2 has no name
+    assert "Loaded 7 triples" in result.output
+
+    result = runner.invoke(app, ["stats", "--triples", str(data), "-o", str(tmp_path / "stats.json")])
+    assert result.exit_code == 0
+    assert "Triples: 7" in result.output
+    assert (tmp_path / "stats.json").exists()
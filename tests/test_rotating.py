@@ -0,0 +1,111 @@
+"""Tests for rotating sharded output.
+
+This module checks shard naming, that shards never split a subject's
+triples, and the manifest written next to the shards.
+"""
+
+import gzip
+import hashlib
+import json
+
+import pytest
+from rdflib import Graph, Literal, Namespace, RDF
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter.external_sort import SortedRunWriter
+from rdfmap.emitter.graph_builder import serialize_graph
+from rdfmap.emitter.node_streaming import create_stream_writer
+from rdfmap.emitter.sinks import manifest_path, shard_path
+
+EX = Namespace("http://example.org/")
+
+
+@pytest.fixture
+def graph():
+    """Create 20 people with three triples each."""
+    g = Graph()
+    for i in range(20):
+        g.add((EX[f"p{i:02d}"], RDF.type, EX.Person))
+        g.add((EX[f"p{i:02d}"], EX.name, Literal(f"Person {i}")))
+        g.add((EX[f"p{i:02d}"], EX.rank, Literal(i)))
+    return g
+
+
+def _shards(output, parse_format):
+    manifest = json.loads(manifest_path(output).read_text())
+    graphs = []
+    for shard in manifest["shards"]:
+        path = output.with_name(shard["path"])
+        data = path.read_bytes()
+        assert shard["bytes"] == len(data)
+        assert shard["sha256"] == hashlib.sha256(data).hexdigest()
+        if path.suffix == ".gz":
+            data = gzip.decompress(data)
+        graphs.append(Graph().parse(data=data.decode(), format=parse_format))
+        assert len(graphs[-1]) == shard["triples"]
+    return manifest, graphs
+
+
+def _assert_subjects_not_split(graphs):
+    seen = set()
+    for part in graphs:
+        subjects = set(part.subjects())
+        assert not subjects & seen
+        seen |= subjects
+
+
+def test_shard_names():
+    assert str(shard_path("out/data.nt.gz", 12)) == "out/data.part-00012.nt.gz"
+    assert str(manifest_path("out/data.nt.gz")) == "out/data.manifest.json"
+
+
+def test_rotates_between_subjects(graph, tmp_path):
+    output = tmp_path / "out.ttl"
+    serialize_graph(graph, "ttl", output, namespaces={"ex": str(EX)}, max_triples_per_file=10)
+
+    manifest, graphs = _shards(output, "turtle")
+    assert [shard["triples"] for shard in manifest["shards"]] == [12] * 5
+    assert manifest["triples"] == 60 and manifest["format"] == "turtle"
+    assert not output.exists()
+    _assert_subjects_not_split(graphs)
+    union = Graph()
+    for part in graphs:
+        union += part
+    assert isomorphic(union, graph)
+
+
+def test_sorted_runs_rotate_between_subjects(graph, tmp_path):
+    output = tmp_path / "out.nt.gz"
+    lines = graph.serialize(format="nt")
+    with SortedRunWriter(output, memory_budget_mb=1, max_triples_per_file=7) as writer:
+        writer.write_lines(lines + lines)
+
+    manifest, graphs = _shards(output, "nt")
+    assert writer.get_triple_count() == manifest["triples"] == 60
+    assert [shard["triples"] for shard in manifest["shards"]] == [9] * 6 + [6]
+    _assert_subjects_not_split(graphs)
+
+
+def test_blocks_are_never_split(graph, tmp_path):
+    output = tmp_path / "out.nt"
+    block = graph.serialize(format="nt")
+    with create_stream_writer("nt", output, max_bytes_per_file=len(block.encode()) + 1) as writer:
+        for run in "abc":
+            writer.write_lines(block.replace("/p", f"/{run}"), 60)
+
+    manifest, _ = _shards(output, "nt")
+    assert [shard["triples"] for shard in manifest["shards"]] == [120, 60]
+    assert writer.get_triple_count() == 180
+
+
+def test_empty_output_has_one_shard(tmp_path):
+    output = tmp_path / "out.jsonld"
+    with create_stream_writer("jsonld", output, max_triples_per_file=5):
+        pass
+    manifest, _ = _shards(output, "json-ld")
+    assert [shard["triples"] for shard in manifest["shards"]] == [0]
+
+
+def test_standard_output_cannot_rotate():
+    with pytest.raises(ValueError):
+        create_stream_writer("nt", "-", max_triples_per_file=5)
@@ -0,0 +1,246 @@
+"""Tests for scan plans pushed into source parsing.
+
+This module checks which columns a sheet plan reads, how filter conditions
+are compiled, that the lazy, byte-range and eager parsers return only the
+projected columns of the filtered, limited rows, and typed parsing with
+invalid values reported instead of converted.
+"""
+
+import json
+
+import polars as pl
+import pytest
+from rdflib import Graph, Namespace, XSD
+
+from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+from rdfmap.emitter.graph_builder import RDFGraphBuilder
+from rdfmap.emitter.mapping_plan import compile_filter, compile_sheet
+from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import ColumnMapping, MappingConfig
+from rdfmap.parsers.data_source import INVALID_PREFIX, SOURCE_ROW, CSVParser, JSONParser, ScanPlan, create_parser
+
+EX = Namespace("http://example.org/")
+
+
+def _config(filter_condition=None, **options):
+    return MappingConfig(
+        namespaces={"ex": str(EX), "xsd": str(XSD)},
+        defaults={"base_iri": str(EX)},
+        options=options,
+        sheets=[{
+            "name": "loans",
+            "source": "loans.csv",
+            "filter_condition": filter_condition,
+            "row_resource": {"class": "ex:Loan", "iri_template": "{base_iri}loan/{id}"},
+            "columns": {"amount": {"as": "ex:amount", "datatype": "xsd:long"}},
+            "objects": {"borrower": {
+                "predicate": "ex:hasBorrower", "class": "ex:Borrower",
+                "iri_template": "{base_iri}borrower/{borrower_id}",
+                "properties": [{"column": "borrower_name", "as": "ex:name"}],
+            }},
+        }],
+    )
+
+
+@pytest.fixture
+def wide_csv(tmp_path):
+    """Create 100 loans with ten unmapped columns."""
+    path = tmp_path / "loans.csv"
+    frame = pl.DataFrame({
+        "id": [f"L{i}" for i in range(100)],
+        "status": ["Active" if i % 4 else "Closed" for i in range(100)],
+        "amount": list(range(100)),
+        "borrower_id": [f"B{i % 10}" for i in range(100)],
+        "borrower_name": [f"Name {i % 10}" for i in range(100)],
+    })
+    frame = frame.with_columns([pl.lit(i).alias(f"unused_{i}") for i in range(10)])
+    frame.write_csv(path)
+    return path
+
+
+def test_source_columns():
+    config = _config()
+    plan = compile_sheet(config.sheets[0], config)
+    assert plan.source_columns() == ["amount", "borrower_name", "id", "borrower_id"]
+    assert plan.filter is None
+
+
+def test_literal_dtypes():
+    config = _config()
+    config.sheets[0].columns["borrower_id"] = config.sheets[0].columns["amount"]
+    config.sheets[0].columns["opened"] = config.sheets[0].columns["amount"].model_copy(
+        update={"datatype": None, "transform": "to_date"}
+    )
+    plan = compile_sheet(config.sheets[0], config)
+    # Template variables keep the inferred type; untyped columns are not listed
+    assert plan.dtypes == {"amount": pl.Int64, "opened": pl.Date}
+    assert compile_sheet(config.sheets[0], _config(typed_parsing=False)).dtypes == {}
+
+
+def test_invalid_filter_condition():
+    with pytest.raises(ValueError):
+        compile_filter("status = = 'Active'")
+
+
+def test_unknown_filter_column(wide_csv):
+    plan = ScanPlan(predicate=compile_filter("state = 'Active'"))
+    with pytest.raises(ValueError, match="state"):
+        next(CSVParser(wide_csv).parse_plan(plan))
+
+
+def test_csv_projection_filter_and_limit(wide_csv):
+    config = _config("status = 'Active' AND amount >= 10")
+    plan = compile_sheet(config.sheets[0], config).scan_plan(limit=50)
+    chunks = list(CSVParser(wide_csv).parse_plan(plan, chunk_size=20))
+
+    assert [len(chunk) for chunk in chunks] == [20, 20, 10]
+    frame = pl.concat(chunks)
+    # Source order is kept; the filter column is not projected
+    assert frame.columns == [SOURCE_ROW, "id", "amount", "borrower_id", "borrower_name", INVALID_PREFIX + "amount"]
+    assert frame.schema["amount"] == pl.Int64
+    assert frame["amount"].min() == 10 and (frame["amount"] % 4 != 0).all()
+
+
+def test_byte_ranges_apply_the_plan(wide_csv):
+    plan = ScanPlan(columns=["id", "amount"], predicate=compile_filter("status = 'Closed'"))
+    parser = CSVParser(wide_csv)
+    ranges = [
+        pl.concat(list(CSVParser(wide_csv, byte_range=byte_range).parse_plan(plan, chunk_size=7)))
+        for byte_range in parser.split_byte_ranges(3)
+    ]
+    frame = pl.concat(ranges)
+    assert frame.columns == [SOURCE_ROW, "id", "amount"]
+    assert frame["amount"].to_list() == list(range(0, 100, 4))
+    # Each range numbers its rows from its own start; amount is the row's position in the file
+    starts = [(part["amount"] - part[SOURCE_ROW].cast(pl.Int64)).unique().to_list() for part in ranges]
+    assert starts[0] == [0] and all(len(start) == 1 for start in starts)
+    assert starts[0][0] < starts[1][0] < starts[2][0]
+
+
+def test_eager_parsers_apply_the_plan(tmp_path):
+    path = tmp_path / "loans.json"
+    path.write_text(json.dumps([{"id": f"L{i}", "amount": i, "note": "x"} for i in range(10)]))
+    plan = ScanPlan(columns=["id", "amount"], predicate=compile_filter("amount > 3"), limit=4)
+    frame = pl.concat(list(JSONParser(path).parse_plan(plan, chunk_size=3)))
+    assert frame.columns == [SOURCE_ROW, "id", "amount"]
+    assert frame["amount"].to_list() == [4, 5, 6, 7]
+    assert frame[SOURCE_ROW].to_list() == [4, 5, 6, 7]
+
+
+def test_filtered_conversion(wide_csv, tmp_path):
+    config = _config("status = 'Closed'")
+    output = tmp_path / "out.nt"
+    report = ProcessingReport()
+    with NTriplesStreamWriter(output) as writer:
+        builder = ColumnarNTriplesBuilder(config, report, writer)
+        sheet = config.sheets[0]
+        scan_plan = builder.compiled.plan_for(sheet).scan_plan()
+        for chunk in CSVParser(wide_csv).parse_plan(scan_plan, chunk_size=10):
+            builder.add_dataframe(chunk, sheet)
+
+    graph = Graph().parse(output, format="nt")
+    assert len(set(graph.subjects(predicate=EX.amount))) == 25
+    assert report.total_rows == 25
+
+
+@pytest.mark.parametrize("builder_class", [RDFGraphBuilder, ColumnarNTriplesBuilder])
+@pytest.mark.parametrize("chunk_size", [1, 2, None])
+def test_filtered_rows_keep_source_numbers(tmp_path, builder_class, chunk_size):
+    path = tmp_path / "loans.csv"
+    path.write_text(
+        "id,amount,borrower_id,borrower_name\n"
+        "L1,1,B1,Ann\nL2,2,B2,Bob\nL3,3,B3,Cy\nL4,n/a,B4,Dee\nL3,5,B5,Eve\n"
+    )
+    config = _config("id != 'L1' AND id != 'L2'")
+    config.sheets[0].detect_duplicates = True
+    report = ProcessingReport()
+    with NTriplesStreamWriter(tmp_path / "out.nt") as writer:
+        builder = builder_class(config, report, streaming_writer=writer)
+        sheet = config.sheets[0]
+        offset = 0
+        for chunk in CSVParser(path).parse_plan(builder.compiled.plan_for(sheet).scan_plan(), chunk_size=chunk_size):
+            builder.add_dataframe(chunk, sheet, offset=offset)
+            offset += len(chunk)
+
+    # Rows are numbered in the source, not among the rows that passed the filter
+    assert [(e.row, e.column) for e in report.errors] == [(4, "amount")]
+    assert builder.get_duplicate_iris() == {str(EX["loan/L3"]): [3, 5]}
+    assert report.total_rows == 3
+
+
+def test_typed_parsing(tmp_path):
+    path = tmp_path / "loans.csv"
+    path.write_text("id,amount,borrower_id,borrower_name\nL1,10,B1,007\nL2,n/a,B2,008\nL3, 30 ,B3,\n")
+    config = _config()
+    config.sheets[0].objects["borrower"].properties[0].datatype = "xsd:string"
+    plan = compile_sheet(config.sheets[0], config).scan_plan()
+    frame = next(CSVParser(path).parse_plan(plan))
+
+    assert frame["amount"].to_list() == [10, None, 30]
+    assert frame[INVALID_PREFIX + "amount"].to_list() == [None, "n/a", None]
+    # Declared strings are not inferred as numbers
+    assert frame["borrower_name"].to_list() == ["007", "008", None]
+
+
+def _convert(config, path, output):
+    report = ProcessingReport()
+    with NTriplesStreamWriter(output) as writer:
+        builder = ColumnarNTriplesBuilder(config, report, writer)
+        sheet = config.sheets[0]
+        scan_plan = builder.compiled.plan_for(sheet).scan_plan()
+        for chunk in create_parser(path).parse_plan(scan_plan):
+            builder.add_dataframe(chunk, sheet)
+    return report
+
+
+@pytest.mark.parametrize("typed_parsing", [True, False])
+def test_invalid_values_are_reported(tmp_path, typed_parsing):
+    path = tmp_path / "loans.csv"
+    path.write_text("id,amount,borrower_id,borrower_name\nL1,10,B1,Ann\nL2,n/a,B2,Bob\n")
+    config = _config(typed_parsing=typed_parsing)
+    output = tmp_path / "out.nt"
+    report = _convert(config, path, output)
+
+    assert report.datatype_violations == {"amount": 1}
+    assert [(e.row, e.column) for e in report.errors] == [(2, "amount")]
+    amounts = {str(o) for o in Graph().parse(output, format="nt").objects(predicate=EX.amount)}
+    # Without typed parsing the invalid value is written as a plain literal
+    assert amounts == ({"10"} if typed_parsing else {"10", "n/a"})
+
+
+def test_unbounded_integers_are_kept(tmp_path):
+    path = tmp_path / "loans.csv"
+    path.write_text("id,amount,borrower_id,borrower_name\nL1,12345678901234567890,B1,Ann\n")
+    config = _config()
+    config.sheets[0].columns["amount"].datatype = "xsd:integer"
+    # xsd:integer has no bound, so it is not parsed into an Int64
+    assert compile_sheet(config.sheets[0], config).dtypes == {}
+    output = tmp_path / "out.nt"
+    report = _convert(config, path, output)
+
+    assert report.datatype_violations == {}
+    amounts = {str(o) for o in Graph().parse(output, format="nt").objects(predicate=EX.amount)}
+    assert amounts == {"12345678901234567890"}
+
+
+def test_native_types_are_converted(tmp_path):
+    path = tmp_path / "loans.json"
+    records = [("L1", 5.0, "2024-01-05Z"), ("L2", 7.0, "2024-01-05+02:00"), ("L3", 7.5, "2024-01-06")]
+    path.write_text(json.dumps([
+        {"id": id_, "amount": amount, "opened": opened, "borrower_id": "B1", "borrower_name": "Ann"}
+        for id_, amount, opened in records
+    ]))
+    config = _config()
+    config.sheets[0].columns["amount"].datatype = "xsd:int"
+    config.sheets[0].columns["opened"] = ColumnMapping.model_validate({"as": "ex:opened", "datatype": "xsd:date"})
+    output = tmp_path / "out.nt"
+    report = _convert(config, path, output)
+
+    graph = Graph().parse(output, format="nt")
+    # Floats without a fraction are integers; 7.5 is not
+    assert {str(o) for o in graph.objects(predicate=EX.amount)} == {"5", "7"}
+    # Dates with a timezone are kept as written, as without typed parsing
+    opened = {str(o) for o in graph.objects(predicate=EX.opened)}
+    assert opened == {"2024-01-05Z", "2024-01-05+02:00", "2024-01-06"}
+    assert report.datatype_violations["amount"] == 1
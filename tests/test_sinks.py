@@ -0,0 +1,101 @@
+"""Tests for streaming output sinks.
+
+This module checks plain, standard output and compressed sinks, and the
+batched byte-oriented write API of NTriplesStreamWriter.
+"""
+
+import gzip
+import io
+
+import pytest
+from rdflib import Literal, Namespace, XSD
+
+from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+from rdfmap.emitter.sinks import CompressedWriter, create_compressor, infer_compression, open_output
+
+EX = Namespace("http://example.org/")
+
+
+class _FailingFile(io.RawIOBase):
+    def writable(self):
+        return True
+
+    def write(self, data):
+        raise OSError("disk full")
+
+
+class TestOpenOutput:
+    """Test suite for output sinks."""
+
+    def test_infer_compression(self):
+        assert infer_compression("out.nt.gz") == "gzip"
+        assert infer_compression("out.nt.zst") == "zstd"
+        assert infer_compression("out.nt") is None
+
+    def test_gzip_by_suffix(self, tmp_path):
+        path = tmp_path / "out.nt.gz"
+        with open_output(path, buffer_size=1024) as handle:
+            for i in range(10_000):
+                handle.write(f"line {i}\n".encode())
+        assert gzip.decompress(path.read_bytes()).decode().splitlines()[-1] == "line 9999"
+
+    def test_text_mode_and_explicit_compression(self, tmp_path):
+        path = tmp_path / "out.ttl"
+        with open_output(path, "w", compression="gzip") as handle:
+            handle.write("é\n")
+        assert gzip.decompress(path.read_bytes()).decode() == "é\n"
+
+    def test_uncompressed(self, tmp_path):
+        path = tmp_path / "out.nt.gz"
+        with open_output(path, compression=None) as handle:
+            handle.write(b"plain\n")
+        assert path.read_bytes() == b"plain\n"
+
+    def test_unknown_compression(self, tmp_path):
+        with pytest.raises(ValueError):
+            open_output(tmp_path / "out.nt", compression="lz4")
+        assert not (tmp_path / "out.nt").exists()
+
+    def test_background_error_is_raised(self):
+        writer = CompressedWriter(_FailingFile(), create_compressor("gzip", 1))
+        with pytest.raises(OSError):
+            writer.write(b"x" * 100_000)
+            writer.close()
+
+    def test_zstd(self, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        path = tmp_path / "out.nt.zst"
+        with open_output(path) as handle:
+            handle.write(b"frame\n")
+        assert zstandard.ZstdDecompressor().decompressobj().decompress(path.read_bytes()) == b"frame\n"
+
+
+class TestNTriplesWriteAPI:
+    """Test suite for batched N-Triples writes."""
+
+    def test_write_lines_inputs(self, tmp_path):
+        path = tmp_path / "out.nt"
+        line = '<http://example.org/a> <http://example.org/p> "x" .\n'
+        with NTriplesStreamWriter(path) as writer:
+            writer.write_lines(line, 1)
+            writer.write_lines(line.encode())
+            writer.write_lines([line.encode(), line.encode()])
+        assert path.read_text() == line * 4
+        assert writer.get_triple_count() == 4
+
+    def test_write_triples_matches_write_triple(self, tmp_path):
+        triples = [
+            (EX.a, EX.name, Literal('say "hi"\n', lang="en")),
+            (EX.a, EX.age, Literal("30", datatype=XSD.integer)),
+            (EX.a, EX.knows, EX.b),
+        ]
+        with NTriplesStreamWriter(tmp_path / "batch.nt.gz") as writer:
+            writer.write_triples(triples)
+        with NTriplesStreamWriter(tmp_path / "single.nt") as single:
+            for triple in triples:
+                single.write_triple(*triple)
+
+        assert writer.get_triple_count() == single.get_triple_count() == 3
+        batch = gzip.decompress((tmp_path / "batch.nt.gz").read_bytes()).decode()
+        assert batch == (tmp_path / "single.nt").read_text()
+        assert '"say \\"hi\\"\\n"@en' in batch
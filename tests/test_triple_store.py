@@ -0,0 +1,176 @@
+"""Tests for the integer-interned triple store.
+
+This module checks pattern lookups, duplicate removal and namespace
+bindings of InternedTripleStore, and that the builder, reasoning,
+structural validation and serialization give the same results on it as
+on rdflib's memory store.
+"""
+
+import polars as pl
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, RDFS, XSD
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter.graph_builder import RDFGraphBuilder, serialize_graph
+from rdfmap.emitter.triple_store import InternedTripleStore
+from rdfmap.generator.ontology_analyzer import OntologyAnalyzer
+from rdfmap.models.errors import ProcessingReport
+from rdfmap.models.mapping import MappingConfig
+from rdfmap.validator.structure import structural_validate
+
+EX = Namespace("http://example.org/")
+
+
+@pytest.fixture
+def graph():
+    """Create an interned graph with repeated triples and every pattern shape."""
+    g = Graph(store=InternedTripleStore())
+    node = BNode()
+    g.add((EX.a, RDF.type, EX.Person))
+    g.add((EX.b, RDF.type, EX.Person))
+    g.add((EX.a, EX.knows, EX.b))
+    g.add((EX.a, EX.knows, EX.c))
+    g.add((EX.a, EX.age, Literal(30)))
+    g.add((EX.c, EX.address, node))
+    g.add((node, EX.city, Literal("Paris", lang="fr")))
+    g.add((EX.a, EX.knows, EX.b))  # Duplicate
+    return g
+
+
+class TestInternedTripleStore:
+    """Test suite for the store's Graph API."""
+
+    def test_len_removes_duplicates(self, graph):
+        assert len(graph) == 7
+        graph.store.add_many([(EX.d, RDF.type, EX.Person), (EX.a, RDF.type, EX.Person)])
+        assert len(graph) == 8
+        assert graph.store.term_count == 13
+
+    @pytest.mark.parametrize("pattern,expected", [
+        ((EX.a, None, None), 4),
+        ((EX.a, EX.knows, None), 2),
+        ((EX.a, EX.knows, EX.c), 1),
+        ((EX.a, None, EX.b), 1),
+        ((None, RDF.type, None), 2),
+        ((None, RDF.type, EX.Person), 2),
+        ((None, None, EX.b), 1),
+        ((None, None, None), 7),
+        ((EX.a, EX.city, None), 0),
+        ((EX.unknown, None, None), 0),
+    ])
+    def test_patterns(self, graph, pattern, expected):
+        memory = Graph()
+        for triple in graph:
+            memory.add(triple)
+        assert sorted(graph.triples(pattern)) == sorted(memory.triples(pattern))
+        assert len(list(graph.triples(pattern))) == expected
+
+    def test_contains_and_remove(self, graph):
+        assert (EX.a, EX.age, Literal(30)) in graph
+        assert (EX.a, EX.age, Literal("30")) not in graph
+        assert (EX.a, EX.knows, None) in graph.store
+
+        graph.remove((EX.a, EX.knows, None))
+        assert len(graph) == 5
+        assert (EX.a, EX.knows, EX.b) not in graph
+        assert set(graph.subjects(RDF.type, EX.Person)) == {EX.a, EX.b}
+
+    def test_adds_while_iterating(self, graph):
+        for s, o in list(graph.subject_objects(EX.knows)):
+            graph.add((o, EX.knownBy, s))
+        assert set(graph.objects(EX.b, EX.knownBy)) == {EX.a}
+        assert len(graph) == 9
+
+    def test_namespace_bindings(self, graph):
+        graph.bind("ex", EX)
+        assert str(graph.store.namespace("ex")) == str(EX)
+        assert "ex:knows" in graph.serialize(format="turtle")
+
+
+@pytest.fixture
+def ontology(tmp_path):
+    """Create an ontology with a superclass, an inverse and a domain."""
+    path = tmp_path / "ontology.ttl"
+    path.write_text("""
+@prefix ex: <http://example.org/> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+
+ex:Agent a owl:Class .
+ex:Person a owl:Class ; rdfs:subClassOf ex:Agent .
+ex:Team a owl:Class .
+ex:reportsTo a owl:ObjectProperty ; owl:inverseOf ex:manages ; rdfs:domain ex:Team .
+ex:manages a owl:ObjectProperty .
+""")
+    return path
+
+
+def _config(triple_store):
+    return MappingConfig(
+        namespaces={"ex": "http://example.org/", "xsd": str(XSD)},
+        defaults={"base_iri": "http://example.org/"},
+        options={"triple_store": triple_store},
+        sheets=[{
+            "name": "people",
+            "source": "people.csv",
+            "row_resource": {"class": "ex:Person", "iri_template": "{base_iri}person/{id}"},
+            "columns": {"age": {"as": "ex:age", "datatype": "xsd:integer"}},
+            "objects": {"manager": {
+                "predicate": "ex:reportsTo", "class": "ex:Person",
+                "iri_template": "{base_iri}person/{manager_id}",
+            }},
+        }],
+    )
+
+
+def test_builder_matches_memory_store(ontology):
+    frame = pl.DataFrame({"id": ["p1", "p2", "p3"], "age": ["30", "41", "x"], "manager_id": ["p2", "p3", None]})
+    graphs = {}
+    for triple_store in ("memory", "interned"):
+        config = _config(triple_store)
+        builder = RDFGraphBuilder(config, ProcessingReport(), ontology_analyzer=OntologyAnalyzer(str(ontology)))
+        builder.add_dataframe(frame, config.sheets[0])
+        graphs[triple_store] = builder.get_graph()
+
+    interned = graphs["interned"]
+    assert isinstance(interned.store, InternedTripleStore)
+    assert isomorphic(interned, graphs["memory"])
+    assert (EX["person/p2"], EX.manages, EX["person/p1"]) in interned
+    assert (EX["person/p1"], RDF.type, EX.Agent) in interned
+
+    ontology_graph = Graph().parse(ontology)
+    memory_report = structural_validate(graphs["memory"], ontology_graph)
+    interned_report = structural_validate(interned, ontology_graph)
+    assert len(interned_report.results) == len(memory_report.results) == 2
+
+
+def test_builder_adds_chunks_in_batches(monkeypatch):
+    calls = []
+    add_many = InternedTripleStore.add_many
+
+    def counting_add_many(self, triples):
+        calls.append(len(triples))
+        add_many(self, triples)
+
+    def single_add(self, triple, context=None, quoted=False):
+        raise AssertionError("triples should be added in batches")
+
+    monkeypatch.setattr(InternedTripleStore, "add_many", counting_add_many)
+    monkeypatch.setattr(InternedTripleStore, "add", single_add)
+    frame = pl.DataFrame({"id": ["p1", "p2"], "age": ["30", "41"], "manager_id": ["p2", None]})
+    config = _config("interned")
+    builder = RDFGraphBuilder(config, ProcessingReport())
+    builder.add_dataframe(frame, config.sheets[0])
+    builder.add_dataframe(frame.with_columns(pl.col("id") + "b"), config.sheets[0], offset=2)
+
+    graph = builder.get_graph()
+    # One batch per chunk
+    assert calls == [6, 6]
+    # The type of p2 comes from its row and from every link to it
+    assert len(graph) == 10
+
+
+def test_serialize_interned_graph(graph, tmp_path):
+    output = tmp_path / "out.ttl"
+    serialize_graph(graph, "ttl", output, namespaces={"ex": str(EX), "rdfs": str(RDFS)})
+    assert isomorphic(Graph().parse(output, format="turtle"), graph)
@@ -0,0 +1,94 @@
+"""Tests for the streaming Turtle writer.
+
+This module checks prefix compaction, subject grouping and that streamed
+Turtle parses back to the triples that were written.
+"""
+
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, XSD
+from rdflib.compare import isomorphic
+
+from rdfmap.emitter.graph_builder import serialize_graph
+from rdfmap.emitter.turtle_streaming import PrefixTrie, TurtleStreamWriter
+
+EX = Namespace("http://example.org/")
+NAMESPACES = {
+    "ex": "http://example.org/",
+    "exp": "http://example.org/person/",
+    "xsd": str(XSD),
+}
+
+
+class TestPrefixTrie:
+    """Test suite for namespace matching."""
+
+    def test_longest_namespace_wins(self):
+        trie = PrefixTrie(NAMESPACES)
+        assert trie.compact("http://example.org/person/p1") == "exp:p1"
+        assert trie.compact("http://example.org/name") == "ex:name"
+        assert trie.compact("http://example.org/") == "ex:"
+
+    def test_unsafe_local_names_stay_iris(self):
+        trie = PrefixTrie(NAMESPACES)
+        assert trie.compact("http://example.org/a/b") == "<http://example.org/a/b>"
+        assert trie.compact("http://example.org/name.") == "<http://example.org/name.>"
+        assert trie.compact("http://other.org/x") == "<http://other.org/x>"
+
+
+class TestTurtleStreamWriter:
+    """Test suite for incremental Turtle output."""
+
+    def test_grouped_statements(self, tmp_path):
+        output = tmp_path / "out.ttl"
+        with TurtleStreamWriter(output, NAMESPACES) as writer:
+            writer.write_triple(EX["person/p1"], RDF.type, EX.Person)
+            writer.write_triple(EX["person/p1"], EX.tag, Literal("a"))
+            writer.write_triple(EX["person/p1"], EX.tag, Literal("b"))
+            writer.write_triple(EX["person/p2"], EX.age, Literal(30))
+
+        body = output.read_text().split("\n\n", 1)[1]
+        assert body == (
+            'exp:p1 a ex:Person ;\n'
+            '    ex:tag "a", "b" .\n'
+            '\n'
+            'exp:p2 ex:age "30"^^xsd:integer .\n'
+        )
+        assert writer.get_triple_count() == 4
+
+    def test_lines_grouped_by_subject(self, tmp_path):
+        output = tmp_path / "out.ttl"
+        lines = (
+            '<http://example.org/a> <http://example.org/p> "1" .\n'
+            '<http://example.org/b> <http://example.org/p> <http://example.org/a> .\n'
+            '<http://example.org/a> <http://example.org/q> "x"^^<http://www.w3.org/2001/XMLSchema#string> .\n'
+        )
+        with TurtleStreamWriter(output, NAMESPACES) as writer:
+            writer.write_lines(lines, 3)
+
+        text = output.read_text()
+        assert text.count("\nex:a ") == 1
+        assert 'ex:q "x"^^xsd:string' in text
+        expected = Graph().parse(data=lines, format="nt")
+        assert isomorphic(Graph().parse(output, format="turtle"), expected)
+
+    def test_not_opened(self, tmp_path):
+        writer = TurtleStreamWriter(tmp_path / "out.ttl")
+        with pytest.raises(RuntimeError):
+            writer.write_triple(EX.a, EX.p, EX.b)
+
+
+def test_serialize_graph_streams_turtle(tmp_path):
+    graph = Graph()
+    node = BNode()
+    graph.add((EX["person/p1"], RDF.type, EX.Person))
+    graph.add((EX["person/p1"], EX.name, Literal('Ann "Annie"\nSmith', lang="en")))
+    graph.add((EX["person/p1"], EX.address, node))
+    graph.add((node, EX.city, Literal("Paris")))
+    graph.add((EX["person/p2"], EX.knows, EX["person/p1"]))
+    graph.add((EX["person/p2"], EX.born, Literal("2001-02-03", datatype=XSD.date)))
+
+    output = tmp_path / "out.ttl"
+    serialize_graph(graph, "ttl", output, namespaces=NAMESPACES)
+
+    assert output.read_text().startswith("@prefix ex: <http://example.org/> .\n")
+    assert isomorphic(Graph().parse(output, format="turtle"), graph)
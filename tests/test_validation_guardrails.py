@@ -13,6 +13,7 @@ from rdfmap.validator.datatypes import (
     validate_xsd_datetime,
     validate_xsd_anyuri,
     validate_datatype,
+    validate_series,
 )
 from rdfmap.validator.config import (
     validate_namespace_prefixes,
@@ -132,6 +133,42 @@ class TestDatatypeValidation:
         is_valid, _ = validate_datatype("3.14", "xsd:decimal")
         assert is_valid is True
 
+    def test_validate_datatype_with_uriref(self):
+        """Test validation with resolved URIRef datatypes."""
+        from rdflib.namespace import XSD
+
+        is_valid, error = validate_datatype("2024-13-45", XSD.date)
+        assert is_valid is False
+        assert "month" in error
+
+    def test_validate_series_matches_scalar(self):
+        """Test that column validation agrees with per-value validation."""
+        cases = {
+            "xsd:integer": ["1", "-007", "+5", "1.5", "abc", "", " 3", None],
+            "xsd:decimal": ["0.065", ".5", "-2", "1e3", "x", "1_0", None],
+            "xsd:boolean": ["true", "0", "yes", "False", "maybe", None],
+            "xsd:date": ["2024-01-15", "2024-13-45", "2024-1-5", "2021-02-29", None],
+            "xsd:anyURI": ["http://example.com/a", "not a uri", "urn:isbn:1", None],
+        }
+        for datatype, values in cases.items():
+            result = validate_series(pl.Series("v", values, dtype=pl.String), datatype)
+            expected = [v is None or validate_datatype(v, datatype)[0] for v in values]
+            assert result.valid.to_list() == expected, datatype
+            assert result.invalid_count == expected.count(False)
+
+    def test_validate_series_native_and_samples(self):
+        """Test native dtypes and the bounded sample of offending rows."""
+        result = validate_series(pl.Series("v", [1.0, 2.5, None, 3.0]), "xsd:integer")
+        assert result.valid.to_list() == [True, False, True, True]
+        assert result.samples == [(1, 2.5)]
+
+        result = validate_series(pl.Series("v", ["x"] * 25), "xsd:date", max_samples=10)
+        assert result.invalid_count == 25
+        assert len(result.samples) == 10
+
+        result = validate_series(pl.Series("v", ["anything"]), "xsd:string")
+        assert result.invalid_count == 0
+
 
 class TestConfigValidation:
     """Test configuration validation."""
@@ -145,7 +182,7 @@ class TestConfigValidation:
     
     def test_validate_namespace_prefixes_valid(self):
         """Test validation with all prefixes declared."""
-        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#"},
             defaults=DefaultsConfig(base_iri="https://data.example.com/"),
             sheets=[
                 SheetMapping(
@@ -168,7 +205,7 @@ class TestConfigValidation:
     
     def test_validate_namespace_prefixes_undefined(self):
         """Test validation with undefined prefixes."""
-        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#"},
             defaults=DefaultsConfig(base_iri="https://data.example.com/"),
             sheets=[
                 SheetMapping(
@@ -191,7 +228,7 @@ class TestConfigValidation:
     
     def test_validate_required_fields(self):
         """Test validation of required fields in IRI templates."""
-        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#"},
             defaults=DefaultsConfig(base_iri="https://data.example.com/"),
             sheets=[
                 SheetMapping(
@@ -259,8 +296,133 @@ class TestDuplicateIRIDetection:
         assert any("item/B" in msg for msg in duplicate_messages)
 
 
+class TestDuplicateIRIDetector:
+    """Test the hashed duplicate IRI detector."""
+
+    def _config(self, detect_duplicates=True):
+        return MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#"},
+            defaults=DefaultsConfig(base_iri="https://data.example.com/"), sheets=[
+                SheetMapping(
+                    name="test",
+                    source="test.csv",
+                    row_resource=RowResource(class_type="ex:Item", iri_template="{base_iri}item/{category}"),
+                    columns={"value": ColumnMapping(as_property="ex:value", datatype="xsd:integer")},
+                    detect_duplicates=detect_duplicates,
+                )
+            ]
+        )
+
+    def test_duplicates_across_chunks(self):
+        from rdfmap.emitter.duplicates import HashedIRIDuplicateDetector
+
+        detector = HashedIRIDuplicateDetector()
+        chunks = [["a", "b", "a", None], ["c", "b", "d"], ["a", "e", "e"]]
+        offset = 0
+        for chunk in chunks:
+            detector.add(pl.Series(chunk, dtype=pl.String), offset)
+            offset += len(chunk)
+
+        assert detector.get_duplicate_iris() == {"a": [1, 3, 8], "b": [2, 6], "e": [9, 10]}
+        assert detector.duplicate_count == 3
+        assert detector.extra_occurrences == 4
+
+    def test_samples_are_bounded(self):
+        from rdfmap.emitter.duplicates import HashedIRIDuplicateDetector
+
+        detector = HashedIRIDuplicateDetector(max_iris=5, max_rows=3)
+        for chunk in range(4):
+            iris = pl.Series([f"iri/{i % 50}" for i in range(500)])
+            detector.add(iris, chunk * 500)
+
+        duplicates = detector.get_duplicate_iris()
+        assert detector.duplicate_count == 50
+        assert len(duplicates) == 5
+        assert all(len(rows) == 3 for rows in duplicates.values())
+        assert duplicates["iri/0"] == [1, 51, 101]
+
+    def test_counts_match_across_merged_runs(self):
+        from collections import Counter
+        import random
+
+        from rdfmap.emitter.duplicates import HashedIRIDuplicateDetector
+
+        rng = random.Random(7)
+        detector = HashedIRIDuplicateDetector(max_iris=0)
+        seen = Counter()
+        offset = 0
+        for size in [rng.randint(1, 300) for _ in range(60)]:
+            chunk = [f"iri/{rng.randint(0, 3000)}" for _ in range(size)]
+            seen.update(chunk)
+            detector.add(pl.Series(chunk), offset)
+            offset += size
+
+        assert detector.duplicate_count == sum(1 for count in seen.values() if count > 1)
+        assert detector.extra_occurrences == sum(count - 1 for count in seen.values())
+
+    def test_builders_report_sampled_rows(self, tmp_path):
+        from rdfmap.emitter.columnar_nt import ColumnarNTriplesBuilder
+        from rdfmap.emitter.nt_streaming import NTriplesStreamWriter
+
+        config = self._config()
+        df = pl.DataFrame({"category": ["A", "B", "A", "C", "B"], "value": [1, 2, 3, 4, 5]})
+        expected = {
+            "https://data.example.com/item/A": [1, 3],
+            "https://data.example.com/item/B": [2, 5],
+        }
+
+        builder = RDFGraphBuilder(config, ProcessingReport())
+        builder.add_dataframe(df, config.sheets[0])
+        assert builder.get_duplicate_iris() == expected
+        assert builder.get_duplicate_count() == 2
+
+        with NTriplesStreamWriter(tmp_path / "out.nt") as writer:
+            streaming = ColumnarNTriplesBuilder(config, ProcessingReport(), writer)
+            streaming.add_dataframe(df.slice(0, 2), config.sheets[0])
+            streaming.add_dataframe(df.slice(2), config.sheets[0], offset=2)
+        assert streaming.get_duplicate_iris() == expected
+
+    def test_disabled_by_default(self):
+        config = self._config(detect_duplicates=False)
+        builder = RDFGraphBuilder(config, ProcessingReport())
+        builder.add_dataframe(pl.DataFrame({"category": ["A", "A"], "value": [1, 2]}), config.sheets[0])
+        assert builder.get_duplicate_iris() == {}
+
+
 class TestIntegratedValidation:
     """Test integrated validation with real-world scenarios."""
+
+    def test_datatype_violations_reported_per_column(self):
+        """Test that invalid values are counted per column with bounded samples."""
+        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#"},
+            defaults=DefaultsConfig(base_iri="https://data.example.com/"), sheets=[
+                SheetMapping(
+                    name="test",
+                    source="test.csv",
+                    row_resource=RowResource(class_type="ex:Item", iri_template="{base_iri}item/{id}"),
+                    columns={
+                        "id": ColumnMapping(as_property="ex:id", datatype="xsd:string"),
+                        "count": ColumnMapping(as_property="ex:count", datatype="xsd:integer"),
+                    }
+                )
+            ]
+        )
+        df = pl.DataFrame({
+            "id": [str(i) for i in range(30)],
+            "count": ["bad"] * 25 + ["1", "2", "3", "4", "5"],
+        })
+
+        report = ProcessingReport()
+        builder = RDFGraphBuilder(config, report)
+        builder.add_dataframe(df, config.sheets[0])
+
+        assert report.datatype_violations == {"count": 25}
+        assert report.warnings == 25
+        samples = [e for e in report.errors if "Datatype validation failed" in e.error]
+        assert len(samples) == 10
+        assert samples[0].row == 1
+        assert all(e.severity == ErrorSeverity.WARNING for e in samples)
+        # Invalid values are still emitted, as plain literals
+        assert len(list(builder.get_graph().triples((None, None, None)))) == 30 * 3
     
     def test_invalid_datatype_caught(self):
         """Test that invalid datatypes are caught during processing."""
@@ -302,7 +464,7 @@ class TestIntegratedValidation:
         """Test all validation features working together."""
         pytest.skip("Integrated validation features not yet fully implemented")
 
-        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#", "xsd": "http://www.w3.org/2001/XMLSchema#"},
+        config = MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#"},
             defaults=DefaultsConfig(base_iri="https://data.example.com/"), sheets=[
                 SheetMapping(
                     name="loans",
@@ -342,3 +504,75 @@ class TestIntegratedValidation:
         # Should have no datatype errors (all valid)
         datatype_errors = [e for e in report.errors if "Datatype validation failed" in e.error]
         assert len(datatype_errors) == 0
+
+
+class TestStaticStructureCheck:
+    """Test domain/range checks decided once per mapping rule."""
+
+    ONTOLOGY = """
+@prefix ex: <https://example.com#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+ex:Person a owl:Class .
+ex:Employee a owl:Class ; rdfs:subClassOf ex:Person .
+ex:Company a owl:Class .
+ex:name a owl:DatatypeProperty ; rdfs:domain ex:Person ; rdfs:range xsd:string .
+ex:age a owl:DatatypeProperty ; rdfs:domain ex:Person ; rdfs:range xsd:integer .
+ex:salary a owl:DatatypeProperty ; rdfs:domain ex:Person ; rdfs:range xsd:integer .
+ex:founded a owl:DatatypeProperty ; rdfs:domain ex:Company .
+ex:employer a owl:ObjectProperty ; rdfs:domain ex:Person ; rdfs:range ex:Company .
+"""
+
+    def _config(self):
+        return MappingConfig(namespaces={"xsd": "http://www.w3.org/2001/XMLSchema#", "ex": "https://example.com#"},
+            defaults=DefaultsConfig(base_iri="https://data.example.com/"), sheets=[
+                SheetMapping(
+                    name="staff",
+                    source="staff.csv",
+                    row_resource=RowResource(class_type="ex:Employee", iri_template="{base_iri}staff/{id}"),
+                    columns={
+                        "name": ColumnMapping(as_property="ex:name", datatype="xsd:string"),
+                        "age": ColumnMapping(as_property="ex:age"),
+                        "salary": ColumnMapping(as_property="ex:salary", datatype="xsd:decimal"),
+                        "founded": ColumnMapping(as_property="ex:founded"),
+                    },
+                    objects={
+                        "employer": LinkedObject(
+                            predicate="ex:employer",
+                            class_type="ex:Person",
+                            iri_template="{base_iri}org/{org}",
+                            properties=[],
+                        ),
+                    },
+                )
+            ]
+        )
+
+    def test_rule_violations_counted_per_row(self, tmp_path):
+        from rdfmap.generator.ontology_analyzer import OntologyAnalyzer
+
+        ontology = tmp_path / "ontology.ttl"
+        ontology.write_text(self.ONTOLOGY)
+        analyzer = OntologyAnalyzer(str(ontology))
+        df = pl.DataFrame({
+            "id": ["1", "2", "3"],
+            "name": ["Ann", "Bob", "Cy"],
+            "age": [30, 40, None],
+            "salary": ["1.5", None, "2"],
+            "founded": [None, "1999", None],
+            "org": ["a", "b", None],
+        })
+
+        report = ProcessingReport()
+        builder = RDFGraphBuilder(self._config(), report, ontology_analyzer=analyzer)
+        builder.add_dataframe(df, builder.config.sheets[0])
+
+        # founded: one triple outside the domain; employer: two objects outside the range,
+        # salary: two decimal literals for an integer range. Subclasses satisfy the domain
+        # and integer columns infer xsd:integer.
+        assert report.domain_violations == 1
+        assert report.range_violations == 4
+        assert len(report.structural_samples) == 3
+        assert any("'salary'" in m for m in report.structural_samples)
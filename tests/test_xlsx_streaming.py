@@ -0,0 +1,195 @@
+"""Tests for streaming the sheets of a workbook in chunks.
+
+This module checks that both workbook readers (python-calamine and
+openpyxl) give the same rows, that ``XLSXParser`` streams chunks and pushes
+the plan's columns and limit into the read, and that the parsers and the
+generator's analyzers share one open workbook per file, closed when a
+command ends.
+"""
+
+import sys
+from datetime import datetime
+
+import polars as pl
+import pytest
+from typer.testing import CliRunner
+
+from rdfmap.cli.main import app
+from rdfmap.generator.data_analyzer import DataSourceAnalyzer
+from rdfmap.generator.multisheet_analyzer import MultiSheetAnalyzer
+from rdfmap.parsers import xlsx_stream
+from rdfmap.parsers.data_source import SOURCE_ROW, ScanPlan, XLSXParser, create_parser
+from rdfmap.parsers.xlsx_stream import close_workbooks, iter_sheet_frames, mapped_sheet_name, open_workbook
+
+openpyxl = pytest.importorskip("openpyxl")
+
+
+@pytest.fixture(params=["openpyxl", "calamine"], autouse=True)
+def engine(request, monkeypatch):
+    """Read workbooks with each library, and with a fresh set of open workbooks."""
+    if request.param == "calamine":
+        pytest.importorskip("python_calamine")
+    else:
+        monkeypatch.setitem(sys.modules, "python_calamine", None)
+    close_workbooks()
+    yield request.param
+    close_workbooks()
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    wb = openpyxl.Workbook()
+    loans = wb.active
+    loans.title = "Loans"
+    loans.append(["id", "amount", None, "opened"])
+    loans.append(["L1", 100, None, datetime(2024, 1, 15, 9, 30)])
+    loans.append(["L2", 2.5, "x", None])
+    loans.append(["L3", "n/a", None, None])
+    loans.append(["L4", 400])
+    loans.append(["L5", 500, None, None])
+    borrowers = wb.create_sheet("Borrowers")
+    borrowers["B1"] = "bid"
+    borrowers["B2"] = "B1"
+    wb.create_sheet("Empty")
+    path = tmp_path / "portfolio.xlsx"
+    wb.save(path)
+    return path
+
+
+def test_rows(workbook_path):
+    workbook = open_workbook(workbook_path)
+    assert workbook.sheet_names == ["Loans", "Borrowers", "Empty"]
+    rows = list(workbook.rows())
+    assert rows[1] == ("L1", 100, None, datetime(2024, 1, 15, 9, 30))
+    assert rows[2] == ("L2", 2.5, "x", None)
+    # Rows start at the first column of the sheet, not the first one used
+    assert list(workbook.rows("Borrowers")) == [(None, "bid"), (None, "B1")]
+    with pytest.raises(ValueError, match="not found"):
+        list(workbook.rows("Missing"))
+
+
+def test_parse_chunks(workbook_path):
+    chunks = list(XLSXParser(workbook_path).parse(chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[0].columns == ["id", "amount", "Column_2", "opened"]
+    # Mixed values in a column become text instead of failing, in every chunk
+    assert chunks[0]["amount"].to_list() == ["100", "2.5"]
+    assert chunks[1]["amount"].to_list() == ["n/a", "400"]
+
+    whole = next(XLSXParser(workbook_path).parse())
+    assert len(whole) == 5
+    assert pl.concat(chunks).equals(whole)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3])
+def test_types_do_not_depend_on_chunks(workbook_path, chunk_size):
+    chunks = list(XLSXParser(workbook_path).parse(chunk_size=chunk_size))
+    for column, dtype in [("amount", pl.String), ("opened", pl.Datetime("us"))]:
+        assert {chunk[column].dtype for chunk in chunks} == {dtype}
+
+
+def test_values_not_fitting_the_sample_become_text(workbook_path, monkeypatch):
+    monkeypatch.setattr(xlsx_stream, "SHEET_SCHEMA_ROWS", 2)
+    chunks = list(XLSXParser(workbook_path).parse(chunk_size=2))
+    assert chunks[0]["amount"].to_list() == [100.0, 2.5]
+    assert chunks[1]["amount"].to_list() == ["n/a", "400"]
+    assert chunks[2]["amount"].to_list() == [500.0]
+
+
+def test_column_names(workbook_path):
+    assert XLSXParser(workbook_path).get_column_names() == ["id", "amount", "Column_2", "opened"]
+    parser = XLSXParser(workbook_path, has_header=False)
+    assert parser.get_column_names() == ["Column_0", "Column_1", "Column_2", "Column_3"]
+    assert next(parser.parse())["Column_0"].to_list()[:2] == ["id", "L1"]
+
+
+def test_parse_plan_reads_planned_columns(workbook_path):
+    plan = ScanPlan(columns=["id"], predicate=pl.col("amount").is_not_null(), limit=2)
+    frames = list(XLSXParser(workbook_path).parse_plan(plan, chunk_size=10))
+    assert len(frames) == 1
+    assert frames[0].columns == [SOURCE_ROW, "id"]
+    assert frames[0]["id"].to_list() == ["L1", "L2"]
+
+
+def test_header_only_and_empty_sheets(workbook_path):
+    frames = list(iter_sheet_frames([("a", "b")], chunk_size=10))
+    assert [frame.columns for frame in frames] == [["a", "b"]] and len(frames[0]) == 0
+    assert list(XLSXParser(workbook_path, sheet_name="Empty").parse()) == []
+
+
+def test_workbook_opened_once(workbook_path, monkeypatch):
+    opened = []
+    workbook_class = xlsx_stream.Workbook
+
+    def counting_workbook(path):
+        opened.append(path)
+        return workbook_class(path)
+
+    monkeypatch.setattr(xlsx_stream, "Workbook", counting_workbook)
+
+    DataSourceAnalyzer(str(workbook_path))
+    MultiSheetAnalyzer(str(workbook_path))
+    for name in ("Loans", "Borrowers"):
+        parser = create_parser(workbook_path, sheet_name=mapped_sheet_name(workbook_path, name))
+        list(parser.parse(chunk_size=2))
+    assert len(opened) == 1
+
+
+def test_workbook_reopened_when_changed(workbook_path):
+    first = open_workbook(workbook_path)
+    wb = openpyxl.load_workbook(workbook_path)
+    wb["Loans"].append(["L6", 600])
+    wb.save(workbook_path)
+    assert open_workbook(workbook_path) is not first
+    assert len(next(XLSXParser(workbook_path).parse())) == 6
+
+
+def test_mapped_sheet_name(workbook_path):
+    assert mapped_sheet_name(workbook_path, "Borrowers") == "Borrowers"
+    # Mappings not named after a sheet read the first one
+    assert mapped_sheet_name(workbook_path, "loans") is None
+    parser = create_parser(workbook_path, sheet_name=mapped_sheet_name(workbook_path, "Borrowers"))
+    assert parser.get_column_names() == ["Column_0", "bid"]
+
+
+def test_convert_closes_workbooks(workbook_path, tmp_path):
+    mapping = tmp_path / "mapping.yaml"
+    mapping.write_text(
+        "namespaces: {ex: 'http://example.org/', xsd: 'http://www.w3.org/2001/XMLSchema#'}\n"
+        "defaults: {base_iri: 'http://example.org/'}\n"
+        "sheets:\n"
+        f"  - name: Loans\n    source: {workbook_path}\n"
+        "    row_resource: {class: 'ex:Loan', iri_template: '{base_iri}loan/{id}'}\n"
+        "    columns: {amount: {as: 'ex:amount'}}\n"
+    )
+    output = tmp_path / "loans.nt"
+    result = CliRunner().invoke(app, ["convert", "-m", str(mapping), "-f", "nt", "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    assert len(output.read_text().splitlines()) == 10
+    assert not xlsx_stream._OPEN
+
+
+def test_date_cells_as_typed_dates(tmp_path):
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    sheet.title = "Loans"
+    sheet.append(["id", "Start"])
+    for i in range(25):
+        sheet.append([f"L{i}", datetime(2024, 1, i + 1)])
+    path = tmp_path / "loans.xlsx"
+    wb.save(path)
+    mapping = tmp_path / "mapping.yaml"
+    mapping.write_text(
+        "namespaces: {ex: 'http://example.org/', xsd: 'http://www.w3.org/2001/XMLSchema#'}\n"
+        "defaults: {base_iri: 'http://example.org/'}\n"
+        "sheets:\n"
+        f"  - name: Loans\n    source: {path}\n"
+        "    row_resource: {class: 'ex:Loan', iri_template: '{base_iri}loan/{id}'}\n"
+        "    columns: {Start: {as: 'ex:start', datatype: 'xsd:date'}}\n"
+    )
+    output = tmp_path / "loans.nt"
+    result = CliRunner().invoke(app, ["convert", "-m", str(mapping), "-f", "nt", "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    starts = [line for line in output.read_text().splitlines() if "example.org/start" in line]
+    assert len(starts) == 25
+    assert any('"2024-01-25"^^<http://www.w3.org/2001/XMLSchema#date>' in line for line in starts)
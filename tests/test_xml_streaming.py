@@ -0,0 +1,91 @@
+"""Tests for reading XML row elements incrementally.
+
+This module checks row XPath compilation, that ``iter_row_elements``
+selects the elements ``findall`` does (namespaces, descendants, nested
+matches, fallback paths) while detaching the elements it is done with, and
+chunked parsing with ``XMLParser``.
+"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from rdfmap.parsers.data_source import XMLParser
+from rdfmap.parsers.xml_stream import compile_row_path, iter_row_elements, relative_row_path
+
+NS = "http://example.org/loans"
+
+DOCUMENT = f"""<?xml version="1.0"?>
+<l:portfolio xmlns:l="{NS}" xmlns:x="http://example.org/extra">
+  <l:meta><l:loan>not a row of loans/loan</l:loan></l:meta>
+  <l:loans>
+    <l:loan l:id="L1" x:flag="y"><l:amount>100</l:amount><l:loan l:id="L1-a"/></l:loan>
+    <l:loan l:id="L2"><l:amount>200</l:amount></l:loan>
+    <other/>
+  </l:loans>
+</l:portfolio>
+"""
+
+
+@pytest.fixture
+def document(tmp_path):
+    path = tmp_path / "portfolio.xml"
+    path.write_text(DOCUMENT)
+    return path
+
+
+class TestRowPath:
+    """Test suite for row XPath compilation."""
+
+    def test_relative_to_root(self):
+        assert relative_row_path("/root/loans/loan", "root") == "loans/loan"
+        assert relative_row_path(f"/{{{NS}}}root/loan", f"{{{NS}}}root") == "loan"
+        assert relative_row_path("./*", "root") == "./*"
+
+    def test_steps(self):
+        assert compile_row_path("./*", {}) == [(False, "*")]
+        assert compile_row_path("l:loans//l:loan", {"l": NS}) == [(False, f"{{{NS}}}loans"), (True, f"{{{NS}}}loan")]
+        assert compile_row_path(".", {}) == []
+
+    @pytest.mark.parametrize("path", ["loans/loan[@id]", "loans/..", "loans/", "loan[1]"])
+    def test_unsupported(self, path):
+        assert compile_row_path(path, {}) is None
+
+    def test_undeclared_prefix(self):
+        with pytest.raises(ValueError):
+            compile_row_path("p:loan", {})
+
+
+@pytest.mark.parametrize("row_xpath", [
+    f"{{{NS}}}loans/{{{NS}}}loan",
+    f".//{{{NS}}}loan",
+    "{*}loans/*",
+    f"/{{{NS}}}portfolio/{{{NS}}}loans/{{{NS}}}loan",
+    f"{{{NS}}}loans/{{{NS}}}loan[{{{NS}}}amount]",
+])
+def test_same_elements_as_findall(document, row_xpath):
+    root = ET.parse(document).getroot()
+    expected = [ET.tostring(e) for e in root.findall(relative_row_path(row_xpath, root.tag))]
+    assert [ET.tostring(e) for e in iter_row_elements(document, row_xpath)] == expected
+
+
+def test_prefixes_declared_in_document(document):
+    ids = [e.get(f"{{{NS}}}id") for e in iter_row_elements(document, "l:loans/l:loan")]
+    assert ids == ["L1", "L2"]
+
+
+def test_finished_elements_are_detached(document):
+    for element in iter_row_elements(document, "{*}loans/{*}loan"):
+        pass
+    # The last row was cleared and nothing is left under the loans element
+    assert len(element) == 0 and not element.attrib
+
+
+def test_parser_chunks_and_columns(document):
+    parser = XMLParser(document, "{*}loans//{*}loan")
+    chunks = list(parser.parse(chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    # Namespace-qualified tags and attributes are kept as they are
+    assert chunks[0][f"@{{{NS}}}id"].to_list() == ["L1", "L1-a"]
+    assert chunks[0]["@{http://example.org/extra}flag"].to_list() == ["y", None]
+    assert f"{{{NS}}}amount" in parser.get_column_names()